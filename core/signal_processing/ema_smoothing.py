@@ -6,7 +6,7 @@ import core.signal_processing.ema_smoothing as cspremsm
 
 import functools
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -68,6 +68,88 @@ def compute_ema(
     return signal_hat
 
 
+def compute_ema_incrementally(
+    signal: Union[pd.DataFrame, pd.Series],
+    tau: float,
+    min_periods: int,
+    depth: int = 1,
+    state: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[Union[pd.DataFrame, pd.Series], Dict[str, np.ndarray]]:
+    """
+    Compute the same iterated EMA as `compute_ema()` one chunk at a time.
+
+    Calling this function on consecutive chunks of a signal, passing the state
+    returned by the previous call, gives the same result as calling
+    `compute_ema()` on the entire signal, with a cost proportional to the
+    length of the chunk and not to the length of the history.
+
+    :param signal: new chunk of the signal
+    :param tau: as in `compute_ema()`
+    :param min_periods: as in `compute_ema()`
+    :param depth: as in `compute_ema()`
+    :param state: state returned by the previous call or `None` to start from
+        an empty history
+    :return: iterated EMA of the chunk and the updated state
+    """
+    hdbg.dassert_isinstance(depth, int)
+    hdbg.dassert_lte(1, depth)
+    hdbg.dassert_lt(0, tau)
+    com = csprspfu.calculate_com_from_tau(tau)
+    # Same conventions as `ewm(adjust=True, ignore_na=False)`.
+    old_wt_factor = 1.0 - 1.0 / (1.0 + com)
+    min_periods = max(int(min_periods), 1)
+    values = signal.to_numpy(dtype=float)
+    is_series = values.ndim == 1
+    if is_series:
+        values = values.reshape(-1, 1)
+    n_cols = values.shape[1]
+    if state is None:
+        # For each EMA level, store the current average, the total weight of
+        # the past observations, and the number of observations.
+        state = {
+            "weighted": np.full((depth, n_cols), np.nan),
+            "old_wt": np.ones((depth, n_cols)),
+            "nobs": np.zeros((depth, n_cols), dtype=int),
+        }
+    hdbg.dassert_eq(state["weighted"].shape, (depth, n_cols))
+    weighted = state["weighted"].copy()
+    old_wt = state["old_wt"].copy()
+    nobs = state["nobs"].copy()
+    for level in range(depth):
+        out = np.empty_like(values)
+        for i, cur in enumerate(values):
+            is_observation = ~np.isnan(cur)
+            nobs[level] += is_observation
+            has_weighted = ~np.isnan(weighted[level])
+            # Decay the weight of the past also for missing observations.
+            old_wt[level] = np.where(
+                has_weighted, old_wt[level] * old_wt_factor, old_wt[level]
+            )
+            update = has_weighted & is_observation
+            weighted[level] = np.where(
+                update & (weighted[level] != cur),
+                (old_wt[level] * weighted[level] + cur) / (old_wt[level] + 1.0),
+                weighted[level],
+            )
+            old_wt[level] = np.where(update, old_wt[level] + 1.0, old_wt[level])
+            weighted[level] = np.where(
+                ~has_weighted & is_observation, cur, weighted[level]
+            )
+            out[i] = np.where(
+                nobs[level] >= min_periods, weighted[level], np.nan
+            )
+        # The output of a level is the input of the next one.
+        values = out
+    state = {"weighted": weighted, "old_wt": old_wt, "nobs": nobs}
+    if is_series:
+        signal_hat = pd.Series(values[:, 0], index=signal.index, name=signal.name)
+    else:
+        signal_hat = pd.DataFrame(
+            values, index=signal.index, columns=signal.columns
+        )
+    return signal_hat, state
+
+
 def compute_smooth_derivative(
     signal: Union[pd.DataFrame, pd.Series],
     tau: float,
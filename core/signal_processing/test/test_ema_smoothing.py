@@ -28,6 +28,34 @@ class Test_compute_smooth_derivative1(hunitest.TestCase):
         self.check_string(actual.to_string())
 
 
+class Test_compute_ema_incrementally1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that processing consecutive chunks gives the same result as
+        processing the entire signal.
+        """
+        np.random.seed(42)
+        tau = 7.5
+        min_periods = 10
+        depth = 3
+        n = 200
+        signal = pd.DataFrame(np.random.randn(n, 2), columns=["a", "b"])
+        # Add missing values.
+        signal.iloc[5:9, 0] = np.nan
+        signal.iloc[0:3, 1] = np.nan
+        expected = cspremsm.compute_ema(signal, tau, min_periods, depth)
+        # Process the signal chunk by chunk.
+        state = None
+        chunks = []
+        for start, end in [(0, 1), (1, 50), (50, 51), (51, n)]:
+            chunk, state = cspremsm.compute_ema_incrementally(
+                signal.iloc[start:end], tau, min_periods, depth, state
+            )
+            chunks.append(chunk)
+        actual = pd.concat(chunks)
+        hpandas.dassert_approx_eq(actual.to_numpy(), expected.to_numpy())
+
+
 class Test_compute_smooth_moving_average1(hunitest.TestCase):
     def test1(self) -> None:
         np.random.seed(42)
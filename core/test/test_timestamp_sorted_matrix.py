@@ -0,0 +1,146 @@
+import logging
+
+import pandas as pd
+
+import core.timestamp_sorted_matrix as ctisomat
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_timestamp(minute: int) -> pd.Timestamp:
+    timestamp = pd.Timestamp("2000-01-01 09:30:00", tz="America/New_York")
+    timestamp += pd.Timedelta(minutes=minute)
+    return timestamp
+
+
+def _get_series(values: list, asset_ids: list) -> pd.Series:
+    index = pd.Index(asset_ids, name="asset_id")
+    srs = pd.Series(values, index=index, dtype=float)
+    return srs
+
+
+# #############################################################################
+# TestTimestampSortedArray1
+# #############################################################################
+
+
+class TestTimestampSortedArray1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Store and retrieve values, growing the arrays.
+        """
+        array = ctisomat.TimestampSortedArray(initial_num_rows=2)
+        for minute in range(1, 6):
+            array[_get_timestamp(minute)] = 100.0 * minute
+        self.assertEqual(len(array), 5)
+        self.assertIn(_get_timestamp(2), array)
+        self.assertNotIn(_get_timestamp(6), array)
+        self.assertEqual(array[_get_timestamp(2)], 200.0)
+        self.assertEqual(array.peek(), (_get_timestamp(5), 500.0))
+        # Check the last values.
+        actual = hpandas.df_to_str(array.get_series(2), num_rows=None)
+        expected = r"""
+                                       0
+        2000-01-01 09:34:00-05:00  400.0
+        2000-01-01 09:35:00-05:00  500.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_unsorted_keys1(self) -> None:
+        """
+        Check that the timestamps must be increasing.
+        """
+        array = ctisomat.TimestampSortedArray()
+        array[_get_timestamp(2)] = 1.0
+        with self.assertRaises(AssertionError):
+            array[_get_timestamp(1)] = 2.0
+
+
+# #############################################################################
+# TestTimestampSortedMatrix1
+# #############################################################################
+
+
+class TestTimestampSortedMatrix1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the dataframe is the same as transposing the dict of the
+        series.
+        """
+        matrix = ctisomat.TimestampSortedMatrix()
+        srs_dict = {
+            _get_timestamp(1): _get_series([1, 2], [101, 202]),
+            _get_timestamp(2): _get_series([3, 4], [101, 202]),
+        }
+        for timestamp, srs in srs_dict.items():
+            matrix[timestamp] = srs
+        actual = matrix.get_dataframe()
+        expected = pd.DataFrame(srs_dict).transpose()
+        self.assert_equal(str(actual), str(expected))
+        self.assertTrue(actual.equals(expected))
+        # Check the last series.
+        timestamp, srs = matrix.peek()
+        self.assertEqual(timestamp, _get_timestamp(2))
+        self.assertTrue(srs.equals(srs_dict[timestamp]))
+        timestamp = _get_timestamp(1)
+        self.assertTrue(matrix[timestamp].equals(srs_dict[timestamp]))
+
+    def test_universe_change1(self) -> None:
+        """
+        Check the dataframe when the assets change over time.
+        """
+        matrix = ctisomat.TimestampSortedMatrix(initial_num_cols=1)
+        srs_dict = {
+            _get_timestamp(1): _get_series([1, 2], [202, 101]),
+            _get_timestamp(2): _get_series([3, 4], [202, 101]),
+            _get_timestamp(3): _get_series([5, 6], [303, 101]),
+        }
+        for timestamp, srs in srs_dict.items():
+            matrix[timestamp] = srs
+        actual = matrix.get_dataframe()
+        expected = pd.DataFrame(srs_dict).transpose()
+        self.assertTrue(actual.equals(expected))
+        actual = hpandas.df_to_str(actual, num_rows=None)
+        expected = r"""
+        asset_id                   101  202  303
+        2000-01-01 09:31:00-05:00  2.0  1.0  NaN
+        2000-01-01 09:32:00-05:00  4.0  3.0  NaN
+        2000-01-01 09:33:00-05:00  6.0  NaN  5.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        # The last row keeps the order of its assets.
+        actual = hpandas.df_to_str(matrix.get_dataframe(1), num_rows=None)
+        expected = r"""
+        asset_id                   303  101
+        2000-01-01 09:33:00-05:00  5.0  6.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_max_keys1(self) -> None:
+        """
+        Check that only the last `max_keys` rows are kept.
+        """
+        matrix = ctisomat.TimestampSortedMatrix(max_keys=3, initial_num_rows=2)
+        for minute in range(1, 11):
+            matrix[_get_timestamp(minute)] = _get_series([minute], [101])
+        self.assertEqual(len(matrix), 3)
+        self.assertNotIn(_get_timestamp(7), matrix)
+        self.assertEqual(matrix[_get_timestamp(8)].to_list(), [8.0])
+        actual = hpandas.df_to_str(matrix.get_dataframe(None), num_rows=None)
+        expected = r"""
+        asset_id                    101
+        2000-01-01 09:38:00-05:00   8.0
+        2000-01-01 09:39:00-05:00   9.0
+        2000-01-01 09:40:00-05:00  10.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_empty1(self) -> None:
+        """
+        Check the dataframe of an empty matrix.
+        """
+        matrix = ctisomat.TimestampSortedMatrix()
+        self.assertEqual(len(matrix), 0)
+        self.assertTrue(matrix.get_dataframe().empty)
@@ -0,0 +1,363 @@
+"""
+Import as:
+
+import core.timestamp_sorted_matrix as ctisomat
+"""
+
+import abc
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# _TimestampSortedStore
+# #############################################################################
+
+
+class _TimestampSortedStore(abc.ABC):
+    """
+    Store one row of values for each timestamp in preallocated NumPy arrays.
+
+    Like `KeySortedOrderedDict`, the timestamps must be inserted in increasing
+    order and only the last `max_keys` rows are kept. The rows are stored
+    contiguously in arrays that are grown by doubling, so that:
+    - inserting a row is amortized O(1)
+    - retrieving the last `n` rows is a slice, i.e., O(n)
+    """
+
+    def __init__(
+        self,
+        max_keys: Optional[int] = None,
+        initial_num_rows: int = 256,
+    ) -> None:
+        """
+        Constructor.
+
+        :param max_keys: number of most recent rows to keep
+            - `None` means keep all the rows
+        :param initial_num_rows: number of rows to preallocate
+        """
+        if max_keys is not None:
+            hdbg.dassert_lte(1, max_keys)
+        hdbg.dassert_lte(1, initial_num_rows)
+        self._max_keys = max_keys
+        # The stored rows are `[self._start, self._end)`.
+        self._start = 0
+        self._end = 0
+        # Timestamps as nanoseconds since epoch.
+        self._keys = np.empty(initial_num_rows, dtype=np.int64)
+        # Timezone of the timestamps, which must be the same for all the rows.
+        self._tz: Any = None
+        # Map the timestamp in nanoseconds to the absolute index of the row,
+        # i.e., the number of rows inserted before it.
+        self._key_to_idx: Dict[int, int] = {}
+        # Absolute index of the row at `self._start`.
+        self._start_idx = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __contains__(self, key: pd.Timestamp) -> bool:
+        hdbg.dassert_isinstance(key, pd.Timestamp)
+        return key.value in self._key_to_idx
+
+    def get_last_key(self) -> pd.Timestamp:
+        """
+        Get the last timestamp.
+        """
+        hdbg.dassert_lt(0, len(self), "The store is empty")
+        return self._to_timestamp(self._keys[self._end - 1])
+
+    def _get_row(self, key: pd.Timestamp) -> int:
+        """
+        Get the position of the row for `key` in the arrays.
+        """
+        hdbg.dassert_isinstance(key, pd.Timestamp)
+        hdbg.dassert_in(key.value, self._key_to_idx)
+        row = self._start + self._key_to_idx[key.value] - self._start_idx
+        return row
+
+    def _get_rows(self, num_keys: Optional[int]) -> slice:
+        """
+        Get the positions of the last `num_keys` rows in the arrays.
+        """
+        if num_keys is None:
+            return slice(self._start, self._end)
+        num_keys = min(max(num_keys, 0), len(self))
+        return slice(self._end - num_keys, self._end)
+
+    def _append_key(self, key: pd.Timestamp) -> int:
+        """
+        Add a row for `key` after the last row, dropping the first row if
+        there are more than `max_keys` rows.
+
+        :return: position of the added row in the arrays
+        """
+        hdbg.dassert_isinstance(key, pd.Timestamp)
+        if len(self) == 0:
+            self._tz = key.tz
+        else:
+            hdbg.dassert_eq(str(key.tz), str(self._tz))
+            # Compare the timestamps in nanoseconds, which is faster than
+            # building the last timestamp.
+            hdbg.dassert_lt(int(self._keys[self._end - 1]), key.value)
+        if self._end == self._keys.shape[0]:
+            self._make_room()
+        row = self._end
+        self._keys[row] = key.value
+        self._key_to_idx[key.value] = self._start_idx + len(self)
+        self._end += 1
+        if self._max_keys is not None and len(self) > self._max_keys:
+            del self._key_to_idx[int(self._keys[self._start])]
+            self._start += 1
+            self._start_idx += 1
+        return row
+
+    def _make_room(self) -> None:
+        """
+        Make room for a row after the last row.
+        """
+        num_rows = len(self)
+        capacity = self._keys.shape[0]
+        if self._start > 0 and 2 * num_rows <= capacity:
+            # Move the rows to the beginning of the arrays, instead of growing
+            # them, e.g., when the first rows were dropped because of
+            # `max_keys`.
+            new_capacity = capacity
+        else:
+            new_capacity = 2 * capacity
+        rows = slice(self._start, self._end)
+        keys = np.empty(new_capacity, dtype=np.int64)
+        keys[:num_rows] = self._keys[rows]
+        self._keys = keys
+        self._resize_rows(rows, new_capacity)
+        self._start = 0
+        self._end = num_rows
+
+    @abc.abstractmethod
+    def _resize_rows(self, rows: slice, new_capacity: int) -> None:
+        """
+        Copy `rows` to the beginning of arrays with `new_capacity` rows.
+        """
+        ...
+
+    def _to_timestamp(self, key: int) -> pd.Timestamp:
+        timestamp = pd.Timestamp(key, tz="UTC")
+        if self._tz is None:
+            timestamp = timestamp.tz_localize(None)
+        else:
+            timestamp = timestamp.tz_convert(self._tz)
+        return timestamp
+
+    def _to_index(self, rows: slice) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self._keys[rows], tz="UTC")
+        if self._tz is None:
+            index = index.tz_localize(None)
+        else:
+            index = index.tz_convert(self._tz)
+        return index
+
+
+# #############################################################################
+# TimestampSortedArray
+# #############################################################################
+
+
+class TimestampSortedArray(_TimestampSortedStore):
+    """
+    Store a float for each timestamp, e.g., the cash of a portfolio.
+    """
+
+    def __init__(
+        self,
+        max_keys: Optional[int] = None,
+        initial_num_rows: int = 256,
+    ) -> None:
+        super().__init__(max_keys, initial_num_rows)
+        self._values = np.empty(initial_num_rows, dtype=np.float64)
+
+    def __getitem__(self, key: pd.Timestamp) -> float:
+        row = self._get_row(key)
+        return float(self._values[row])
+
+    def __setitem__(self, key: pd.Timestamp, value: float) -> None:
+        row = self._append_key(key)
+        self._values[row] = value
+
+    def peek(self) -> Tuple[pd.Timestamp, float]:
+        """
+        Get the last timestamp and value.
+        """
+        key = self.get_last_key()
+        return key, float(self._values[self._end - 1])
+
+    def get_series(self, num_keys: Optional[int] = None) -> pd.Series:
+        """
+        Get the `num_keys` most recent values indexed by timestamp.
+
+        :param num_keys: number of rows to return
+            - `None` means all the rows
+        """
+        rows = self._get_rows(num_keys)
+        srs = pd.Series(self._values[rows], index=self._to_index(rows))
+        return srs
+
+    def _resize_rows(self, rows: slice, new_capacity: int) -> None:
+        values = np.empty(new_capacity, dtype=np.float64)
+        values[: rows.stop - rows.start] = self._values[rows]
+        self._values = values
+
+
+# #############################################################################
+# TimestampSortedMatrix
+# #############################################################################
+
+
+class TimestampSortedMatrix(_TimestampSortedStore):
+    """
+    Store a `pd.Series` for each timestamp, e.g., the holdings of a portfolio
+    indexed by asset id.
+
+    The values are stored in a matrix with a column for each label of the
+    series (e.g., asset id) ever inserted, so that the labels can change over
+    time (e.g., when the universe changes). Each row remembers the labels of
+    its series and their order (i.e., the "layout" of the row), so that
+    `get_dataframe()` returns the same dataframe as transposing the dict of
+    the series, i.e.:
+    - the columns are the labels of the series in the requested rows
+    - the values of the labels missing from a series are NaN
+    """
+
+    def __init__(
+        self,
+        max_keys: Optional[int] = None,
+        initial_num_rows: int = 256,
+        initial_num_cols: int = 32,
+    ) -> None:
+        """
+        Constructor.
+
+        :param initial_num_cols: number of columns to preallocate
+        """
+        super().__init__(max_keys, initial_num_rows)
+        hdbg.dassert_lte(1, initial_num_cols)
+        self._values = np.full(
+            (initial_num_rows, initial_num_cols), np.nan, dtype=np.float64
+        )
+        # Map the labels to the columns of `self._values`.
+        self._label_to_col: Dict[Any, int] = {}
+        # Index of each distinct layout, with the positions of its labels in
+        # the columns of `self._values`.
+        self._layouts: List[pd.Index] = []
+        self._layout_cols: List[np.ndarray] = []
+        # Layout of each row.
+        self._row_layouts = np.empty(initial_num_rows, dtype=np.int64)
+
+    def __getitem__(self, key: pd.Timestamp) -> pd.Series:
+        row = self._get_row(key)
+        return self._get_series(row, key)
+
+    def __setitem__(self, key: pd.Timestamp, value: pd.Series) -> None:
+        hdbg.dassert_isinstance(value, pd.Series)
+        hdbg.dassert(not value.index.has_duplicates)
+        layout = self._get_layout(value.index)
+        row = self._append_key(key)
+        self._row_layouts[row] = layout
+        self._values[row, :] = np.nan
+        self._values[row, self._layout_cols[layout]] = value.to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+    def peek(self) -> Tuple[pd.Timestamp, pd.Series]:
+        """
+        Get the last timestamp and series.
+        """
+        key = self.get_last_key()
+        return key, self._get_series(self._end - 1, key)
+
+    def get_dataframe(self, num_keys: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the `num_keys` most recent series as rows of a dataframe indexed
+        by timestamp.
+
+        :param num_keys: number of rows to return
+            - `None` means all the rows
+        """
+        if len(self) == 0:
+            return pd.DataFrame()
+        rows = self._get_rows(num_keys)
+        layouts = np.unique(self._row_layouts[rows])
+        if len(layouts) == 1:
+            # All the series have the same labels in the same order.
+            columns = self._layouts[layouts[0]]
+        else:
+            # Like `pd.Index.union()`, sort the union of the labels, if
+            # possible.
+            indices = [self._layouts[layout] for layout in layouts]
+            columns = indices[0].append(indices[1:]).unique()
+            try:
+                columns = columns.sort_values()
+            except TypeError:
+                pass
+            names = {index.name for index in indices}
+            columns.name = names.pop() if len(names) == 1 else None
+        cols = [self._label_to_col[label] for label in columns]
+        df = pd.DataFrame(
+            self._values[rows][:, cols],
+            index=self._to_index(rows),
+            columns=columns,
+        )
+        return df
+
+    def _get_series(self, row: int, key: pd.Timestamp) -> pd.Series:
+        layout = self._row_layouts[row]
+        srs = pd.Series(
+            self._values[row, self._layout_cols[layout]],
+            index=self._layouts[layout],
+            name=key,
+        )
+        return srs
+
+    def _get_layout(self, index: pd.Index) -> int:
+        """
+        Get the layout for `index`, adding it if it's different from the last
+        one.
+        """
+        if self._layouts:
+            last_index = self._layouts[-1]
+            if last_index.equals(index) and last_index.name == index.name:
+                return len(self._layouts) - 1
+        # Add the new labels.
+        for label in index:
+            if label not in self._label_to_col:
+                self._label_to_col[label] = len(self._label_to_col)
+        num_cols = self._values.shape[1]
+        if len(self._label_to_col) > num_cols:
+            new_num_cols = max(2 * num_cols, len(self._label_to_col))
+            values = np.full(
+                (self._values.shape[0], new_num_cols), np.nan, dtype=np.float64
+            )
+            values[:, :num_cols] = self._values
+            self._values = values
+        cols = np.array([self._label_to_col[label] for label in index], dtype=int)
+        self._layouts.append(index.copy())
+        self._layout_cols.append(cols)
+        return len(self._layouts) - 1
+
+    def _resize_rows(self, rows: slice, new_capacity: int) -> None:
+        num_rows = rows.stop - rows.start
+        values = np.full(
+            (new_capacity, self._values.shape[1]), np.nan, dtype=np.float64
+        )
+        values[:num_rows] = self._values[rows]
+        self._values = values
+        row_layouts = np.empty(new_capacity, dtype=np.int64)
+        row_layouts[:num_rows] = self._row_layouts[rows]
+        self._row_layouts = row_layouts
@@ -4,6 +4,8 @@ Import as:
 import dataflow.core.dag as dtfcordag
 """
 
+import concurrent.futures
+import copy
 import itertools
 import json
 import logging
@@ -25,6 +27,7 @@ import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hsystem as hsystem
+import helpers.hthreading as hthread
 import helpers.htimer as htimer
 import helpers.hwall_clock_time as hwacltim
 
@@ -33,6 +36,15 @@ _LOG = logging.getLogger(__name__)
 
 DagOutput = Dict[dtfcornode.NodeId, dtfcornode.NodeOutput]
 
+# Key of the Parquet metadata storing the first index value of the node output
+# when saving only the new rows, see `DAG.set_debug_mode()`.
+NODE_IO_WINDOW_START_KEY = "node_io_window_start"
+
+
+# #############################################################################
+# DAG
+# #############################################################################
+
 
 # TODO(gp): Consider calling it `Dag` given our convention of snake case
 #  abbreviations in the code (but not in comments).
@@ -88,6 +100,9 @@ class DAG(hobject.PrintableMixin):
         self._save_node_df_out_stats = False
         self._profile_execution = False
         self._dst_dir: Optional[str] = None
+        self._save_node_io_in_background = False
+        self._save_node_io_delta = False
+        self._node_io_writer: Optional[hthread.BackgroundWriter] = None
         self.set_debug_mode(
             self._save_node_io,
             self._save_node_df_out_stats,
@@ -95,7 +110,29 @@ class DAG(hobject.PrintableMixin):
             self._dst_dir,
         )
         # Disable freeing nodes.
+        # If enabled, the outputs of a node are freed as soon as all the nodes
+        # consuming them in the current run have been executed.
         self.force_free_nodes = False
+        # Peak RSS memory sampled during the last run of the DAG.
+        self._peak_rss_in_gb: Optional[float] = None
+        # Disable incremental execution.
+        self._incremental_mode = False
+        self._incremental_tail_window = 0
+        self._check_incremental = False
+        self._reset_incremental_state()
+        # Run the nodes one at a time.
+        self._scheduler = "serial"
+        self._max_workers: Optional[int] = None
+
+    def __str__(
+        self,
+        *,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        # Copy the list to avoid modifying the one passed by the caller.
+        attr_names_to_skip = list(attr_names_to_skip or [])
+        attr_names_to_skip.extend(self._get_attr_names_to_skip())
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
 
     def __repr__(self) -> str:
         """
@@ -120,7 +157,8 @@ class DAG(hobject.PrintableMixin):
         """
         txt = []
         # Get the representation for the class.
-        txt.append(super().__repr__())
+        attr_names_to_skip = self._get_attr_names_to_skip()
+        txt.append(super().__repr__(attr_names_to_skip=attr_names_to_skip))
         # Add more details.
         res = []
         res.append("nodes=" + str(self.nx_dag.nodes(data=True)))
@@ -133,12 +171,41 @@ class DAG(hobject.PrintableMixin):
         txt = "\n".join(txt)
         return txt
 
+    @staticmethod
+    def _get_attr_names_to_skip() -> List[str]:
+        """
+        Return the names of the attributes not to print.
+        """
+        attr_names_to_skip = [
+            # The memory usage changes from run to run.
+            "_peak_rss_in_gb",
+            "_node_io_writer",
+            "_node_io_last_idxs",
+            # The incremental state stores dataframes and node copies.
+            "_incremental_mode",
+            "_incremental_tail_window",
+            "_check_incremental",
+            "_incremental_tails",
+            "_incremental_last_idxs",
+            "_incremental_histories",
+            "_incremental_prototypes",
+            # Run-time settings of the execution and of the debug mode.
+            "_scheduler",
+            "_max_workers",
+            "_save_node_io_in_background",
+            "_save_node_io_delta",
+        ]
+        return attr_names_to_skip
+
     def set_debug_mode(
         self,
         save_node_io: str,
         save_node_df_out_stats: bool,
         profile_execution: bool,
         dst_dir: Optional[str],
+        *,
+        save_node_io_in_background: bool = False,
+        save_node_io_delta: bool = False,
     ) -> None:
         """
         Set the debug parameters.
@@ -158,18 +225,56 @@ class DAG(hobject.PrintableMixin):
         :param profile_execution: if not `None`, store information about the
             execution of the nodes
         :param dst_dir: directory to save node interface and execution profiling info
+        :param save_node_io_in_background: save the node interface in a
+            background thread, instead of on the critical path of the DAG
+            execution. Use `wait_for_node_io()` to wait for the files to be
+            written
+        :param save_node_io_delta: save only the rows of the node outputs that
+            are new since the previous run, instead of the full lookback
+            window. The outputs can be reconstructed with
+            `get_dag_node_output()`, assuming that the rows already saved
+            don't change (e.g., the warm-up rows of a rolling window are
+            stored as computed the first time)
         """
         hdbg.dassert_in(
             save_node_io,
             ("", "stats", "df_as_csv", "df_as_pq", "df_as_csv_and_pq"),
         )
+        hdbg.dassert_isinstance(save_node_io_in_background, bool)
+        hdbg.dassert_isinstance(save_node_io_delta, bool)
+        if save_node_io_delta:
+            # The full outputs are reconstructed from the start of the lookback
+            # window stored in the Parquet metadata.
+            hdbg.dassert_eq(
+                save_node_io,
+                "df_as_pq",
+                "Saving only the new rows requires saving Parquet files",
+            )
+        # Complete the writes to the previous `dst_dir`.
+        self.wait_for_node_io()
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
                 hprint.to_str(
                     "save_node_io save_node_df_out_stats profile_execution dst_dir"
+                    " save_node_io_in_background save_node_io_delta"
                 )
             )
         self._save_node_io = save_node_io
+        self._save_node_io_in_background = save_node_io_in_background
+        self._save_node_io_delta = save_node_io_delta
+        # Map `(method, nid, output_name)` to the last index value saved.
+        self._node_io_last_idxs: Dict[Tuple[str, str, str], Any] = {}
+        if save_node_io_in_background:
+            if self._node_io_writer is None:
+                max_queue_size = 100
+                self._node_io_writer = hthread.BackgroundWriter(
+                    self._save_node_interfaces,
+                    max_queue_size=max_queue_size,
+                    name="node_io_writer",
+                )
+        elif self._node_io_writer is not None:
+            self._node_io_writer.close()
+            self._node_io_writer = None
         # To process the profiling info in a human consumable form:
         # ```
         # ls -tr -1 tmp.dag_profile/*after* | xargs -n 1 -i sh -c 'echo; echo; echo "# {}"; cat {}'
@@ -196,6 +301,99 @@ class DAG(hobject.PrintableMixin):
                 dst_dir, None, "Need to specify a directory to save the data"
             )
 
+    def wait_for_node_io(self) -> None:
+        """
+        Wait until the node interfaces saved in background are written.
+        """
+        if self._node_io_writer is not None:
+            self._node_io_writer.flush()
+
+    def set_incremental_mode(
+        self,
+        incremental_mode: bool,
+        *,
+        tail_window: int = 1000,
+        check_incremental: bool = False,
+    ) -> None:
+        """
+        Set the DAG to run `predict()` only on the data that is new since the
+        previous run.
+
+        In incremental mode:
+        - the source nodes emit only the rows that were not emitted by the
+          previous run (see `DataSource.set_incremental_mode()`)
+        - the nodes with `is_stateful_incremental = True` receive only the new
+          rows of their inputs and carry their state across runs
+        - the other nodes are run on a tail window of their inputs and emit
+          only the rows that were not emitted by the previous run
+
+        The incremental mode applies only to `predict()`, while `fit()` is
+        always run on the entire data.
+
+        :param incremental_mode: enable or disable the incremental mode
+        :param tail_window: number of most recent index values of the past
+            inputs that are prepended to the new rows for the nodes that are
+            not stateful-incremental. It should be at least as large as the
+            longest lookback of these nodes
+        :param check_incremental: recompute the output of each node on the
+            full history of its inputs and assert that it matches the output
+            computed incrementally. This is very slow and it's meant only for
+            testing and debugging
+        """
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                hprint.to_str("incremental_mode tail_window check_incremental")
+            )
+        hdbg.dassert_isinstance(incremental_mode, bool)
+        hdbg.dassert_isinstance(tail_window, int)
+        hdbg.dassert_lte(1, tail_window)
+        hdbg.dassert_isinstance(check_incremental, bool)
+        self._incremental_mode = incremental_mode
+        self._incremental_tail_window = tail_window
+        self._check_incremental = check_incremental
+        self._reset_incremental_state()
+        # Propagate the mode to the nodes supporting it (e.g., `DataSource`
+        # and the nodes carrying their own state, like `SmaModel`).
+        sources = self.get_sources()
+        for nid in self._nx_dag.nodes():
+            node = self.get_node(nid)
+            if hasattr(node, "set_incremental_mode"):
+                node.set_incremental_mode(incremental_mode)
+            elif nid in sources:
+                _LOG.warning(
+                    "Source node '%s' of type '%s' doesn't support incremental "
+                    "mode and will emit all its data at each run",
+                    nid,
+                    type(node),
+                )
+
+    def set_scheduler(
+        self, scheduler: str, *, max_workers: Optional[int] = None
+    ) -> None:
+        """
+        Set how the nodes are scheduled when running the DAG.
+
+        :param scheduler: how to run the nodes
+            - "serial": run the nodes one at a time following a topological
+              sort
+            - "threading": run each node in a thread pool as soon as all its
+              predecessors have been run, so that independent branches of the
+              DAG (e.g., multiple models fed by the same node) run concurrently.
+              This is useful when the nodes spend most of their time in NumPy /
+              pandas code releasing the GIL. The results are the same as with
+              "serial" since each node depends only on its predecessors
+        :param max_workers: max number of threads used by "threading" (`None`
+            means the `ThreadPoolExecutor` default)
+        """
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(hprint.to_str("scheduler max_workers"))
+        hdbg.dassert_in(scheduler, ("serial", "threading"))
+        if max_workers is not None:
+            hdbg.dassert_isinstance(max_workers, int)
+            hdbg.dassert_lte(1, max_workers)
+        self._scheduler = scheduler
+        self._max_workers = max_workers
+
     # /////////////////////////////////////////////////////////////////////////////
     # Accessor.
     # /////////////////////////////////////////////////////////////////////////////
@@ -214,6 +412,16 @@ class DAG(hobject.PrintableMixin):
     def mode(self) -> str:
         return self._mode
 
+    @property
+    def peak_rss_in_gb(self) -> Optional[float]:
+        """
+        Return the peak RSS memory in GB sampled during the last run.
+
+        The memory is sampled after the execution of each node, before freeing
+        the outputs that are not needed anymore.
+        """
+        return self._peak_rss_in_gb
+
     # /////////////////////////////////////////////////////////////////////////////
     # Build DAG.
     # /////////////////////////////////////////////////////////////////////////////
@@ -493,8 +701,8 @@ class DAG(hobject.PrintableMixin):
             `get_outputs(method)`
         """
         sinks = self.get_sinks()
-        for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
-            self._run_node(id_, nid, method)
+        nids = list(networ.topological_sort(self._nx_dag))
+        self._run_nodes(nids, method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -523,14 +731,9 @@ class DAG(hobject.PrintableMixin):
         )
         # The `ancestors` filter only returns nodes strictly less than `nid`,
         # and so we need to add `nid` back.
-        nids = itertools.chain(ancestors, [nid])
+        nids = list(itertools.chain(ancestors, [nid]))
         # Execute all the ancestors of `nid`.
-        if progress_bar:
-            nids = tqdm(list(nids), desc="run_leq_node")
-        for id_, pred_nid in enumerate(nids):
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+        self._run_nodes(nids, method, progress_bar=progress_bar)
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
@@ -661,33 +864,27 @@ class DAG(hobject.PrintableMixin):
             obj = pd.DataFrame(obj)
         if isinstance(obj, pd.DataFrame):
             df = obj
-            if self._save_node_df_out_stats:
-                # Save high level description about the df.
-                _LOG.debug("Saving node df out stats...")
-                txt = hpandas.df_to_str(
-                    df,
-                    print_dtypes=True,
-                    print_shape_info=True,
-                    print_memory_usage=True,
-                    print_nan_info=True,
-                )
-                hio.to_file(file_name + ".txt", txt)
-            # Save content of the df.
-            if self._save_node_io == "df_as_csv":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-            elif self._save_node_io == "df_as_pq":
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
-            elif self._save_node_io == "df_as_csv_and_pq":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
+            metadata = {}
+            df_to_save = df
+            if self._save_node_io_delta:
+                # Save only the rows after the ones saved at the previous run,
+                # storing the start of the lookback window to reconstruct the
+                # full output.
+                hdbg.dassert_isinstance(df.index, pd.DatetimeIndex)
+                key = (method, nid, output_name)
+                last_idx = self._node_io_last_idxs.get(key)
+                if last_idx is not None:
+                    df_to_save = df.loc[df.index > last_idx]
+                if not df_to_save.empty:
+                    self._node_io_last_idxs[key] = df_to_save.index.max()
+                if not df.empty:
+                    metadata[NODE_IO_WINDOW_START_KEY] = str(df.index.min())
+            # The nodes don't modify their outputs after returning them, so the
+            # dfs can be saved by another thread without copying them.
+            if self._node_io_writer is None:
+                self._save_node_interface(file_name, df, df_to_save, metadata)
             else:
-                raise ValueError(f"Invalid save_node_io='{self._save_node_io}'")
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("Saved log dir in '%s'", file_name)
+                self._node_io_writer.put((file_name, df, df_to_save, metadata))
         else:
             _LOG.warning(
                 "Can't save node input / output of type '%s': %s",
@@ -695,6 +892,314 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _save_node_interfaces(
+        self,
+        items: List[Tuple[str, pd.DataFrame, pd.DataFrame, Dict[str, str]]],
+    ) -> None:
+        """
+        Save the node outputs queued for the background thread.
+
+        :param items: params of `_save_node_interface()` for each node output
+        """
+        for file_name, df, df_to_save, metadata in items:
+            self._save_node_interface(file_name, df, df_to_save, metadata)
+
+    def _save_node_interface(
+        self,
+        file_name: str,
+        df: pd.DataFrame,
+        df_to_save: pd.DataFrame,
+        metadata: Dict[str, str],
+    ) -> None:
+        """
+        Save a node output into files.
+
+        :param file_name: path of the files without extension
+        :param df: node output
+        :param df_to_save: rows of `df` to save
+        :param metadata: metadata to save in the Parquet file
+        """
+        if self._save_node_df_out_stats:
+            # Save high level description about the df.
+            _LOG.debug("Saving node df out stats...")
+            txt = hpandas.df_to_str(
+                df,
+                print_dtypes=True,
+                print_shape_info=True,
+                print_memory_usage=True,
+                print_nan_info=True,
+            )
+            hio.to_file(file_name + ".txt", txt)
+        # Save content of the df.
+        if self._save_node_io == "df_as_csv":
+            csv_file_name = f"{file_name}.csv.gz"
+            df_to_save.to_csv(csv_file_name, compression="gzip")
+        elif self._save_node_io == "df_as_pq":
+            parquet_file_name = f"{file_name}.parquet"
+            hparque.to_parquet(df_to_save, parquet_file_name, metadata=metadata)
+        elif self._save_node_io == "df_as_csv_and_pq":
+            csv_file_name = f"{file_name}.csv.gz"
+            df_to_save.to_csv(csv_file_name, compression="gzip")
+            parquet_file_name = f"{file_name}.parquet"
+            hparque.to_parquet(df_to_save, parquet_file_name, metadata=metadata)
+        else:
+            raise ValueError(f"Invalid save_node_io='{self._save_node_io}'")
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Saved log dir in '%s'", file_name)
+
+    def _reset_incremental_state(self) -> None:
+        """
+        Clear the data accumulated while running in incremental mode.
+        """
+        # Map `(nid, input_name)` to the tail window of the input.
+        self._incremental_tails: Dict[Tuple[dtfcornode.NodeId, str], Any] = {}
+        # Map `(nid, output_name)` to the last index value emitted.
+        self._incremental_last_idxs: Dict[Tuple[dtfcornode.NodeId, str], Any] = {}
+        # Map `(nid, input_name)` to the full history of the input, used only
+        # when checking the incremental execution.
+        self._incremental_histories: Dict[
+            Tuple[dtfcornode.NodeId, str], Any
+        ] = {}
+        # Map `nid` to a copy of the node before its first incremental run,
+        # used only when checking the incremental execution.
+        self._incremental_prototypes: Dict[
+            dtfcornode.NodeId, dtfcornode.Node
+        ] = {}
+
+    def _run_node_incrementally(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run `method` on a node passing the new rows of its inputs.
+
+        :param kwargs: map from input names to the new rows of the inputs
+        :return: map from output names to the new rows of the outputs
+        """
+        nid = node.nid
+        if self._check_incremental and nid not in self._incremental_prototypes:
+            # Save the node before it accumulates any state, so that the output
+            # can be recomputed from scratch.
+            self._incremental_prototypes[nid] = copy.deepcopy(node)
+        if getattr(node, "is_stateful_incremental", False):
+            # The node carries its own state across runs.
+            output = getattr(node, method)(**kwargs)
+        else:
+            # Run the node on the new rows appended to the tail window of its
+            # past inputs.
+            tail_kwargs = {}
+            for input_name, value in kwargs.items():
+                key = (nid, input_name)
+                tail = _append_new_rows(self._incremental_tails.get(key), value)
+                tail_kwargs[input_name] = tail
+                self._incremental_tails[key] = _get_tail_window(
+                    tail, self._incremental_tail_window
+                )
+            output = dict(getattr(node, method)(**tail_kwargs))
+            # Emit only the rows that were not emitted by the previous run.
+            for output_name, value in output.items():
+                if not isinstance(value, (pd.DataFrame, pd.Series)):
+                    continue
+                key = (nid, output_name)
+                last_idx = self._incremental_last_idxs.get(key)
+                if last_idx is not None:
+                    value = value.loc[value.index > last_idx]
+                if not value.empty:
+                    self._incremental_last_idxs[key] = value.index.max()
+                output[output_name] = value
+        if self._check_incremental:
+            self._check_incremental_output(node, method, kwargs, output)
+        return output
+
+    def _check_incremental_output(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        kwargs: Dict[str, Any],
+        output: Dict[str, Any],
+    ) -> None:
+        """
+        Assert that the output computed incrementally matches the output
+        computed from scratch on the full history of the inputs.
+        """
+        nid = node.nid
+        full_kwargs = {}
+        for input_name, value in kwargs.items():
+            key = (nid, input_name)
+            history = _append_new_rows(
+                self._incremental_histories.get(key), value
+            )
+            self._incremental_histories[key] = history
+            full_kwargs[input_name] = history
+        # Recompute the output on a copy of the node without any state.
+        ref_node = copy.deepcopy(self._incremental_prototypes[nid])
+        expected_output = getattr(ref_node, method)(**full_kwargs)
+        for output_name, value in output.items():
+            if not isinstance(value, (pd.DataFrame, pd.Series)):
+                continue
+            expected = expected_output[output_name]
+            hdbg.dassert_is_subset(value.index, expected.index)
+            expected = expected.loc[value.index]
+            if isinstance(value, pd.DataFrame):
+                hpandas.dassert_columns_equal(value, expected)
+            hpandas.dassert_approx_eq(
+                value.to_numpy(dtype=float),
+                expected.to_numpy(dtype=float),
+                msg=f"Incremental output mismatch for nid='{nid}' "
+                f"output_name='{output_name}'",
+            )
+
+    def _run_nodes(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        *,
+        progress_bar: bool = False,
+    ) -> None:
+        """
+        Run `method` on the nodes `nids` according to the scheduler.
+
+        :param nids: nodes to run in topological order
+        """
+        # Count the nodes of this run consuming the outputs of each node. The
+        # nodes without consumers (i.e., the requested node or the sinks) are
+        # never freed.
+        nids_set = set(nids)
+        num_pending_consumers = {
+            nid: sum(
+                1
+                for succ_nid in self._nx_dag.successors(nid)
+                if succ_nid in nids_set
+            )
+            for nid in nids
+        }
+        self._peak_rss_in_gb = hloggin.get_memory_usage(process=None)[0]
+        if self._scheduler == "serial":
+            nids_iter = nids
+            if progress_bar:
+                nids_iter = tqdm(nids, desc="run_leq_node")
+            for id_, nid in enumerate(nids_iter):
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("Executing node '%s'", nid)
+                self._run_node(id_, nid, method)
+                self._process_executed_node(nid, num_pending_consumers)
+        else:
+            self._run_nodes_concurrently(
+                nids, method, num_pending_consumers, progress_bar=progress_bar
+            )
+        # Report the peak memory.
+        log_level = logging.DEBUG
+        if self.force_free_nodes or self._profile_execution:
+            log_level = logging.INFO
+        _LOG.log(
+            log_level,
+            "Peak RSS running method '%s' on %s nodes: %.3f GB",
+            method,
+            len(nids),
+            self._peak_rss_in_gb,
+        )
+
+    def _process_executed_node(
+        self,
+        nid: dtfcornode.NodeId,
+        num_pending_consumers: Dict[dtfcornode.NodeId, int],
+    ) -> None:
+        """
+        Update the peak memory and free the predecessors of the executed node
+        `nid` that are not needed anymore.
+
+        :param num_pending_consumers: number of nodes consuming the outputs of
+            each node that haven't been executed yet
+        """
+        rss_in_gb = hloggin.get_memory_usage(process=None)[0]
+        self._peak_rss_in_gb = max(cast(float, self._peak_rss_in_gb), rss_in_gb)
+        for pred_nid in self._nx_dag.predecessors(nid):
+            if pred_nid not in num_pending_consumers:
+                continue
+            num_pending_consumers[pred_nid] -= 1
+            if self.force_free_nodes and num_pending_consumers[pred_nid] == 0:
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug(
+                        "Freeing pred_nid='%s' after running nid='%s'",
+                        pred_nid,
+                        nid,
+                    )
+                self.get_node(pred_nid).free()
+
+    def _run_nodes_concurrently(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        num_pending_consumers: Dict[dtfcornode.NodeId, int],
+        *,
+        progress_bar: bool = False,
+    ) -> None:
+        """
+        Run `method` on the nodes `nids` running each node as soon as all its
+        predecessors have been run.
+
+        :param nids: nodes to run in topological order, which is also used to
+            assign the `topological_id` of each node like in the serial
+            execution
+        :param num_pending_consumers: as in `_process_executed_node()`
+        """
+        hdbg.dassert_eq(self._scheduler, "threading")
+        topological_ids = {nid: id_ for id_, nid in enumerate(nids)}
+        # Count the predecessors of each node that have not been run yet.
+        num_pending_preds = {
+            nid: sum(
+                1
+                for pred_nid in self._nx_dag.predecessors(nid)
+                if pred_nid in topological_ids
+            )
+            for nid in nids
+        }
+        pbar = None
+        if progress_bar:
+            pbar = tqdm(total=len(nids), desc="run_leq_node")
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as executor:
+            futures: Dict[concurrent.futures.Future, dtfcornode.NodeId] = {}
+
+            def _submit(nid: dtfcornode.NodeId) -> None:
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("Executing node '%s'", nid)
+                future = executor.submit(
+                    self._run_node, topological_ids[nid], nid, method
+                )
+                futures[future] = nid
+
+            for nid in nids:
+                if num_pending_preds[nid] == 0:
+                    _submit(nid)
+            while futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                # Process the completed nodes in topological order so that the
+                # nodes are always submitted in the same order.
+                done = sorted(done, key=lambda x: topological_ids[futures[x]])
+                for future in done:
+                    nid = futures.pop(future)
+                    # Propagate any exception raised by the node.
+                    future.result()
+                    # The predecessors of `nid` are freed only when all their
+                    # consumers, which might be running, have been executed.
+                    self._process_executed_node(nid, num_pending_consumers)
+                    if pbar is not None:
+                        pbar.update(1)
+                    for succ_nid in self._nx_dag.successors(nid):
+                        if succ_nid not in num_pending_preds:
+                            continue
+                        num_pending_preds[succ_nid] -= 1
+                        if num_pending_preds[succ_nid] == 0:
+                            _submit(succ_nid)
+        if pbar is not None:
+            pbar.close()
+
     def _run_node(
         self,
         topological_id: int,
@@ -732,14 +1237,6 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
-                if self.force_free_nodes:
-                    _LOG.warning(
-                        "Forcing deallocation of pred_node=%s", pred_node
-                    )
-                    # TODO(gp): We should move this after using the data deallocating
-                    # all the nodes whose output has been used. For linear pipelines,
-                    # this check is not needed.
-                    pred_node.free()
             # TODO(gp): Save info for inputs, if needed.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("kwargs are %s", kwargs)
@@ -747,7 +1244,12 @@ class DAG(hobject.PrintableMixin):
         with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
             node = self.get_node(nid)
             try:
-                output = getattr(node, method)(**kwargs)
+                if self._incremental_mode and method == "predict" and kwargs:
+                    # Source nodes (i.e., without inputs) handle the
+                    # incremental mode on their own.
+                    output = self._run_node_incrementally(node, method, kwargs)
+                else:
+                    output = getattr(node, method)(**kwargs)
             except AttributeError as e:
                 raise AttributeError(
                     f"An exception occurred in node '{nid}'\n{str(e)}"
@@ -780,6 +1282,32 @@ class DAG(hobject.PrintableMixin):
             )
 
 
+def _append_new_rows(prev_obj: Any, obj: Any) -> Any:
+    """
+    Append the rows of `obj` to `prev_obj`, replacing any overlapping rows.
+
+    Objects that are not dataframes or series are replaced by `obj`.
+    """
+    if prev_obj is None or not isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj
+    prev_obj = prev_obj.loc[~prev_obj.index.isin(obj.index)]
+    obj = pd.concat([prev_obj, obj])
+    return obj
+
+
+def _get_tail_window(obj: Any, tail_window: int) -> Any:
+    """
+    Keep the rows of `obj` with the last `tail_window` index values.
+    """
+    if not isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj
+    idx = obj.index.unique()
+    if len(idx) <= tail_window:
+        return obj
+    obj = obj.loc[obj.index >= idx[-tail_window]]
+    return obj
+
+
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
 # function (together with `DAG._write_prof_stats_to_dst_dir()`) there.
 def load_prof_stats_from_dst_dir(
@@ -6,7 +6,7 @@ import dataflow.core.dag_runner as dtfcodarun
 
 import abc
 import logging
-from typing import Generator, List, Optional, Tuple
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -553,7 +553,16 @@ class IncrementalDagRunner(DagRunner):
     """
     Run DAGs in incremental fashion, i.e., running one step at a time.
 
-    # TODO(gp): Improve description.
+    By default at each step the DAG is re-run on the entire history up to the
+    prediction time, which costs O(N) per step and O(N^2) for N steps.
+
+    In step mode (i.e., `incremental_mode_kwargs` is not `None`) the DAG is
+    run in incremental mode (see `DAG.set_incremental_mode()`): at each step
+    the source nodes emit only the new rows, the nodes carrying their own
+    state (e.g., `SmaModel`) advance their state by the new rows, and the other
+    nodes are run on a bounded tail window of their inputs. The cost of a step
+    doesn't depend on the length of the history. In this mode the
+    `ResultBundle` of each step contains only the rows computed in that step.
     """
 
     def __init__(
@@ -563,6 +572,8 @@ class IncrementalDagRunner(DagRunner):
         end_timestamp: pd.Timestamp,
         freq: str,
         fit_state: cconfig.Config,
+        *,
+        incremental_mode_kwargs: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Constructor.
@@ -576,6 +587,9 @@ class IncrementalDagRunner(DagRunner):
             of the underlying DAG)
         :param fit_state: Config containing any learned state required for
             initializing the DAG
+        :param incremental_mode_kwargs: if not `None`, run in step mode. The
+            params are passed to `DAG.set_incremental_mode()` (e.g.,
+            `tail_window`, `check_incremental`)
         """
         super().__init__(dag)
         self._start_timestamp = start_timestamp
@@ -583,6 +597,10 @@ class IncrementalDagRunner(DagRunner):
         self._freq = freq
         self._fit_state = fit_state
         dtfcorvisi.set_fit_state(self.dag, self._fit_state)
+        if incremental_mode_kwargs is not None:
+            hdbg.dassert_isinstance(incremental_mode_kwargs, dict)
+        self._incremental_mode_kwargs = incremental_mode_kwargs
+        self._reset_step_mode()
         # Create predict range.
         self._date_range = pd.date_range(
             start=self._start_timestamp, end=self._end_timestamp, freq=self._freq
@@ -599,6 +617,9 @@ class IncrementalDagRunner(DagRunner):
         :return: a generator of `ResultBundle`s (one `ResultBundle` for each
             prediction)
         """
+        # Start from an empty state, so that each call generates the same
+        # predictions.
+        self._reset_step_mode()
         for end_dt in self._date_range:
             result_bundle = self.predict_at_datetime(end_dt)
             yield result_bundle
@@ -610,11 +631,14 @@ class IncrementalDagRunner(DagRunner):
         """
         Generate a prediction as of `dt` (for a future point in time).
 
+        In step mode `dt` must be later than the one of the previous call.
+
         :param dt: point in time at which to generate a prediction
         :return: populated `ResultBundle`
         """
         # Cut off data at `end_dt`. Do not restrict the start datetime_ so
-        # so as not to adversely affect any required warm-up period.
+        # so as not to adversely affect any required warm-up period. In step
+        # mode the source nodes skip the data that was already emitted.
         interval = [(None, dt)]
         # Set prediction intervals and predict.
         for input_nid in self.dag.get_sources():
@@ -622,6 +646,17 @@ class IncrementalDagRunner(DagRunner):
         result_bundle = self._run_dag("predict")
         return result_bundle
 
+    def _reset_step_mode(self) -> None:
+        """
+        Reset the state of the DAG in step mode.
+        """
+        if self._incremental_mode_kwargs is None:
+            return
+        incremental_mode = True
+        self.dag.set_incremental_mode(
+            incremental_mode, **self._incremental_mode_kwargs
+        )
+
     def _run_dag(self, method: dtfcornode.Method) -> dtfcorebun.ResultBundle:
         """
         Run DAG and return a ResultBundle.
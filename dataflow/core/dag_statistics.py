@@ -172,6 +172,31 @@ def _get_dag_node_parquet_file_names(dag_dir: str) -> List[str]:
     return nodes
 
 
+def _get_dag_node_parquet_file_paths(
+    dag_dir: str, dag_node_name: str
+) -> List[str]:
+    """
+    Get the Parquet files storing the output of a node sorted by bar
+    timestamp.
+
+    :param dag_dir: dir with the DAG output
+    :param dag_node_name: a node name, e.g., `predict.0.read_data`
+    :return: paths to the files, one per bar timestamp
+    """
+    file_names = _get_dag_node_parquet_file_names(dag_dir)
+    # E.g., `predict.0.read_data.df_out.20221028_080000.20221028_080143.parquet`.
+    prefix = f"{dag_node_name}.df_out."
+    file_names = sorted(
+        file_name for file_name in file_names if file_name.startswith(prefix)
+    )
+    bar_timestamps = [file_name.split(".")[-3] for file_name in file_names]
+    hdbg.dassert_no_duplicates(bar_timestamps)
+    file_paths = [
+        os.path.join(dag_dir, file_name) for file_name in file_names
+    ]
+    return file_paths
+
+
 # TODO(Grisha): @Dan use `hio.listdir()` instead.
 def get_dag_node_csv_file_names(dag_dir: str) -> List[str]:
     """
@@ -287,6 +312,10 @@ def get_dag_node_output(
     This function relies on our file naming conventions, e.g.,
     `dag/node_io/node_io.data/predict.0.read_data.df_out.20221021_060500.parquet`.
 
+    If the DAG saved only the new rows at each bar (see
+    `DAG.set_debug_mode()`), the output is reconstructed from the rows saved
+    up to the bar timestamp.
+
     :param dag_dir: dir with the DAG output
     :param dag_node_name: a node name, e.g., `predict.0.read_data`
     :param timestamp: bar timestamp
@@ -304,7 +333,23 @@ def get_dag_node_output(
     number_of_files = len(files)
     msg = f"There were found {number_of_files} files at {dag_dir} for node={dag_node_name} for bar_timestamp={timestamp} while should be only one file for each node, bar timestamp."
     hdbg.dassert_eq(1, number_of_files, msg=msg)
-    df = hparque.from_parquet(files[0])
+    file_path = files[0]
+    metadata = hparque.get_parquet_metadata(file_path)
+    if dtfcordag.NODE_IO_WINDOW_START_KEY in metadata:
+        # Concatenate the rows saved up to the bar timestamp and keep the
+        # lookback window of the output.
+        file_paths = _get_dag_node_parquet_file_paths(
+            os.path.dirname(file_path), dag_node_name
+        )
+        file_names = [os.path.basename(path) for path in file_paths]
+        idx = file_names.index(os.path.basename(file_path))
+        df = pd.concat(
+            [hparque.from_parquet(path) for path in file_paths[: idx + 1]]
+        )
+        window_start = pd.Timestamp(metadata[dtfcordag.NODE_IO_WINDOW_START_KEY])
+        df = df.loc[df.index >= window_start]
+    else:
+        df = hparque.from_parquet(file_path)
     hpandas.dassert_index_is_datetime(df.index)
     return df
 
@@ -326,16 +371,26 @@ def load_dag_outputs(
     :return: a df that consists of last rows from every bar timestamp
         DAG results df
     """
-    # Get DAG timestamps to iterate over them.
-    dag_timestamps = get_dag_node_timestamps(dag_data_path, node_name)
-    # Keep bar timestamps only.
-    bar_timestamps = [bar_timestamp for bar_timestamp, _ in dag_timestamps]
+    file_paths = _get_dag_node_parquet_file_paths(dag_data_path, node_name)
     last_rows = []
-    for timestamp in bar_timestamps:
+    last_row = None
+    for file_path in file_paths:
         # Get the row that corresponds to the current bar timestamp, i.e.
         # the last row.
-        df = get_dag_node_output(dag_data_path, node_name, timestamp)
-        df = df.sort_index().tail(1)
+        df = hparque.from_parquet(file_path)
+        hpandas.dassert_index_is_datetime(df.index)
+        if (
+            df.empty
+            and last_row is not None
+            and dtfcordag.NODE_IO_WINDOW_START_KEY
+            in hparque.get_parquet_metadata(file_path)
+        ):
+            # There are no new rows since the previous bar, so the last row
+            # of the output is the same.
+            df = last_row
+        else:
+            df = df.sort_index().tail(1)
+            last_row = df
         last_rows.append(df)
     df = pd.concat(last_rows)
     return df
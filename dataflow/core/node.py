@@ -161,6 +161,9 @@ class Node(_Node):
         # Minimize the dependencies by importing locally since this is a method
         # called rarely, for now.
         import gc
+        import sys
+
+        import pandas as pd
 
         import helpers.hintrospection as hintros
         import helpers.hlogging as hloggin
@@ -182,7 +185,10 @@ class Node(_Node):
         for method, node_output in self._output_vals.items():
             for name in node_output:
                 obj = node_output[name]
-                used_mem_tmp = obj.memory_usage(deep=True).sum()
+                if isinstance(obj, (pd.DataFrame, pd.Series)):
+                    used_mem_tmp = obj.memory_usage(deep=True).sum()
+                else:
+                    used_mem_tmp = sys.getsizeof(obj)
                 if _LOG.isEnabledFor(logging.DEBUG):
                     _LOG.debug(
                         "Removing %s:%s -> type=%s, mem=%s refs=%s",
@@ -194,7 +200,7 @@ class Node(_Node):
                     )
                 rss_used_mem_in_gb += used_mem_tmp / (1024**3)
         # Remove all the outstanding references to the objects.
-        del obj
+        obj = None
         del self._output_vals
         # Force garbage collection.
         gc.collect()
@@ -44,6 +44,14 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
     # Represent the state of a `Node`.
     NodeState = Dict[str, Any]
 
+    # Whether the node can run `predict()` only on the new rows of its inputs
+    # (e.g., when the DAG is executed in incremental mode), carrying across
+    # invocations any state needed to compute the output (e.g., EMA
+    # accumulators, rolling windows).
+    # Nodes that don't support this are run by the DAG on a bounded tail window
+    # of their inputs.
+    is_stateful_incremental = False
+
     def __init__(
         self,
         nid: dtfcornode.NodeId,
@@ -156,6 +164,10 @@ class DataSource(FitPredictNode, abc.ABC):
         self._fit_intervals: Optional[dtfcorutil.Intervals] = None
         self._predict_intervals: Optional[dtfcorutil.Intervals] = None
         self._predict_idxs = None
+        # In incremental mode `predict()` emits only the rows with an index
+        # larger than the last emitted one.
+        self._incremental_mode = False
+        self._last_predict_idx: Optional[Any] = None
 
     # //////////////////////////////////////////////////////////////////////////
     # fit / predict.
@@ -221,6 +233,18 @@ class DataSource(FitPredictNode, abc.ABC):
             dtfcorutil.dassert_valid_intervals(intervals)
         self._predict_intervals = intervals
 
+    def set_incremental_mode(self, incremental_mode: bool) -> None:
+        """
+        Set whether `predict()` emits only the rows that were not emitted yet.
+
+        :param incremental_mode: if `True`, each call to `predict()` returns
+            only the rows with an index strictly larger than the largest index
+            returned by the previous call
+        """
+        hdbg.dassert_isinstance(incremental_mode, bool)
+        self._incremental_mode = incremental_mode
+        self._last_predict_idx = None
+
     # TODO(gp): Factor out common code with `fit()`.
     def predict(  # type: ignore[override]  # pylint: disable=arguments-differ
         self,
@@ -230,16 +254,37 @@ class DataSource(FitPredictNode, abc.ABC):
         """
         hdbg.dassert_is_not(self.df, None)
         self.df = cast(pd.DataFrame, self.df)
+        df = self.df
+        if (
+            self._incremental_mode
+            and self._last_predict_idx is not None
+            and df.index.is_monotonic_increasing
+        ):
+            # Skip the rows that were already emitted, so that the cost of
+            # each call is proportional to the number of new rows.
+            start = df.index.searchsorted(self._last_predict_idx, side="right")
+            df = df.iloc[start:]
         if self._predict_intervals is not None:
             idx_slices = [
-                self.df.loc[interval[0] : interval[1]].index
+                df.loc[interval[0] : interval[1]].index
                 for interval in self._predict_intervals
             ]
             idx = functools.reduce(lambda x, y: x.union(y), idx_slices)
-            predict_df = self.df.loc[idx].copy()
+            predict_df = df.loc[idx].copy()
+        else:
+            predict_df = df.copy()
+        if self._incremental_mode and self._last_predict_idx is not None:
+            # Emit only the rows that haven't been emitted yet. A bar can have
+            # no new data, in which case an empty df with the same columns is
+            # emitted and `_last_predict_idx` is left unchanged.
+            mask = predict_df.index > self._last_predict_idx
+            predict_df = predict_df.loc[mask]
+            if not predict_df.empty:
+                self._last_predict_idx = predict_df.index.max()
         else:
-            predict_df = self.df.copy()
-        hdbg.dassert(not predict_df.empty)
+            hdbg.dassert(not predict_df.empty)
+            if self._incremental_mode:
+                self._last_predict_idx = predict_df.index.max()
         # Update `info`.
         info = collections.OrderedDict()
         info["predict_df_info"] = dtfcorutil.get_df_info_as_string(predict_df)
@@ -119,6 +119,33 @@ class TestSmaModel(hunitest.TestCase):
         )
         self.assert_equal(actual, expected)
 
+    def test6(self) -> None:
+        """
+        Check that `predict()` in incremental mode on consecutive chunks
+        matches `predict()` on the entire data.
+        """
+        data = self._get_data()
+        config = cconfig.Config.from_dict(
+            {
+                "col": ["vol_sq"],
+                "steps_ahead": 2,
+                "tau": 4,
+                "nan_mode": "drop",
+            }
+        )
+        node = SmaModel("sma", **config.to_dict())
+        node.fit(data)
+        expected = node.predict(data)["df_out"]
+        # Run `predict()` on consecutive chunks in incremental mode.
+        node.set_incremental_mode(True)
+        dfs = []
+        for start, end in [(0, 1), (1, 15), (15, 16), (16, len(data))]:
+            dfs.append(node.predict(data.iloc[start:end])["df_out"])
+        actual = pd.concat(dfs)
+        # The forward-looking columns can only be computed inside each chunk.
+        col = "vol_sq.shift_-2_hat"
+        hpandas.dassert_approx_eq(actual[col], expected[col])
+
     @staticmethod
     def _get_data() -> pd.DataFrame:
         """
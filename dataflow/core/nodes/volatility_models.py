@@ -77,6 +77,10 @@ class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
         self._min_depth = 1
         self._max_depth = 1
         self._metric = sklear.metrics.mean_absolute_error
+        # In incremental mode `predict()` receives only the new rows and the
+        # EMA accumulators are carried across calls.
+        self.is_stateful_incremental = False
+        self._ema_states: Dict[int, Dict[str, np.ndarray]] = {}
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         idx = df_in.index[: -self._steps_ahead]
@@ -120,6 +124,18 @@ class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
             df_in, idx, non_nan_idx, fit=False
         )
 
+    def set_incremental_mode(self, incremental_mode: bool) -> None:
+        """
+        Set whether `predict()` is called only on the rows that are new since
+        the previous call.
+
+        :param incremental_mode: if `True`, the state of the SMA is carried
+            across calls to `predict()`
+        """
+        hdbg.dassert_isinstance(incremental_mode, bool)
+        self.is_stateful_incremental = incremental_mode
+        self._ema_states = {}
+
     def get_fit_state(self) -> Dict[str, Any]:
         fit_state = {"_tau": self._tau, "_info['fit']": self._info["fit"]}
         return fit_state
@@ -136,7 +152,10 @@ class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
         fit: bool = True,
     ) -> Dict[str, pd.DataFrame]:
         data = cdatadap.transform_to_sklearn(df_in.loc[non_nan_idx], self._col)
-        fwd_y_hat = self._predict(data)
+        if self.is_stateful_incremental and not fit:
+            fwd_y_hat = self._predict_incrementally(data)
+        else:
+            fwd_y_hat = self._predict(data)
         forward_y_df = dtfcorutil.get_forward_cols(
             df_in, self._col, self._steps_ahead
         )
@@ -227,6 +246,26 @@ class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
         )
         return x_sma.values
 
+    def _predict_incrementally(self, x: np.array) -> np.array:
+        """
+        Same as `_predict()` but computing the SMA only on the new rows `x`.
+        """
+        x_srs = pd.DataFrame(x.flatten())
+        min_periods = int(np.rint(self._min_tau_periods * self._tau))
+        # Same as `csigproc.compute_smooth_moving_average()`.
+        x_sma = 0
+        for depth in range(self._min_depth, self._max_depth + 1):
+            ema, self._ema_states[depth] = csigproc.compute_ema_incrementally(
+                x_srs,
+                self._tau,
+                min_periods,
+                depth=depth,
+                state=self._ema_states.get(depth),
+            )
+            x_sma += ema
+        x_sma /= float(self._max_depth - self._min_depth + 1)
+        return x_sma.values
+
 
 class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
     def __init__(
@@ -253,6 +292,18 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
         self._learn_tau_on_fit = tau is None
         self._nan_mode = nan_mode
         self._out_col_prefix = out_col_prefix
+        # In incremental mode the internal DAG is kept across calls to
+        # `predict()`, so that it can carry the state of the SMA.
+        self.is_stateful_incremental = False
+        self._incremental_dag: Optional[dtfcordag.DAG] = None
+
+    def set_incremental_mode(self, incremental_mode: bool) -> None:
+        """
+        Same as `SmaModel.set_incremental_mode()`.
+        """
+        hdbg.dassert_isinstance(incremental_mode, bool)
+        self.is_stateful_incremental = incremental_mode
+        self._incremental_dag = None
 
     def get_fit_state(self) -> Dict[str, Any]:
         fit_state = {
@@ -294,8 +345,23 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
             tau = None
         else:
             tau = self._tau
-        config = self._get_config(col=self._col, out_col_prefix=name, tau=tau)
-        dag = self._get_dag(df_in[[self._col]], config)
+        if self.is_stateful_incremental and not fit:
+            # Run the internal DAG only on the new rows.
+            if self._incremental_dag is None:
+                config = self._get_config(
+                    col=self._col, out_col_prefix=name, tau=tau
+                )
+                dag = self._get_dag(df_in[[self._col]], config)
+                dag.set_incremental_mode(True)
+                self._incremental_dag = dag
+            else:
+                dag = self._incremental_dag
+                dag.get_node("load_data").df = df_in[[self._col]]
+        else:
+            config = self._get_config(
+                col=self._col, out_col_prefix=name, tau=tau
+            )
+            dag = self._get_dag(df_in[[self._col]], config)
         mode = "fit" if fit else "predict"
         df_out = dag.run_leq_node(
             "demodulate_using_vol_pred", mode, progress_bar=self._progress_bar
@@ -415,12 +481,30 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
 
 
 class _MultiColVolatilityModelMixin:
+    def set_incremental_mode(self, incremental_mode: bool) -> None:
+        """
+        Same as `SmaModel.set_incremental_mode()`.
+        """
+        hdbg.dassert_isinstance(incremental_mode, bool)
+        self.is_stateful_incremental = incremental_mode
+        # Map from column to the model carrying its state across calls.
+        self._incremental_scvms: Dict[
+            dtfcorutil.NodeColumn, SingleColumnVolatilityModel
+        ] = {}
+
     def _fit_predict_volatility_model(
         self, df: pd.DataFrame, fit: bool, out_col_prefix: Optional[str] = None
     ) -> Tuple[Dict[str, pd.DataFrame], collections.OrderedDict]:
         dfs = {}
         info = collections.OrderedDict()
+        incremental = self.is_stateful_incremental and not fit
         for col in df.columns:
+            if incremental and col in self._incremental_scvms:
+                scvm = self._incremental_scvms[col]
+                df_out = scvm.predict(df[[col]])["df_out"]
+                dfs[col] = df_out
+                info[col] = scvm.get_info("predict")
+                continue
             local_out_col_prefix = out_col_prefix or col
             scvm = SingleColumnVolatilityModel(
                 "volatility",
@@ -432,6 +516,9 @@ class _MultiColVolatilityModelMixin:
                 nan_mode=self._nan_mode,
                 out_col_prefix=local_out_col_prefix,
             )
+            if incremental:
+                scvm.set_incremental_mode(True)
+                self._incremental_scvms[col] = scvm
             if fit:
                 df_out = scvm.fit(df[[col]])["df_out"]
                 info_out = scvm.get_info("fit")
@@ -1,11 +1,23 @@
 import logging
 import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 import dataflow.core.dag as dtfcordag
+import dataflow.core.dag_statistics as dtfcodasta
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
+import helpers.hpandas as hpandas
+import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 
 _LOG = logging.getLogger(__name__)
 
@@ -528,3 +540,410 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+class _CumSum(dtfconobas.FitPredictNode):
+    """
+    Compute the cumulative sum of the input carrying the state across calls.
+    """
+
+    is_stateful_incremental = True
+
+    def __init__(self, nid: dtfcornode.NodeId) -> None:
+        super().__init__(nid)
+        self._total = None
+
+    def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        return self.predict(df_in)
+
+    def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        df_out = df_in.cumsum()
+        if self._total is not None:
+            df_out += self._total
+        if not df_out.empty:
+            self._total = df_out.iloc[-1]
+        return {"df_out": df_out}
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    """
+    Run a DAG in incremental mode.
+    """
+
+    @staticmethod
+    def get_data() -> pd.DataFrame:
+        idx = pd.date_range("2022-01-03 09:31", periods=20, freq="T")
+        data = np.arange(20, dtype=float).reshape(10, 2)
+        data = np.concatenate([data, data[::-1]])
+        df = pd.DataFrame(data, index=idx, columns=["a", "b"])
+        return df
+
+    def build_dag(self) -> dtfcordag.DAG:
+        dag = dtfcordag.DAG()
+        df = self.get_data()
+        dag.add_node(dtfconosou.DfDataSource("source", df))
+        # Add a node that needs a lookback to compute its output.
+        func = lambda df: df.rolling(3).mean()
+        dag.append_to_tail(dtfconotra.FunctionWrapper("rolling", func))
+        dag.append_to_tail(_CumSum("cumsum"))
+        return dag
+
+    def run_incrementally(
+        self, dag: dtfcordag.DAG, ends: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Feed the data to the DAG in chunks and concatenate the outputs.
+
+        :param ends: number of rows of the data available at each bar
+        """
+        if ends is None:
+            ends = [10, 11, 15, 20]
+        df = self.get_data()
+        source = dag.get_node("source")
+        dfs_out = []
+        for end in ends:
+            source.df = df.iloc[:end]
+            df_out = dag.run_leq_node("cumsum", "predict", progress_bar=False)[
+                "df_out"
+            ]
+            dfs_out.append(df_out)
+        df_out = pd.concat(dfs_out)
+        return df_out
+
+    def test1(self) -> None:
+        """
+        Check that the outputs computed incrementally match the output computed
+        on the entire data.
+        """
+        # Compute the output on the entire data.
+        dag = self.build_dag()
+        expected = dag.run_leq_node("cumsum", "predict", progress_bar=False)[
+            "df_out"
+        ]
+        # Compute the output incrementally.
+        dag = self.build_dag()
+        dag.set_incremental_mode(True, tail_window=5, check_incremental=True)
+        actual = self.run_incrementally(dag)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test2(self) -> None:
+        """
+        Check that the tail window is bounded.
+        """
+        dag = self.build_dag()
+        dag.set_incremental_mode(True, tail_window=5)
+        _ = self.run_incrementally(dag)
+        # pylint: disable=protected-access
+        tail = dag._incremental_tails[("rolling", "df_in")]
+        self.assertEqual(len(tail), 5)
+        self.assertEqual(tail.index[-1], self.get_data().index[-1])
+
+    def test3(self) -> None:
+        """
+        Check that the check mode detects a tail window that is too short.
+        """
+        dag = self.build_dag()
+        dag.set_incremental_mode(True, tail_window=1, check_incremental=True)
+        with self.assertRaises(AssertionError):
+            _ = self.run_incrementally(dag)
+
+    def test4(self) -> None:
+        """
+        Check that bars without new data emit empty outputs and don't affect
+        the following bars.
+        """
+        dag = self.build_dag()
+        expected = dag.run_leq_node("cumsum", "predict", progress_bar=False)[
+            "df_out"
+        ]
+        dag = self.build_dag()
+        dag.set_incremental_mode(True, tail_window=5, check_incremental=True)
+        # The 2 bars after the second one have no new data.
+        actual = self.run_incrementally(dag, ends=[10, 11, 11, 11, 15, 20])
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+
+# #############################################################################
+# Test_dataflow_core_DAG7
+# #############################################################################
+
+
+class Test_dataflow_core_DAG7(hunitest.TestCase):
+    """
+    Run a DAG with independent branches using the different schedulers.
+    """
+
+    @staticmethod
+    def build_dag(func: Callable) -> dtfcordag.DAG:
+        """
+        Build a DAG with two branches merged by a `YConnector`.
+
+        ```
+        source -> branch1 -> merge
+               -> branch2 ->
+        ```
+        """
+        dag = dtfcordag.DAG()
+        idx = pd.date_range("2022-01-03 09:31", periods=10, freq="T")
+        df = pd.DataFrame({"a": np.arange(10, dtype=float)}, index=idx)
+        dag.add_node(dtfconosou.DfDataSource("source", df))
+        for nid, col in [("branch1", "x"), ("branch2", "y")]:
+            node = dtfconotra.FunctionWrapper(
+                nid, func, func_kwargs={"col": col}
+            )
+            dag.add_node(node)
+            dag.connect("source", nid)
+        node = dtfconobas.YConnector(
+            "merge",
+            connector_func=lambda df_in1, df_in2: df_in1.join(df_in2),
+        )
+        dag.add_node(node)
+        dag.connect("branch1", ("merge", "df_in1"))
+        dag.connect("branch2", ("merge", "df_in2"))
+        return dag
+
+    def test1(self) -> None:
+        """
+        Check that the threading scheduler gives the same result as the
+        serial one.
+        """
+        func = lambda df, col: df.rename(columns={"a": col}).cumsum()
+        dag = self.build_dag(func)
+        expected = dag.run_leq_node("merge", "predict", progress_bar=False)
+        #
+        dag = self.build_dag(func)
+        dag.set_scheduler("threading", max_workers=2)
+        actual = dag.run_leq_node("merge", "predict", progress_bar=False)
+        self.assert_equal(
+            hpandas.df_to_str(actual["df_out"], num_rows=None),
+            hpandas.df_to_str(expected["df_out"], num_rows=None),
+        )
+        actual = dag.run_dag("predict")["merge"]
+        self.assert_equal(
+            hpandas.df_to_str(actual["df_out"], num_rows=None),
+            hpandas.df_to_str(expected["df_out"], num_rows=None),
+        )
+
+    def test2(self) -> None:
+        """
+        Check that the independent branches run concurrently.
+        """
+        # Each branch waits for the other one to start, so the DAG can complete
+        # only if the branches run at the same time.
+        barrier = threading.Barrier(2, timeout=10)
+
+        def func(df: pd.DataFrame, col: str) -> pd.DataFrame:
+            barrier.wait()
+            return df.rename(columns={"a": col})
+
+        dag = self.build_dag(func)
+        dag.set_scheduler("threading", max_workers=2)
+        df_out = dag.run_leq_node("merge", "predict", progress_bar=False)[
+            "df_out"
+        ]
+        self.assertEqual(df_out.columns.tolist(), ["x", "y"])
+
+    def test3(self) -> None:
+        """
+        Check that an exception in a node is propagated.
+        """
+
+        def func(df: pd.DataFrame, col: str) -> pd.DataFrame:
+            if col == "y":
+                raise ValueError("Failing branch")
+            return df.rename(columns={"a": col})
+
+        dag = self.build_dag(func)
+        dag.set_scheduler("threading")
+        with self.assertRaises(ValueError):
+            dag.run_leq_node("merge", "predict", progress_bar=False)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG8
+# #############################################################################
+
+
+class Test_dataflow_core_DAG8(hunitest.TestCase):
+    """
+    Free the outputs of the nodes that are not needed anymore.
+    """
+
+    def run_dag(self, scheduler: str) -> dtfcordag.DAG:
+        """
+        Run a DAG with two branches freeing the nodes.
+        """
+        func = lambda df, col: df.rename(columns={"a": col}).cumsum()
+        dag = Test_dataflow_core_DAG7.build_dag(func)
+        dag.set_scheduler(scheduler)
+        dag.force_free_nodes = True
+        df_out = dag.run_leq_node("merge", "predict", progress_bar=False)[
+            "df_out"
+        ]
+        self.assertEqual(df_out.columns.tolist(), ["x", "y"])
+        return dag
+
+    def check_freed(self, dag: dtfcordag.DAG) -> None:
+        # The intermediate nodes are freed.
+        for nid in ["source", "branch1", "branch2"]:
+            with self.assertRaises(AssertionError):
+                dag.get_node(nid).get_outputs("predict")
+        # The output of the requested node is kept.
+        _ = dag.get_node("merge").get_outputs("predict")
+        # The peak memory is reported.
+        self.assertIsNotNone(dag.peak_rss_in_gb)
+        self.assertLess(0, dag.peak_rss_in_gb)
+
+    def test1(self) -> None:
+        """
+        Check that the source is freed only after both the branches consuming
+        it have been executed.
+        """
+        dag = self.run_dag("serial")
+        self.check_freed(dag)
+
+    def test2(self) -> None:
+        """
+        Same as `test1()` using the threading scheduler.
+        """
+        dag = self.run_dag("threading")
+        self.check_freed(dag)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG9
+# #############################################################################
+
+
+class Test_dataflow_core_DAG9(hunitest.TestCase):
+    """
+    Save the node outputs in background and only the new rows at each bar.
+    """
+
+    def tearDown(self) -> None:
+        hwacltim.reset_current_bar_timestamp()
+        super().tearDown()
+
+    def run_dag(
+        self, save_node_io_in_background: bool, save_node_io_delta: bool
+    ) -> Tuple[str, Dict[pd.Timestamp, pd.DataFrame]]:
+        """
+        Run a DAG at each bar on a sliding lookback window of the data.
+
+        :return: the dir with the saved node outputs and the outputs computed
+            at each bar
+        """
+        df = Test_dataflow_core_DAG6.get_data()
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("source", df))
+        # The rows saved only once must not depend on the lookback window.
+        func = lambda df: 2 * df
+        dag.append_to_tail(dtfconotra.FunctionWrapper("scale", func))
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        dag.set_debug_mode(
+            "df_as_pq",
+            False,
+            False,
+            dst_dir,
+            save_node_io_in_background=save_node_io_in_background,
+            save_node_io_delta=save_node_io_delta,
+        )
+        source = dag.get_node("source")
+        hwacltim.reset_current_bar_timestamp()
+        dfs_out = {}
+        # The bar at 09:45 has no new data.
+        for end in [10, 11, 15, 15, 20]:
+            bar_timestamp = pd.Timestamp(
+                "2022-01-03 09:30", tz="America/New_York"
+            ) + pd.Timedelta(minutes=end + len(dfs_out))
+            hwacltim.set_current_bar_timestamp(bar_timestamp)
+            source.df = df.iloc[max(0, end - 8) : end]
+            df_out = dag.run_leq_node("scale", "predict", progress_bar=False)[
+                "df_out"
+            ]
+            dfs_out[bar_timestamp] = df_out
+        dag.wait_for_node_io()
+        dag_dir = os.path.join(dst_dir, "node_io.data")
+        return dag_dir, dfs_out
+
+    def check_outputs(
+        self, dag_dir: str, dfs_out: Dict[pd.Timestamp, pd.DataFrame]
+    ) -> None:
+        """
+        Check that the saved outputs match the ones computed at each bar.
+        """
+        nid = "predict.1.scale"
+        for bar_timestamp, df_out in dfs_out.items():
+            actual = dtfcodasta.get_dag_node_output(dag_dir, nid, bar_timestamp)
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(df_out, num_rows=None),
+            )
+        actual = dtfcodasta.load_dag_outputs(dag_dir, nid)
+        expected = pd.concat([df.tail(1) for df in dfs_out.values()])
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test1(self) -> None:
+        """
+        Check saving the full outputs in background.
+        """
+        dag_dir, dfs_out = self.run_dag(True, False)
+        self.check_outputs(dag_dir, dfs_out)
+
+    def test2(self) -> None:
+        """
+        Check saving only the new rows at each bar.
+        """
+        dag_dir, dfs_out = self.run_dag(True, True)
+        self.check_outputs(dag_dir, dfs_out)
+        file_name = sorted(os.listdir(dag_dir))[-1]
+        df = hparque.from_parquet(os.path.join(dag_dir, file_name))
+        self.assertEqual(df.shape[0], 5)
+
+    def test3(self) -> None:
+        """
+        Check that an error in the background thread is raised.
+        """
+        df = Test_dataflow_core_DAG6.get_data()
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("source", df))
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        # Saving only the stats is not supported.
+        dag.set_debug_mode(
+            "stats", False, False, dst_dir, save_node_io_in_background=True
+        )
+        _ = dag.run_leq_node("source", "predict", progress_bar=False)
+        with self.assertRaises(RuntimeError):
+            dag.wait_for_node_io()
+
+    def test4(self) -> None:
+        """
+        Check that saving only the new rows requires Parquet files and a
+        `DatetimeIndex`, which are needed to reconstruct the outputs.
+        """
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("source", pd.DataFrame({"a": [1]})))
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        with self.assertRaises(AssertionError):
+            dag.set_debug_mode(
+                "df_as_csv", False, False, dst_dir, save_node_io_delta=True
+            )
+        dag.set_debug_mode(
+            "df_as_pq", False, False, dst_dir, save_node_io_delta=True
+        )
+        with self.assertRaises(AssertionError):
+            dag.run_leq_node("source", "predict", progress_bar=False)
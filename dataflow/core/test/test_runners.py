@@ -1,4 +1,5 @@
 import logging
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
@@ -125,3 +126,38 @@ class TestIncrementalDagRunner1(hunitest.TestCase):
             srs_i = rb_i.result_df[col]
             srs_i_next = rb_i_next.result_df[col]
             self.assertTrue(srs_i.compare(srs_i_next[:-1]).empty)
+
+    def test2(self) -> None:
+        """
+        Check that the step mode generates the same predictions as re-running
+        the DAG on the entire history at each step.
+        """
+        dag_builder = dtfcdabuex.ArmaReturnsBuilder()
+        config = dag_builder.get_config_template()
+
+        def _run(incremental_mode_kwargs: Optional[Dict[str, Any]]) -> List:
+            dag = dag_builder.get_dag(config)
+            nid = dag.get_unique_sink()
+            dag.run_leq_node(nid, "fit")
+            fit_state = dtfcorvisi.get_fit_state(dag)
+            dag_runner = dtfcodarun.IncrementalDagRunner(
+                dag=dag,
+                start_timestamp="2010-01-04 15:30",
+                end_timestamp="2010-01-04 15:45",
+                freq="5T",
+                fit_state=fit_state,
+                incremental_mode_kwargs=incremental_mode_kwargs,
+            )
+            result_bundles = list(dag_runner.predict())
+            return result_bundles
+
+        result_bundles = _run(None)
+        # Check the output of each node against a full run at each step.
+        incremental_mode_kwargs = {"tail_window": 100, "check_incremental": True}
+        step_result_bundles = _run(incremental_mode_kwargs)
+        self.assertEqual(len(step_result_bundles), 4)
+        # Each step computes only the new rows.
+        col = "vwap_ret_0_vol.shift_-2_hat"
+        actual = pd.concat([rb.result_df[col] for rb in step_result_bundles])
+        expected = result_bundles[-1].result_df[col]
+        hpandas.dassert_approx_eq(actual, expected)
@@ -121,11 +121,12 @@ def get_df_info_as_string(
     :return: dataframe info as `str`
     """
     buffer = io.StringIO()
-    df.info(buf=buffer)
+    # Computing the memory usage is expensive, so skip it when not needed.
+    df.info(buf=buffer, memory_usage=not exclude_memory_usage)
     info = buffer.getvalue()
     if exclude_memory_usage:
-        # Remove memory usage (and a newline).
-        info = info.rsplit("\n", maxsplit=2)[0]
+        # Remove the trailing newline.
+        info = info.rstrip("\n")
     return info
 
 
@@ -4,15 +4,18 @@ Import as:
 import dataflow.model.forecast_evaluator_from_prices as dtfmfefrpr
 """
 import collections
+import functools
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 import core.finance as cofinanc
 import helpers.hdbg as hdbg
 import helpers.hio as hio
+import helpers.hnumba as hnumba
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 
@@ -336,6 +339,8 @@ class ForecastEvaluatorFromPrices:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        engine: str = "pandas",
+        tile_size_in_days: Optional[int] = None,
         **kwargs: Dict[str, Any],
     ) -> Dict[str, pd.DataFrame]:
         """
@@ -371,6 +376,19 @@ class ForecastEvaluatorFromPrices:
             value of `style`
         :param asset_id_to_share_decimals: same as in
             `core.finance.share_quantization.quantize_shares()`
+        :param engine: how to compute holdings, trades, and PnL from the
+            target positions
+            - "pandas": chain dataframe operations over the entire period
+            - "numpy": process bars x assets NumPy arrays in tiles of days,
+              carrying the state across tiles. The results match "pandas" up
+              to floating point precision, but `adjust_for_splits` is not
+              supported
+            - "numba": same as "numpy", but compile the underfill
+              adjustment, which is done on all the bars at once, with Numba,
+              if installed
+        :param tile_size_in_days: number of days to process at once with the
+            "numpy" and "numba" engines, to bound the memory used by the
+            intermediate results. `None` means all the days at once
         :return: dictionary of portfolio dataframes, with keys
             ["holdings_shares", "holdings_notional", "executed_trades_shares",
              "executed_trades_notional", "pnl", "stats"]
@@ -391,33 +409,64 @@ class ForecastEvaluatorFromPrices:
             style,
             **kwargs,
         )
-        # Compute holdings (in shares).
         # TODO(Paul): Expose these two parameters.
         ffill_limit = 4
-        holdings_shares = self._compute_holdings_shares(
-            df,
-            target_holdings_notional,
-            quantization,
-            liquidate_at_end_of_day,
-            adjust_for_splits,
-            ffill_limit,
-            asset_id_to_share_decimals,
-        )
-        # Compute cash inflows/outflows from trades.
-        executed_trades_shares = self._compute_executed_trades_shares(
-            df,
-            holdings_shares,
-            initialize_beginning_of_day_trades_to_zero,
-        )
-        executed_trades_notional = self._compute_executed_trades_notional(
-            df,
-            executed_trades_shares,
-            ffill_limit,
-        )
-        # Compute notional positions.
-        holdings_notional = self._compute_holdings_notional(df, holdings_shares)
-        # Compute PnL.
-        pnl = self._compute_pnl(df, holdings_notional, executed_trades_notional)
+        if engine == "pandas":
+            # Compute holdings (in shares).
+            holdings_shares = self._compute_holdings_shares(
+                df,
+                target_holdings_notional,
+                quantization,
+                liquidate_at_end_of_day,
+                adjust_for_splits,
+                ffill_limit,
+                asset_id_to_share_decimals,
+            )
+            # Compute cash inflows/outflows from trades.
+            executed_trades_shares = self._compute_executed_trades_shares(
+                df,
+                holdings_shares,
+                initialize_beginning_of_day_trades_to_zero,
+            )
+            executed_trades_notional = self._compute_executed_trades_notional(
+                df,
+                executed_trades_shares,
+                ffill_limit,
+            )
+            # Compute notional positions.
+            holdings_notional = self._compute_holdings_notional(
+                df, holdings_shares
+            )
+            # Compute PnL.
+            pnl = self._compute_pnl(
+                df, holdings_notional, executed_trades_notional
+            )
+        elif engine in ("numpy", "numba"):
+            hdbg.dassert(
+                liquidate_at_end_of_day or not adjust_for_splits,
+                "`adjust_for_splits` is not supported by engine='%s'",
+                engine,
+            )
+            use_numba = engine == "numba"
+            (
+                holdings_shares,
+                holdings_notional,
+                executed_trades_shares,
+                executed_trades_notional,
+                pnl,
+            ) = self._compute_portfolio_in_tiles(
+                df,
+                target_holdings_notional,
+                quantization,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+                ffill_limit,
+                asset_id_to_share_decimals,
+                use_numba,
+                tile_size_in_days,
+            )
+        else:
+            raise ValueError(f"Invalid engine='{engine}'")
         # Compute statistics.
         stats = self._compute_stats(
             df,
@@ -908,6 +957,266 @@ class ForecastEvaluatorFromPrices:
         ).subtract(executed_trades_notional, fill_value=0)
         return pnl
 
+    def _compute_portfolio_in_tiles(
+        self,
+        df: pd.DataFrame,
+        target_notional_positions: pd.DataFrame,
+        quantization: Optional[int],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        ffill_limit: int,
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        use_numba: bool,
+        tile_size_in_days: Optional[int],
+    ) -> Tuple[pd.DataFrame, ...]:
+        """
+        Compute holdings, trades, and PnL on NumPy arrays, a tile of days at a
+        time.
+
+        This computes the same values as `_compute_holdings_shares()`,
+        `_compute_executed_trades_shares()`,
+        `_compute_executed_trades_notional()`, `_compute_holdings_notional()`
+        and `_compute_pnl()`, which take a shifted or forward-filled copy of
+        full-width dataframes at each step.
+
+        :param use_numba: compile the underfill adjustment with Numba
+        :return: holdings_shares, holdings_notional, executed_trades_shares,
+            executed_trades_notional, pnl
+        """
+        price_df = ForecastEvaluatorFromPrices._get_df(df, self._price_col)
+        hpandas.dassert_axes_equal(target_notional_positions, price_df)
+        prices = price_df.to_numpy(dtype=np.float64)
+        target_notional = target_notional_positions.to_numpy(dtype=np.float64)
+        adjust_for_underfills = self._buy_price_col is not None
+        if adjust_for_underfills:
+            buy_prices = ForecastEvaluatorFromPrices._get_df(
+                df, self._buy_price_col
+            ).to_numpy(dtype=np.float64)
+            sell_prices = ForecastEvaluatorFromPrices._get_df(
+                df, self._sell_price_col
+            ).to_numpy(dtype=np.float64)
+        # Compute the number of decimals to round the shares of each asset to.
+        if quantization is not None:
+            hdbg.dassert_isinstance(quantization, int)
+            hdbg.dassert_is(asset_id_to_share_decimals, None)
+            share_decimals = None
+        else:
+            hdbg.dassert_isinstance(asset_id_to_share_decimals, dict)
+            hdbg.dassert_is_subset(
+                price_df.columns, asset_id_to_share_decimals.keys()
+            )
+            share_decimals = [
+                asset_id_to_share_decimals[asset_id]
+                for asset_id in price_df.columns
+            ]
+        # Find the days and the rows where they start and end.
+        num_rows, num_assets = prices.shape
+        dates = np.array(price_df.index.date)
+        is_first_row_of_day = np.ones(num_rows, dtype=bool)
+        is_first_row_of_day[1:] = dates[1:] != dates[:-1]
+        day_first_rows = np.flatnonzero(is_first_row_of_day)
+        is_last_row_of_day = np.ones(num_rows, dtype=bool)
+        is_last_row_of_day[:-1] = is_first_row_of_day[1:]
+        # The beginning / end of day for trades and execution prices only
+        # consider the bars with at least one price.
+        is_bod = _get_first_or_last_active_rows_of_days(prices, dates, "first")
+        if adjust_for_underfills:
+            is_buy_eod = _get_first_or_last_active_rows_of_days(
+                buy_prices, dates, "last"
+            )
+            is_sell_eod = _get_first_or_last_active_rows_of_days(
+                sell_prices, dates, "last"
+            )
+            adjust_holdings_for_underfills = (
+                _get_adjust_holdings_for_underfills(use_numba)
+            )
+        # Split the days in tiles.
+        if tile_size_in_days is None:
+            tile_first_rows = day_first_rows[:1]
+        else:
+            hdbg.dassert_lte(1, tile_size_in_days)
+            tile_first_rows = day_first_rows[::tile_size_in_days]
+        tile_last_rows = np.append(tile_first_rows[1:], num_rows)
+        tiles = [
+            slice(first_row, last_row)
+            for first_row, last_row in zip(tile_first_rows, tile_last_rows)
+        ]
+        # Allocate the results.
+        results = {
+            name: np.empty((num_rows, num_assets), dtype=np.float64)
+            for name in [
+                "holdings_shares",
+                "holdings_notional",
+                "executed_trades_shares",
+                "executed_trades_notional",
+                "pnl",
+            ]
+        }
+        if adjust_for_underfills:
+            no_buy_price = np.empty((num_rows, num_assets), dtype=bool)
+            no_sell_price = np.empty((num_rows, num_assets), dtype=bool)
+        # As in `cofinanc.adjust_holdings_for_underfills()`.
+        # TODO(Paul): Factor out ffill_limit.
+        underfill_ffill_limit = 2
+        # The state carried across tiles is the last row of the values that
+        # are shifted and the last rows of the values that are forward-filled.
+        nan_row = np.full((1, num_assets), np.nan)
+        # Compute the holdings in shares, as in `_compute_holdings_shares()`.
+        prev_target_holdings_shares = nan_row
+        prev_prices = prices[:0]
+        for rows in tiles:
+            tile_prices = prices[rows]
+            # Tiles start at the beginning of a day.
+            tile_day_first_rows = np.maximum.accumulate(
+                np.where(
+                    is_first_row_of_day[rows],
+                    np.arange(tile_prices.shape[0]),
+                    0,
+                )
+            )
+            target_holdings_shares = target_notional[rows] / tile_prices
+            if share_decimals is None:
+                target_holdings_shares = np.round(
+                    target_holdings_shares, quantization
+                )
+            else:
+                for idx, decimals in enumerate(share_decimals):
+                    target_holdings_shares[:, idx] = np.round(
+                        target_holdings_shares[:, idx], decimals
+                    )
+            # Adjust for the end of day.
+            holdings_shares = np.concatenate(
+                [prev_target_holdings_shares, target_holdings_shares[:-1]]
+            )
+            prev_target_holdings_shares = target_holdings_shares[-1:]
+            if liquidate_at_end_of_day:
+                holdings_shares[is_last_row_of_day[rows]] = 0.0
+                holdings_shares[is_first_row_of_day[rows]] *= 0
+            if ffill_limit > 0:
+                holdings_shares = _ffill(
+                    holdings_shares,
+                    ffill_limit,
+                    group_first_rows=tile_day_first_rows,
+                )
+            results["holdings_shares"][rows] = holdings_shares
+            # Find the trades that can't be filled, using the mark to market
+            # price at the end of the day.
+            if adjust_for_underfills:
+                eod_prices = _ffill_with_prev_rows(
+                    tile_prices, prev_prices, underfill_ffill_limit
+                )
+                is_eod = is_last_row_of_day[rows]
+                tile_buy_prices = buy_prices[rows].copy()
+                tile_buy_prices[is_eod] = eod_prices[is_eod]
+                no_buy_price[rows] = np.isnan(tile_buy_prices)
+                tile_sell_prices = sell_prices[rows].copy()
+                tile_sell_prices[is_eod] = eod_prices[is_eod]
+                no_sell_price[rows] = np.isnan(tile_sell_prices)
+                prev_prices = np.concatenate([prev_prices, tile_prices])[
+                    -underfill_ffill_limit:
+                ]
+        # Adjust for underfills. The adjustment can change the holdings of any
+        # later bar, so it is done on all the bars at once.
+        if adjust_for_underfills:
+            # As in `cofinanc.adjust_holdings_for_underfills()`.
+            max_num_iterations = 99
+            (
+                results["holdings_shares"],
+                num_iterations,
+            ) = adjust_holdings_for_underfills(
+                results["holdings_shares"],
+                no_buy_price,
+                no_sell_price,
+                max_num_iterations,
+            )
+            hdbg.dassert_lt(
+                num_iterations,
+                max_num_iterations,
+                "Exceeded underfill adjustment iteration limit",
+            )
+            _LOG.debug(
+                "Performed %d iterations of underfill adjustments",
+                num_iterations,
+            )
+        # Compute the trades, the notional values, and the PnL.
+        prev_holdings_shares = nan_row
+        prev_holdings_notional = nan_row
+        prev_prices = prices[:0]
+        prev_execution_prices = prices[:0]
+        for rows in tiles:
+            tile_prices = prices[rows]
+            holdings_shares = results["holdings_shares"][rows]
+            # Compute the trades, as in `_compute_executed_trades_shares()`.
+            executed_trades_shares = _subtract_with_zero_fill_value(
+                holdings_shares,
+                np.concatenate([prev_holdings_shares, holdings_shares[:-1]]),
+            )
+            prev_holdings_shares = holdings_shares[-1:]
+            if initialize_beginning_of_day_trades_to_zero:
+                executed_trades_shares[is_bod[rows]] *= 0
+            # Compute the execution prices, as in `_compute_execution_prices()`.
+            mark_to_market_prices = _ffill_with_prev_rows(
+                tile_prices, prev_prices, ffill_limit
+            )
+            if adjust_for_underfills:
+                tile_buy_prices = buy_prices[rows].copy()
+                is_eod = is_buy_eod[rows]
+                tile_buy_prices[is_eod] = mark_to_market_prices[is_eod]
+                tile_sell_prices = sell_prices[rows].copy()
+                is_eod = is_sell_eod[rows]
+                tile_sell_prices[is_eod] = mark_to_market_prices[is_eod]
+                is_buy = executed_trades_shares > 0
+                is_sell = executed_trades_shares < 0
+                hdbg.dassert(
+                    not (is_buy & np.isnan(tile_buy_prices)).any(),
+                    "Buy trades without a buy price",
+                )
+                hdbg.dassert(
+                    not (is_sell & np.isnan(tile_sell_prices)).any(),
+                    "Sell trades without a sell price",
+                )
+                execution_prices = np.where(
+                    is_buy,
+                    tile_buy_prices,
+                    np.where(is_sell, tile_sell_prices, np.nan),
+                )
+            else:
+                execution_prices = mark_to_market_prices
+            # Compute the notional values and the PnL.
+            executed_trades_notional = executed_trades_shares * (
+                _ffill_with_prev_rows(
+                    execution_prices, prev_execution_prices, ffill_limit
+                )
+            )
+            holdings_notional = holdings_shares * tile_prices
+            pnl = _subtract_with_zero_fill_value(
+                _subtract_with_zero_fill_value(
+                    holdings_notional,
+                    np.concatenate(
+                        [prev_holdings_notional, holdings_notional[:-1]]
+                    ),
+                ),
+                executed_trades_notional,
+            )
+            prev_holdings_notional = holdings_notional[-1:]
+            if ffill_limit > 0:
+                prev_prices = np.concatenate([prev_prices, tile_prices])[
+                    -ffill_limit:
+                ]
+                prev_execution_prices = np.concatenate(
+                    [prev_execution_prices, execution_prices]
+                )[-ffill_limit:]
+            # Store the results of the tile.
+            results["holdings_notional"][rows] = holdings_notional
+            results["executed_trades_shares"][rows] = executed_trades_shares
+            results["executed_trades_notional"][rows] = executed_trades_notional
+            results["pnl"][rows] = pnl
+        dfs = tuple(
+            pd.DataFrame(values, index=price_df.index, columns=price_df.columns)
+            for values in results.values()
+        )
+        return dfs
+
     def _compute_stats(
         self,
         df: pd.DataFrame,
@@ -967,6 +1276,154 @@ class ForecastEvaluatorFromPrices:
         return derived_dfs
 
 
+# #############################################################################
+# Array helpers
+# #############################################################################
+
+
+def _ffill(
+    values: np.ndarray,
+    limit: int,
+    *,
+    group_first_rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Forward fill the NaNs of each column of `values`, like
+    `pd.DataFrame.ffill(limit=limit)`.
+
+    :param group_first_rows: the first row of the group of each row, to
+        forward fill within groups (e.g., days) like
+        `df.groupby(...).ffill(limit=limit)`. `None` means a single group
+    """
+    row_idxs = np.arange(values.shape[0])[:, None]
+    # Find the last row with a value for each element.
+    last_valid_row_idxs = np.where(np.isnan(values), -1, row_idxs)
+    np.maximum.accumulate(last_valid_row_idxs, axis=0, out=last_valid_row_idxs)
+    is_filled = (last_valid_row_idxs >= 0) & (
+        row_idxs - last_valid_row_idxs <= limit
+    )
+    if group_first_rows is not None:
+        is_filled &= last_valid_row_idxs >= group_first_rows[:, None]
+    filled_values = np.take_along_axis(
+        values, np.maximum(last_valid_row_idxs, 0), axis=0
+    )
+    return np.where(is_filled, filled_values, values)
+
+
+def _ffill_with_prev_rows(
+    values: np.ndarray, prev_values: np.ndarray, limit: int
+) -> np.ndarray:
+    """
+    Forward fill `values` using also the rows preceding them.
+
+    :param prev_values: the last (up to `limit`) rows preceding `values`
+    """
+    values = np.concatenate([prev_values, values])
+    return _ffill(values, limit)[prev_values.shape[0] :]
+
+
+def _subtract_with_zero_fill_value(
+    values1: np.ndarray, values2: np.ndarray
+) -> np.ndarray:
+    """
+    Subtract like `pd.DataFrame.subtract(..., fill_value=0)`, i.e., a NaN is
+    replaced with 0 unless both values are NaN.
+    """
+    is_nan1 = np.isnan(values1)
+    is_nan2 = np.isnan(values2)
+    diff = np.where(is_nan1, 0.0, values1) - np.where(is_nan2, 0.0, values2)
+    diff[is_nan1 & is_nan2] = np.nan
+    return diff
+
+
+def _get_first_or_last_active_rows_of_days(
+    values: np.ndarray, dates: np.ndarray, mode: str
+) -> np.ndarray:
+    """
+    Find the first or last row of each day with at least one value, like
+    `cofinanc.retrieve_beginning_of_day_timestamps()` and
+    `cofinanc.retrieve_end_of_day_timestamps()`.
+
+    :param mode: "first" or "last"
+    :return: boolean mask of the rows
+    """
+    is_active = ~np.isnan(values).all(axis=1)
+    active_row_idxs = np.flatnonzero(is_active)
+    active_dates = dates[active_row_idxs]
+    is_new_date = np.ones(active_dates.shape[0], dtype=bool)
+    is_new_date[1:] = active_dates[1:] != active_dates[:-1]
+    if mode == "first":
+        row_idxs = active_row_idxs[is_new_date]
+    elif mode == "last":
+        is_last_of_date = np.append(is_new_date[1:], True)
+        row_idxs = active_row_idxs[is_last_of_date]
+    else:
+        raise ValueError(f"Invalid mode='{mode}'")
+    mask = np.zeros(values.shape[0], dtype=bool)
+    mask[row_idxs] = True
+    return mask
+
+
+def _adjust_holdings_for_underfills(
+    holdings: np.ndarray,
+    no_buy_price: np.ndarray,
+    no_sell_price: np.ndarray,
+    max_num_iterations: int,
+) -> Tuple[np.ndarray, int]:
+    """
+    Hold the previous position when the trade to reach `holdings` can't be
+    filled.
+
+    This is the iterative adjustment of
+    `cofinanc.adjust_holdings_for_underfills()` on arrays, which can be
+    compiled with Numba.
+
+    :param holdings: bars x assets holdings (in shares)
+    :param no_buy_price, no_sell_price: bars x assets masks of the missing
+        buy / sell prices
+    :param max_num_iterations: the maximum number of iterations to perform
+    :return: the adjusted holdings and the number of iterations performed
+    """
+    adjusted_holdings = holdings.copy()
+    num_iterations = 0
+    while num_iterations < max_num_iterations:
+        # If we want to buy but no buy price is available, or we want to
+        # sell and no sell price is available, then hold.
+        diff = adjusted_holdings[1:] - adjusted_holdings[:-1]
+        force_hold = ((diff > 0) & no_buy_price[1:]) | (
+            (diff < 0) & no_sell_price[1:]
+        )
+        if not force_hold.any():
+            break
+        # Impute NaN, forward fill by one bar, and fall back to `holdings`.
+        imputed_holdings = adjusted_holdings.copy()
+        imputed_holdings[1:] = np.where(
+            force_hold, np.nan, adjusted_holdings[1:]
+        )
+        filled_holdings = imputed_holdings.copy()
+        filled_holdings[1:] = np.where(
+            np.isnan(imputed_holdings[1:]),
+            imputed_holdings[:-1],
+            imputed_holdings[1:],
+        )
+        adjusted_holdings = np.where(
+            np.isnan(filled_holdings), holdings, filled_holdings
+        )
+        num_iterations += 1
+    return adjusted_holdings, num_iterations
+
+
+@functools.lru_cache(maxsize=None)
+def _get_adjust_holdings_for_underfills(use_numba: bool) -> Callable:
+    """
+    Return `_adjust_holdings_for_underfills()`, compiled with Numba if
+    requested.
+    """
+    if use_numba:
+        return hnumba.jit(_adjust_holdings_for_underfills)
+    return _adjust_holdings_for_underfills
+
+
 # #############################################################################
 
 
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import Any, List
 
 import numpy as np
 import pandas as pd
@@ -555,3 +555,97 @@ class TestForecastEvaluatorFromPrices1(hunitest.TestCase):
 2022-01-03 09:55:00-05:00    -278.06      9.64e+05  -200690.59  1.00e+06 -236802.17
 2022-01-03 10:00:00-05:00    1385.12      1.21e+05  -120770.11  9.98e+05 -356187.17"""
         self.assert_equal(stats_df_str, expected_stats_df_str, fuzzy_match=True)
+
+
+class TestForecastEvaluatorFromPrices2(hunitest.TestCase):
+    """
+    Check that the "numpy" and "numba" engines match the "pandas" engine.
+    """
+
+    @staticmethod
+    def get_data() -> pd.DataFrame:
+        """
+        Build 3 days of data with missing prices and buy / sell prices.
+        """
+        df = cfidaexa.get_forecast_price_based_dataframe(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            [101, 201, 301],
+            bar_duration="5T",
+        )
+        rng = np.random.default_rng(seed=0)
+        price = df["price"]
+        spread = 0.01 * price
+        buy_price = (price + spread).mask(rng.random(price.shape) < 0.2)
+        sell_price = (price - spread).mask(rng.random(price.shape) < 0.2)
+        price = price.mask(rng.random(price.shape) < 0.03)
+        df = pd.concat(
+            {
+                "price": price,
+                "volatility": df["volatility"],
+                "prediction": df["prediction"],
+                "buy_price": buy_price,
+                "sell_price": sell_price,
+            },
+            axis=1,
+        )
+        return df
+
+    def helper(
+        self,
+        forecast_evaluator: dtfmfefrpr.ForecastEvaluatorFromPrices,
+        **kwargs: Any,
+    ) -> None:
+        data = self.get_data()
+        expected = forecast_evaluator.compute_portfolio(
+            data, target_gmv=1e5, **kwargs
+        )
+        for engine, tile_size_in_days in [
+            ("numpy", None),
+            ("numpy", 1),
+            ("numba", 2),
+        ]:
+            actual = forecast_evaluator.compute_portfolio(
+                data,
+                target_gmv=1e5,
+                engine=engine,
+                tile_size_in_days=tile_size_in_days,
+                **kwargs,
+            )
+            self.assertEqual(actual.keys(), expected.keys())
+            for key, expected_df in expected.items():
+                _LOG.debug(
+                    "engine=%s tile_size_in_days=%s key=%s",
+                    engine,
+                    tile_size_in_days,
+                    key,
+                )
+                self.assert_dfs_close(actual[key], expected_df, equal_nan=True)
+
+    def test_mark_to_market_prices(self) -> None:
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+        )
+        self.helper(
+            forecast_evaluator,
+            quantization=0,
+            liquidate_at_end_of_day=False,
+            initialize_beginning_of_day_trades_to_zero=False,
+        )
+
+    def test_buy_sell_prices(self) -> None:
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            buy_price_col="buy_price",
+            sell_price_col="sell_price",
+        )
+        self.helper(
+            forecast_evaluator,
+            quantization=None,
+            liquidate_at_end_of_day=True,
+            asset_id_to_share_decimals={101: 0, 201: 1, 301: -1},
+        )
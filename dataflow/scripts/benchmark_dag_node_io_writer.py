@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the latency of a DAG run at each bar when saving the node interfaces
+synchronously, in background, and only with the rows new at each bar.
+
+The DAG is a chain of `--num_nodes` nodes run on a sliding window of
+`--lookback` bars of `--num_cols` columns of random data, for `--num_bars`
+bars.
+
+> benchmark_dag_node_io_writer.py --num_bars 200 --lookback 2000
+
+Import as:
+
+import dataflow.scripts.benchmark_dag_node_io_writer as dtfsbdniwr
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import dataflow.core as dtfcore
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+import helpers.hwall_clock_time as hwacltim
+
+_LOG = logging.getLogger(__name__)
+
+# #############################################################################
+
+
+def _get_data(num_bars: int, num_cols: int) -> pd.DataFrame:
+    index = pd.date_range(
+        "2022-01-03 09:30", periods=num_bars, freq="T", tz="America/New_York"
+    )
+    columns = [f"col{i}" for i in range(num_cols)]
+    rng = np.random.default_rng(seed=0)
+    data = rng.standard_normal((num_bars, num_cols))
+    df = pd.DataFrame(data, index=index, columns=columns)
+    return df
+
+
+def _run(
+    df: pd.DataFrame,
+    num_nodes: int,
+    lookback: int,
+    num_bars: int,
+    save_node_io: str,
+    set_debug_mode_kwargs: Dict[str, Any],
+) -> Tuple[List[float], float]:
+    """
+    Run the DAG at each bar.
+
+    :return: the latency of each run and the time to wait for the node
+        interfaces to be written at the end, in seconds
+    """
+    dag = dtfcore.DAG()
+    dag.add_node(dtfcore.DfDataSource("source", df))
+    for i in range(num_nodes):
+        func = lambda df: 2 * df
+        dag.append_to_tail(dtfcore.FunctionWrapper(f"node{i}", func))
+    nid = dag.get_unique_sink()
+    source = dag.get_node("source")
+    with tempfile.TemporaryDirectory() as dst_dir:
+        if save_node_io:
+            dag.set_debug_mode(
+                save_node_io, False, False, dst_dir, **set_debug_mode_kwargs
+            )
+        latencies = []
+        for end in range(lookback, lookback + num_bars):
+            source.df = df.iloc[end - lookback : end]
+            hwacltim.set_current_bar_timestamp(df.index[end - 1])
+            start_time = time.perf_counter()
+            dag.run_leq_node(nid, "predict", progress_bar=False)
+            latencies.append(time.perf_counter() - start_time)
+        # Wait for the files to be written, since the last bars are still in
+        # flight when running in background.
+        start_time = time.perf_counter()
+        dag.wait_for_node_io()
+        flush_time = time.perf_counter() - start_time
+    hwacltim.reset_current_bar_timestamp()
+    return latencies, flush_time
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_bars", action="store", type=int, default=200, help="Bars to run"
+    )
+    parser.add_argument(
+        "--lookback",
+        action="store",
+        type=int,
+        default=2000,
+        help="Bars in the lookback window of each run",
+    )
+    parser.add_argument(
+        "--num_cols", action="store", type=int, default=20, help="Data columns"
+    )
+    parser.add_argument(
+        "--num_nodes", action="store", type=int, default=3, help="DAG nodes"
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_bars)
+    df = _get_data(args.lookback + args.num_bars, args.num_cols)
+    modes = [
+        ("no save", "", {}),
+        ("sync", "df_as_pq", {}),
+        ("background", "df_as_pq", {"save_node_io_in_background": True}),
+        (
+            "background+delta",
+            "df_as_pq",
+            {"save_node_io_in_background": True, "save_node_io_delta": True},
+        ),
+    ]
+    for mode, save_node_io, set_debug_mode_kwargs in modes:
+        latencies, flush_time = _run(
+            df,
+            args.num_nodes,
+            args.lookback,
+            args.num_bars,
+            save_node_io,
+            set_debug_mode_kwargs,
+        )
+        latencies_ms = 1000 * np.array(latencies)
+        _LOG.info(
+            "%s: mean=%.1fms p50=%.1fms p99=%.1fms max=%.1fms flush=%.1fms",
+            mode,
+            latencies_ms.mean(),
+            np.percentile(latencies_ms, 50),
+            np.percentile(latencies_ms, 99),
+            latencies_ms.max(),
+            1000 * flush_time,
+        )
+
+
+if __name__ == "__main__":
+    _main(_parse())
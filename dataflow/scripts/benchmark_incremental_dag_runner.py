@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+Benchmark `IncrementalDagRunner` re-running the entire history at each step
+against the step mode.
+
+The DAG is built with `ArmaReturnsBuilder` from `dag_builder_example` and it
+is run on `--num_days` days of 1-minute bars, predicting every `--freq`.
+
+> benchmark_incremental_dag_runner.py --num_days 5 --freq 5T
+
+Import as:
+
+import dataflow.scripts.benchmark_incremental_dag_runner as dtfsbidaru
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import dataflow.core as dtfcore
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+
+_LOG = logging.getLogger(__name__)
+
+# #############################################################################
+
+
+def _run(
+    num_days: int,
+    freq: str,
+    incremental_mode_kwargs: Optional[Dict[str, Any]],
+) -> Tuple[List[dtfcore.ResultBundle], float]:
+    """
+    Run the incremental DAG runner and return the result bundles and the
+    elapsed time in seconds.
+    """
+    dag_builder = dtfcore.ArmaReturnsBuilder()
+    config = dag_builder.get_config_template()
+    start_date = pd.Timestamp("2010-01-04 09:00:00")
+    end_date = start_date + pd.Timedelta(days=num_days - 1, hours=7, minutes=30)
+    # Allow reassignment of the data end date.
+    config.update_mode = "overwrite"
+    config[("rets/read_data", "end_date")] = str(end_date)
+    dag = dag_builder.get_dag(config)
+    # Fit.
+    nid = dag.get_unique_sink()
+    dag.run_leq_node(nid, "fit")
+    fit_state = dtfcore.get_fit_state(dag)
+    # Predict for the last day.
+    start_timestamp = end_date.normalize() + pd.Timedelta(hours=9, minutes=35)
+    end_timestamp = end_date.normalize() + pd.Timedelta(hours=16)
+    dag_runner = dtfcore.IncrementalDagRunner(
+        dag=dag,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+        freq=freq,
+        fit_state=fit_state,
+        incremental_mode_kwargs=incremental_mode_kwargs,
+    )
+    start_time = time.perf_counter()
+    result_bundles = list(dag_runner.predict())
+    elapsed_time = time.perf_counter() - start_time
+    return result_bundles, elapsed_time
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_days", action="store", type=int, default=5, help="Days of data"
+    )
+    parser.add_argument(
+        "--freq", action="store", default="5T", help="Prediction frequency"
+    )
+    parser.add_argument(
+        "--tail_window",
+        action="store",
+        type=int,
+        default=1000,
+        help="Tail window of the nodes without incremental state",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_days)
+    # Run re-computing the entire history at each step.
+    full_rbs, full_time = _run(args.num_days, args.freq, None)
+    _LOG.info("Full re-run: steps=%s time=%.2fs", len(full_rbs), full_time)
+    # Run in step mode.
+    incremental_mode_kwargs = {"tail_window": args.tail_window}
+    step_rbs, step_time = _run(args.num_days, args.freq, incremental_mode_kwargs)
+    _LOG.info("Step mode: steps=%s time=%.2fs", len(step_rbs), step_time)
+    _LOG.info("Speedup=%.1fx", full_time / step_time)
+    # Compare the predictions that are computed in each step.
+    col = "vwap_ret_0_vol.shift_-2_hat"
+    full_srs = pd.concat(
+        [rb.result_df[col].iloc[-1:] for rb in full_rbs[1:]]
+    )
+    step_srs = pd.concat([rb.result_df[col] for rb in step_rbs])
+    step_srs = step_srs.reindex(full_srs.index)
+    max_abs_diff = np.nanmax(np.abs(full_srs - step_srs))
+    _LOG.info("Max abs difference of '%s'=%s", col, max_abs_diff)
+
+
+if __name__ == "__main__":
+    _main(_parse())
@@ -51,6 +51,7 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         set_current_bar_timestamp: bool = True,
         # TODO(Danya): -> `max_allowed_delay_from_bar_start_in_secs`.
         max_distance_in_secs: int = 30,
+        incremental_mode_kwargs: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Build object.
@@ -73,6 +74,11 @@ class RealTimeDagRunner(dtfcore.DagRunner):
             that last a multiple of one minute.
         :param max_distance_in_secs: maximal distance that is allowed
             from the start of the bar.
+        :param incremental_mode_kwargs: if not `None`, run `predict()` in
+            incremental mode, so that at each bar the source nodes emit only
+            the new data and the nodes compute only the new rows. The
+            params are passed to `DAG.set_incremental_mode()` (e.g.,
+            `tail_window`, `check_incremental`)
         """
         super().__init__(dag)
         # Save input parameters.
@@ -86,6 +92,15 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         self._bar_duration_in_secs = bar_duration_in_secs
         self._set_current_bar_timestamp = set_current_bar_timestamp
         self._max_distance_in_secs = max_distance_in_secs
+        if incremental_mode_kwargs is not None:
+            hdbg.dassert_isinstance(incremental_mode_kwargs, dict)
+            _LOG.info(
+                "Running in incremental mode with %s", incremental_mode_kwargs
+            )
+            incremental_mode = True
+            self.dag.set_incremental_mode(
+                incremental_mode, **incremental_mode_kwargs
+            )
         # Store information about the real-time execution.
         self._events: creatime.Events = []
         if _LOG.isEnabledFor(logging.DEBUG):
@@ -133,6 +148,9 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         async for result_bundle in self.predict_at_datetime():
             self._apply_current_bar_timestamp()
             result_bundles.append(result_bundle)
+        # Make sure that the node interfaces saved in the background are on
+        # disk before returning.
+        self.dag.wait_for_node_io()
         return result_bundles
 
     async def predict_at_datetime(self) -> dtfcore.ResultBundle:
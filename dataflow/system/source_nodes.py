@@ -391,6 +391,21 @@ class RealTimeDataSource(dtfcore.DataSource):
         self._ts_col_name = ts_col_name
         hdbg.dassert_isinstance(multiindex_output, bool)
         self._multiindex_output = multiindex_output
+        # Wall clock time of the last data retrieval, used in incremental mode
+        # to retrieve only the data that arrived after it.
+        self._last_wall_clock_time: Optional[pd.Timestamp] = None
+
+    def set_incremental_mode(self, incremental_mode: bool) -> None:
+        """
+        Same as the parent class, but retrieve only the new data from
+        `MarketData`.
+
+        The first call retrieves the entire `timedelta` lookback to warm up
+        the downstream nodes, while the following calls retrieve only the data
+        in `[last_wall_clock_time, wall_clock_time)`.
+        """
+        super().set_incremental_mode(incremental_mode)
+        self._last_wall_clock_time = None
 
     # TODO(gp): Can we use a run and move it inside fit?
     async def wait_for_latest_data(
@@ -400,21 +415,52 @@ class RealTimeDataSource(dtfcore.DataSource):
         return ret  # type: ignore[no-any-return]
 
     def fit(self) -> Optional[Dict[str, pd.DataFrame]]:
-        self._get_data()
+        # `fit()` always uses the entire lookback.
+        incremental = False
+        self._get_data(incremental)
         return super().fit()  # type: ignore[no-any-return]
 
     def predict(self) -> Optional[Dict[str, pd.DataFrame]]:
-        self._get_data()
+        incremental = self._incremental_mode
+        self._get_data(incremental)
         return super().predict()  # type: ignore[no-any-return]
 
-    def _get_data(self) -> None:
+    def _get_data(self, incremental: bool) -> None:
+        """
+        Retrieve the data from `MarketData` and store it in `self.df`.
+
+        :param incremental: retrieve only the data that arrived after the
+            previous incremental retrieval
+        """
         # TODO(gp): This approach of communicating params through the state
         #  makes the code difficult to understand.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("timedelta=%s", self._timedelta)
-        self.df = self._market_data.get_data_for_last_period(
-            self._timedelta, ts_col_name=self._ts_col_name
-        )
+        wall_clock_time = self._market_data.get_wall_clock_time()
+        if incremental and self._last_wall_clock_time is not None:
+            # Retrieve only the slice of data that has arrived since the last
+            # call. The intervals are `[a, b)` like in
+            # `get_data_for_last_period()`, so that the union of the slices
+            # is the same data retrieved in non-incremental mode.
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug(
+                    hprint.to_str("self._last_wall_clock_time wall_clock_time")
+                )
+            asset_ids = None
+            self.df = self._market_data.get_data_for_interval(
+                self._last_wall_clock_time,
+                wall_clock_time,
+                self._ts_col_name,
+                asset_ids,
+                left_close=True,
+                right_close=False,
+            )
+        else:
+            self.df = self._market_data.get_data_for_last_period(
+                self._timedelta, ts_col_name=self._ts_col_name
+            )
+        if incremental:
+            self._last_wall_clock_time = wall_clock_time
         if self._multiindex_output:
             self.df = dtfcorutil.convert_to_multiindex(self.df, self._asset_id_col)
 
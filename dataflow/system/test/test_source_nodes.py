@@ -1,8 +1,14 @@
+import asyncio
+from typing import List
+
+import pandas as pd
 import pytest
 
 import dataflow.system.source_nodes as dtfsysonod
+import helpers.hasyncio as hasynci
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
+import market_data as mdata
 
 
 @pytest.mark.skip(reason="Kibot Equity Reader not in use ref. #5582.")
@@ -19,3 +25,68 @@ class TestKibotEquityReader(hunitest.TestCase):
         df = node.fit()["df_out"]
         df_str = hpandas.df_to_str(df, num_rows=None)
         self.check_string(df_str)
+
+
+# #############################################################################
+# TestRealTimeDataSource1
+# #############################################################################
+
+
+class TestRealTimeDataSource1(hunitest.TestCase):
+    """
+    Check `RealTimeDataSource` in incremental mode.
+    """
+
+    @staticmethod
+    async def get_predict_outputs(
+        node: dtfsysonod.RealTimeDataSource, num_bars: int
+    ) -> List[pd.DataFrame]:
+        """
+        Call `predict()` once per minute for `num_bars` minutes.
+        """
+        dfs = []
+        for _ in range(num_bars):
+            dfs.append(node.predict()["df_out"])
+            await asyncio.sleep(60)
+        return dfs
+
+    def run_node(self, incremental_mode: bool) -> List[pd.DataFrame]:
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example3(
+                event_loop
+            )
+            node = dtfsysonod.RealTimeDataSource(
+                "source",
+                market_data,
+                pd.Timedelta("10T"),
+                "end_datetime",
+                multiindex_output=False,
+            )
+            node.set_incremental_mode(incremental_mode)
+            num_bars = 4
+            coroutine = self.get_predict_outputs(node, num_bars)
+            dfs = hasynci.run(coroutine, event_loop=event_loop)
+        return dfs
+
+    def test1(self) -> None:
+        """
+        Check that the data emitted incrementally is the same data emitted in
+        non-incremental mode.
+        """
+        dfs = self.run_node(incremental_mode=False)
+        incremental_dfs = self.run_node(incremental_mode=True)
+        # The first call emits the entire lookback.
+        hpandas.dassert_axes_equal(incremental_dfs[0], dfs[0])
+        # The following calls emit only the new data.
+        for df in incremental_dfs[1:]:
+            self.assertEqual(len(df), 2)
+        # Concatenating the incremental outputs gives all the data.
+        actual = pd.concat(incremental_dfs)
+        expected = pd.concat(dfs)
+        expected = (
+            expected.reset_index().drop_duplicates().set_index("end_datetime")
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
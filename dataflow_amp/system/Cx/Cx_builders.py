@@ -77,8 +77,9 @@ def get_Cx_RealTimeMarketData_prod_instance1(
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug(hprint.to_str("asset_ids db_stage"))
     universe_version = "infer_from_data"
-    # Get DB connection.
-    db_connection = imvcddbut.DbConnectionManager.get_connection(db_stage)
+    # Get a pool of DB connections, so that `MarketData` waits for the latest
+    # data without blocking the event loop.
+    db_connection = imvcddbut.DbConnectionManager.get_connection_pool(db_stage)
     # Get the real-time `ImClient`.
     # TODO(Grisha): @Dan pass as much as possible via `system.config`.
     resample_1min = False
@@ -11,6 +11,7 @@ import math
 import time
 from typing import (
     Any,
+    Awaitable,
     Callable,
     Coroutine,
     Dict,
@@ -161,6 +162,11 @@ PollOutput = Tuple[bool, Any]
 # built through lambdas and closures.
 PollingFunction = Callable[[Any], PollOutput]
 
+# A function waiting up to the passed number of seconds for a change that can
+# make a polling function succeed (e.g., a notification that rows were
+# inserted in a DB table) and returning whether there was a change.
+WaitForChange = Callable[[float], Awaitable[bool]]
+
 
 def _get_max_num_iterations(
     sleep_in_secs: float,
@@ -180,12 +186,14 @@ def _poll_iterate(
     timeout_in_secs: float,
     get_wall_clock_time: hdateti.GetWallClockTime,
     num_iter: int,
-    max_num_iter,
+    max_num_iter: Optional[int],
     tag: str,
 ) -> Tuple[int, PollOutput]:
     """
     Execute an iteration of the polling loop.
 
+    :param max_num_iter: number of iterations before a timeout
+        - `None` means no limit
     :return: the number of iterations executed and the output of the
         polling function (sucess, return value)
     :raises: TimeoutError in case of timeout
@@ -212,7 +220,7 @@ def _poll_iterate(
     else:
         # Otherwise update state.
         num_iter += 1
-        if num_iter > max_num_iter:
+        if max_num_iter is not None and num_iter > max_num_iter:
             msg = "Timeout for " + hprint.to_str(
                 "polling_func sleep_in_secs timeout_in_secs tag"
             )
@@ -229,6 +237,7 @@ async def poll(
     get_wall_clock_time: hdateti.GetWallClockTime,
     *,
     tag: Optional[str] = None,
+    wait_for_change: Optional[WaitForChange] = None,
 ) -> Tuple[int, Any]:
     """
     Call `polling_func()` every `sleep_in_secs` secs until the polling function
@@ -236,6 +245,10 @@ async def poll(
     achieved within `timeout_in_secs` secs.
 
     :param polling_func: function returning a tuple (success, value)
+    :param wait_for_change: function waiting for a change between calls to
+        `polling_func()`, so that the polling function is called as soon as
+        there is a change, instead of after `sleep_in_secs` secs
+        - `None` means sleep `sleep_in_secs` secs between calls
     :return:
         - number of iterations before a successful call to `polling_func`
         - result from `polling_func`
@@ -246,6 +259,14 @@ async def poll(
         # Use the function calling this function.
         tag = hintros.get_function_name(count=0)
     max_num_iter = _get_max_num_iterations(sleep_in_secs, timeout_in_secs)
+    if wait_for_change is not None:
+        # The wait ends as soon as there is a change, so it can be shorter
+        # than `sleep_in_secs` and the timeout is enforced on the elapsed
+        # time instead of on the number of iterations.
+        max_num_iter = None
+        timeout_timestamp = get_wall_clock_time() + pd.Timedelta(
+            seconds=timeout_in_secs
+        )
     num_iter = 1
     while True:
         num_iter, (success, value) = _poll_iterate(
@@ -259,8 +280,24 @@ async def poll(
         )
         if success:
             return num_iter, value
-        _LOG.debug("sleep for %s secs", sleep_in_secs)
-        await asyncio.sleep(sleep_in_secs)
+        if wait_for_change is None:
+            _LOG.debug("sleep for %s secs", sleep_in_secs)
+            await asyncio.sleep(sleep_in_secs)
+        else:
+            wall_clock_time = get_wall_clock_time()
+            if wall_clock_time >= timeout_timestamp:
+                msg = "Timeout for " + hprint.to_str(
+                    "polling_func sleep_in_secs timeout_in_secs tag"
+                )
+                _LOG.error(msg)
+                raise TimeoutError(msg)
+            # Do not wait past the timeout.
+            wait_in_secs = min(
+                sleep_in_secs,
+                (timeout_timestamp - wall_clock_time).total_seconds(),
+            )
+            _LOG.debug("wait for a change for %s secs", wait_in_secs)
+            await wait_for_change(wait_in_secs)
 
 
 def sync_poll(
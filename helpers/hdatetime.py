@@ -864,6 +864,32 @@ def convert_timestamp_to_unix_epoch(
     return epoch
 
 
+def convert_timestamps_to_unix_epoch(
+    timestamps: Union[pd.Series, pd.DatetimeIndex], unit: str = "ms"
+) -> pd.Series:
+    """
+    Convert timestamps to Unix epochs in a vectorized way.
+
+    This is equivalent to applying `convert_timestamp_to_unix_epoch()` to
+    each timestamp, but it is much faster on large data.
+
+    :param timestamps: timestamps, either tz-aware or tz-naive
+    :param unit: epoch's time unit
+    :return: Unix time epochs with the same index of `timestamps`
+    """
+    if isinstance(timestamps, pd.DatetimeIndex):
+        timestamps = timestamps.to_series(index=timestamps)
+    hdbg.dassert_isinstance(timestamps, pd.Series)
+    # Make timestamps tz-naive if they are not. They are converted to UTC tz
+    # before becoming naive automatically.
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    epochs: pd.Series = (
+        timestamps - pd.Timestamp("1970-01-01")
+    ) // pd.Timedelta("1" + unit)
+    return epochs
+
+
 # TODO(Sameep): Reuse this function across the code base (`jackpy strftime`) when
 # it doesn't make the import graph too complicated.
 def timestamp_to_str(timestamp: pd.Timestamp) -> str:
@@ -7,9 +7,11 @@ import helpers.hparquet as hparque
 import collections
 import datetime
 import glob
+import hashlib
 import logging
 import os
-from typing import Any, Iterator, List, Optional, Tuple, Union
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -77,6 +79,219 @@ def _get_parquet_tiles_from_file_path(file_path: str) -> List[Tuple[str, Any]]:
     return tiles
 
 
+def _get_timestamp_filter_expression(
+    schema: pa.Schema,
+    start_timestamp: Optional[pd.Timestamp],
+    end_timestamp: Optional[pd.Timestamp],
+    timestamp_col_name: Optional[str],
+) -> Optional[ds.Expression]:
+    """
+    Build a predicate selecting the rows in `[start_timestamp, end_timestamp]`.
+
+    :param schema: schema of the Parquet dataset
+    :param start_timestamp: start of the interval. `None` means no bound
+    :param end_timestamp: end of the interval. `None` means no bound
+    :param timestamp_col_name: name of the column to filter on
+        - `None` means use the index of the data stored with Pandas
+    :return: predicate or `None` if there is no timestamp column to filter on
+    """
+    if start_timestamp is None and end_timestamp is None:
+        return None
+    if timestamp_col_name is None:
+        # Use the index stored with Pandas, e.g., `timestamp` or
+        # `__index_level_0__`. A `RangeIndex` is stored as a dict.
+        pandas_metadata = schema.pandas_metadata or {}
+        index_columns = [
+            col
+            for col in pandas_metadata.get("index_columns", [])
+            if isinstance(col, str)
+        ]
+        if len(index_columns) != 1:
+            _LOG.debug(
+                "Can't find a timestamp index: index_columns=%s", index_columns
+            )
+            return None
+        timestamp_col_name = index_columns[0]
+    hdbg.dassert_in(timestamp_col_name, schema.names)
+    type_ = schema.field(timestamp_col_name).type
+    if not pa.types.is_timestamp(type_):
+        _LOG.debug(
+            "Can't filter by timestamp column '%s' with type=%s",
+            timestamp_col_name,
+            type_,
+        )
+        return None
+
+    def _to_scalar(timestamp: pd.Timestamp) -> pa.Scalar:
+        # Pyarrow can't compare tz-aware and tz-naive timestamps, so convert
+        # the bound to the type of the column. Tz-naive columns store UTC.
+        if type_.tz is None and timestamp.tz is not None:
+            timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+        return pa.scalar(timestamp, type=type_)
+
+    timestamp_col = ds.field(timestamp_col_name)
+    expressions = []
+    if start_timestamp is not None:
+        expressions.append(timestamp_col >= _to_scalar(start_timestamp))
+    if end_timestamp is not None:
+        expressions.append(timestamp_col <= _to_scalar(end_timestamp))
+    expression = expressions[0]
+    for expression_ in expressions[1:]:
+        expression = expression & expression_
+    return expression
+
+
+def _plan_parquet_scan(
+    dataset: ds.FileSystemDataset, filter_expression: Optional[ds.Expression]
+) -> Tuple[List[ds.ParquetFileFragment], Dict[str, int]]:
+    """
+    Select the row groups of a Parquet dataset that can match a filter.
+
+    Files are pruned using the partitioning (e.g., `year` and `month`) and
+    row groups using the min / max statistics stored in the Parquet files,
+    e.g., a one-day query on a by-month tile reads only the row groups of
+    that day.
+
+    :param dataset: Parquet dataset to scan
+    :param filter_expression: predicate on the partition and data columns
+    :return:
+        - the fragments storing the selected row groups
+        - the number of files in the dataset, the number of row groups and
+          uncompressed bytes in the files selected by the partitioning, and
+          the ones that are scanned, e.g.,
+          ```
+          {
+              "num_files": 2,
+              "num_scanned_files": 1,
+              "num_row_groups": 59,
+              "num_scanned_row_groups": 2,
+              "num_bytes": 1302300,
+              "num_scanned_bytes": 44112,
+          }
+          ```
+    """
+    stats = collections.OrderedDict(
+        [
+            ("num_files", 0),
+            ("num_scanned_files", 0),
+            ("num_row_groups", 0),
+            ("num_scanned_row_groups", 0),
+            ("num_bytes", 0),
+            ("num_scanned_bytes", 0),
+        ]
+    )
+    stats["num_files"] = len(dataset.files)
+    row_group_fragments = []
+    # Prune the files by partition, without reading their metadata.
+    for fragment in dataset.get_fragments(filter=filter_expression):
+        # Prune the row groups using the statistics.
+        scanned_fragments = fragment.split_by_row_group(
+            filter_expression, schema=dataset.schema
+        )
+        metadata = fragment.metadata
+        stats["num_row_groups"] += metadata.num_row_groups
+        stats["num_bytes"] += sum(
+            metadata.row_group(idx).total_byte_size
+            for idx in range(metadata.num_row_groups)
+        )
+        if not scanned_fragments:
+            continue
+        stats["num_scanned_files"] += 1
+        for scanned_fragment in scanned_fragments:
+            for row_group in scanned_fragment.row_groups:
+                stats["num_scanned_row_groups"] += 1
+                stats["num_scanned_bytes"] += metadata.row_group(
+                    row_group.id
+                ).total_byte_size
+        row_group_fragments.extend(scanned_fragments)
+    return row_group_fragments, stats
+
+
+def _read_parquet_with_pushdown(
+    file_name: str,
+    columns: Optional[List[str]],
+    filters: Optional[List[Any]],
+    partitioning: ds.Partitioning,
+    filesystem: Optional[pafs.FileSystem],
+    start_timestamp: Optional[pd.Timestamp],
+    end_timestamp: Optional[pd.Timestamp],
+    timestamp_col_name: Optional[str],
+    report_scan_stats: bool,
+    log_level: int,
+) -> pa.Table:
+    """
+    Read a Parquet dataset reading only the row groups that match the filters.
+
+    This is equivalent to `pq.ParquetDataset(...).read_pandas()`, but the
+    interval `[start_timestamp, end_timestamp]` is also pushed down to the row
+    groups.
+
+    :param report_scan_stats: whether to report the files, row groups and
+        bytes that are scanned and returned
+    See `from_parquet()` for the other params.
+    """
+    dataset = ds.dataset(
+        file_name,
+        filesystem=filesystem,
+        format="parquet",
+        partitioning=partitioning,
+    )
+    if columns:
+        # Note: `schema.names` also includes and index.
+        hdbg.dassert_is_subset(columns, dataset.schema.names)
+    # Build the predicate on the partitions and on the data.
+    filter_expression = None
+    if filters:
+        filter_expression = pq.filters_to_expression(filters)
+    timestamp_expression = _get_timestamp_filter_expression(
+        dataset.schema, start_timestamp, end_timestamp, timestamp_col_name
+    )
+    if timestamp_expression is not None:
+        if filter_expression is None:
+            filter_expression = timestamp_expression
+        else:
+            filter_expression = filter_expression & timestamp_expression
+    row_group_fragments, stats = _plan_parquet_scan(dataset, filter_expression)
+    # Read only the selected row groups.
+    scanned_dataset = ds.FileSystemDataset(
+        row_group_fragments,
+        schema=dataset.schema,
+        format=dataset.format,
+        filesystem=dataset.filesystem,
+    )
+    # Read also the index, like `read_pandas()` does.
+    pandas_metadata = dataset.schema.pandas_metadata or {}
+    if columns:
+        index_columns = [
+            col
+            for col in pandas_metadata.get("index_columns", [])
+            if isinstance(col, str) and col not in columns
+        ]
+        columns = list(columns) + index_columns
+    table = scanned_dataset.to_table(columns=columns, filter=filter_expression)
+    # Restore the Pandas metadata that is dropped when selecting columns.
+    if pandas_metadata:
+        metadata = table.schema.metadata or {}
+        metadata[b"pandas"] = dataset.schema.metadata[b"pandas"]
+        table = table.replace_schema_metadata(metadata)
+    if report_scan_stats:
+        _LOG.log(
+            log_level,
+            "Scanned '%s': files=%s/%s row_groups=%s/%s bytes=%s/%s, "
+            "returned rows=%s bytes=%s",
+            file_name,
+            stats["num_scanned_files"],
+            stats["num_files"],
+            stats["num_scanned_row_groups"],
+            stats["num_row_groups"],
+            hintros.format_size(stats["num_scanned_bytes"]),
+            hintros.format_size(stats["num_bytes"]),
+            table.num_rows,
+            hintros.format_size(table.nbytes),
+        )
+    return table
+
+
 # TODO(Dan): Add mode to allow querying even when some non-existing columns are passed.
 def from_parquet(
     file_name: str,
@@ -88,6 +303,12 @@ def from_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+    check_path_exists: bool = True,
+    start_timestamp: Optional[pd.Timestamp] = None,
+    end_timestamp: Optional[pd.Timestamp] = None,
+    timestamp_col_name: Optional[str] = None,
+    report_scan_stats: bool = False,
 ) -> pd.DataFrame:
     """
     Load a dataframe from a Parquet file.
@@ -106,25 +327,45 @@ def from_parquet(
     :param report_stats: whether to report Parquet file size or not
     :param aws_profile: AWS profile to use if and only if using an S3 path,
         otherwise `None` for local path
+    :param filesystem: Pyarrow filesystem to read an S3 path with, e.g., to
+        share the same filesystem across multiple reads
+        - `None` means build it from `aws_profile`
+    :param check_path_exists: whether to check that the path exists before
+        reading it, e.g., the caller can skip it if the check was already done
+    :param start_timestamp: read only the rows with a timestamp greater than or
+        equal to `start_timestamp`, skipping the row groups that don't contain
+        any according to the Parquet statistics
+        - `None` means no bound
+    :param end_timestamp: same as `start_timestamp` for the rows with a
+        timestamp less than or equal to `end_timestamp`
+    :param timestamp_col_name: name of the column to apply the timestamp
+        bounds to
+        - `None` means use the index of the data
+    :param report_scan_stats: whether to report the files, row groups and
+        bytes scanned versus the ones returned
     :return: data from Parquet dataset
     """
     _LOG.debug(hprint.to_str("file_name columns filters schema"))
     hdbg.dassert_isinstance(file_name, str)
     hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
     if hs3.is_s3_path(file_name):
-        if isinstance(aws_profile, str):
-            filesystem = get_pyarrow_s3fs(aws_profile)
-        else:
-            # Note: `s3fs` filesystem is only to be used on exact file path
-            # as `pq.ParquetDataset` is not properly handling directory path.
-            filesystem = aws_profile
-        # Pyarrow S3FileSystem does not have `exists` method.
-        s3_filesystem = hs3.get_s3fs(aws_profile)
-        hs3.dassert_path_exists(file_name, s3_filesystem)
+        if filesystem is None:
+            if isinstance(aws_profile, str):
+                filesystem = get_pyarrow_s3fs(aws_profile)
+            else:
+                # Note: `s3fs` filesystem is only to be used on exact file path
+                # as `pq.ParquetDataset` is not properly handling directory path.
+                filesystem = aws_profile
+        if check_path_exists or n_rows:
+            # Pyarrow S3FileSystem does not have `exists` method.
+            s3_filesystem = hs3.get_s3fs(aws_profile)
+        if check_path_exists:
+            hs3.dassert_path_exists(file_name, s3_filesystem)
         file_name = file_name.lstrip("s3://")
     else:
-        filesystem = None
-        hdbg.dassert_path_exists(file_name)
+        hdbg.dassert_is(filesystem, None)
+        if check_path_exists:
+            hdbg.dassert_path_exists(file_name)
     # Load data.
     with htimer.TimedScope(
         logging.DEBUG, f"# Reading Parquet file '{file_name}'"
@@ -154,20 +395,38 @@ def from_parquet(
                 # Pass partition columns types explicitly.
                 schema = pa.schema(schema)
             partitioning = ds.partitioning(schema, flavor="hive")
-            dataset = pq.ParquetDataset(
-                # Replace URI with path.
-                file_name,
-                filesystem=filesystem,
-                filters=filters,
-                partitioning=partitioning,
-            )
-            if columns:
-                # Note: `schema.names` also includes and index.
-                hdbg.dassert_is_subset(columns, dataset.schema.names)
-            # To read also the index we need to use `read_pandas()`, instead of
-            # `read_table()`.
-            # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
-            table = dataset.read_pandas(columns=columns)
+            if (
+                start_timestamp is None
+                and end_timestamp is None
+                and not report_scan_stats
+            ):
+                dataset = pq.ParquetDataset(
+                    # Replace URI with path.
+                    file_name,
+                    filesystem=filesystem,
+                    filters=filters,
+                    partitioning=partitioning,
+                )
+                if columns:
+                    # Note: `schema.names` also includes and index.
+                    hdbg.dassert_is_subset(columns, dataset.schema.names)
+                # To read also the index we need to use `read_pandas()`,
+                # instead of `read_table()`.
+                # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
+                table = dataset.read_pandas(columns=columns)
+            else:
+                table = _read_parquet_with_pushdown(
+                    file_name,
+                    columns,
+                    filters,
+                    partitioning,
+                    filesystem,
+                    start_timestamp,
+                    end_timestamp,
+                    timestamp_col_name,
+                    report_scan_stats,
+                    log_level,
+                )
             # Convert the Pandas Dataframe timestamp columns and index to `ns`
             # resolution. The general approach is to preserve the time unit
             # information after reading data back from Parquet files.
@@ -233,9 +492,13 @@ def to_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
+    metadata: Optional[Dict[str, str]] = None,
 ) -> None:
     """
     Save a dataframe as Parquet.
+
+    :param metadata: key-value pairs to store in the file together with the
+        Pandas metadata, see `get_parquet_metadata()`
     """
     hdbg.dassert_isinstance(df, pd.DataFrame)
     hdbg.dassert_isinstance(file_name, str)
@@ -261,6 +524,12 @@ def to_parquet(
         logging.DEBUG, f"# Writing Parquet file '{file_name}'"
     ) as ts:
         table = pa.Table.from_pandas(df)
+        if metadata:
+            schema_metadata = table.schema.metadata or {}
+            for key, value in metadata.items():
+                hdbg.dassert_not_in(key.encode(), schema_metadata)
+                schema_metadata[key.encode()] = value.encode()
+            table = table.replace_schema_metadata(schema_metadata)
         # This is needed to handle:
         # ```
         # pyarrow.lib.ArrowInvalid: Casting from timestamp[ns, tz=America/New_York]
@@ -288,6 +557,158 @@ def to_parquet(
         )
 
 
+def get_parquet_metadata(
+    file_name: str, *, aws_profile: hs3.AwsProfile = None
+) -> Dict[str, str]:
+    """
+    Read the key-value metadata stored with `to_parquet(..., metadata=...)`.
+
+    Only the schema is read, without loading the data.
+
+    :return: metadata of the file, excluding the Pandas metadata
+    """
+    hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
+    if hs3.is_s3_path(file_name):
+        filesystem = hs3.get_s3fs(aws_profile)
+        file_name = file_name.lstrip("s3://")
+    else:
+        filesystem = None
+    schema = pq.read_schema(file_name, filesystem=filesystem)
+    schema_metadata = schema.metadata or {}
+    metadata = {
+        key.decode(): value.decode()
+        for key, value in schema_metadata.items()
+        if key != b"pandas"
+    }
+    return metadata
+
+
+# #############################################################################
+# ParquetTileCache
+# #############################################################################
+
+
+class ParquetTileCache:
+    """
+    Cache on local disk the data read from Parquet datasets.
+
+    Each entry is keyed by the root dir of a dataset and by the filters and the
+    columns of a query, and it is stored as a Parquet file in `cache_dir`.
+    When the total size of the cached files exceeds `max_size_in_gb`, the least
+    recently used entries are evicted.
+
+    The cache assumes that the data already written doesn't change, so it
+    should not be used for datasets that are being updated, e.g., with
+    `data_snapshot="latest"`.
+    """
+
+    def __init__(self, cache_dir: str, max_size_in_gb: float) -> None:
+        """
+        Constructor.
+
+        :param cache_dir: local dir to store the cached files
+        :param max_size_in_gb: max total size of the cached files
+        """
+        hdbg.dassert_isinstance(cache_dir, str)
+        hdbg.dassert(
+            not hs3.is_s3_path(cache_dir),
+            "The cache dir '%s' must be local",
+            cache_dir,
+        )
+        hdbg.dassert_lt(0, max_size_in_gb)
+        self._cache_dir = cache_dir
+        self._max_size_in_bytes = int(max_size_in_gb * 1024**3)
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # Map the keys to the size of the corresponding files, from the least
+        # to the most recently used. The entries from previous runs are sorted
+        # by the modification time of the files, which is updated at each
+        # access.
+        self._entries: collections.OrderedDict[
+            str, int
+        ] = collections.OrderedDict()
+        file_names = glob.glob(os.path.join(self._cache_dir, "*.parquet"))
+        file_names = sorted(file_names, key=os.path.getmtime)
+        for file_name in file_names:
+            key = os.path.basename(file_name)[: -len(".parquet")]
+            self._entries[key] = os.path.getsize(file_name)
+        # Serialize the accesses from multiple threads, e.g., to avoid evicting
+        # a file while another thread is reading it.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(
+        root_dir: str,
+        filters: Optional[List[Any]],
+        columns: Optional[List[str]],
+    ) -> str:
+        """
+        Return the key of the cache entry for a query.
+        """
+        txt = repr((root_dir, filters, columns))
+        key = hashlib.sha256(txt.encode("utf-8")).hexdigest()
+        return key
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Return the total size of the cached files.
+        """
+        with self._lock:
+            size = sum(self._entries.values())
+        return size
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Return the data cached for `key` or `None` if it is not in the cache.
+        """
+        file_name = self._get_file_name(key)
+        with self._lock:
+            if key not in self._entries:
+                _LOG.debug("Cache miss for key='%s'", key)
+                return None
+            _LOG.debug("Cache hit for key='%s'", key)
+            # Mark the entry as the most recently used one.
+            self._entries.move_to_end(key)
+            os.utime(file_name)
+            table = pq.read_table(file_name)
+        # See `from_parquet()` for the time unit conversion.
+        df = table.to_pandas(coerce_temporal_nanoseconds=True)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store `df` in the cache, evicting the least recently used entries if
+        needed.
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        file_name = self._get_file_name(key)
+        # Write to a temporary file and then rename it, so that a partially
+        # written file is never read.
+        tmp_file_name = f"{file_name}.{threading.get_ident()}.tmp"
+        table = pa.Table.from_pandas(df)
+        pq.write_table(table, tmp_file_name)
+        with self._lock:
+            os.replace(tmp_file_name, file_name)
+            self._entries[key] = os.path.getsize(file_name)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _get_file_name(self, key: str) -> str:
+        file_name = os.path.join(self._cache_dir, f"{key}.parquet")
+        return file_name
+
+    def _evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache fits its max
+        size.
+        """
+        total_size = sum(self._entries.values())
+        while total_size > self._max_size_in_bytes:
+            key, size = self._entries.popitem(last=False)
+            _LOG.debug("Evicting key='%s' with size=%s", key, size)
+            os.remove(self._get_file_name(key))
+            total_size -= size
+
+
 # #############################################################################
 
 
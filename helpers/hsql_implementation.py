@@ -4,13 +4,29 @@ Import as:
 import helpers.hsql_implementation as hsqlimpl
 """
 
+import asyncio
 import collections
+import contextlib
+import functools
 import io
 import logging
 import os
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import pandas as pd
 import psycopg2 as psycop
@@ -240,6 +256,208 @@ def db_connection_to_tuple(connection: DbConnection) -> DbConnectionInfo:
     return ret
 
 
+# #############################################################################
+# DbConnectionPool
+# #############################################################################
+
+
+class DbConnectionPool:
+    """
+    Thread-safe pool of DB connections.
+
+    A connection is borrowed for each query and returned to the pool after
+    the query, so that multiple threads (e.g., the threads running the queries
+    of `execute_query_to_df_async()`) can query the DB concurrently without
+    sharing a connection.
+
+    The connections are created lazily, up to `max_num_connections`. When all
+    the connections are borrowed, the callers wait for a connection to be
+    returned.
+
+    The pool records:
+    - the time spent waiting for a connection (`pool_wait_time_in_secs`)
+    - the time a connection is borrowed, i.e., the query time
+      (`query_time_in_secs`)
+    """
+
+    def __init__(
+        self,
+        get_connection_func: Callable[[], DbConnection],
+        max_num_connections: int,
+        *,
+        timeout_in_secs: Optional[float] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        :param get_connection_func: function creating a new connection
+        :param max_num_connections: max number of connections in the pool
+        :param timeout_in_secs: max time to wait for a connection before
+            raising `TimeoutError`
+            - `None` to wait indefinitely
+        """
+        hdbg.dassert_isinstance(get_connection_func, Callable)
+        hdbg.dassert_lte(1, max_num_connections)
+        if timeout_in_secs is not None:
+            hdbg.dassert_lt(0, timeout_in_secs)
+        self._get_connection_func = get_connection_func
+        self.max_num_connections = max_num_connections
+        self._timeout_in_secs = timeout_in_secs
+        # Limit the number of borrowed connections.
+        self._semaphore = threading.BoundedSemaphore(max_num_connections)
+        # Protect the state below.
+        self._lock = threading.Lock()
+        self._idle_connections: List[DbConnection] = []
+        self._num_connections = 0
+        self._metrics: Dict[str, float] = collections.defaultdict(float)
+
+    def __str__(self) -> str:
+        txt = (
+            f"{self.__class__.__name__} at {hex(id(self))}: "
+            f"num_connections={self._num_connections} "
+            f"max_num_connections={self.max_num_connections}"
+        )
+        return txt
+
+    @contextlib.contextmanager
+    def get_connection(self) -> Iterator[DbConnection]:
+        """
+        Borrow a connection from the pool.
+
+        E.g.,
+        ```
+        with pool.get_connection() as connection:
+            df = hsql.execute_query_to_df(connection, query)
+        ```
+        """
+        wait_start_time = time.perf_counter()
+        if not self._semaphore.acquire(timeout=self._timeout_in_secs):
+            raise TimeoutError(
+                f"No DB connection available after {self._timeout_in_secs} "
+                f"secs in {self}"
+            )
+        try:
+            connection = self._pop_connection()
+            query_start_time = time.perf_counter()
+            pool_wait_time_in_secs = query_start_time - wait_start_time
+            is_broken = False
+            try:
+                yield connection
+            except (psycop.OperationalError, psycop.InterfaceError):
+                # The connection can be broken (e.g., the DB restarted), so
+                # replace it with a new one at the next borrow.
+                is_broken = True
+                raise
+            finally:
+                query_time_in_secs = time.perf_counter() - query_start_time
+                self._push_connection(connection, is_broken)
+                self._update_metrics(pool_wait_time_in_secs, query_time_in_secs)
+        finally:
+            self._semaphore.release()
+
+    def get_metrics(self) -> pd.Series:
+        """
+        Get the metrics about the use of the pool.
+
+        :return: series with the number of borrows and the total / max wait
+            and query times, e.g.,
+            ```
+            num_connections                  2.000
+            num_borrows                     10.000
+            pool_wait_time_in_secs.total     0.001
+            pool_wait_time_in_secs.max       0.001
+            query_time_in_secs.total         0.250
+            query_time_in_secs.max           0.050
+            ```
+        """
+        with self._lock:
+            metrics = {"num_connections": self._num_connections}
+            metrics.update(self._metrics)
+        srs = pd.Series(metrics, dtype=float)
+        return srs
+
+    def close(self) -> None:
+        """
+        Close the idle connections.
+        """
+        with self._lock:
+            for connection in self._idle_connections:
+                connection.close()
+            self._num_connections -= len(self._idle_connections)
+            self._idle_connections = []
+
+    def _pop_connection(self) -> DbConnection:
+        """
+        Get an idle connection or create a new one.
+        """
+        with self._lock:
+            while self._idle_connections:
+                connection = self._idle_connections.pop()
+                if not connection.closed:
+                    return connection
+                self._num_connections -= 1
+            # Reserve a slot for the new connection.
+            self._num_connections += 1
+        try:
+            # Create the connection without holding the lock, since it can be
+            # slow.
+            connection = self._get_connection_func()
+        except Exception:
+            with self._lock:
+                self._num_connections -= 1
+            raise
+        _LOG.debug("Created new connection in %s", self)
+        return connection
+
+    def _push_connection(
+        self, connection: DbConnection, is_broken: bool
+    ) -> None:
+        """
+        Return a connection to the pool, discarding it if it's broken.
+        """
+        with self._lock:
+            if is_broken or connection.closed:
+                _LOG.warning("Discarding broken connection in %s", self)
+                self._num_connections -= 1
+                try:
+                    connection.close()
+                except psycop.Error:
+                    pass
+            else:
+                self._idle_connections.append(connection)
+
+    def _update_metrics(
+        self, pool_wait_time_in_secs: float, query_time_in_secs: float
+    ) -> None:
+        with self._lock:
+            self._metrics["num_borrows"] += 1
+            for tag, value in [
+                ("pool_wait_time_in_secs", pool_wait_time_in_secs),
+                ("query_time_in_secs", query_time_in_secs),
+            ]:
+                self._metrics[f"{tag}.total"] += value
+                self._metrics[f"{tag}.max"] = max(
+                    self._metrics[f"{tag}.max"], value
+                )
+
+
+@contextlib.contextmanager
+def borrow_connection(
+    connection: Union[DbConnection, DbConnectionPool]
+) -> Iterator[DbConnection]:
+    """
+    Borrow a connection from a pool or use the passed connection.
+
+    This allows the functions querying the DB to accept both a connection
+    and a pool.
+    """
+    if isinstance(connection, DbConnectionPool):
+        with connection.get_connection() as connection_:
+            yield connection_
+    else:
+        yield connection
+
+
 # #############################################################################
 # State of the whole DB
 # #############################################################################
@@ -382,6 +600,79 @@ def get_table_names(connection: DbConnection) -> List[str]:
     return tables
 
 
+# The metadata of the tables is cached for each connection to avoid querying
+# the DB catalog on every insert. The caches are weak references to the
+# connections, so that they are freed together with the connections.
+# Map a connection to the names of its tables.
+_TABLE_NAMES_CACHE: "weakref.WeakKeyDictionary[DbConnection, Set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Map a connection to the column types of its tables, e.g.,
+# `{"ccxt_ohlcv": {"timestamp": "bigint", "open": "numeric", ...}}`.
+_TABLE_COLUMN_TYPES_CACHE: (
+    "weakref.WeakKeyDictionary[DbConnection, Dict[str, Dict[str, str]]]"
+) = weakref.WeakKeyDictionary()
+# Map a connection to its staging tables and their columns, e.g.,
+# `{"ccxt_ohlcv": ["timestamp", "open", ...]}`.
+_STAGING_TABLES_CACHE: (
+    "weakref.WeakKeyDictionary[DbConnection, Dict[str, List[str]]]"
+) = weakref.WeakKeyDictionary()
+
+
+def dassert_table_exists(connection: DbConnection, table_name: str) -> None:
+    """
+    Assert if a table doesn't exist, using the cached table names.
+
+    The cache is refreshed when the table is not found, e.g., since the table
+    was created after filling the cache.
+    """
+    table_names = _TABLE_NAMES_CACHE.get(connection)
+    if table_names is None or table_name not in table_names:
+        table_names = set(get_table_names(connection))
+        _TABLE_NAMES_CACHE[connection] = table_names
+    hdbg.dassert_in(table_name, table_names)
+
+
+def get_table_column_types(
+    connection: DbConnection, table_name: str
+) -> Dict[str, str]:
+    """
+    Get the types of the columns of a table, caching them.
+
+    :return: column names to SQL types, e.g.,
+        `{"id": "integer", "currency_pair": "character varying(255)"}`
+    """
+    column_types_cache = _TABLE_COLUMN_TYPES_CACHE.setdefault(connection, {})
+    if table_name not in column_types_cache:
+        query = f"""
+            SELECT attname, format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = '{table_name}'::regclass
+            AND attnum > 0
+            AND NOT attisdropped
+            ORDER BY attnum
+        """
+        cursor = connection.cursor()
+        cursor.execute(query)
+        column_types_cache[table_name] = dict(cursor.fetchall())
+    return column_types_cache[table_name]
+
+
+def clear_table_metadata_cache(connection: DbConnection) -> None:
+    """
+    Clear the cached metadata of the tables of a connection.
+
+    This is needed when tables are altered with queries not executed through
+    this module.
+    """
+    for cache in [
+        _TABLE_NAMES_CACHE,
+        _TABLE_COLUMN_TYPES_CACHE,
+        _STAGING_TABLES_CACHE,
+    ]:
+        cache.pop(connection, None)
+
+
 def get_tables_size(
     connection: DbConnection,
     only_public: bool = True,
@@ -458,7 +749,9 @@ def head_tables(
     return txt
 
 
-def get_table_columns(connection: DbConnection, table_name: str) -> List[str]:
+def get_table_columns(
+    connection: Union[DbConnection, DbConnectionPool], table_name: str
+) -> List[str]:
     """
     Get column names for given table.
     """
@@ -466,9 +759,10 @@ def get_table_columns(connection: DbConnection, table_name: str) -> List[str]:
         SELECT column_name
             FROM information_schema.columns
             WHERE TABLE_NAME = '{table_name}'"""
-    cursor = connection.cursor()
-    cursor.execute(query)
-    columns = [x[0] for x in cursor.fetchall()]
+    with borrow_connection(connection) as connection_:
+        cursor = connection_.cursor()
+        cursor.execute(query)
+        columns = [x[0] for x in cursor.fetchall()]
     return columns
 
 
@@ -526,6 +820,8 @@ def remove_table(
     if cascade:
         query = " ".join([query, "CASCADE"])
     connection.cursor().execute(query)
+    # A table with the same name can be created with a different schema.
+    clear_table_metadata_cache(connection)
 
 
 def remove_all_tables(connection: DbConnection, cascade: bool = False) -> None:
@@ -549,7 +845,7 @@ def remove_all_tables(connection: DbConnection, cascade: bool = False) -> None:
 
 # TODO(gp): -> as_df
 def execute_query_to_df(
-    connection: DbConnection,
+    connection: Union[DbConnection, DbConnectionPool],
     query: str,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
@@ -559,6 +855,8 @@ def execute_query_to_df(
 ) -> pd.DataFrame:
     """
     Execute a query.
+
+    :param connection: connection to the DB or pool of connections
     """
     if False:
         # Ask the user before executing a query.
@@ -577,16 +875,17 @@ def execute_query_to_df(
     # Compute.
     if use_timer:
         idx = htimer.dtimer_start(0, "Sql time")
-    cursor = connection.cursor()
-    try:
-        df = pd.read_sql_query(query, connection)
-    except psycop.OperationalError:
-        # Catch error and execute query directly to print error.
+    with borrow_connection(connection) as connection_:
+        cursor = connection_.cursor()
         try:
-            cursor.execute(query)
-        except psycop.Error as e:
-            print(e.pgerror)
-            raise e
+            df = pd.read_sql_query(query, connection_)
+        except psycop.OperationalError:
+            # Catch error and execute query directly to print error.
+            try:
+                cursor.execute(query)
+            except psycop.Error as e:
+                print(e.pgerror)
+                raise e
     if use_timer:
         htimer.dtimer_stop(idx)
     if profile:
@@ -594,6 +893,24 @@ def execute_query_to_df(
     return df
 
 
+async def execute_query_to_df_async(
+    connection: Union[DbConnection, DbConnectionPool],
+    query: str,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Same as `execute_query_to_df()` but run the query in a thread, without
+    blocking the event loop.
+
+    Using a `DbConnectionPool` allows coroutines to run queries concurrently,
+    while the queries on a single connection are serialized by the driver.
+    """
+    loop = asyncio.get_running_loop()
+    func = functools.partial(execute_query_to_df, connection, query, **kwargs)
+    df = await loop.run_in_executor(None, func)
+    return df
+
+
 # #############################################################################
 # Insert
 # #############################################################################
@@ -637,7 +954,7 @@ def copy_rows_with_copy_from(
     :param table_name: name of the table for insertion
     """
     # The target table needs to exist.
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     # Read the data.
     buffer = io.StringIO()
     df.to_csv(buffer, index=False, header=False)
@@ -714,7 +1031,7 @@ def execute_insert_query(
     else:
         df = obj
     hdbg.dassert_isinstance(df, pd.DataFrame)
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
     # Transform dataframe into list of tuples.
     values = [tuple(v) for v in df.to_numpy()]
@@ -749,7 +1066,7 @@ def execute_insert_on_conflict_do_nothing_query(
     else:
         df = obj
     hdbg.dassert_isinstance(df, pd.DataFrame)
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
     # Transform dataframe into list of tuples.
     values = [tuple(v) for v in df.to_numpy()]
@@ -777,7 +1094,145 @@ def execute_insert_on_conflict_do_nothing_query(
         raise e
 
 
-def execute_query(connection: DbConnection, query: str) -> List[tuple]:
+def create_insert_from_table_on_conflict_do_nothing_query(
+    src_table_name: str,
+    dst_table_name: str,
+    columns: List[str],
+    unique_columns: List[str],
+) -> str:
+    """
+    Create an INSERT query copying the rows of a table into another table.
+
+    If a unique constraint is violated for a provided set of columns,
+    duplicates are not inserted.
+
+    :param src_table_name: name of the table to copy the rows from
+    :param dst_table_name: name of the table for insertion
+    :param columns: columns to copy
+    :param unique_columns: set of columns which should be unique record-wise
+        - an empty list means a regular insert
+    :return: sql query, e.g.,
+        ```
+        INSERT INTO ccxt_bid_ask(timestamp,bid_size,exchange_id,currency_pair)
+        SELECT timestamp,bid_size,exchange_id,currency_pair
+        FROM ccxt_bid_ask_staging
+        ON CONFLICT (timestamp,exchange_id,currency_pair) DO NOTHING
+        ```
+    """
+    hdbg.dassert_is_subset(unique_columns, columns)
+    columns_str = ",".join(columns)
+    query = [
+        f"INSERT INTO {dst_table_name}({columns_str})",
+        f"SELECT {columns_str}",
+        f"FROM {src_table_name}",
+    ]
+    if unique_columns:
+        unique_columns_str = ",".join(unique_columns)
+        query.append(f"ON CONFLICT ({unique_columns_str}) DO NOTHING")
+    query = "\n".join(query)
+    _LOG.debug("query=%s", query)
+    return query
+
+
+def _get_staging_table(
+    connection: DbConnection, df: pd.DataFrame, table_name: str
+) -> str:
+    """
+    Get a staging table to copy the columns of `df` before inserting them into
+    `table_name`.
+
+    The staging table is a temporary table, i.e., it is visible only to the
+    connection and it is not written to the WAL. It is created once and then
+    reused, as long as the columns of `df` don't change.
+
+    :return: name of the staging table
+    """
+    staging_table_name = f"{table_name}_staging"
+    columns = list(df.columns)
+    staging_tables = _STAGING_TABLES_CACHE.setdefault(connection, {})
+    if staging_tables.get(table_name) != columns:
+        column_types = get_table_column_types(connection, table_name)
+        hdbg.dassert_is_subset(columns, list(column_types.keys()))
+        column_defs = []
+        for column in columns:
+            column_type = column_types[column]
+            if df[column].dtype.kind == "f" and column_type in (
+                "smallint",
+                "integer",
+                "bigint",
+            ):
+                # Integer values of float columns (e.g., because of NaNs) are
+                # formatted like `1.0`, which can't be copied into an integer
+                # column, but they are cast when inserted into the table.
+                column_type = "double precision"
+            column_defs.append(f"{column} {column_type}")
+        column_defs = ", ".join(column_defs)
+        query = f"""
+            DROP TABLE IF EXISTS {staging_table_name};
+            CREATE TEMPORARY TABLE {staging_table_name} ({column_defs});
+        """
+        connection.cursor().execute(query)
+        staging_tables[table_name] = columns
+    return staging_table_name
+
+
+def execute_copy_insert_on_conflict_do_nothing_query(
+    connection: DbConnection,
+    obj: Union[pd.DataFrame, pd.Series],
+    table_name: str,
+    unique_columns: List[str],
+) -> None:
+    """
+    Same as `execute_insert_on_conflict_do_nothing_query()` but stream the
+    data with `COPY` through a staging table.
+
+    The data is sent to the DB as a single CSV stream into a temporary staging
+    table and then inserted with an `INSERT ... SELECT` query, instead of
+    building a tuple and a SQL literal for each value. This is much faster for
+    large dataframes (e.g., bid/ask data for many levels and assets).
+
+    Note that empty strings are saved as NULL values.
+    """
+    if isinstance(obj, pd.Series):
+        df = obj.to_frame().T
+    else:
+        df = obj
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    dassert_table_exists(connection, table_name)
+    _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
+    staging_table_name = _get_staging_table(connection, df, table_name)
+    # Convert the data to CSV.
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    columns = list(df.columns)
+    copy_query = (
+        f"COPY {staging_table_name}({','.join(columns)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    insert_query = create_insert_from_table_on_conflict_do_nothing_query(
+        staging_table_name, table_name, columns, unique_columns
+    )
+    cur = connection.cursor()
+    try:
+        # Remove the rows left by a previous insert that failed.
+        cur.execute(f"TRUNCATE {staging_table_name}")
+        cur.copy_expert(copy_query, buffer)
+        cur.execute(insert_query)
+        cur.execute(f"TRUNCATE {staging_table_name}")
+        connection.commit()
+    except Exception as e:
+        _LOG.error(
+            "Failed to insert data with the '%s'. Query %s.",
+            str(e),
+            insert_query,
+        )
+        raise e
+
+
+def execute_query(
+    connection: Union[DbConnection, DbConnectionPool], query: str
+) -> List[tuple]:
     """
     Use for generic simple operations.
 
@@ -786,15 +1241,16 @@ def execute_query(connection: DbConnection, query: str) -> List[tuple]:
     :return: list of tuples with the results of the query
     """
     _LOG.debug(hprint.to_str("query"))
-    with connection.cursor() as cursor:
-        cursor.execute(query)
-        if not connection.autocommit:
-            connection.commit()
-        try:
-            result = cursor.fetchall()
-        except psycop.ProgrammingError:
-            result = [()]
-        return result
+    with borrow_connection(connection) as connection_:
+        with connection_.cursor() as cursor:
+            cursor.execute(query)
+            if not connection_.autocommit:
+                connection_.commit()
+            try:
+                result = cursor.fetchall()
+            except psycop.ProgrammingError:
+                result = [()]
+    return result
 
 
 # #############################################################################
@@ -934,3 +1390,81 @@ async def wait_for_change_in_number_of_rows(
     _ = num_iters
     diff_num_rows = cast(int, diff_num_rows)
     return diff_num_rows
+
+
+# #############################################################################
+# Notifications
+# #############################################################################
+
+
+def get_create_insert_notification_trigger_query(
+    table_name: str, channel_name: str
+) -> str:
+    """
+    Get a query creating a trigger that sends a notification on `channel_name`
+    after every insert statement into `table_name`.
+
+    The trigger is executed once per statement, so inserting the data for
+    all the assets with a single statement sends a single notification.
+    """
+    function_name = f"{table_name}_notify_{channel_name}"
+    query = f"""
+    CREATE OR REPLACE FUNCTION {function_name}() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{channel_name}', '{table_name}');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    DROP TRIGGER IF EXISTS {function_name} ON {table_name};
+    CREATE TRIGGER {function_name}
+        AFTER INSERT ON {table_name}
+        FOR EACH STATEMENT EXECUTE PROCEDURE {function_name}();
+    """
+    query = hprint.dedent(query)
+    return query
+
+
+def listen(connection: DbConnection, channel_name: str) -> None:
+    """
+    Subscribe the connection to the notifications sent on `channel_name`.
+    """
+    # Notifications are delivered only outside of a transaction.
+    hdbg.dassert(connection.autocommit, "The connection needs autocommit")
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {channel_name};")
+
+
+async def wait_for_notification(
+    connection: DbConnection, timeout_in_secs: float
+) -> bool:
+    """
+    Wait for a notification on any of the channels the connection listens to.
+
+    :return: whether a notification was received before the timeout
+    """
+    # Check the notifications that were received while executing other
+    # queries.
+    connection.poll()
+    if not connection.notifies:
+        # Wait for the socket of the connection to become readable.
+        loop = asyncio.get_running_loop()
+        is_readable = loop.create_future()
+
+        def _set_readable() -> None:
+            if not is_readable.done():
+                is_readable.set_result(None)
+
+        fileno = connection.fileno()
+        loop.add_reader(fileno, _set_readable)
+        try:
+            await asyncio.wait_for(is_readable, timeout_in_secs)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fileno)
+        connection.poll()
+    is_notified = bool(connection.notifies)
+    # Discard the notifications since the caller only needs to know that new
+    # data is available.
+    connection.notifies.clear()
+    return is_notified
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """
-`timeout` decorator which is used to limit function execution time.
+`timeout` decorator which is used to limit function execution time and
+`BackgroundWriter` to write data in a background thread.
 
 Import as:
 
@@ -8,9 +9,16 @@ import helpers.hthreading as hthread
 """
 
 import _thread
+import atexit
+import logging
+import queue
 import sys
 import threading
-from typing import Any
+from typing import Any, Callable, List, Optional
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
 
 
 def _timeout_handler() -> None:
@@ -41,3 +49,105 @@ def timeout(timeout_sec: int) -> Any:
         return inner
 
     return outer
+
+
+# #############################################################################
+# BackgroundWriter
+# #############################################################################
+
+
+class BackgroundWriter:
+    """
+    Write items (e.g., files or log records) in a background thread.
+
+    The items are put in a bounded queue, so that a slow disk blocks the
+    caller instead of accumulating the items in memory. The thread passes all
+    the items queued so far to `write_func()` at once, so that it can batch the
+    writes (e.g., open a file once for many records).
+
+    The first exception raised by `write_func()` is raised in the thread of the
+    caller at the next `put()` or `flush()`.
+    """
+
+    def __init__(
+        self,
+        write_func: Callable[[List[Any]], None],
+        *,
+        max_queue_size: int = 100,
+        name: str = "background_writer",
+    ) -> None:
+        """
+        Constructor.
+
+        :param write_func: function writing a list of items
+        :param max_queue_size: max number of items waiting to be written
+        :param name: name of the thread, used also in the error messages
+        """
+        hdbg.dassert_lte(1, max_queue_size)
+        self._write_func = write_func
+        self._name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._exception: Optional[Exception] = None
+        self._thread = threading.Thread(
+            target=self._run, name=name, daemon=True
+        )
+        self._thread.start()
+        # Complete the pending writes before the interpreter exits, since the
+        # thread is a daemon.
+        atexit.register(self.flush)
+
+    def put(self, item: Any) -> None:
+        """
+        Queue an item to write.
+        """
+        self._raise_if_failed()
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """
+        Wait until all the queued items are written.
+        """
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """
+        Wait for the queued items and stop the thread.
+        """
+        atexit.unregister(self.flush)
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _raise_if_failed(self) -> None:
+        if self._exception is not None:
+            exception = self._exception
+            self._exception = None
+            raise RuntimeError(f"'{self._name}' failed to write") from exception
+
+    def _run(self) -> None:
+        is_closed = False
+        while not is_closed:
+            # Wait for an item and get all the other queued items.
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if items[-1] is None:
+                    # Nothing is queued after closing.
+                    is_closed = True
+                items_to_write = [item for item in items if item is not None]
+                if items_to_write:
+                    self._write_func(items_to_write)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.exception("'%s' failed to write", self._name)
+                if self._exception is None:
+                    self._exception = e
+            finally:
+                for _ in items:
+                    self._queue.task_done()
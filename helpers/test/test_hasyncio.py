@@ -89,3 +89,100 @@ class Test_hasyncio1(hunitest.TestCase):
             )
             # Run.
             self.run_test(event_loop, get_wall_clock_time)
+
+
+class Test_poll1(hunitest.TestCase):
+    """
+    Poll a value set by another coroutine after 3.5 secs with polling every 1
+    sec.
+    """
+
+    @staticmethod
+    async def workload(
+        get_wall_clock_time: hdateti.GetWallClockTime,
+        use_wait_for_change: bool,
+    ) -> float:
+        """
+        Return how many seconds after the value is set the polling succeeds.
+        """
+        state = {"is_set": False}
+        event = asyncio.Event()
+
+        async def _set_value() -> None:
+            await asyncio.sleep(3.5)
+            state["is_set"] = True
+            event.set()
+
+        def _polling_func() -> hasynci.PollOutput:
+            return state["is_set"], None
+
+        async def _wait_for_change(timeout_in_secs: float) -> bool:
+            try:
+                await asyncio.wait_for(event.wait(), timeout_in_secs)
+            except asyncio.TimeoutError:
+                return False
+            event.clear()
+            return True
+
+        poll_kwargs = hasynci.get_poll_kwargs(get_wall_clock_time)
+        if use_wait_for_change:
+            poll_kwargs["wait_for_change"] = _wait_for_change
+        start_timestamp = get_wall_clock_time()
+        await asyncio.gather(
+            _set_value(), hasynci.poll(_polling_func, **poll_kwargs)
+        )
+        elapsed_time = get_wall_clock_time() - start_timestamp
+        delay_in_secs = elapsed_time.total_seconds() - 3.5
+        return delay_in_secs
+
+    def run_test(self, use_wait_for_change: bool) -> float:
+        with hasynci.solipsism_context() as event_loop:
+            get_wall_clock_time = lambda: hdateti.get_current_time(
+                tz="ET", event_loop=event_loop
+            )
+            coroutine = self.workload(get_wall_clock_time, use_wait_for_change)
+            delay_in_secs = hasynci.run(coroutine, event_loop=event_loop)
+        return delay_in_secs
+
+    def test_sleep1(self) -> None:
+        """
+        Check that polling succeeds at the next polling interval.
+        """
+        delay_in_secs = self.run_test(use_wait_for_change=False)
+        self.assertAlmostEqual(delay_in_secs, 0.5, places=3)
+
+    def test_wait_for_change1(self) -> None:
+        """
+        Check that polling succeeds as soon as the value is set.
+        """
+        delay_in_secs = self.run_test(use_wait_for_change=True)
+        self.assertAlmostEqual(delay_in_secs, 0.0, places=3)
+
+    def test_wait_for_change2(self) -> None:
+        """
+        Check that waking up because of a change counts towards the timeout.
+        """
+
+        def _polling_func() -> hasynci.PollOutput:
+            return False, None
+
+        async def _wait_for_change(timeout_in_secs: float) -> bool:
+            # Report a change that doesn't make the polling succeed.
+            _ = timeout_in_secs
+            await asyncio.sleep(0.1)
+            return True
+
+        with hasynci.solipsism_context() as event_loop:
+            get_wall_clock_time = lambda: hdateti.get_current_time(
+                tz="ET", event_loop=event_loop
+            )
+            poll_kwargs = hasynci.get_poll_kwargs(
+                get_wall_clock_time, timeout_in_secs=2.0
+            )
+            poll_kwargs["wait_for_change"] = _wait_for_change
+            start_timestamp = get_wall_clock_time()
+            coroutine = hasynci.poll(_polling_func, **poll_kwargs)
+            with self.assertRaises(TimeoutError):
+                hasynci.run(coroutine, event_loop=event_loop)
+            elapsed_time = get_wall_clock_time() - start_timestamp
+        self.assertAlmostEqual(elapsed_time.total_seconds(), 2.0, places=3)
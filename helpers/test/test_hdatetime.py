@@ -649,6 +649,54 @@ class Test_convert_timestamp_to_unix_epoch(hunitest.TestCase):
         self.assert_equal(str(actual), str(expected))
 
 
+# #############################################################################
+# Test_convert_timestamps_to_unix_epoch
+# #############################################################################
+
+
+class Test_convert_timestamps_to_unix_epoch(hunitest.TestCase):
+    def helper(self, timestamps: pd.Series, unit: str) -> None:
+        actual = hdateti.convert_timestamps_to_unix_epoch(timestamps, unit=unit)
+        expected = timestamps.apply(
+            lambda x: hdateti.convert_timestamp_to_unix_epoch(x, unit=unit)
+        )
+        hunitest.compare_df(actual.to_frame(), expected.to_frame())
+
+    def test1(self) -> None:
+        """
+        Test tz-naive timestamps.
+        """
+        timestamps = pd.Series(
+            pd.date_range("2021-09-09", periods=5, freq="1min")
+        )
+        self.helper(timestamps, "ms")
+
+    def test2(self) -> None:
+        """
+        Test tz-aware timestamps with specified unit.
+        """
+        timestamps = pd.Series(
+            pd.date_range(
+                "2021-09-08T17:00:00", periods=5, freq="1s", tz="US/Pacific"
+            )
+        )
+        self.helper(timestamps, "s")
+
+    def test3(self) -> None:
+        """
+        Test a `DatetimeIndex`.
+        """
+        timestamps = pd.date_range(
+            "2021-09-09", periods=3, freq="1min", tz="UTC", name="timestamp"
+        )
+        actual = hdateti.convert_timestamps_to_unix_epoch(timestamps)
+        self.assert_equal(
+            str(actual.to_list()),
+            "[1631145600000, 1631145660000, 1631145720000]",
+        )
+        self.assertTrue(actual.index.equals(timestamps))
+
+
 class Test_str_to_timestamp1(hunitest.TestCase):
     """
     Test if string representation of datetime is converted correctly.
@@ -6,6 +6,7 @@ from typing import Any, List, Optional, Tuple
 
 import pandas as pd
 import pyarrow
+import pyarrow.dataset as ds
 import pyarrow.parquet as parquet
 import pytest
 
@@ -1333,3 +1334,149 @@ class TestBuildFilterWithOnlyEqualities(hunitest.TestCase):
         actual = str(filters)
         expected = r"[]"
         self.assert_equal(actual, expected)
+
+
+# #############################################################################
+
+
+class TestParquetTileCache1(hunitest.TestCase):
+    def test_get_put1(self) -> None:
+        """
+        Check that the data is the same after a round trip through the cache.
+        """
+        cache_dir = self.get_scratch_space()
+        max_size_in_gb = 1.0
+        tile_cache = hparque.ParquetTileCache(cache_dir, max_size_in_gb)
+        key = tile_cache.get_key("dummy_dir", [("year", "=", 2020)], None)
+        self.assertIsNone(tile_cache.get(key))
+        df = _get_df(datetime.date(2020, 1, 1))
+        tile_cache.put(key, df)
+        actual = tile_cache.get(key)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(df, num_rows=None),
+        )
+        # Check that a cache on the same dir finds the entry.
+        tile_cache = hparque.ParquetTileCache(cache_dir, max_size_in_gb)
+        self.assertIsNotNone(tile_cache.get(key))
+
+    def test_evict1(self) -> None:
+        """
+        Check that the least recently used entry is evicted.
+        """
+        cache_dir = self.get_scratch_space()
+        df = _get_df(datetime.date(2020, 1, 1))
+        # Build a cache that fits 2 entries.
+        tile_cache = hparque.ParquetTileCache(cache_dir, 1.0)
+        key1 = tile_cache.get_key("dummy_dir", [("year", "=", 2020)], None)
+        tile_cache.put(key1, df)
+        max_size_in_gb = 2.5 * tile_cache.get_size_in_bytes() / 1024**3
+        tile_cache = hparque.ParquetTileCache(cache_dir, max_size_in_gb)
+        key2 = tile_cache.get_key("dummy_dir", [("year", "=", 2021)], None)
+        tile_cache.put(key2, df)
+        # Access the first entry, so that the second one is the least recently
+        # used.
+        self.assertIsNotNone(tile_cache.get(key1))
+        key3 = tile_cache.get_key("dummy_dir", [("year", "=", 2022)], None)
+        tile_cache.put(key3, df)
+        # Check.
+        self.assertIsNotNone(tile_cache.get(key1))
+        self.assertIsNone(tile_cache.get(key2))
+        self.assertIsNotNone(tile_cache.get(key3))
+
+
+# #############################################################################
+
+
+class TestFromParquetWithTimestamps1(hunitest.TestCase):
+    """
+    Check that the timestamp bounds are pushed down to the row groups.
+    """
+
+    def get_data(self, tz: Optional[str]) -> Tuple[pd.DataFrame, str]:
+        """
+        Write 2 months of 1-minute data partitioned by year and month with a
+        row group per day.
+
+        :return: the written data and the dir storing it
+        """
+        index = pd.date_range(
+            "2022-01-01", "2022-02-28 23:59", freq="1min", tz=tz
+        )
+        df = pd.DataFrame({"close": range(len(index))}, index=index)
+        df.index.name = "timestamp"
+        dir_name = os.path.join(self.get_scratch_space(), "data.parquet")
+        for (year, month), df_tmp in df.groupby(
+            [df.index.year, df.index.month]
+        ):
+            tile_dir = os.path.join(dir_name, f"year={year}", f"month={month}")
+            os.makedirs(tile_dir)
+            parquet.write_table(
+                pyarrow.Table.from_pandas(df_tmp),
+                os.path.join(tile_dir, "data.parquet"),
+                row_group_size=24 * 60,
+            )
+        return df, dir_name
+
+    def test_read1(self) -> None:
+        """
+        Check that the data in the interval is read.
+        """
+        df, dir_name = self.get_data("UTC")
+        start_timestamp = pd.Timestamp("2022-01-05 10:00:00+00:00")
+        end_timestamp = pd.Timestamp("2022-01-06 12:00:00+00:00")
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            "by_year_month", start_timestamp, end_timestamp
+        )
+        actual = hparque.from_parquet(
+            dir_name,
+            columns=["close"],
+            filters=filters,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            report_scan_stats=True,
+        )
+        expected = df.loc[start_timestamp:end_timestamp]
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_read2(self) -> None:
+        """
+        Check that tz-aware bounds are applied to tz-naive data.
+        """
+        df, dir_name = self.get_data(None)
+        start_timestamp = pd.Timestamp("2022-02-27 23:58:00-05:00")
+        actual = hparque.from_parquet(
+            dir_name, start_timestamp=start_timestamp
+        )
+        self.assertEqual(actual.index[0], pd.Timestamp("2022-02-28 04:58:00"))
+        self.assertEqual(actual.shape[0], 19 * 60 + 2)
+
+    def test_plan_scan1(self) -> None:
+        """
+        Check that only the row groups in the interval are scanned.
+        """
+        _, dir_name = self.get_data("UTC")
+        dataset = ds.dataset(
+            dir_name,
+            format="parquet",
+            partitioning=ds.partitioning(flavor="hive"),
+        )
+        filter_expression = hparque._get_timestamp_filter_expression(
+            dataset.schema,
+            pd.Timestamp("2022-01-05 10:00:00+00:00"),
+            pd.Timestamp("2022-01-06 12:00:00+00:00"),
+            None,
+        )
+        _, stats = hparque._plan_parquet_scan(dataset, filter_expression)
+        actual = {key: val for key, val in stats.items() if "bytes" not in key}
+        expected = {
+            "num_files": 2,
+            "num_scanned_files": 1,
+            "num_row_groups": 59,
+            "num_scanned_row_groups": 2,
+        }
+        self.assertDictEqual(actual, expected)
+        self.assertLess(stats["num_scanned_bytes"], stats["num_bytes"] / 10)
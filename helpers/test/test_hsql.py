@@ -1,3 +1,7 @@
+import concurrent.futures
+import time
+from typing import Any, List
+
 import helpers.hsql as hsql
 import helpers.hunit_test as hunitest
 
@@ -22,3 +26,156 @@ class TestCreateInOperator(hunitest.TestCase):
         actual = hsql.create_in_operator(values, column)
         expected = "exchange_id IN ('ftx')"
         self.assertEqual(actual, expected)
+
+
+class TestCreateInsertFromTableOnConflictDoNothingQuery(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test creating a query skipping the duplicates.
+        """
+        actual = hsql.create_insert_from_table_on_conflict_do_nothing_query(
+            "bars_staging",
+            "bars",
+            ["timestamp", "currency_pair", "close"],
+            ["timestamp", "currency_pair"],
+        )
+        expected = r"""
+        INSERT INTO bars(timestamp,currency_pair,close)
+        SELECT timestamp,currency_pair,close
+        FROM bars_staging
+        ON CONFLICT (timestamp,currency_pair) DO NOTHING
+        """
+        self.assert_equal(actual, expected, dedent=True)
+
+    def test2(self) -> None:
+        """
+        Test creating a query without unique columns.
+        """
+        actual = hsql.create_insert_from_table_on_conflict_do_nothing_query(
+            "bars_staging", "bars", ["timestamp", "close"], []
+        )
+        expected = r"""
+        INSERT INTO bars(timestamp,close)
+        SELECT timestamp,close
+        FROM bars_staging
+        """
+        self.assert_equal(actual, expected, dedent=True)
+
+
+class TestGetCreateInsertNotificationTriggerQuery(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test creating a trigger notifying the inserts into a table.
+        """
+        actual = hsql.get_create_insert_notification_trigger_query(
+            "bars", "new_bars"
+        )
+        expected = r"""
+        CREATE OR REPLACE FUNCTION bars_notify_new_bars() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('new_bars', 'bars');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        DROP TRIGGER IF EXISTS bars_notify_new_bars ON bars;
+        CREATE TRIGGER bars_notify_new_bars
+            AFTER INSERT ON bars
+            FOR EACH STATEMENT EXECUTE PROCEDURE bars_notify_new_bars();
+        """
+        self.assert_equal(actual, expected, dedent=True)
+
+
+# #############################################################################
+# TestDbConnectionPool
+# #############################################################################
+
+
+class _FakeConnection:
+    """
+    Fake DB connection tracking whether it is closed.
+    """
+
+    def __init__(self, id_: int) -> None:
+        self.id_ = id_
+        self.closed = 0
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class TestDbConnectionPool(hunitest.TestCase):
+    def get_pool(self, **kwargs: Any) -> hsql.DbConnectionPool:
+        self._connections: List[_FakeConnection] = []
+
+        def _get_connection() -> _FakeConnection:
+            connection = _FakeConnection(len(self._connections))
+            self._connections.append(connection)
+            return connection
+
+        pool = hsql.DbConnectionPool(_get_connection, 2, **kwargs)
+        return pool
+
+    def test_reuse1(self) -> None:
+        """
+        Check that a returned connection is reused.
+        """
+        pool = self.get_pool()
+        with pool.get_connection() as connection1:
+            pass
+        with pool.get_connection() as connection2:
+            pass
+        self.assertIs(connection1, connection2)
+        self.assertEqual(len(self._connections), 1)
+        metrics = pool.get_metrics()
+        self.assertEqual(metrics["num_connections"], 1)
+        self.assertEqual(metrics["num_borrows"], 2)
+
+    def test_max_num_connections1(self) -> None:
+        """
+        Check that borrowing more than the max number of connections waits
+        until the timeout.
+        """
+        pool = self.get_pool(timeout_in_secs=0.1)
+        with pool.get_connection() as connection1:
+            with pool.get_connection() as connection2:
+                self.assertIsNot(connection1, connection2)
+                with self.assertRaises(TimeoutError):
+                    with pool.get_connection():
+                        pass
+        metrics = pool.get_metrics()
+        self.assertEqual(metrics["num_connections"], 2)
+        self.assertEqual(metrics["num_borrows"], 2)
+
+    def test_concurrent_borrows1(self) -> None:
+        """
+        Check that threads borrowing connections concurrently don't create
+        more than the max number of connections.
+        """
+        pool = self.get_pool()
+
+        def _borrow() -> None:
+            with pool.get_connection():
+                time.sleep(0.01)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(_borrow) for _ in range(16)]
+        for future in futures:
+            future.result()
+        metrics = pool.get_metrics()
+        self.assertLessEqual(len(self._connections), 2)
+        self.assertEqual(metrics["num_borrows"], 16)
+        # Some threads waited for a connection to be returned.
+        self.assertLess(0, metrics["pool_wait_time_in_secs.max"])
+        self.assertLessEqual(0.01, metrics["query_time_in_secs.max"])
+
+    def test_broken_connection1(self) -> None:
+        """
+        Check that a closed connection is replaced by a new one.
+        """
+        pool = self.get_pool()
+        with pool.get_connection() as connection1:
+            connection1.close()
+        with pool.get_connection() as connection2:
+            pass
+        self.assertIsNot(connection1, connection2)
+        self.assertEqual(pool.get_metrics()["num_connections"], 1)
@@ -0,0 +1,49 @@
+import threading
+from typing import Any, List
+
+import helpers.hthreading as hthread
+import helpers.hunit_test as hunitest
+
+
+class Test_BackgroundWriter1(hunitest.TestCase):
+    def test_write1(self) -> None:
+        """
+        Check that the items are written in order in the background thread.
+        """
+        batches: List[List[Any]] = []
+        thread_names: List[str] = []
+
+        def write_func(items: List[Any]) -> None:
+            batches.append(items)
+            thread_names.append(threading.current_thread().name)
+
+        writer = hthread.BackgroundWriter(write_func, name="test_writer")
+        for item in range(10):
+            writer.put(item)
+        writer.flush()
+        writer.close()
+        # Check.
+        actual = [item for batch in batches for item in batch]
+        self.assertEqual(actual, list(range(10)))
+        self.assertEqual(set(thread_names), {"test_writer"})
+
+    def test_write2(self) -> None:
+        """
+        Check that an error in the background thread is raised by `flush()`
+        and that the following writes are done.
+        """
+        written: List[Any] = []
+
+        def write_func(items: List[Any]) -> None:
+            if "error" in items:
+                raise ValueError("Write failed")
+            written.extend(items)
+
+        writer = hthread.BackgroundWriter(write_func)
+        writer.put("error")
+        with self.assertRaises(RuntimeError) as cm:
+            writer.flush()
+        self.assertIsInstance(cm.exception.__cause__, ValueError)
+        writer.put("item")
+        writer.close()
+        self.assertEqual(written, ["item"])
@@ -1,12 +1,17 @@
+import asyncio
 import logging
 import pprint
+from typing import List
 
+import numpy as np
 import pandas as pd
 import psycopg2.errors as perrors
 import pytest
 
+import helpers.hasyncio as hasynci
 import helpers.hpandas as hpandas
 import helpers.hsql as hsql
+import helpers.htimer as htimer
 
 # TODO(gp): This is a problematic dependency, since helpers should not depende
 #  from im_v2. For tests we could be more forgiving, but it would be better to
@@ -119,6 +124,128 @@ class TestSql1(imvcddbut.TestImDbHelper):
         # Delete the table.
         hsql.remove_table(self.connection, "test_table")
 
+    @pytest.mark.slow("16 seconds.")
+    def test_execute_copy_insert_on_conflict_do_nothing_query1(self) -> None:
+        """
+        Verify that inserting through a staging table with `COPY` gives the
+        same data as inserting the values.
+        """
+        test_data = self._get_test_data()
+        # Insert the values.
+        self._create_test_table()
+        hsql.execute_insert_on_conflict_do_nothing_query(
+            self.connection, test_data, "test_table", ["id"]
+        )
+        query = "SELECT * FROM test_table ORDER BY id"
+        expected = hsql.execute_query_to_df(self.connection, query)
+        hsql.remove_table(self.connection, "test_table")
+        # Insert the data twice with `COPY`, since the duplicates should be
+        # skipped.
+        self._create_test_table()
+        for _ in range(2):
+            hsql.execute_copy_insert_on_conflict_do_nothing_query(
+                self.connection, test_data, "test_table", ["id"]
+            )
+        actual = hsql.execute_query_to_df(self.connection, query)
+        self.assert_equal(
+            hpandas.convert_df_to_json_string(actual, n_tail=None),
+            hpandas.convert_df_to_json_string(expected, n_tail=None),
+        )
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("10 seconds.")
+    def test_execute_query_to_df_async1(self) -> None:
+        """
+        Verify that concurrent queries on a pool of connections return the
+        same data as a query on a connection.
+        """
+        self._create_test_table()
+        test_data = self._get_test_data()
+        hsql.execute_insert_query(self.connection, test_data, "test_table")
+        query = "SELECT * FROM test_table ORDER BY id"
+        expected = hsql.execute_query_to_df(self.connection, query)
+        # Run the queries on a pool.
+        connection_info = hsql.db_connection_to_tuple(self.connection)
+        pool = hsql.DbConnectionPool(
+            lambda: hsql.get_connection(*connection_info), 2
+        )
+
+        async def _run_queries() -> List[pd.DataFrame]:
+            coroutines = [
+                hsql.execute_query_to_df_async(pool, query) for _ in range(4)
+            ]
+            dfs = await asyncio.gather(*coroutines)
+            return dfs
+
+        dfs = hasynci.run(_run_queries(), event_loop=None)
+        for df in dfs:
+            self.assert_equal(
+                hpandas.convert_df_to_json_string(df, n_tail=None),
+                hpandas.convert_df_to_json_string(expected, n_tail=None),
+            )
+        self.assertEqual(pool.get_metrics()["num_borrows"], 4)
+        pool.close()
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.superslow("~60 seconds.")
+    def test_insert_throughput1(self) -> None:
+        """
+        Report the rows per second inserted with values and with `COPY`.
+        """
+        query = """CREATE TABLE IF NOT EXISTS test_bid_ask(
+                    id SERIAL PRIMARY KEY,
+                    timestamp BIGINT NOT NULL,
+                    bid_size NUMERIC,
+                    bid_price NUMERIC,
+                    ask_size NUMERIC,
+                    ask_price NUMERIC,
+                    currency_pair VARCHAR(255) NOT NULL,
+                    level INTEGER NOT NULL,
+                    UNIQUE(timestamp, currency_pair, level)
+                    )
+                    """
+        self.connection.cursor().execute(query)
+        # Build 10 levels of bid/ask data for 100 assets.
+        num_rows = 100000
+        rng = np.random.default_rng(seed=0)
+        data = pd.DataFrame(
+            {
+                "timestamp": 1709148600000 + np.arange(num_rows) // 1000,
+                "bid_size": rng.random(num_rows),
+                "bid_price": rng.random(num_rows),
+                "ask_size": rng.random(num_rows),
+                "ask_price": rng.random(num_rows),
+                "currency_pair": [f"ASSET{i}_USDT" for i in range(100)]
+                * (num_rows // 100),
+                "level": np.arange(num_rows) // 100 % 10 + 1,
+            }
+        )
+        funcs = [
+            hsql.execute_insert_on_conflict_do_nothing_query,
+            hsql.execute_copy_insert_on_conflict_do_nothing_query,
+        ]
+        for func in funcs:
+            hsql.execute_query(self.connection, "TRUNCATE test_bid_ask")
+            with htimer.TimedScope(logging.INFO, func.__name__) as ts:
+                func(
+                    self.connection,
+                    data,
+                    "test_bid_ask",
+                    ["timestamp", "currency_pair", "level"],
+                )
+            _LOG.info(
+                "%s: %.0f rows/sec",
+                func.__name__,
+                num_rows / ts.elapsed_time,
+            )
+            self.assertEqual(
+                hsql.get_num_rows(self.connection, "test_bid_ask"), num_rows
+            )
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_bid_ask")
+
     @pytest.mark.slow("9 seconds.")
     def test_duplicate_removal1(self) -> None:
         """
@@ -7,13 +7,14 @@ import im_v2.ccxt.data.client.ccxt_clients as imvcdccccl
 import abc
 import logging
 import os
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 import pandas as pd
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
+import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hs3 as hs3
 import helpers.hsql as hsql
@@ -210,7 +211,7 @@ class CcxtSqlRealTimeImClient(CcxtImClient, icdc.SqlRealTimeImClient):
     def __init__(
         self,
         universe_version: str,
-        db_connection: hsql.DbConnection,
+        db_connection: Union[hsql.DbConnection, hsql.DbConnectionPool],
         table_name: str,
         *,
         resample_1min: bool = False,
@@ -427,6 +428,8 @@ class CcxtHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        num_threads: int = 4,
+        tile_cache: Optional[hparque.ParquetTileCache] = None,
     ) -> None:
         """
         Constructor.
@@ -447,4 +450,6 @@ class CcxtHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            num_threads=num_threads,
+            tile_cache=tile_cache,
         )
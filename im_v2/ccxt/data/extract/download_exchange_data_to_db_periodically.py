@@ -57,6 +57,14 @@ def _parse() -> argparse.ArgumentParser:
         "on_buffer_full: Save data to the database when the buffer is full. \n"
         "on_sufficient_time: Save data to the database based on a predefined time interval.",
     )
+    parser.add_argument(
+        "--db_resampled_table",
+        action="store",
+        required=False,
+        type=str,
+        help="DB table to save the bid/ask data resampled to 1 minute to, "
+        "while downloading the raw data (applies when data_type=bid_ask)",
+    )
     parser.add_argument(
         "--watch_multiple_symbols",
         action="store_true",
@@ -83,6 +91,9 @@ def _main(parser: argparse.ArgumentParser) -> None:
         imvcdeexut.WEBSOCKET_CONFIG[args.data_type][
             "max_buffer_size"
         ] = args.websocket_data_buffer_size
+    if args.db_resampled_table is not None:
+        hdbg.dassert_eq(args.method, "websocket")
+        hdbg.dassert_eq(args.data_type, "bid_ask")
     # Check that arguments correspond to the table name,
     # e.g. `ohlcv` and `futures` in `ccxt_ohlcv_futures`.
     hdbg.dassert_in(args.data_type, args.db_table)
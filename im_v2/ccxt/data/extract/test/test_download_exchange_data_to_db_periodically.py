@@ -193,6 +193,7 @@ class TestDownloadRealtimeForOneExchangePeriodically1(
             "log_level": "INFO",
             "websocket_data_buffer_size": None,
             "db_saving_mode": "on_buffer_full",
+            "db_resampled_table": None,
             "bid_ask_depth": 10,
         }
         namespace = argparse.Namespace(**kwargs)
@@ -467,6 +468,7 @@ class TestDownloadRealtimeForOneExchangePeriodically2(hunitest.TestCase):
             "log_level": "INFO",
             "websocket_data_buffer_size": expected_buffer_size,
             "db_saving_mode": "on_buffer_full",
+            "db_resampled_table": None,
         }
         # Run.
         namespace = argparse.Namespace(**kwargs)
@@ -578,6 +580,7 @@ class TestDownloadRealtimeForOneExchangePeriodically3(
             "log_level": "INFO",
             "websocket_data_buffer_size": 0,
             "db_saving_mode": "on_buffer_full",
+            "db_resampled_table": None,
         }
         # Create argparser.
         namespace = argparse.Namespace(**kwargs)
@@ -8,6 +8,7 @@ import abc
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 import core.finance.bid_ask as cfibiask
@@ -250,42 +251,32 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         )
         # Rename index.
         df.index.name = self._timestamp_col_name
-        # Normalize data for each symbol.
-        _LOG.debug("full_symbols=%s", df[full_symbol_col_name].unique())
-        dfs = []
-        for full_symbol, df_tmp in df.groupby(full_symbol_col_name):
-            _LOG.debug("apply_im_normalization: full_symbol=%s", full_symbol)
-            df_tmp = self._apply_im_normalizations(
-                df_tmp,
-                full_symbol_col_name,
-                self._resample_1min,
-                start_ts,
-                end_ts,
-            )
-            if not df_tmp.empty:
-                # Validate data that remained after normalization and append it
-                # to the result.
-                # TODO(gp): Difference between amp and cmamp.
-                self._dassert_output_data_is_valid(
-                    df_tmp,
-                    full_symbol_col_name,
-                    self._resample_1min,
-                    start_ts,
-                    end_ts,
-                    self._timestamp_col_name,
-                )
-                dfs.append(df_tmp)
-            else:
-                _LOG.debug("Df for full_symbol=%s is empty", full_symbol)
         hdbg.dassert_lt(0, df.shape[0], "Empty df=\n%s", df)
-        df = pd.concat(dfs, axis=0)
+        # Normalize the data of all the symbols at once.
+        df = self._apply_im_normalizations(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+        )
         _LOG.debug("After im_normalization: df=\n%s", hpandas.df_to_str(df))
+        # Validate data that remained after normalization.
+        # TODO(gp): Difference between amp and cmamp.
+        self._dassert_output_data_is_valid(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+            self._timestamp_col_name,
+        )
         # Sort by index and `full_symbol_col_name`.
-        # There is not a simple way to sort by index and columns in Pandas,
-        # so we convert the index into a column, sort, and convert back.
-        df = df.reset_index()
-        df = df.sort_values(by=[self._timestamp_col_name, full_symbol_col_name])
-        df = df.set_index(self._timestamp_col_name, drop=True)
+        # Sorting the positions and taking the rows once avoids the copies of
+        # `reset_index()`, `sort_values()`, and `set_index()`.
+        full_symbol_codes, _ = pd.factorize(df[full_symbol_col_name], sort=True)
+        idxs = np.lexsort((full_symbol_codes, df.index.asi8))
+        df = df.take(idxs)
         # The full_symbol should be a string.
         hdbg.dassert_isinstance(df[full_symbol_col_name].values[0], str)
         _LOG.debug("After sorting: df=\n%s", hpandas.df_to_str(df))
@@ -352,6 +343,9 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
     ) -> pd.DataFrame:
         """
         Apply normalizations to IM data.
+
+        The data of all the symbols is normalized at once, without splitting it
+        by symbol.
         """
         _LOG.debug(hprint.to_str("full_symbol_col_name start_ts end_ts"))
         # 1) Drop duplicated timestamps.
@@ -363,14 +357,16 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             duplicate_columns = [full_symbol_col_name]
             # Sort values by "knowledge_timestamp" to keep the latest ones while
             # removing duplicates.
-            df = df.sort_values("knowledge_timestamp", ascending=True)
+            df = df.sort_values(
+                "knowledge_timestamp", ascending=True, kind="stable"
+            )
             use_index = True
             df = hpandas.drop_duplicates(
                 df,
                 use_index,
                 column_subset=duplicate_columns,
                 keep="last",
-            ).sort_index()
+            )
         # 2) Trim the data keeping only the data with index in [start_ts, end_ts].
         # Trimming of the data is done because:
         # - some data sources can be only queried at day resolution, so we get
@@ -384,16 +380,74 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             df, ts_col_name, start_ts, end_ts, left_close, right_close
         )
         # 3) Resample index to 1 min frequency if specified.
-        if resample_1min:
-            df = hpandas.resample_df(df, "T")
-            # Fill NaN values appeared after resampling in full symbol column.
-            # Combination of full symbol and timestamp is a unique identifier,
-            # so full symbol cannot be NaN.
-            df[full_symbol_col_name] = df[full_symbol_col_name].bfill()
+        if resample_1min and not df.empty:
+            df = ImClient._resample_to_1min(df, full_symbol_col_name)
         # 4) Convert to UTC.
         df.index = df.index.tz_convert("UTC")
         return df
 
+    @staticmethod
+    def _resample_to_1min(
+        df: pd.DataFrame, full_symbol_col_name: str
+    ) -> pd.DataFrame:
+        """
+        Resample the data of each symbol on a 1 minute grid.
+
+        Like `hpandas.resample_df()` applied to the data of each symbol, the grid
+        of a symbol goes from its first to its last timestamp, the rows that are
+        not on the grid are dropped, and the missing rows are filled with NaNs.
+
+        :return: data sorted by full symbol and timestamp
+        """
+        full_symbol_codes, full_symbols = pd.factorize(
+            df[full_symbol_col_name], sort=True
+        )
+        index = df.index
+        ts = index.asi8
+        # Sort by symbol and timestamp.
+        idxs = np.lexsort((ts, full_symbol_codes))
+        df = df.take(idxs)
+        full_symbol_codes = full_symbol_codes[idxs]
+        ts = ts[idxs]
+        is_duplicated = (np.diff(full_symbol_codes) == 0) & (np.diff(ts) == 0)
+        hdbg.dassert(
+            not is_duplicated.any(),
+            "Index must have only unique values for each symbol",
+        )
+        # Compute the grid of each symbol.
+        num_symbols = len(full_symbols)
+        is_first = np.r_[True, np.diff(full_symbol_codes) != 0]
+        is_last = np.r_[is_first[1:], True]
+        min_ts = ts[is_first]
+        max_ts = ts[is_last]
+        step = pd.Timedelta(minutes=1).as_unit(index.unit).value
+        grid_lengths = (max_ts - min_ts) // step + 1
+        grid_offsets = np.r_[0, np.cumsum(grid_lengths)[:-1]]
+        grid_length = int(grid_lengths.sum())
+        grid_full_symbol_codes = np.repeat(np.arange(num_symbols), grid_lengths)
+        grid_ts = np.repeat(min_ts, grid_lengths) + step * (
+            np.arange(grid_length) - np.repeat(grid_offsets, grid_lengths)
+        )
+        # Place the rows on the grid, dropping the ones that are not on it.
+        rel_ts = ts - min_ts[full_symbol_codes]
+        is_on_grid = rel_ts % step == 0
+        grid_idxs = grid_offsets[full_symbol_codes] + rel_ts // step
+        df = df[is_on_grid]
+        df.index = grid_idxs[is_on_grid]
+        df = df.reindex(np.arange(grid_length))
+        # Fill the full symbols of the rows added by resampling.
+        # Combination of full symbol and timestamp is a unique identifier,
+        # so full symbol cannot be NaN.
+        df[full_symbol_col_name] = full_symbols.take(grid_full_symbol_codes)
+        grid_index = pd.to_datetime(grid_ts, unit=index.unit, utc=True)
+        if index.tz is None:
+            grid_index = grid_index.tz_localize(None)
+        else:
+            grid_index = grid_index.tz_convert(index.tz)
+        grid_index.name = index.name
+        df.index = grid_index
+        return df
+
     @staticmethod
     def _dassert_output_data_is_valid(
         df: pd.DataFrame,
@@ -404,18 +458,30 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         timestamp_col_name: str,
     ) -> None:
         """
-        Verify that the normalized data is valid.
+        Verify that the normalized data of all the symbols is valid.
         """
         # TODO(Grisha): consider using `hpandas.dassert_time_indexed_df()`.
         # Check that data is not empty.
         hdbg.dassert_lt(0, df.shape[0])
         # Check that index is `pd.DatetimeIndex`.
         hpandas.dassert_index_is_datetime(df)
+        # Check that full symbol column has no NaNs.
+        hdbg.dassert(df[full_symbol_col_name].notna().all())
         if resample_1min:
-            # Check that index is monotonic increasing.
-            hpandas.dassert_strictly_increasing_index(df)
-            # Verify that index frequency is 1 minute.
-            hdbg.dassert_eq(df.index.freq, "T")
+            # Check that the index of each symbol is strictly increasing with
+            # 1 minute frequency.
+            full_symbol_codes, _ = pd.factorize(df[full_symbol_col_name])
+            ts = df.index.asi8
+            # Sort by symbol, keeping the order of the timestamps.
+            idxs = np.argsort(full_symbol_codes, kind="stable")
+            full_symbol_codes = full_symbol_codes[idxs]
+            ts = ts[idxs]
+            is_same_symbol = np.diff(full_symbol_codes) == 0
+            step = pd.Timedelta(minutes=1).as_unit(df.index.unit).value
+            hdbg.dassert(
+                (np.diff(ts)[is_same_symbol] == step).all(),
+                "The index of each symbol must have 1 minute frequency",
+            )
         # Check that timezone info is correct.
         expected_tz = ["UTC"]
         # Assume that the first value of an index is representative.
@@ -423,12 +489,10 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             df.index[0],
             expected_tz,
         )
-        # Check that full symbol column has no NaNs.
-        hdbg.dassert(df[full_symbol_col_name].notna().all())
         # Check that there are no duplicates in data by index and full symbol.
         n_duplicated_rows = (
-            df.reset_index()
-            .duplicated(subset=[timestamp_col_name, full_symbol_col_name])
+            pd.MultiIndex.from_arrays([df.index, df[full_symbol_col_name]])
+            .duplicated()
             .sum()
         )
         hdbg.dassert_eq(
@@ -447,11 +511,11 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             # is 20:00:40. That means that the data was downloaded before the bar
             # ends, i.e. incomplete data is received.
             mask = df["knowledge_timestamp"] <= (df.index)
-            early_data = df.loc[mask]
-            if not early_data.empty:
+            num_early_rows = mask.sum()
+            if num_early_rows > 0:
                 _LOG.warning(
                     "Data that is downloaded before a bar ends accounts for=%s",
-                    hprint.perc(early_data.shape[0], df.shape[0]),
+                    hprint.perc(num_early_rows, df.shape[0]),
                 )
 
     @staticmethod
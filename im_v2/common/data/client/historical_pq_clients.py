@@ -6,11 +6,13 @@ import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 
 import abc
 import collections
+import concurrent.futures
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import pandas as pd
+import pyarrow.fs as pafs
 
 import helpers.hdbg as hdbg
 import helpers.henv as henv
@@ -56,6 +58,8 @@ class HistoricalPqByTileClient(
         aws_profile: Optional[str] = None,
         full_symbol_col_name: Optional[str] = None,
         resample_1min: bool = False,
+        num_threads: int = 4,
+        tile_cache: Optional[hparque.ParquetTileCache] = None,
     ):
         """
         Constructor.
@@ -72,6 +76,9 @@ class HistoricalPqByTileClient(
             multiple Parquet files on exchange. See CmTask #1533 "Add
             exchange to the ParquetDataset partition".
         :param aws_profile: AWS profile, e.g., "ck"
+        :param num_threads: max number of root dirs to read concurrently
+        :param tile_cache: local cache for the data read from the root dirs
+            - `None` means always read the data from `root_dir`
         """
         super().__init__(
             vendor,
@@ -84,6 +91,50 @@ class HistoricalPqByTileClient(
         self._infer_exchange_id = infer_exchange_id
         self._partition_mode = partition_mode
         self._aws_profile = aws_profile
+        hdbg.dassert_lte(1, num_threads)
+        self._num_threads = num_threads
+        self._tile_cache = tile_cache
+        # Pyarrow S3 filesystem shared by all the reads, built at the first
+        # read from S3.
+        self._pyarrow_s3fs: Optional[pafs.S3FileSystem] = None
+        # Root dirs that are already known to exist.
+        self._existing_root_dirs: Set[str] = set()
+
+    def __str__(
+        self,
+        *,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        # The performance settings and the state of the reads are not part of
+        # the configuration.
+        attr_names_to_skip.extend(
+            [
+                "_num_threads",
+                "_tile_cache",
+                "_pyarrow_s3fs",
+                "_existing_root_dirs",
+            ]
+        )
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        *,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(
+            [
+                "_num_threads",
+                "_tile_cache",
+                "_pyarrow_s3fs",
+                "_existing_root_dirs",
+            ]
+        )
+        return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     @staticmethod
     def get_metadata() -> pd.DataFrame:
@@ -166,86 +217,168 @@ class HistoricalPqByTileClient(
         root_dir_symbol_filter_dict = self._get_root_dirs_symbol_filters(
             full_symbols, full_symbol_col_name
         )
-        #
-        res_df_list = []
-        for root_dir, symbol_filter in root_dir_symbol_filter_dict.items():
-            # Build list of filters for a query and add them to kwargs.
-            filters = hparque.get_parquet_filters_from_timestamp_interval(
-                self._partition_mode,
-                start_ts,
-                end_ts,
-                additional_filters=[symbol_filter],
-            )
-            kwargs["filters"] = filters
-            # Read Parquet data from a root dir.
-            root_dir_df = hparque.from_parquet(root_dir, **kwargs)
-            # TODO(Grisha): "Handle missing tiles" CmTask #1775.
-            # hdbg.dassert_lte(
-            #     1,
-            #     root_dir_df.shape[0],
-            #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
-            #     root_dir,
-            #     symbol_filter,
-            # )
-            # Convert index to datetime.
-            root_dir_df.index = pd.to_datetime(root_dir_df.index)
-            # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
-            #  Not sure if this is still needed.
-            #        # Rename column storing `full_symbols`, if needed.
-            #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
-            #        if full_symbol_col_name != self._full_symbol_col_name:
-            #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
-            #            df.rename(
-            #                columns={self._full_symbol_col_name: full_symbol_col_name},
-            #                inplace=True,
-            #            )
-            transformation_kwargs: Dict = {}
-            if self._infer_exchange_id:
-                # Infer `exchange_id` position in a file path.
-                s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
-                reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
-                daily_staged_reorg_dir = os.path.join(
-                    reorg_root_dir, "daily_staged.airflow.pq"
+        # Check that the root dirs exist only once, instead of at each read.
+        for root_dir in root_dir_symbol_filter_dict.keys():
+            self._dassert_root_dir_exists(root_dir)
+        kwargs["check_path_exists"] = False
+        # Share the same filesystem across all the reads from S3.
+        if hs3.is_s3_path(self._root_dir) and isinstance(
+            self._aws_profile, str
+        ):
+            if self._pyarrow_s3fs is None:
+                self._pyarrow_s3fs = hparque.get_pyarrow_s3fs(self._aws_profile)
+            kwargs["filesystem"] = self._pyarrow_s3fs
+        # Read the data from the root dirs concurrently.
+        func_kwargs = {
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "full_symbol_col_name": full_symbol_col_name,
+        }
+        root_dir_symbol_filters = list(root_dir_symbol_filter_dict.items())
+        num_threads = min(self._num_threads, len(root_dir_symbol_filters))
+        if num_threads <= 1:
+            res_df_list = [
+                self._read_data_for_root_dir(
+                    root_dir, symbol_filter, **func_kwargs, **kwargs
                 )
-                if root_dir == daily_staged_reorg_dir:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
-                    exchange_loc = -1
-                else:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
-                    exchange_loc = -2
-                # Infer `exchange_id` from a file path if it is not present in data.
-                # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
-                transformation_kwargs["exchange_id"] = root_dir.split("/")[
-                    exchange_loc
+                for root_dir, symbol_filter in root_dir_symbol_filters
+            ]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_threads
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._read_data_for_root_dir,
+                        root_dir,
+                        symbol_filter,
+                        **func_kwargs,
+                        **kwargs,
+                    )
+                    for root_dir, symbol_filter in root_dir_symbol_filters
                 ]
-            # Transform data.
-            root_dir_df = self._apply_transformations(
-                root_dir_df, full_symbol_col_name, **transformation_kwargs
-            )
-            # The columns are used just to partition the data but these columns
-            # are not included in the `ImClient` output.
-            current_columns = root_dir_df.columns.to_list()
-            month_column = "month"
-            if month_column in current_columns:
-                root_dir_df = root_dir_df.drop(month_column, axis=1)
-            year_column = "year"
-            if year_column in current_columns:
-                root_dir_df = root_dir_df.drop(year_column, axis=1)
-            # Column with name "timestamp" that stores epochs remains in most
-            # vendors data if no column filtering was done. Drop it since it
-            # replicates data from index and has the same name as index column
-            # which causes a break when we try to reset it.
-            timestamp_column = "timestamp"
-            if timestamp_column in current_columns:
-                root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
-            #
-            res_df_list.append(root_dir_df)
+                # Keep the order of the root dirs.
+                res_df_list = [future.result() for future in futures]
         # Combine data from all root dirs into a single DataFrame.
         res_df = pd.concat(res_df_list, axis=0)
         return res_df
 
+    def _dassert_root_dir_exists(self, root_dir: str) -> None:
+        """
+        Check that a root dir exists, if it was not already checked.
+        """
+        if root_dir in self._existing_root_dirs:
+            return
+        if hs3.is_s3_path(root_dir):
+            hs3.dassert_path_exists(root_dir, self._aws_profile)
+        else:
+            hdbg.dassert_path_exists(root_dir)
+        self._existing_root_dirs.add(root_dir)
+
+    def _read_data_for_root_dir(
+        self,
+        root_dir: str,
+        symbol_filter: hparque.ParquetFilter,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        full_symbol_col_name: str,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Read and transform the data from a single root dir.
+
+        :param root_dir: root dir to read the data from
+        :param symbol_filter: filter on the symbols to read
+        :param kwargs: kwargs for `hparque.from_parquet()`
+        """
+        # Build list of filters for a query and add them to kwargs.
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            self._partition_mode,
+            start_ts,
+            end_ts,
+            additional_filters=[symbol_filter],
+        )
+        kwargs["filters"] = filters
+        # Read Parquet data from a root dir, or from the cache if available.
+        if self._tile_cache is None:
+            # Filter by timestamp also the row groups inside the tiles, so that
+            # a short interval doesn't load an entire tile.
+            root_dir_df = hparque.from_parquet(
+                root_dir,
+                start_timestamp=start_ts,
+                end_timestamp=end_ts,
+                **kwargs,
+            )
+        else:
+            # Cache entire tiles so that they can be reused across intervals.
+            key = self._tile_cache.get_key(root_dir, filters, kwargs["columns"])
+            root_dir_df = self._tile_cache.get(key)
+            if root_dir_df is None:
+                root_dir_df = hparque.from_parquet(root_dir, **kwargs)
+                self._tile_cache.put(key, root_dir_df)
+        # TODO(Grisha): "Handle missing tiles" CmTask #1775.
+        # hdbg.dassert_lte(
+        #     1,
+        #     root_dir_df.shape[0],
+        #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
+        #     root_dir,
+        #     symbol_filter,
+        # )
+        # Convert index to datetime.
+        root_dir_df.index = pd.to_datetime(root_dir_df.index)
+        # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
+        #  Not sure if this is still needed.
+        #        # Rename column storing `full_symbols`, if needed.
+        #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
+        #        if full_symbol_col_name != self._full_symbol_col_name:
+        #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
+        #            df.rename(
+        #                columns={self._full_symbol_col_name: full_symbol_col_name},
+        #                inplace=True,
+        #            )
+        transformation_kwargs: Dict = {}
+        if self._infer_exchange_id:
+            # Infer `exchange_id` position in a file path.
+            s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
+            reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
+            daily_staged_reorg_dir = os.path.join(
+                reorg_root_dir, "daily_staged.airflow.pq"
+            )
+            if root_dir == daily_staged_reorg_dir:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
+                exchange_loc = -1
+            else:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
+                exchange_loc = -2
+            # Infer `exchange_id` from a file path if it is not present in data.
+            # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
+            transformation_kwargs["exchange_id"] = root_dir.split("/")[
+                exchange_loc
+            ]
+        # Transform data.
+        root_dir_df = self._apply_transformations(
+            root_dir_df, full_symbol_col_name, **transformation_kwargs
+        )
+        # The columns are used just to partition the data but these columns
+        # are not included in the `ImClient` output.
+        current_columns = root_dir_df.columns.to_list()
+        month_column = "month"
+        if month_column in current_columns:
+            root_dir_df = root_dir_df.drop(month_column, axis=1)
+        year_column = "year"
+        if year_column in current_columns:
+            root_dir_df = root_dir_df.drop(year_column, axis=1)
+        # Column with name "timestamp" that stores epochs remains in most
+        # vendors data if no column filtering was done. Drop it since it
+        # replicates data from index and has the same name as index column
+        # which causes a break when we try to reset it.
+        timestamp_column = "timestamp"
+        if timestamp_column in current_columns:
+            root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
+        return root_dir_df
+
     # TODO(Grisha): try to unify child classes with the base class, see CmTask #1696
     # "Refactor HistoricalPqByTileClient and its child classes".
     # TODO(Grisha): remove the hack that allows to read data for multiple exchanges in
@@ -316,6 +449,8 @@ class HistoricalPqByCurrencyPairTileClient(HistoricalPqByTileClient):
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        num_threads: int = 4,
+        tile_cache: Optional[hparque.ParquetTileCache] = None,
     ) -> None:
         """
         Constructor.
@@ -341,6 +476,8 @@ class HistoricalPqByCurrencyPairTileClient(HistoricalPqByTileClient):
             infer_exchange_id,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            num_threads=num_threads,
+            tile_cache=tile_cache,
         )
         hdbg.dassert_in(
             dataset, ["bid_ask", "ohlcv"], f"Invalid dataset type='{dataset}'"
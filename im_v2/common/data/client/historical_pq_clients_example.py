@@ -5,8 +5,9 @@ import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 """
 
 import os
-from typing import Any, List
+from typing import Any, List, Optional
 
+import helpers.hparquet as hparque
 import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 import im_v2.common.test as imvct
 import im_v2.common.universe as ivcu
@@ -21,6 +22,8 @@ def get_MockHistoricalByTileClient_example1(
     self_: Any,
     full_symbols: List[ivcu.FullSymbol],
     resample_1min: bool,
+    *,
+    tile_cache: Optional[hparque.ParquetTileCache] = None,
 ) -> imvcdchpcl.HistoricalPqByTileClient:
     """
     Build mock client example to test data in span of 2 days.
@@ -57,6 +60,7 @@ def get_MockHistoricalByTileClient_example1(
         partition_mode,
         infer_exchange_id,
         resample_1min=resample_1min,
+        tile_cache=tile_cache,
     )
     return im_client
 
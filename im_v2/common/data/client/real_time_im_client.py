@@ -6,7 +6,7 @@ import im_v2.common.data.client.real_time_im_client as imvcdcrtimc
 
 import abc
 import logging
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -43,11 +43,19 @@ class SqlRealTimeImClient(RealTimeImClient):
         self,
         vendor: str,
         universe_version: str,
-        db_connection: hsql.DbConnection,
+        db_connection: Union[hsql.DbConnection, hsql.DbConnectionPool],
         table_name: str,
         *,
         resample_1min: bool = False,
     ) -> None:
+        """
+        Constructor.
+
+        :param db_connection: connection to the DB or pool of connections
+            - with a pool, the data can be read concurrently by multiple
+              threads
+        :param table_name: name of the table to read the data from
+        """
         _LOG.debug(hprint.to_str("db_connection table_name"))
         # These parameters are needed to get the universe which is needed to init
         # the parent class so they go before the parent's init.
@@ -66,6 +74,12 @@ class SqlRealTimeImClient(RealTimeImClient):
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         pass
 
+    def has_connection_pool(self) -> bool:
+        """
+        Return whether the queries borrow a connection from a pool.
+        """
+        return isinstance(self._db_connection, hsql.DbConnectionPool)
+
     def get_universe(self) -> List[ivcu.FullSymbol]:
         """
         See the description in the parent class.
@@ -3,6 +3,8 @@ from typing import List
 import pandas as pd
 
 import core.finance as cofinanc
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client.data_frame_im_clients as imvcdcdfimc
 import im_v2.common.data.client.data_frame_im_clients_example as imvcdcdfimce
 import im_v2.common.data.client.im_client_test_case as imvcdcimctc
@@ -329,3 +331,77 @@ class TestDataFrameImClient1(imvcdcimctc.ImClientTestCase):
             expected_first_elements,
             expected_last_elements,
         )
+
+
+# #############################################################################
+# TestDataFrameImClient2
+# #############################################################################
+
+
+class TestDataFrameImClient2(hunitest.TestCase):
+    """
+    Check the normalization of data for multiple symbols at once.
+    """
+
+    @staticmethod
+    def get_data() -> pd.DataFrame:
+        """
+        Return data for 2 symbols with gaps, a duplicate and unsorted rows.
+        """
+        data = [
+            ("2000-01-01 09:31:00", "binance::ETH_USDT", 1.0),
+            ("2000-01-01 09:34:00", "binance::ETH_USDT", 2.0),
+            ("2000-01-01 09:32:00", "binance::BTC_USDT", 3.0),
+            ("2000-01-01 09:31:00", "binance::BTC_USDT", 4.0),
+            ("2000-01-01 09:32:00", "binance::BTC_USDT", 3.0),
+            ("2000-01-01 09:33:00", "binance::BTC_USDT", 5.0),
+        ]
+        df = pd.DataFrame(data, columns=["timestamp", "full_symbol", "close"])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        df = df.set_index("timestamp")
+        return df
+
+    def helper(self, resample_1min: bool, expected: str) -> None:
+        df = self.get_data()
+        universe = ["binance::BTC_USDT", "binance::ETH_USDT"]
+        im_client = imvcdcdfimc.DataFrameImClient(
+            df, universe, resample_1min=resample_1min
+        )
+        actual = im_client.read_data(universe, None, None, None, "assert")
+        actual = hpandas.df_to_str(actual, num_rows=None)
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_read_data1(self) -> None:
+        """
+        Check that the data is de-duplicated and sorted by timestamp and
+        symbol.
+        """
+        resample_1min = False
+        expected = r"""
+                                         full_symbol  close
+        timestamp
+        2000-01-01 09:31:00+00:00  binance::BTC_USDT    4.0
+        2000-01-01 09:31:00+00:00  binance::ETH_USDT    1.0
+        2000-01-01 09:32:00+00:00  binance::BTC_USDT    3.0
+        2000-01-01 09:33:00+00:00  binance::BTC_USDT    5.0
+        2000-01-01 09:34:00+00:00  binance::ETH_USDT    2.0
+        """
+        self.helper(resample_1min, expected)
+
+    def test_read_data2(self) -> None:
+        """
+        Check that each symbol is resampled to 1 minute within its own range.
+        """
+        resample_1min = True
+        expected = r"""
+                                         full_symbol  close
+        timestamp
+        2000-01-01 09:31:00+00:00  binance::BTC_USDT    4.0
+        2000-01-01 09:31:00+00:00  binance::ETH_USDT    1.0
+        2000-01-01 09:32:00+00:00  binance::BTC_USDT    3.0
+        2000-01-01 09:32:00+00:00  binance::ETH_USDT    NaN
+        2000-01-01 09:33:00+00:00  binance::BTC_USDT    5.0
+        2000-01-01 09:33:00+00:00  binance::ETH_USDT    NaN
+        2000-01-01 09:34:00+00:00  binance::ETH_USDT    2.0
+        """
+        self.helper(resample_1min, expected)
@@ -1,11 +1,16 @@
 import logging
+import os
 import random
+import shutil
 from typing import List, Tuple
 
 import pandas as pd
 import pytest
 
 import helpers.hdatetime as hdateti
+import helpers.hio as hio
+import helpers.hpandas as hpandas
+import helpers.hparquet as hparque
 import im_v2.common.data.client as icdc
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 import im_v2.common.universe as ivcu
@@ -831,3 +836,51 @@ class TestHistoricalPqByTileClient3(icdc.ImClientTestCase):
         self.assert_equal(str(actual_df.shape[0]), str(expected_length))
         self.assert_equal(str(actual_df.index[0]), str(start_ts))
         self.assert_equal(str(actual_df.index[-1]), str(end_ts))
+
+
+# #############################################################################
+# TestHistoricalPqByTileClient4
+# #############################################################################
+
+
+class TestHistoricalPqByTileClient4(icdc.ImClientTestCase):
+    """
+    Test reading data through a `ParquetTileCache`.
+    """
+
+    def test_tile_cache1(self) -> None:
+        """
+        Check that the data is served from the cache when the same query is
+        repeated, even if the original data is not available anymore.
+        """
+        # Generate Parquet test data and initialize client.
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        resample_1min = False
+        # The cache dir must be outside of the root dir of the client, which is
+        # the scratch dir.
+        scratch_dir = self.get_scratch_space()
+        cache_dir = os.path.join(os.path.dirname(scratch_dir), "tmp.tile_cache")
+        hio.create_dir(cache_dir, incremental=False)
+        max_size_in_gb = 1.0
+        tile_cache = hparque.ParquetTileCache(cache_dir, max_size_in_gb)
+        im_client = imvcdchpce.get_MockHistoricalByTileClient_example1(
+            self, full_symbols, resample_1min, tile_cache=tile_cache
+        )
+        # Read the data, which is stored in the cache.
+        start_ts = pd.Timestamp("2021-12-31 00:00:00+00:00")
+        end_ts = pd.Timestamp("2021-12-31 23:59:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        expected_df = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        self.assertLess(0, tile_cache.get_size_in_bytes())
+        # Delete the original data and read it again from the cache.
+        shutil.rmtree(os.path.join(scratch_dir, "tiled.bar_data"))
+        actual_df = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_df, num_rows=None),
+            hpandas.df_to_str(expected_df, num_rows=None),
+        )
@@ -28,6 +28,7 @@ import helpers.htimer as htimer
 import im_v2.ccxt.data.extract.cryptocom_extractor as imvcdecrex
 import im_v2.ccxt.data.extract.extractor as imvcdexex
 import im_v2.common.data.extract.extractor as ivcdexex
+import im_v2.common.data.transform.streaming_bid_ask_resampler as imvcdtsbar
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 import im_v2.common.db.db_utils as imvcddbut
 import im_v2.common.universe as ivcu
@@ -55,6 +56,9 @@ WEBSOCKET_CONFIG = {
         "max_buffer_size": 250,
         "sleep_between_iter_in_ms": 200,
         "resubscription_threshold_in_iter": 3,
+        # How long to wait after a minute ends before saving the data
+        # resampled to 1 minute, to receive the data of the end of the minute.
+        "resampling_delay_in_ms": 2000,
     },
     "trades": {
         "max_buffer_size": 0,
@@ -586,7 +590,12 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     # a buffer is created, its size is determined by the config specific to each
     # data type.
     data_buffer = []
-    data_buffer_to_resample: List[pd.DataFrame] = []
+    # Resample bid/ask data to 1 minute alongside the raw data collection, if
+    # requested.
+    db_resampled_table = args.get("db_resampled_table")
+    if db_resampled_table is not None:
+        hdbg.dassert_eq(data_type, "bid_ask")
+        bid_ask_resampler = imvcdtsbar.StreamingBidAskResampler()
     # Sync to the specified start_time.
     start_delay = max(0, ((start_time - datetime.now(tz)).total_seconds()))
     _LOG.info("Syncing with the start time, waiting for %s seconds", start_delay)
@@ -596,11 +605,15 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     await exchange.sleep(start_delay * 1000)
     # Start data collection.
     timestamps_dict = {}
-    # If bid/ask data is resampled alongside side raw data collection, the resampling is done exactly after
-    # a given minutes ends.
+    # If bid/ask data is resampled alongside side raw data collection, the
+    # resampled bars of a minute are saved after the minute ends, leaving
+    # some time to receive the data of the end of the minute.
     next_bid_ask_resampling_threshold = pd.Timestamp.now(tz).replace(
         second=0, microsecond=0
     ) + pd.Timedelta(minutes=1)
+    bid_ask_resampling_delay = pd.Timedelta(
+        milliseconds=WEBSOCKET_CONFIG["bid_ask"]["resampling_delay_in_ms"]
+    )
     while pd.Timestamp.now(tz) < stop_time:
         if data_type == "bid_ask" and args.get("vendor") == "ccxt":
             try:
@@ -638,6 +651,11 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
         )
         is_last_iteration = pd.Timestamp.now(tz) >= stop_time
         is_non_empty_buffer = len(data_buffer) > 0
+        # Save the buffered data before saving the resampled data.
+        is_resampling_due = db_resampled_table is not None and (
+            pd.Timestamp.now(tz)
+            >= next_bid_ask_resampling_threshold + bid_ask_resampling_delay
+        )
         # Save the data if the download was faster.
         is_download_fast = (
             download_time
@@ -645,7 +663,10 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             and args["db_saving_mode"] == "on_sufficient_time"
         )
         if (
-            is_buffer_full or is_last_iteration or is_download_fast
+            is_buffer_full
+            or is_last_iteration
+            or is_download_fast
+            or is_resampling_due
         ) and is_non_empty_buffer:
             df = imvcdttrut.transform_raw_websocket_data(
                 data_buffer,
@@ -657,25 +678,35 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             # to log missing symbols every iteration.
             downloaded_currency_pairs = df['currency_pair'].unique().tolist()
             hdbg.dassert_set_eq(currency_pairs, downloaded_currency_pairs, only_warning=True)
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # data_buffer_to_resample.append(df)
+            # The buffer contains the data of all the assets for many
+            # iterations, so stream it to the DB.
             imvcddbut.save_data_to_db(
-                df, data_type, db_connection, db_table, str(tz)
+                df, data_type, db_connection, db_table, str(tz), use_copy=True
             )
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # if args.resample_bid_ask_data_to_1min and pd.Timestamp.now(tz) > next_bid_ask_resampling_threshold:
-            #    with htimer.TimedScope(logging.DEBUG, "# Resample 1-minute of raw data"):
-            #        df_resampled = imvcdttrut.transform_and_resample_rt_bid_ask_data(
-            #            pd.concat(data_buffer_to_resample)
-            #        )
-            # imvcddbut.save_data_to_db(
-            #    df_resampled, data_type, db_connection, db_resampled_table, str(tz), add_knowledge_timestamp=False
-            # )
-            # Reset resampling variables to start over.
-            # data_buffer_to_resample = []
-            # next_bid_ask_resampling_threshold += pd.Timedelta(minutes=1)
+            if db_resampled_table is not None:
+                bid_ask_resampler.update(df)
             # Empty buffer after persisting the data.
             data_buffer = []
+        if is_resampling_due:
+            with htimer.TimedScope(
+                logging.DEBUG, "# Save 1-minute of resampled data"
+            ):
+                df_resampled = bid_ask_resampler.get_finished_bars(
+                    next_bid_ask_resampling_threshold
+                )
+                if not df_resampled.empty:
+                    df_resampled["end_download_timestamp"] = pd.Timestamp.now(
+                        tz
+                    )
+                    imvcddbut.save_data_to_db(
+                        df_resampled,
+                        data_type,
+                        db_connection,
+                        db_resampled_table,
+                        str(tz),
+                        add_knowledge_timestamp=False,
+                    )
+            next_bid_ask_resampling_threshold += pd.Timedelta(minutes=1)
         # Determine actual sleep time needed based on the difference
         # between value set in config and actual time it took to complete
         # an iteration, this provides an "time align" mechanism.
@@ -790,6 +790,9 @@ class TestDownloadResampleBidAskData(hmoto.S3Mock_TestCase):
             "dst_s3_path": base_s3_path,
             "assert_all_resampled": True,
             "bid_ask_levels": 10,
+            "num_symbols_per_chunk": 10,
+            "num_threads": "serial",
+            "log_dir": None,
         }
         namespace = argparse.Namespace(**run_args)
 
@@ -809,6 +812,9 @@ class TestDownloadResampleBidAskData(hmoto.S3Mock_TestCase):
             imvcdtrdbad._run(namespace, aws_profile=self.s3fs_)
         self.assertIn("Missing symbols", str(fail.exception))
         self.assertIn("BTC_USDT", str(fail.exception))
+        # Check that no chunk is saved when a symbol is missing.
+        df = hparque.from_parquet(dst_dir, aws_profile=self.s3fs_)
+        self.assertEqual(len(df), len(actual_df))
 
     def test_download_and_resample_bid_ask_data(self) -> None:
         """
@@ -8,6 +8,7 @@ import logging
 from typing import List
 
 import helpers.hdbg as hdbg
+import im_v2.common.data.qa.qa_check as imvcdqqach
 import sorrentum_sandbox.common.validate as ssacoval
 
 _LOG = logging.getLogger(__name__)
@@ -15,7 +16,6 @@ _LOG = logging.getLogger(__name__)
 
 class DataFrameDatasetValidator(ssacoval.DatasetValidator):
 
-    # TODO(Sameep): Add unit test for the function.
     def run_all_checks(self, datasets: List, *, abort_on_error: bool = True) -> str:
         """
         Run all quality assurance (QA) checks on the provided datasets.
@@ -29,11 +29,13 @@ class DataFrameDatasetValidator(ssacoval.DatasetValidator):
         """
         error_msgs: List[str] = []
         _LOG.info("Running all QA checks:")
-        for qa_check in self.qa_checks:
-            if qa_check.check(datasets):
-                _LOG.info("\t" + qa_check.get_status())
-            else:
-                error_msgs.append("\t" + qa_check.get_status())
+        # Sort each dataset once for all the checks.
+        with imvcdqqach.sorted_datasets_cache():
+            for qa_check in self.qa_checks:
+                if qa_check.check(datasets):
+                    _LOG.info("\t" + qa_check.get_status())
+                else:
+                    error_msgs.append("\t" + qa_check.get_status())
         if error_msgs:
             error_msg = "\n".join(error_msgs)
             if abort_on_error:
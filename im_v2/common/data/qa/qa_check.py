@@ -5,17 +5,27 @@ Import as:
 
 import im_v2.common.data.qa.qa_check as imvcdqqach
 """
-from typing import Dict, List, Optional
+import contextlib
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 import core.config as cconfig
-import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 import sorrentum_sandbox.common.validate as ssacoval
 
+# Number of failing rows to show in the status of a failed check.
+_NUM_FAILING_ROWS_TO_SHOW = 10
+# Datasets sorted by `currency_pair` and `timestamp` that are shared by the
+# checks run within `sorted_datasets_cache()`, keyed by `id()` of the source
+# dataset. The source dataset is stored too so that its id is not reused.
+_SORTED_DATASETS_CACHE: Optional[
+    Dict[int, Tuple[pd.DataFrame, pd.DataFrame]]
+] = None
+
 
 def build_dummy_data_reconciliation_config() -> cconfig.ConfigList:
     """
@@ -42,6 +52,61 @@ def get_multilevel_bid_ask_column_names(*, depth: int = 10) -> List[str]:
     return multilevel_bid_ask_cols
 
 
+@contextlib.contextmanager
+def sorted_datasets_cache() -> Iterator[None]:
+    """
+    Sort each dataset once and share it among the checks run in the context.
+    """
+    global _SORTED_DATASETS_CACHE
+    prev_cache = _SORTED_DATASETS_CACHE
+    _SORTED_DATASETS_CACHE = {}
+    try:
+        yield
+    finally:
+        _SORTED_DATASETS_CACHE = prev_cache
+
+
+def get_sorted_dataset(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a dataset sorted by `currency_pair` and `timestamp`.
+
+    The returned dataset has a default index and a `timestamp` column. Within
+    `sorted_datasets_cache()` it is shared among the checks, so it must not be
+    modified in place.
+
+    :param data: dataset with `currency_pair` and `timestamp` columns, where
+        `timestamp` can also be the index
+    :return: sorted dataset
+    """
+    cache = _SORTED_DATASETS_CACHE
+    if cache is not None and id(data) in cache:
+        return cache[id(data)][1]
+    sorted_data = data
+    if "timestamp" not in sorted_data.columns:
+        sorted_data = sorted_data.reset_index()
+    sorted_data = sorted_data.sort_values(
+        ["currency_pair", "timestamp"], ignore_index=True
+    )
+    if cache is not None:
+        cache[id(data)] = (data, sorted_data)
+    return sorted_data
+
+
+def _get_failing_rows_summary(failing_rows: pd.DataFrame, num_rows: int) -> str:
+    """
+    Summarize the rows that failed a check without rendering all of them.
+
+    :param failing_rows: rows that failed a check
+    :param num_rows: number of rows the check was performed on
+    :return: number of failing rows and the first and the last ones
+    """
+    signature = hpandas.get_df_signature(
+        failing_rows, num_rows=_NUM_FAILING_ROWS_TO_SHOW
+    )
+    summary = f"{len(failing_rows)} out of {num_rows} rows failed:\n{signature}"
+    return summary
+
+
 class GapsInTimeIntervalCheck(ssacoval.QaCheck):
     """
     Check that all timestamps for given datasets are present.
@@ -124,44 +189,61 @@ class GapsInTimeIntervalBySymbolsCheck(ssacoval.QaCheck):
         """
         status = []
         for data in datasets:
-            if self.align:
-                data = self._align(data.copy(), freq=self.data_frequency)
             if data.empty:
                 self._status = "FAILED: The dataset is empty."
                 return False
-            for currency_pair in data["currency_pair"].unique():
-                current_data = data[data["currency_pair"] == currency_pair]
-                gaps_check = GapsInTimeIntervalCheck(
-                    start_timestamp=self.start_timestamp,
-                    end_timestamp=self.end_timestamp,
-                    data_frequency=self.data_frequency,
+            gaps_by_currency_pair = self._find_gaps_by_currency_pair(data)
+            for currency_pair, gaps in gaps_by_currency_pair.items():
+                gaps_to_show = [
+                    str(gap) for gap in gaps[:_NUM_FAILING_ROWS_TO_SHOW]
+                ]
+                status.append(
+                    f"FAILED: Found {len(gaps)} gaps in the dataset, first"
+                    f" ones: {gaps_to_show}. Currency pair = {currency_pair}."
                 )
-                if not gaps_check.check(datasets=[current_data]):
-                    status.append(
-                        f"{gaps_check.get_status()}. "
-                        f"Currency pair = {currency_pair}."
-                    )
         if len(status) > 0:
             self._status = "\n".join(status)
             return False
         self._status = "PASSED"
         return True
 
-    def _align(self, df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    def _find_gaps_by_currency_pair(
+        self, data: pd.DataFrame
+    ) -> Dict[str, pd.DatetimeIndex]:
         """
-        Align the "timestamp" column in df to nearest freq.
-        
-        :param df: pandas dataframe to align
-        :param freq: frequency string to which the timestamp column should be rounded, eg. "60S"
-        :return: dataframe with the 'timestamp' column aligned to the specified frequency
-        """
-        df.reset_index(inplace=True)
-        if str(df["timestamp"].dtype) in ["int32", "int64"]:
-            df["timestamp"] = df["timestamp"].apply(
-                lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
-            )
-        df["timestamp"] = df["timestamp"].dt.round(freq)
-        return df
+        Find missing timestamps for all the currency pairs at once.
+
+        Each timestamp is mapped to its position on the expected time grid,
+        and a currency pairs x grid positions mask marks the present ones.
+
+        :param data: pandas dataframe to check
+        :return: missing timestamps for each currency pair with gaps
+        """
+        data = get_sorted_dataset(data)
+        timestamps = data["timestamp"]
+        if str(timestamps.dtype) in ["int32", "int64"]:
+            timestamps = pd.to_datetime(timestamps, unit="ms", utc=True)
+        if self.align:
+            # Align the timestamps to the nearest frequency, e.g. "60S".
+            timestamps = timestamps.dt.round(self.data_frequency)
+        expected_timestamps = pd.date_range(
+            start=self.start_timestamp,
+            end=self.end_timestamp,
+            freq=self.data_frequency,
+        )
+        # Timestamps outside of the grid get -1 and are ignored.
+        positions = expected_timestamps.get_indexer(timestamps)
+        codes, currency_pairs = pd.factorize(data["currency_pair"])
+        mask = (positions >= 0) & (codes >= 0)
+        is_present = np.zeros(
+            (len(currency_pairs), len(expected_timestamps)), dtype=bool
+        )
+        is_present[codes[mask], positions[mask]] = True
+        gaps_by_currency_pair = {
+            currency_pairs[idx]: expected_timestamps[~is_present[idx]]
+            for idx in np.flatnonzero(~is_present.all(axis=1))
+        }
+        return gaps_by_currency_pair
 
 
 class NaNChecks(ssacoval.QaCheck):
@@ -181,11 +263,13 @@ class NaNChecks(ssacoval.QaCheck):
         """
         for dataset in datasets:
             dataset_to_check = dataset[self.fields] if self.fields else dataset
-            if dataset_to_check.isnull().any().any():
+            is_nan_row = dataset_to_check.isna().to_numpy().any(axis=1)
+            if is_nan_row.any():
+                summary = _get_failing_rows_summary(
+                    dataset[is_nan_row], len(dataset)
+                )
                 self._status = (
-                    f"FAILED: Found nulls values "
-                    f"{dataset_to_check[dataset_to_check.isna().any(axis=1)]}\n"
-                    "in the dataset."
+                    f"FAILED: Found nulls values in the dataset, {summary}"
                 )
                 return False
         self._status = "PASSED"
@@ -297,12 +381,10 @@ class IdenticalDataFramesCheck(ssacoval.QaCheck):
             datasets[0], datasets[1]
         )
         if not dataset_difference.empty:
-            difference_signature = hpandas.get_df_signature(
-                dataset_difference, num_rows=len(dataset_difference)
-            )
-            self._status = (
-                f"FAILED: Differing table contents:\n\t{difference_signature}"
+            summary = _get_failing_rows_summary(
+                dataset_difference, len(datasets[0])
             )
+            self._status = f"FAILED: Differing table contents:\n\t{summary}"
             return False
         self._status = "PASSED"
         return True
@@ -311,38 +393,68 @@ class OuterCrossOHLCVDataCheck(ssacoval.QaCheck):
     """
     Check that two DataFrames have similar OHLCV data using outer join.
 
-    This QA check performs a full outer join on two DataFrames based on the 
-    'timestamp' and 'currency_pair' columns. It compares the OHLCV data in 
+    This QA check performs a full outer join on two DataFrames based on the
+    'timestamp' and 'currency_pair' columns. It compares the OHLCV data in
     the joined DataFrame, and if any differences are found, the check fails.
     """
 
+    _COLUMNS = ["open", "high", "low", "close", "volume"]
+
+    def __init__(self, *, rtol: float = 0.0, atol: float = 0.0) -> None:
+        """
+        :param rtol: relative tolerance of the values comparison, see
+            `np.isclose()`
+        :param atol: absolute tolerance of the values comparison, see
+            `np.isclose()`
+        """
+        super().__init__()
+        hdbg.dassert_lte(0, rtol)
+        hdbg.dassert_lte(0, atol)
+        self.rtol = rtol
+        self.atol = atol
+
     def check(self, datasets: List[pd.DataFrame]) -> bool:
         """
+        Rows present in only one of the datasets or containing NaNs fail the
+        check.
+
         :param datasets: List of Pandas dataframe
         :return: True if both datasets are similar, False
             otherwise.
         """
         hdbg.dassert_eq(len(datasets), 2)
-        # Perform a full outer join
-        merged_df = pd.merge(datasets[0], datasets[1], on=['timestamp', 'currency_pair'], how='outer', suffixes=('_A', '_B'))
-        merged_df["QAcheck"] = merged_df.apply(self._is_valid_row, axis=1)
-        qa_check_failed = merged_df[merged_df["QAcheck"] == False]
-        if len(qa_check_failed) > 0:
-            qa_check_failed = qa_check_failed.to_string()
-            self._status = f"FAILED: Different data found:\n\t{qa_check_failed}"
+        # Perform a full outer join.
+        merged_df = pd.merge(
+            get_sorted_dataset(datasets[0]),
+            get_sorted_dataset(datasets[1]),
+            on=["timestamp", "currency_pair"],
+            how="outer",
+            suffixes=("_A", "_B"),
+        )
+        # Compare the values column-wise.
+        num_differing_values = {}
+        is_valid_row = np.ones(len(merged_df), dtype=bool)
+        for col in self._COLUMNS:
+            is_close = np.isclose(
+                merged_df[f"{col}_A"].to_numpy(dtype=float, na_value=np.nan),
+                merged_df[f"{col}_B"].to_numpy(dtype=float, na_value=np.nan),
+                rtol=self.rtol,
+                atol=self.atol,
+            )
+            num_differing_values[col] = int((~is_close).sum())
+            is_valid_row &= is_close
+        if not is_valid_row.all():
+            summary = _get_failing_rows_summary(
+                merged_df[~is_valid_row], len(merged_df)
+            )
+            self._status = (
+                "FAILED: Different data found, number of differing values by"
+                f" column: {num_differing_values}, {summary}"
+            )
             return False
         self._status = "PASSED"
         return True
 
-    def _is_valid_row(self, row: pd.Series) -> bool:
-        """
-        Check if the OHLCV is similar.
-        """
-        cols = ["open", "high", "low", "close", "volume"]
-        for col in cols:
-            if row[col + "_A"] != row[col + "_B"]:
-                return False
-        return True
 
 class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
     """
@@ -374,35 +486,39 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
         """
         data = self._preprocess_datasets(datasets)
         bid_ask_cols = get_multilevel_bid_ask_column_names()
-        # Each bid ask value will have a notional and a relative difference between two sources.
-        for col in bid_ask_cols:
-            # Notional difference: Dataset1 - Dataset2.
-            data[f"{col}_diff"] = data[f"{col}_cc"] - data[f"{col}_ccxt"]
-            # Relative value: (Dataset1 - Dataset2)/Dataset1.
-            data[f"{col}_relative_diff_pct"] = (
-                100
-                * (data[f"{col}_cc"] - data[f"{col}_ccxt"])
-                / data[f"{col}_ccxt"]
-            )
-        # Calculate the mean value of differences for each coin.
-        diff_stats = []
-        grouper = data.groupby(["currency_pair"])
-        for col in bid_ask_cols:
-            diff_stats.append(grouper[f"{col}_diff"].mean())
-            diff_stats.append(grouper[f"{col}_relative_diff_pct"].mean())
-        diff_stats = pd.concat(diff_stats, axis=1)
-        error_message = []
+        thresholds = np.array(
+            [self.accuracy_threshold_dict[col] for col in bid_ask_cols]
+        )
+        # Relative difference of all the bid ask values at once:
+        # (Dataset1 - Dataset2) / Dataset2.
+        values_cc = data[[f"{col}_cc" for col in bid_ask_cols]].to_numpy(
+            dtype=float
+        )
+        values_ccxt = data[[f"{col}_ccxt" for col in bid_ask_cols]].to_numpy(
+            dtype=float
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_diff_pct = 100 * (values_cc - values_ccxt) / values_ccxt
+        # Calculate the mean value of the differences for each coin.
+        relative_diff_pct = pd.DataFrame(
+            relative_diff_pct,
+            index=data.index.get_level_values("currency_pair"),
+            columns=bid_ask_cols,
+        )
+        mean_relative_diff_pct = relative_diff_pct.groupby(level=0).mean().abs()
         # Log the difference.
-        for index, row in diff_stats.iterrows():
-            for col in get_multilevel_bid_ask_column_names():
-                cur_threshold = self.accuracy_threshold_dict[col]
-                cur_col = f"{col}_relative_diff_pct"
-                if abs(row[cur_col]) > cur_threshold:
-                    message = (
-                        f"Difference in {col}"
-                        f" for `{index}` coin is {abs(row[cur_col])}% (> {cur_threshold}% threshold)."
-                    )
-                    error_message.append(message)
+        error_message = []
+        exceeds_threshold = mean_relative_diff_pct.to_numpy() > thresholds
+        for row_idx, col_idx in zip(*np.nonzero(exceeds_threshold)):
+            index = mean_relative_diff_pct.index[row_idx]
+            col = bid_ask_cols[col_idx]
+            message = (
+                f"Difference in {col}"
+                f" for `{index}` coin is"
+                f" {mean_relative_diff_pct.iat[row_idx, col_idx]}%"
+                f" (> {self.accuracy_threshold_dict[col]}% threshold)."
+            )
+            error_message.append(message)
         if error_message:
             error_message = "\n".join(error_message)
             self._status = f"FAILED :\n\t{error_message}"
@@ -417,7 +533,7 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
         """
         datasets = list(
             map(
-                lambda data: data.set_index(
+                lambda data: get_sorted_dataset(data).set_index(
                     ["timestamp", "currency_pair"], drop=True
                 ),
                 datasets,
@@ -432,8 +548,6 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
             # TODO(Juraj) handle the suffixes better.
             suffixes=("_ccxt", "_cc"),
         )
-        # Move the same metrics from two vendors together.
-        data = data.reindex(sorted(data.columns), axis=1)
         return data
 
 
@@ -466,24 +580,33 @@ class DuplicateDifferingOhlcvCheck(ssacoval.QaCheck):
             differing values, False otherwise
         """
         for dataset in datasets:
-            dataset = dataset.drop_duplicates(
-                subset=[
-                    "timestamp",
-                    "currency_pair",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "volume",
-                ]
+            # Rows with the same `timestamp` and `currency_pair` are adjacent
+            # in the sorted dataset, so it is enough to compare each row with
+            # the next one.
+            dataset = get_sorted_dataset(dataset)
+            group_ids = dataset.groupby(
+                ["currency_pair", "timestamp"], sort=False
+            ).ngroup()
+            group_ids = group_ids.to_numpy()
+            values = dataset[
+                ["open", "high", "low", "close", "volume"]
+            ].to_numpy(dtype=float, na_value=np.nan)
+            # NaNs are considered equal, like in `drop_duplicates()`.
+            is_equal = (values[1:] == values[:-1]) | (
+                np.isnan(values[1:]) & np.isnan(values[:-1])
             )
-            duplicates = dataset[
-                dataset.duplicated(["timestamp", "currency_pair"], keep=False)
-            ]
-            if not duplicates.empty:
-                duplicates_str = duplicates.to_string()
+            is_differing = (group_ids[1:] == group_ids[:-1]) & ~is_equal.all(
+                axis=1
+            )
+            if is_differing.any():
+                is_duplicate_row = np.zeros(len(dataset), dtype=bool)
+                is_duplicate_row[:-1] |= is_differing
+                is_duplicate_row[1:] |= is_differing
+                summary = _get_failing_rows_summary(
+                    dataset[is_duplicate_row], len(dataset)
+                )
                 self._status = (
-                    f"FAILED: Duplicate table contents:\n\t{duplicates_str}"
+                    f"FAILED: Duplicate table contents:\n\t{summary}"
                 )
                 return False
         self._status = "PASSED"
@@ -0,0 +1,59 @@
+import unittest.mock as umock
+
+import pandas as pd
+
+import helpers.hunit_test as hunitest
+import im_v2.common.data.qa.dataset_validator as imvcdqdava
+import im_v2.common.data.qa.qa_check as imvcdqqach
+
+
+class TestDataFrameDatasetValidator(hunitest.TestCase):
+    @staticmethod
+    def _get_data() -> pd.DataFrame:
+        data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range(
+                    "2023-01-15", periods=3, freq="T", tz="UTC"
+                ).tolist()
+                * 2,
+                "open": [1.0, 2.0, 3.0, 1.0, 2.0, 3.0],
+                "high": [2.0, 3.0, 4.0, 2.0, 3.0, 4.0],
+                "low": [0.5, 1.5, 2.5, 0.5, 1.5, 2.5],
+                "close": [1.5, 2.5, 3.5, 1.5, 2.5, 3.5],
+                "volume": [10.0, 20.0, 30.0, 10.0, 20.0, 30.0],
+                "currency_pair": ["BTC_USDT"] * 3 + ["ETH_USDT"] * 3,
+            }
+        )
+        return data
+
+    def test_run_all_checks1(self) -> None:
+        """
+        Test that the checks share the sorted datasets and that all the check
+        failures are returned when not aborting on error.
+        """
+        # Prepare data.
+        data1 = self._get_data()
+        data2 = data1.copy()
+        data2.loc[4, "volume"] = 0.0
+        qa_checks = [
+            imvcdqqach.OuterCrossOHLCVDataCheck(),
+            imvcdqqach.OuterCrossOHLCVDataCheck(atol=1e-3),
+            imvcdqqach.OuterCrossOHLCVDataCheck(atol=100),
+        ]
+        dataset_validator = imvcdqdava.DataFrameDatasetValidator(qa_checks)
+        # Execute.
+        sort_values = pd.DataFrame.sort_values
+        with umock.patch.object(
+            pd.DataFrame, "sort_values", autospec=True, side_effect=sort_values
+        ) as mock_sort_values:
+            actual = dataset_validator.run_all_checks(
+                [data1, data2], abort_on_error=False
+            )
+        # Check results.
+        # Each dataset is sorted only once.
+        self.assertEqual(mock_sort_values.call_count, 2)
+        self.assertEqual(actual.count("OuterCrossOHLCVDataCheck: FAILED"), 2)
+        self.assertIn("1 out of 6 rows failed", actual)
+        self.assertEqual(
+            qa_checks[2].get_status(), "OuterCrossOHLCVDataCheck: PASSED"
+        )
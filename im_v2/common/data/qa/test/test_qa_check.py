@@ -3,6 +3,7 @@ import datetime
 import numpy as np
 import pandas as pd
 
+import helpers.hdatetime as hdateti
 import helpers.hunit_test as hunitest
 import im_v2.common.data.qa.qa_check as imvcdqqach
 
@@ -107,6 +108,58 @@ class TestGapsInTimeIntervalBySymbolsCheck(QAChecksTestCase):
         self.assertFalse(check_result)
         self.assertIn("BTC_USDT", check_instance.get_status())
 
+    def test_multiple_symbols(self) -> None:
+        """
+        Test that only the symbols with gaps are reported.
+        """
+        # Get the data.
+        minutes = 120
+        start_timestamp = pd.Timestamp(datetime.datetime(2000, 1, 1))
+        end_timestamp = start_timestamp + datetime.timedelta(minutes=minutes)
+        data1 = self._get_data(start_timestamp=start_timestamp, minutes=minutes)
+        data2 = data1.assign(currency_pair="ETH_USDT").drop([10, 11])
+        data = pd.concat([data2, data1], ignore_index=True)
+        # Check.
+        check_instance = imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            data_frequency="T",
+        )
+        check_result = check_instance.check(datasets=[data])
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = (
+            "GapsInTimeIntervalBySymbolsCheck: FAILED: Found 2 gaps in the"
+            " dataset, first ones: ['2000-01-01 00:10:00',"
+            " '2000-01-01 00:11:00']. Currency pair = ETH_USDT."
+        )
+        self.assert_equal(actual, expected)
+
+    def test_unix_epoch_align(self) -> None:
+        """
+        Test that unaligned timestamps in Unix epoch format pass the check
+        when aligned.
+        """
+        # Get the data.
+        minutes = 120
+        start_timestamp = pd.Timestamp("2000-01-01", tz="UTC")
+        end_timestamp = start_timestamp + datetime.timedelta(minutes=minutes)
+        data = self._get_data(start_timestamp=start_timestamp, minutes=minutes)
+        data["timestamp"] = data["timestamp"].apply(
+            hdateti.convert_timestamp_to_unix_epoch
+        )
+        data["timestamp"] += 1500
+        for align, expected in [(False, False), (True, True)]:
+            # Check.
+            check_instance = imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+                start_timestamp=start_timestamp,
+                end_timestamp=end_timestamp,
+                data_frequency="T",
+                align=align,
+            )
+            check_result = check_instance.check(datasets=[data])
+            self.assertEqual(check_result, expected)
+
 
 class TestNaNChecks(QAChecksTestCase):
     def test_main(self):
@@ -253,6 +306,117 @@ class TestIdenticalDataFramesCheck(QAChecksTestCase):
         )
 
 
+class TestOuterCrossOHLCVDataCheck(QAChecksTestCase):
+    def test_identical_datasets(self) -> None:
+        """
+        Test that datasets with the same rows in a different order pass.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset1 = self._get_data(start_timestamp, 5)
+        dataset2 = dataset1.iloc[::-1]
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertTrue(check_result)
+        self.assertIn("PASSED", check_instance.get_status())
+
+    def test_different_datasets(self) -> None:
+        """
+        Test that differing values and rows missing in one of the datasets
+        fail the check.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset1 = self._get_data(start_timestamp, 5)
+        dataset2 = dataset1.drop(0)
+        dataset2.loc[3, "close"] = 0.4
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        self.assertIn(
+            "number of differing values by column: {'open': 1, 'high': 1,"
+            " 'low': 1, 'close': 2, 'volume': 1}, 2 out of 6 rows failed",
+            actual,
+        )
+
+    def test_tolerance(self) -> None:
+        """
+        Test that differences within the tolerance pass the check.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset1 = self._get_data(start_timestamp, 5)
+        dataset2 = dataset1.copy()
+        dataset2["volume"] += 1e-3
+        # Execute and check results.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        self.assertFalse(check_instance.check([dataset1, dataset2]))
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck(atol=1e-2)
+        self.assertTrue(check_instance.check([dataset1, dataset2]))
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck(rtol=1e-6)
+        self.assertTrue(check_instance.check([dataset1, dataset2]))
+
+
+class TestBidAskDataFramesSimilarityCheck(hunitest.TestCase):
+    def test_main(self) -> None:
+        """
+        Test that only the mean relative differences above the threshold are
+        reported.
+        """
+        # Prepare data.
+        bid_ask_cols = imvcdqqach.get_multilevel_bid_ask_column_names()
+        dataset1 = pd.DataFrame(
+            {
+                "timestamp": [1, 2, 1, 2],
+                "currency_pair": ["BTC_USDT"] * 2 + ["ETH_USDT"] * 2,
+                **{col: [100.0, 100.0, 16.0, 16.0] for col in bid_ask_cols},
+            }
+        )
+        dataset2 = dataset1.copy()
+        is_eth = dataset2["currency_pair"] == "ETH_USDT"
+        dataset2.loc[is_eth, "ask_price_l3"] = [16.5, 17.0]
+        accuracy_threshold_dict = {col: 1 for col in bid_ask_cols}
+        # Execute.
+        check_instance = imvcdqqach.BidAskDataFramesSimilarityCheck(
+            accuracy_threshold_dict
+        )
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = (
+            "BidAskDataFramesSimilarityCheck: FAILED :\n"
+            "\tDifference in ask_price_l3 for `ETH_USDT` coin is 4.6875%"
+            " (> 1% threshold)."
+        )
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+class TestSortedDatasetsCache(QAChecksTestCase):
+    def test_main(self) -> None:
+        """
+        Test that a dataset is sorted once within the cache context.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset = self._get_data(start_timestamp, 5).iloc[::-1]
+        # Execute and check results.
+        with imvcdqqach.sorted_datasets_cache():
+            sorted_dataset = imvcdqqach.get_sorted_dataset(dataset)
+            sorted_dataset2 = imvcdqqach.get_sorted_dataset(dataset)
+            self.assertIs(sorted_dataset2, sorted_dataset)
+        self.assertTrue(sorted_dataset["timestamp"].is_monotonic_increasing)
+        self.assertEqual(sorted_dataset.index.tolist(), list(range(6)))
+        # Outside of the context the dataset is sorted on every call.
+        sorted_dataset3 = imvcdqqach.get_sorted_dataset(dataset)
+        self.assertIsNot(sorted_dataset3, sorted_dataset)
+
+
 class TestDuplicateDifferingOhlcvCheck(QAChecksTestCase):
     def test_duplicates_with_same_ohlcv(self) -> None:
         """
@@ -306,3 +470,21 @@ class TestDuplicateDifferingOhlcvCheck(QAChecksTestCase):
         # Check results.
         self.assertFalse(check_result)
         self.assertIn("FAILED", check_instance.get_status())
+
+    def test_duplicates_with_nans(self) -> None:
+        """
+        Test case to check that duplicates with NaNs in the same columns are
+        considered identical.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        data_len = 5
+        dataset = self._get_data(start_timestamp, data_len)
+        dataset.loc[2, "volume"] = np.nan
+        dataset = pd.concat([dataset, dataset], ignore_index=True)
+        # Execute.
+        check_instance = imvcdqqach.DuplicateDifferingOhlcvCheck()
+        check_result = check_instance.check([dataset])
+        # Check results.
+        self.assertTrue(check_result)
+        self.assertIn("PASSED", check_instance.get_status())
@@ -12,7 +12,9 @@ This assumes that the underlying data is sampled at a 1 second resolution.
     --src_signature 'periodic_daily.airflow.downloaded_1sec.csv.bid_ask.futures.v3.crypto_chassis.binance.v1_0_0' \
     --src_s3_path 's3://cryptokaizen-data-test/' \
     --dst_signature 'periodic_daily.airflow.resampled_1min.parquet.bid_ask.futures.v3.crypto_chassis.binance.v1_0_0' \
-    --dst_s3_path 's3://cryptokaizen-data-test/'
+    --dst_s3_path 's3://cryptokaizen-data-test/' \
+    --num_symbols_per_chunk 5 \
+    --num_threads 4
 
 Import as:
 
@@ -20,7 +22,9 @@ import im_v2.common.data.transform.resample_daily_bid_ask_data as imvcdtrdba
 """
 import argparse
 import logging
-from typing import Callable, List, Optional, Tuple
+import os
+import tempfile
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
@@ -28,6 +32,7 @@ import core.finance.bid_ask as cfibiask
 import data_schema.dataset_schema_utils as dsdascut
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
+import helpers.hjoblib as hjoblib
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
 import helpers.hparser as hparser
@@ -101,6 +106,94 @@ def _get_s3_path_from_signature(signature: str, base_s3_path: str) -> str:
     return s3_path
 
 
+def _resample_currency_pairs(
+    currency_pairs: List[str],
+    src_s3_path: str,
+    staging_file_name: str,
+    filters: List[Tuple],
+    dataset_action_tag: str,
+    epoch_unit: str,
+    bid_ask_levels: int,
+    aws_profile: hs3.AwsProfile,
+    incremental: bool,
+    num_attempts: int,
+) -> List[str]:
+    """
+    Load and resample the data of a chunk of currency pairs.
+
+    Only the data of the currency pairs in the chunk is loaded so that the
+    memory used is bounded by the chunk size and not by the universe size.
+
+    :param currency_pairs: currency pairs to resample, e.g. `["BTC_USDT"]`
+    :param staging_file_name: local file to save the resampled data to,
+        before it is saved in the destination dataset
+    :param filters: Parquet filters for the data period
+    :return: resampled currency pairs
+    """
+    # This function only supports non-incremental mode and no re-try.
+    hdbg.dassert(not incremental)
+    hdbg.dassert_eq(num_attempts, 1)
+    hdbg.dassert_container_type(currency_pairs, list, str)
+    filters = filters + [("currency_pair", "in", currency_pairs)]
+    data = hparque.from_parquet(
+        src_s3_path, filters=filters, aws_profile=aws_profile
+    )
+    _LOG.info("Source data loaded for %s", currency_pairs)
+    # TODO(Juraj): we are aware of duplicate data problem #7230 but for the
+    # sake of resampled data availability we allow occasional duplicate with
+    # different values.
+    duplicate_cols_subset = [
+        "timestamp",
+        "exchange_id",
+        "currency_pair",
+        "level",
+    ]
+    # Ensure there are no duplicates, in this case
+    #  using duplicates would compute the wrong resampled values.
+    data = data.drop_duplicates(subset=duplicate_cols_subset)
+    data = _preprocess_src_data(dataset_action_tag, data)
+    data_resampled = []
+    # Partition the data in a single pass, instead of masking the whole data
+    # for each currency pair.
+    for currency_pair, data_single in data.groupby(
+        "currency_pair", sort=False, observed=True
+    ):
+        data_resampled_single = (
+            imvcdttrut.resample_multilevel_bid_ask_data_to_1min(
+                data_single, number_levels_of_order_book=bid_ask_levels
+            )
+        )
+        if not data_resampled_single.empty:
+            data_resampled_single["currency_pair"] = currency_pair
+            data_resampled.append(data_resampled_single)
+        else:
+            _LOG.warning(
+                "Empty Dataframe: no resampled data for %s", currency_pair
+            )
+    # Free the memory of the source data before saving.
+    del data
+    resampled_currency_pairs = [
+        df["currency_pair"].iloc[0] for df in data_resampled
+    ]
+    if not data_resampled:
+        return resampled_currency_pairs
+    # Transform the dataset to make save_parquet applicable.
+    data_resampled = pd.concat(data_resampled).reset_index()
+    data_resampled["timestamp"] = hdateti.convert_timestamps_to_unix_epoch(
+        data_resampled["timestamp"], unit=epoch_unit
+    )
+    data_resampled = imvcdttrut.add_knowledge_timestamp_col(
+        data_resampled, "UTC"
+    )
+    _LOG.info(
+        hpandas.df_to_str(
+            data_resampled, print_shape_info=True, tag="Resampled data"
+        )
+    )
+    hparque.to_parquet(data_resampled, staging_file_name)
+    return resampled_currency_pairs
+
+
 def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
     # Get arguments from the dataset signatures.
     dataset_schema = dsdascut.get_dataset_schema()
@@ -118,6 +211,7 @@ def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
     # Check that the source and destination data format are parquet.
     hdbg.dassert_eq(scr_signature_args["data_format"], "parquet")
     hdbg.dassert_eq(dst_signature_args["data_format"], "parquet")
+    hdbg.dassert_lte(1, args.num_symbols_per_chunk)
     # Define filters for data period.
     # Note(Juraj): it's better from Airflow execution perspective
     #  to keep the interval closed: [start, end].
@@ -130,97 +224,128 @@ def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
         epoch_unit,
         bid_ask_levels,
     )
-    # filters = [("timestamp", ">=", start), ("timestamp", "<=", end)]
     src_s3_path = _get_s3_path_from_signature(
         args.src_signature, args.src_s3_path
     )
-    data = hparque.from_parquet(
-        src_s3_path, filters=filters, aws_profile=aws_profile
+    dst_s3_path = _get_s3_path_from_signature(
+        args.dst_signature, args.dst_s3_path
     )
-    _LOG.info("Source data loaded.")
-    # TODO(Juraj): we are aware of duplicate data problem #7230 but for the
-    # sake of resampled data availability we allow occasional duplicate with different values.
-    duplicate_cols_subset = [
-            "timestamp",
-            "exchange_id",
-            "currency_pair",
-            "level",
-    ] 
-    # Ensure there are no duplicates, in this case
-    #  using duplicates would compute the wrong resampled values.
-    data = data.drop_duplicates(subset=duplicate_cols_subset)
-    data = _preprocess_src_data(scr_signature_args["action_tag"], data)
-    data_resampled = []
-    input_currency_pairs = data["currency_pair"].unique()
-    for currency_pair in input_currency_pairs:
-        data_single = data[data["currency_pair"] == currency_pair]
-        if data_single.empty:
-            _LOG.warning(
-                "Empty Dataframe: no data for %s in %s-%s time period",
-                currency_pair,
-                args.start_timestamp,
-                args.end_timestamp,
-            )
-            continue
-        data_resampled_single = imvcdttrut.resample_multilevel_bid_ask_data_to_1min(
-            data_single, number_levels_of_order_book=args.bid_ask_levels
+    # Load only the symbols column to get the universe of the period, so that
+    # the data can be then loaded in chunks of symbols.
+    input_currency_pairs = hparque.from_parquet(
+        src_s3_path,
+        columns=["currency_pair"],
+        filters=filters,
+        aws_profile=aws_profile,
+    )["currency_pair"]
+    input_currency_pairs = sorted(input_currency_pairs.unique())
+    if not input_currency_pairs:
+        _LOG.warning(
+            "Empty Dataframe: no data in %s-%s time period",
+            args.start_timestamp,
+            args.end_timestamp,
         )
-        if not data_resampled_single.empty:
-            data_resampled_single["currency_pair"] = currency_pair
-            data_resampled.append(data_resampled_single)
-        else:
-            _LOG.warning(
-                "Empty Dataframe: no resampled data for %s "
-                "in %s-%s time period",
-                currency_pair,
-                args.start_timestamp,
-                args.end_timestamp,
+        _LOG.warning("Resampled dataset is empty!")
+        return
+    _LOG.info(
+        "Resampling %s currency pairs in chunks of %s",
+        len(input_currency_pairs),
+        args.num_symbols_per_chunk,
+    )
+    # Prepare the tasks, one for each chunk of currency pairs.
+    chunked_currency_pairs = hjoblib.split_list_in_tasks(
+        input_currency_pairs,
+        1,
+        num_elems_per_task=args.num_symbols_per_chunk,
+    )
+    # The resampled chunks are staged locally and saved in the destination
+    # dataset only after checking all the symbols, so that a failed run
+    # doesn't leave some of the chunks in the destination dataset and a retry
+    # doesn't save them again.
+    with tempfile.TemporaryDirectory() as staging_dir:
+        tasks = []
+        for idx, currency_pairs in enumerate(chunked_currency_pairs):
+            staging_file_name = os.path.join(
+                staging_dir, f"chunk.{idx}.parquet"
             )
-    # Transform the dataset to make save_parquet applicable.
-    if data_resampled:
-        data_resampled = pd.concat(data_resampled).reset_index()
-        output_currency_pairs = data_resampled["currency_pair"].unique()
-        # The set of input symbols should be equal to the set of output symbols
-        # since this is a resampling transformation.
-        if args.assert_all_resampled and not list(input_currency_pairs) == list(
-            output_currency_pairs
+            task: hjoblib.Task = (
+                # args.
+                (currency_pairs,),
+                # kwargs.
+                {
+                    "src_s3_path": src_s3_path,
+                    "staging_file_name": staging_file_name,
+                    "filters": filters,
+                    "dataset_action_tag": scr_signature_args["action_tag"],
+                    "epoch_unit": epoch_unit,
+                    "bid_ask_levels": args.bid_ask_levels,
+                    "aws_profile": aws_profile,
+                },
+            )
+            tasks.append(task)
+        func = _resample_currency_pairs
+        workload = (func, func.__name__, tasks)
+        hjoblib.validate_workload(workload)
+        # Prepare the log file.
+        log_dir = args.log_dir
+        if log_dir is None:
+            log_dir = tempfile.gettempdir()
+        timestamp = hdateti.get_current_timestamp_as_string("ET")
+        log_file = os.path.join(log_dir, f"log.{timestamp}.txt")
+        _LOG.info("log_file='%s'", log_file)
+        # Execute the workload.
+        dry_run = False
+        incremental = False
+        abort_on_error = True
+        num_attempts = 1
+        res = hjoblib.parallel_execute(
+            workload,
+            dry_run,
+            args.num_threads,
+            incremental,
+            abort_on_error,
+            num_attempts,
+            log_file,
+        )
+        resampled_currency_pairs = [
+            currency_pair for chunk_res in res for currency_pair in chunk_res
+        ]
+        # The set of input symbols should be equal to the set of output
+        # symbols since this is a resampling transformation.
+        if args.assert_all_resampled and set(resampled_currency_pairs) != set(
+            input_currency_pairs
         ):
             raise RuntimeError(
-                "Missing symbols in the resampled data: %s",
-                hprint.set_diff_to_str(
+                "Missing symbols in the resampled data: %s"
+                % hprint.set_diff_to_str(
                     input_currency_pairs,
-                    output_currency_pairs,
+                    resampled_currency_pairs,
                     sep_char=",",
                     add_space=True,
-                ),
+                )
             )
-        data_resampled["timestamp"] = data_resampled["timestamp"].apply(
-            lambda x: hdateti.convert_timestamp_to_unix_epoch(x, epoch_unit)
-        )
-        data_resampled = imvcdttrut.add_knowledge_timestamp_col(
-            data_resampled, "UTC"
-        )
-        _LOG.info(
-            hpandas.df_to_str(
-                data_resampled, print_shape_info=True, tag="Resampled data"
+        if not resampled_currency_pairs:
+            _LOG.warning("Resampled dataset is empty!")
+            return
+        # Save the chunks one at a time to bound the memory used.
+        for task in tasks:
+            staging_file_name = task[1]["staging_file_name"]
+            if not os.path.exists(staging_file_name):
+                # There is no resampled data for the chunk.
+                continue
+            data_resampled = hparque.from_parquet(staging_file_name)
+            # We sometimes run batch resampling tasks, for that it is more
+            # convenient to set mode as "append", in the default mode
+            # concurrent access to the single parquet file might no be possible
+            # if two processes need it at the same time.
+            imvcdeexut.save_parquet(
+                data_resampled,
+                dst_s3_path,
+                epoch_unit,
+                aws_profile,
+                "bid_ask",
+                mode="append",
             )
-        )
-        dst_s3_path = _get_s3_path_from_signature(
-            args.dst_signature, args.dst_s3_path
-        )
-        # We sometimes run batch resampling tasks, for that it is more convenient to
-        # set mode as "append", in the default mode concurrent access to the single
-        # parquet file might no be possible if two processes need it at the same time.
-        imvcdeexut.save_parquet(
-            data_resampled,
-            dst_s3_path,
-            epoch_unit,
-            aws_profile,
-            "bid_ask",
-            mode="append",
-        )
-    else:
-        _LOG.warning("Resampled dataset is empty!")
 
 
 def _parse() -> argparse.ArgumentParser:
@@ -285,6 +410,35 @@ def _parse() -> argparse.ArgumentParser:
         type=int,
         help='Filter data to get top "n" levels of bid-ask data.',
     )
+    parser.add_argument(
+        "--num_symbols_per_chunk",
+        default=10,
+        action="store",
+        required=False,
+        type=int,
+        help="Number of symbols loaded and resampled together, which bounds "
+        "the memory used by each process",
+    )
+    parser.add_argument(
+        "--log_dir",
+        default=None,
+        action="store",
+        required=False,
+        type=str,
+        help="Dir to save the log of the parallel execution to; by default "
+        "a temp dir",
+    )
+    parser.add_argument(
+        "--num_threads",
+        default="serial",
+        action="store",
+        required=False,
+        type=str,
+        help="""
+Number of processes resampling the chunks of symbols in parallel:
+- '-1' to use all CPUs;
+- 'serial' to resample the chunks one after the other""",
+    )
     parser = hparser.add_verbosity_arg(parser)
     return parser
 
@@ -0,0 +1,507 @@
+"""
+Resample bid/ask data to 1 minute while it is downloaded.
+
+Import as:
+
+import im_v2.common.data.transform.streaming_bid_ask_resampler as imvcdtsbar
+"""
+
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+# Point-in-time columns that are resampled, in the order of the columns
+# of `imvcdttrut.resample_bid_ask_data_to_1min()`.
+_COLS = [
+    "bid_price",
+    "bid_size",
+    "ask_price",
+    "ask_size",
+    "bid_ask_midpoint",
+    "half_spread",
+    "log_size_imbalance",
+]
+_BID_ASK_MIDPOINT_IDX = _COLS.index("bid_ask_midpoint")
+_LOG_SIZE_IMBALANCE_IDX = _COLS.index("log_size_imbalance")
+_MINUTE_IN_MS = 60000
+
+
+def _nan_to_zero(value: float) -> float:
+    return 0.0 if math.isnan(value) else value
+
+
+# #############################################################################
+# _BidAskResamplingState
+# #############################################################################
+
+
+class _BidAskResamplingState:
+    """
+    Running state to resample one level of the order book of one symbol.
+
+    The state mirrors the steps of
+    `imvcdttrut.resample_bid_ask_data_to_1min()`:
+    - the open bin of the sampling grid (e.g., 100ms) with the last values
+      received
+    - the forward-filled values of the last closed bin of the grid, used to
+      compute the differences between consecutive bins
+    - the aggregates of the bins of the open 1-minute bar
+
+    The values are stored in lists of floats, since updating few values is
+    faster with Python than with NumPy.
+    """
+
+    def __init__(self, grid_step_in_ms: int, ffill_limit: int) -> None:
+        """
+        Constructor.
+
+        :param grid_step_in_ms: resolution of the sampling grid
+        :param ffill_limit: max number of empty bins of the grid to forward
+            fill with the last values
+        """
+        self._grid_step_in_ms = grid_step_in_ms
+        self._ffill_limit = ffill_limit
+        num_cols = len(_COLS)
+        # Label of the last closed bin of the grid.
+        self._last_bin_label: Optional[int] = None
+        # Label and values of the bin receiving the data.
+        self._open_bin_label: Optional[int] = None
+        self._open_bin_values: List[float] = []
+        # Last values received and the number of closed bins since then.
+        self._last_valid_values = [math.nan] * num_cols
+        self._num_bins_since_last_valid = [0] * num_cols
+        # Values of the last closed bin, after forward filling.
+        self._prev_bid_ask_midpoint = math.nan
+        self._prev_bid_ask_midpoint_diff = math.nan
+        self._prev_log_size_imbalance = math.nan
+        # Aggregates of the open 1-minute bar.
+        self._bar_label: Optional[int] = None
+        self._reset_bar()
+        # Finished 1-minute bars, as (bar label, values).
+        self._finished_bars: List[Tuple[int, List[float]]] = []
+
+    def add(self, timestamp_in_ms: int, values: List[float]) -> bool:
+        """
+        Add the values received at `timestamp_in_ms`.
+
+        :param values: values of the columns in `_COLS`
+        :return: whether the values were added, i.e., they are not older
+            than the bins already closed
+        """
+        bin_label = self._get_bin_label(timestamp_in_ms)
+        last_bin_label = self._last_bin_label
+        if last_bin_label is not None and bin_label <= last_bin_label:
+            return False
+        open_bin_label = self._open_bin_label
+        if open_bin_label is not None and bin_label > open_bin_label:
+            self.close_bins(bin_label - self._grid_step_in_ms)
+        if self._open_bin_label is None:
+            self._open_bin_label = bin_label
+            self._open_bin_values = list(values)
+        else:
+            # Keep the last value of each column, like `resample().last()`.
+            for idx, value in enumerate(values):
+                if not math.isnan(value):
+                    self._open_bin_values[idx] = value
+        return True
+
+    def close_bins(self, end_bin_label: int) -> None:
+        """
+        Close all the bins of the grid up to `end_bin_label`, forward filling
+        the empty bins.
+        """
+        if (
+            self._open_bin_label is not None
+            and self._open_bin_label <= end_bin_label
+        ):
+            if self._last_bin_label is not None:
+                self._add_empty_bins(
+                    self._open_bin_label - self._grid_step_in_ms
+                )
+            self._add_open_bin()
+        if self._last_bin_label is not None:
+            self._add_empty_bins(end_bin_label)
+
+    def flush(self) -> None:
+        """
+        Close the open bin and the open 1-minute bar.
+        """
+        if self._open_bin_label is not None:
+            self.close_bins(self._open_bin_label)
+        if self._bar_label is not None:
+            self._finish_bar()
+
+    def pop_finished_bars(self) -> List[Tuple[int, List[float]]]:
+        """
+        Return the finished 1-minute bars and forget them.
+        """
+        finished_bars = self._finished_bars
+        self._finished_bars = []
+        return finished_bars
+
+    def _get_bin_label(self, timestamp_in_ms: int) -> int:
+        """
+        Get the label of the bin of the grid containing `timestamp_in_ms`.
+
+        The bins are closed and labeled on the right, like in
+        `cfinresa.resample()`.
+        """
+        grid_step_in_ms = self._grid_step_in_ms
+        return -(-timestamp_in_ms // grid_step_in_ms) * grid_step_in_ms
+
+    def _add_open_bin(self) -> None:
+        """
+        Close the bin receiving the data.
+        """
+        values = self._open_bin_values
+        last_valid_values = self._last_valid_values
+        num_bins_since_last_valid = self._num_bins_since_last_valid
+        filled_values = []
+        for idx, value in enumerate(values):
+            if math.isnan(value):
+                # Forward fill the missing values, like `ffill(limit=...)`.
+                if num_bins_since_last_valid[idx] < self._ffill_limit:
+                    value = last_valid_values[idx]
+                num_bins_since_last_valid[idx] += 1
+            else:
+                last_valid_values[idx] = value
+                num_bins_since_last_valid[idx] = 0
+            filled_values.append(value)
+        self._add_bins(filled_values, self._open_bin_label, 1)
+        self._open_bin_label = None
+        self._open_bin_values = []
+
+    def _add_empty_bins(self, end_bin_label: int) -> None:
+        """
+        Close the empty bins after the last closed bin up to `end_bin_label`.
+
+        The empty bins are split in runs with the same forward-filled values
+        in the same 1-minute bar, and each run is added at once.
+        """
+        hdbg.dassert_is_not(self._last_bin_label, None)
+        last_valid_values = self._last_valid_values
+        num_bins_since_last_valid = self._num_bins_since_last_valid
+        while self._last_bin_label < end_bin_label:
+            first_bin_label = self._last_bin_label + self._grid_step_in_ms
+            # Stop at the end of the 1-minute bar.
+            bar_label = -(-first_bin_label // _MINUTE_IN_MS) * _MINUTE_IN_MS
+            last_bin_label = min(end_bin_label, bar_label)
+            num_bins = (
+                last_bin_label - first_bin_label
+            ) // self._grid_step_in_ms + 1
+            # Stop when a value can't be forward filled anymore.
+            values = []
+            for idx, value in enumerate(last_valid_values):
+                num_filled_bins = (
+                    self._ffill_limit - num_bins_since_last_valid[idx]
+                )
+                if num_filled_bins > 0 and not math.isnan(value):
+                    num_bins = min(num_bins, num_filled_bins)
+                else:
+                    value = math.nan
+                values.append(value)
+            self._add_bins(values, first_bin_label, num_bins)
+            for idx in range(len(num_bins_since_last_valid)):
+                num_bins_since_last_valid[idx] += num_bins
+
+    def _add_bins(
+        self, values: List[float], first_bin_label: int, num_bins: int
+    ) -> None:
+        """
+        Add `num_bins` consecutive bins with the same `values` in the same
+        1-minute bar.
+        """
+        bar_label = -(-first_bin_label // _MINUTE_IN_MS) * _MINUTE_IN_MS
+        if self._bar_label is None:
+            self._bar_label = bar_label
+        hdbg.dassert_eq(self._bar_label, bar_label)
+        # Update the open / close / high / low / mean aggregates, skipping
+        # NaNs like `resample().agg()`.
+        for idx, value in enumerate(values):
+            if math.isnan(value):
+                continue
+            if math.isnan(self._first_values[idx]):
+                self._first_values[idx] = value
+            self._last_values[idx] = value
+            if not self._max_values[idx] >= value:
+                self._max_values[idx] = value
+            if not self._min_values[idx] <= value:
+                self._min_values[idx] = value
+            self._sum_values[idx] += value * num_bins
+            self._counts[idx] += num_bins
+        # Update the variance / autocovariance of the midpoint differences.
+        # The differences between the bins of the run are 0.
+        bid_ask_midpoint = values[_BID_ASK_MIDPOINT_IDX]
+        bid_ask_midpoint_diff = bid_ask_midpoint - self._prev_bid_ask_midpoint
+        self._bid_ask_midpoint_var += _nan_to_zero(bid_ask_midpoint_diff**2)
+        self._bid_ask_midpoint_autocovar += _nan_to_zero(
+            bid_ask_midpoint_diff * self._prev_bid_ask_midpoint_diff
+        )
+        if num_bins > 1:
+            bid_ask_midpoint_diff = bid_ask_midpoint - bid_ask_midpoint
+        self._prev_bid_ask_midpoint = bid_ask_midpoint
+        self._prev_bid_ask_midpoint_diff = bid_ask_midpoint_diff
+        # Update the variance / autocovariance of the log size imbalance.
+        log_size_imbalance = values[_LOG_SIZE_IMBALANCE_IDX]
+        log_size_imbalance_var = _nan_to_zero(log_size_imbalance**2)
+        self._log_size_imbalance_var += log_size_imbalance_var * num_bins
+        self._log_size_imbalance_autocovar += (
+            _nan_to_zero(log_size_imbalance * self._prev_log_size_imbalance)
+            + log_size_imbalance_var * (num_bins - 1)
+        )
+        self._prev_log_size_imbalance = log_size_imbalance
+        #
+        self._last_bin_label = (
+            first_bin_label + (num_bins - 1) * self._grid_step_in_ms
+        )
+        if self._last_bin_label == self._bar_label:
+            self._finish_bar()
+
+    def _finish_bar(self) -> None:
+        """
+        Store the open 1-minute bar and start a new one.
+        """
+        mean_values = [
+            sum_value / count if count > 0 else math.nan
+            for sum_value, count in zip(self._sum_values, self._counts)
+        ]
+        values = (
+            self._first_values
+            + self._last_values
+            + self._max_values
+            + self._min_values
+            + mean_values
+            + [
+                self._bid_ask_midpoint_var,
+                self._bid_ask_midpoint_autocovar,
+                self._log_size_imbalance_var,
+                self._log_size_imbalance_autocovar,
+            ]
+        )
+        self._finished_bars.append((self._bar_label, values))
+        self._bar_label = None
+        self._reset_bar()
+
+    def _reset_bar(self) -> None:
+        num_cols = len(_COLS)
+        self._first_values = [math.nan] * num_cols
+        self._last_values = [math.nan] * num_cols
+        self._max_values = [math.nan] * num_cols
+        self._min_values = [math.nan] * num_cols
+        self._sum_values = [0.0] * num_cols
+        self._counts = [0] * num_cols
+        self._bid_ask_midpoint_var = 0.0
+        self._bid_ask_midpoint_autocovar = 0.0
+        self._log_size_imbalance_var = 0.0
+        self._log_size_imbalance_autocovar = 0.0
+
+
+# #############################################################################
+# StreamingBidAskResampler
+# #############################################################################
+
+
+class StreamingBidAskResampler:
+    """
+    Resample raw bid/ask data to 1 minute incrementally, as it is downloaded.
+
+    This computes the same bars as
+    `imvcdttrut.transform_and_resample_rt_bid_ask_data()` without keeping the
+    raw data: the state of each symbol and level of the order book is updated
+    in constant time for each row of raw data, and each 1-minute bar is
+    returned once it is finished.
+
+    E.g., in a downloader:
+    ```
+    resampler = StreamingBidAskResampler()
+    ...
+    resampler.update(df_raw)
+    ...
+    # After the minute ending at `end_timestamp` is over.
+    df_resampled = resampler.get_finished_bars(end_timestamp)
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        time_resolution_in_ms: int = 200,
+        ffill_limit: int = 601,
+        max_num_levels: int = 1,
+    ) -> None:
+        """
+        Constructor.
+
+        :param time_resolution_in_ms: same as in
+            `imvcdttrut.resample_bid_ask_data_to_1min()`, the data is
+            sampled on a grid of `time_resolution_in_ms / 2`
+        :param ffill_limit: max number of bins of the grid to forward fill, as
+            in `imvcdttrut.resample_bid_ask_data_to_1min()`
+        :param max_num_levels: resample the order book levels up to
+            `max_num_levels`
+        """
+        hdbg.dassert_lt(0, time_resolution_in_ms)
+        hdbg.dassert_eq(
+            _MINUTE_IN_MS % (time_resolution_in_ms // 2),
+            0,
+            "The grid must divide a minute",
+        )
+        hdbg.dassert_lte(0, ffill_limit)
+        hdbg.dassert_lte(1, max_num_levels)
+        self._grid_step_in_ms = time_resolution_in_ms // 2
+        self._ffill_limit = ffill_limit
+        self._max_num_levels = max_num_levels
+        self._exchange_id: Optional[str] = None
+        self._states: Dict[Tuple[str, int], _BidAskResamplingState] = {}
+        self._num_late_rows = 0
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add raw bid/ask data.
+
+        The rows with data older than the grid bins already closed (e.g.,
+        because `get_finished_bars()` closed their minute) are discarded.
+
+        :param df: raw bid/ask data from a single exchange in the DB format,
+            e.g., from `imvcdttrut.transform_raw_websocket_data()`, with
+            increasing timestamps for each symbol and level
+        """
+        if df.empty:
+            return
+        exchange_ids = df["exchange_id"].unique()
+        hdbg.dassert_eq(len(exchange_ids), 1)
+        if self._exchange_id is None:
+            self._exchange_id = exchange_ids[0]
+        hdbg.dassert_eq(self._exchange_id, exchange_ids[0])
+        df = df[df["level"] <= self._max_num_levels]
+        # Compute the point-in-time derived columns on all the rows at once.
+        bid_price = df["bid_price"].to_numpy(dtype=np.float64)
+        bid_size = df["bid_size"].to_numpy(dtype=np.float64)
+        ask_price = df["ask_price"].to_numpy(dtype=np.float64)
+        ask_size = df["ask_size"].to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_size_imbalance = np.log(bid_size) - np.log(ask_size)
+        values = np.column_stack(
+            [
+                bid_price,
+                bid_size,
+                ask_price,
+                ask_size,
+                0.5 * (ask_price + bid_price),
+                0.5 * (ask_price - bid_price),
+                log_size_imbalance,
+            ]
+        )
+        values = values.tolist()
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64).tolist()
+        keys = zip(df["currency_pair"].tolist(), df["level"].tolist())
+        for idx, key in enumerate(keys):
+            state = self._states.get(key)
+            if state is None:
+                state = _BidAskResamplingState(
+                    self._grid_step_in_ms, self._ffill_limit
+                )
+                self._states[key] = state
+            is_added = state.add(timestamps[idx], values[idx])
+            if not is_added:
+                self._num_late_rows += 1
+                _LOG.warning(
+                    "Discarding late row for %s at timestamp=%s",
+                    key,
+                    timestamps[idx],
+                )
+
+    def get_finished_bars(self, end_timestamp: pd.Timestamp) -> pd.DataFrame:
+        """
+        Return the finished 1-minute bars that were not returned yet.
+
+        The bars ending at or before `end_timestamp` are considered finished
+        for all the symbols, forward filling the symbols without data up to
+        `end_timestamp`. The bars followed by data are finished as well.
+
+        :param end_timestamp: end of the last finished minute
+        :return: resampled data in the format of
+            `imvcdttrut.transform_and_resample_rt_bid_ask_data()`
+        """
+        end_timestamp_in_ms = hdateti.convert_timestamp_to_unix_epoch(
+            end_timestamp, unit="ms"
+        )
+        end_bar_label = end_timestamp_in_ms // _MINUTE_IN_MS * _MINUTE_IN_MS
+        for state in self._states.values():
+            state.close_bins(end_bar_label)
+        return self._pop_finished_bars()
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Return all the 1-minute bars not returned yet, including the
+        unfinished ones.
+
+        This returns the same bars as
+        `imvcdttrut.transform_and_resample_rt_bid_ask_data()` run on all the
+        data passed to `update()`.
+        """
+        for state in self._states.values():
+            state.flush()
+        return self._pop_finished_bars()
+
+    def get_num_late_rows(self) -> int:
+        """
+        Return the number of rows discarded because they were late.
+        """
+        return self._num_late_rows
+
+    def _pop_finished_bars(self) -> pd.DataFrame:
+        rows = []
+        for (currency_pair, level), state in self._states.items():
+            for bar_label, values in state.pop_finished_bars():
+                rows.append((bar_label, values, currency_pair, level))
+        columns = self._get_resampled_columns()
+        if not rows:
+            df = pd.DataFrame(
+                columns=["timestamp"]
+                + columns
+                + ["exchange_id", "currency_pair", "level"]
+            )
+            return df
+        df = pd.DataFrame([row[1] for row in rows], columns=columns)
+        df.insert(0, "timestamp", np.array([row[0] for row in rows]))
+        df["exchange_id"] = self._exchange_id
+        df["currency_pair"] = [row[2] for row in rows]
+        df["level"] = np.array([row[3] for row in rows], dtype=np.int64)
+        df = df.sort_values(["currency_pair", "level", "timestamp"])
+        df = df.reset_index(drop=True)
+        return df
+
+    def _get_resampled_columns(self) -> List[str]:
+        """
+        Get the names of the resampled columns, as in
+        `imvcdttrut.transform_and_resample_rt_bid_ask_data()`.
+        """
+        price_cols = ["bid_price", "ask_price"]
+        columns = [f"{col}_open" for col in _COLS]
+        columns += [f"{col}_close" for col in _COLS]
+        columns += [
+            f"{col}_high" if col in price_cols else f"{col}_max"
+            for col in _COLS
+        ]
+        columns += [
+            f"{col}_low" if col in price_cols else f"{col}_min"
+            for col in _COLS
+        ]
+        columns += [f"{col}_mean" for col in _COLS]
+        rule = f"{self._grid_step_in_ms}ms"
+        columns += [
+            f"bid_ask_midpoint_var_{rule}",
+            f"bid_ask_midpoint_autocovar_{rule}",
+            f"log_size_imbalance_var_{rule}",
+            f"log_size_imbalance_autocovar_{rule}",
+        ]
+        return columns
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+import helpers.hunit_test as hunitest
+import im_v2.common.data.transform.streaming_bid_ask_resampler as imvcdtsbar
+import im_v2.common.data.transform.transform_utils as imvcdttrut
+
+
+def _get_raw_bid_ask_data() -> pd.DataFrame:
+    """
+    Build raw bid/ask data for 2 symbols and 2 levels.
+
+    The data has gaps longer than the forward fill limit of the resampling
+    and gaps spanning whole minutes.
+    """
+    rng = np.random.default_rng(seed=0)
+    dfs = []
+    for currency_pair in ["BTC_USDT", "ETH_USDT"]:
+        num_timestamps = 600
+        time_diffs = rng.integers(1, 400, num_timestamps)
+        time_diffs[150] = 75000
+        time_diffs[300] = 59000
+        time_diffs[450] = 200000
+        timestamps = 1683295200037 + np.cumsum(time_diffs)
+        for level in [1, 2]:
+            bid_price = 100 + rng.normal(size=num_timestamps)
+            df = pd.DataFrame(
+                {
+                    "id": 0,
+                    "timestamp": timestamps,
+                    "bid_size": rng.random(num_timestamps),
+                    "bid_price": bid_price,
+                    "ask_size": rng.random(num_timestamps),
+                    "ask_price": bid_price + 0.1 * rng.random(num_timestamps),
+                    "currency_pair": currency_pair,
+                    "exchange_id": "binance",
+                    "level": level,
+                    "end_download_timestamp": 0,
+                    "knowledge_timestamp": 0,
+                }
+            )
+            dfs.append(df)
+    df = pd.concat(dfs).sort_values("timestamp", kind="stable")
+    df = df.reset_index(drop=True)
+    return df
+
+
+class TestStreamingBidAskResampler1(hunitest.TestCase):
+    def get_expected(self, df: pd.DataFrame) -> pd.DataFrame:
+        expected = imvcdttrut.transform_and_resample_rt_bid_ask_data(df.copy())
+        expected = expected.sort_values(["currency_pair", "level", "timestamp"])
+        expected = expected.reset_index(drop=True)
+        return expected
+
+    def test_flush1(self) -> None:
+        """
+        Check that the bars match the batch resampling of all the data.
+        """
+        df = _get_raw_bid_ask_data()
+        resampler = imvcdtsbar.StreamingBidAskResampler()
+        resampler.update(df)
+        actual = resampler.flush()
+        expected = self.get_expected(df)
+        self.assertEqual(actual.columns.to_list(), expected.columns.to_list())
+        pd.testing.assert_frame_equal(
+            actual, expected, check_dtype=False, rtol=1e-9
+        )
+
+    def test_get_finished_bars1(self) -> None:
+        """
+        Check that the bars returned minute by minute while the data is
+        received match the batch resampling of all the data.
+        """
+        df = _get_raw_bid_ask_data()
+        resampler = imvcdtsbar.StreamingBidAskResampler()
+        dfs = []
+        for chunk in np.array_split(df, 40):
+            resampler.update(chunk)
+            # Close the minutes ended 5 seconds before the last data.
+            end_timestamp = pd.Timestamp(
+                chunk["timestamp"].max() - 5000, unit="ms", tz="UTC"
+            )
+            df_resampled = resampler.get_finished_bars(end_timestamp)
+            # The minutes that are not over are not returned.
+            self.assertTrue(
+                (df_resampled["timestamp"] < chunk["timestamp"].max()).all()
+            )
+            dfs.append(df_resampled)
+        dfs.append(resampler.flush())
+        actual = pd.concat(dfs)
+        actual = actual.sort_values(["currency_pair", "level", "timestamp"])
+        actual = actual.reset_index(drop=True)
+        expected = self.get_expected(df)
+        pd.testing.assert_frame_equal(
+            actual, expected, check_dtype=False, rtol=1e-9
+        )
+        self.assertEqual(resampler.get_num_late_rows(), 0)
+
+    def test_late_rows1(self) -> None:
+        """
+        Check that the data received after its minute was closed is discarded.
+        """
+        df = _get_raw_bid_ask_data()
+        df = df[df["level"] == 1]
+        resampler = imvcdtsbar.StreamingBidAskResampler()
+        resampler.update(df.iloc[100:])
+        end_timestamp = pd.Timestamp(df["timestamp"].iloc[100], unit="ms")
+        _ = resampler.get_finished_bars(end_timestamp)
+        resampler.update(df.iloc[:100])
+        self.assertEqual(resampler.get_num_late_rows(), 100)
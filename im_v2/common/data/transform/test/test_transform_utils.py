@@ -1,10 +1,14 @@
 import os
 import unittest.mock as umock
+from typing import List
 
+import numpy as np
 import pandas as pd
 import pytest
 
+import core.finance.bid_ask as cfibiask
 import data_schema.dataset_schema_utils as dsdascut
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hmoto as hmoto
 import helpers.hpandas as hpandas
@@ -776,3 +780,123 @@ class TestResampleBidAskData2(hunitest.TestCase):
         scratch_dir = self.get_scratch_space()
         aws_profile = "ck"
         hs3.copy_data_from_s3_to_local_dir(s3_input_dir, scratch_dir, aws_profile)
+
+
+# #############################################################################
+
+
+class TestResampleCurrencyPairs(hunitest.TestCase):
+    """
+    Test resampling chunks of symbols stored in a local Parquet dataset.
+    """
+
+    def get_src_data(self) -> pd.DataFrame:
+        """
+        Build 200ms bid/ask data in long format for 3 symbols and 2 levels.
+        """
+        rng = np.random.default_rng(seed=0)
+        timestamps = 1680307200000 + np.arange(0, 180000, 200)
+        num_timestamps = len(timestamps)
+        dfs = []
+        for currency_pair in ["BTC_USDT", "ETH_USDT", "SOL_USDT"]:
+            for level in [1, 2]:
+                bid_price = 100 + rng.normal(size=num_timestamps)
+                df = pd.DataFrame(
+                    {
+                        "timestamp": timestamps,
+                        "bid_size": rng.random(num_timestamps),
+                        "bid_price": bid_price,
+                        "ask_size": rng.random(num_timestamps),
+                        "ask_price": bid_price + 0.1,
+                        "currency_pair": currency_pair,
+                        "exchange_id": "binance",
+                        "level": level,
+                        "knowledge_timestamp": pd.Timestamp(
+                            "2023-04-02", tz="UTC"
+                        ),
+                    }
+                )
+                dfs.append(df)
+        data = pd.concat(dfs).reset_index(drop=True)
+        return data
+
+    def helper(self, currency_pairs: List[str]) -> pd.DataFrame:
+        """
+        Resample a chunk of symbols and load the saved data.
+        """
+        scratch_dir = self.get_scratch_space()
+        src_dir = os.path.join(scratch_dir, "src")
+        dst_dir = os.path.join(scratch_dir, "dst")
+        data = self.get_src_data()
+        imvcdeexut.save_parquet(
+            data,
+            src_dir,
+            "ms",
+            None,
+            "bid_ask",
+            mode="append",
+            partition_mode="by_year_month_day",
+        )
+        filters = imvcdtrdbad._build_parquet_filters(
+            "archived_200ms",
+            "2023-04-01T00:00:00+00:00",
+            "2023-04-01T00:02:59.999+00:00",
+            "ms",
+            [1, 2],
+        )
+        resampled_currency_pairs = imvcdtrdbad._resample_currency_pairs(
+            currency_pairs,
+            src_dir,
+            dst_dir,
+            filters,
+            "archived_200ms",
+            "ms",
+            2,
+            True,
+            None,
+            False,
+            1,
+        )
+        self.assertEqual(resampled_currency_pairs, currency_pairs)
+        actual = hparque.from_parquet(dst_dir)
+        actual = actual.reset_index(drop=True)
+        return actual
+
+    def test1(self) -> None:
+        """
+        Check that only the symbols in the chunk are resampled and that the
+        data matches the resampling of all the symbols at once.
+        """
+        currency_pairs = ["BTC_USDT", "SOL_USDT"]
+        actual = self.helper(currency_pairs)
+        # Compute the expected data.
+        data = self.get_src_data()
+        data["timestamp"] = pd.to_datetime(
+            data["timestamp"], unit="ms", utc=True
+        )
+        data = data.set_index("timestamp")
+        data = cfibiask.transform_bid_ask_long_data_to_wide(data, "timestamp")
+        expected = (
+            imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_to_1min(
+                data, number_levels_of_order_book=2
+            )
+        )
+        expected = expected[expected["currency_pair"].isin(currency_pairs)]
+        # Compare.
+        self.assertEqual(
+            sorted(actual["currency_pair"].unique()), currency_pairs
+        )
+        actual = actual.sort_values(["currency_pair", "timestamp"])
+        expected = expected.reset_index().sort_values(
+            ["currency_pair", "timestamp"]
+        )
+        self.assert_equal(
+            str(actual["timestamp"].to_list()),
+            str(
+                hdateti.convert_timestamps_to_unix_epoch(
+                    expected["timestamp"]
+                ).to_list()
+            ),
+        )
+        for col in ["level_1.bid_price.close", "level_2.ask_size.mean"]:
+            np.testing.assert_allclose(actual[col], expected[col])
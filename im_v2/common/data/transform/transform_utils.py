@@ -634,11 +634,9 @@ def transform_and_resample_rt_bid_ask_data(
     # Resetting index is needed before inserting to RDS,
     # because the column is passed to the query.
     df_resampled = df_resampled.reset_index()
-    # TODO(Juraj): librarize this, we tend to use .apply(hdateti.convert_timestamp_to_unix_epoch) but that's
-    # slow.
-    df_resampled["timestamp"] = (
-        df_resampled["timestamp"] - pd.Timestamp("1970-01-01")
-    ) // pd.Timedelta("1ms")
+    df_resampled["timestamp"] = hdateti.convert_timestamps_to_unix_epoch(
+        df_resampled["timestamp"], unit="ms"
+    )
     # Add back level column because DB table is in long format.
     df_resampled["level"] = 1
     return df_resampled
@@ -7,10 +7,11 @@ import im_v2.common.db.db_utils as imvcddbut
 """
 import abc
 import argparse
+import functools
 import logging
 import os
 from datetime import timedelta
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 import pandas as pd
 import psycopg2 as psycop
@@ -59,10 +60,15 @@ class DbConnectionManager:
     Provide a singleton-like functionality in order to avoid overhead of
     many short-lived DB connection. For simplicity the class only
     supports setting up a DB connection to exactly one stage.
+
+    The class also stores a pool of connections for each stage, which can be
+    used concurrently, e.g., by the coroutines of an asyncio program running
+    queries with `hsql.execute_query_to_df_async()`.
     """
 
     connection = None
     db_stage = None
+    connection_pools: Dict[str, hsql.DbConnectionPool] = {}
 
     @classmethod
     def get_connection(cls, db_stage: str) -> hsql.DbConnection:
@@ -88,6 +94,34 @@ class DbConnectionManager:
         cls.db_stage = db_stage
         return cls.connection
 
+    @classmethod
+    def get_connection_pool(
+        cls, db_stage: str, *, max_num_connections: int = 4
+    ) -> hsql.DbConnectionPool:
+        """
+        Get a pool of connections to a DB stage. If the pool exists, return
+        the object, otherwise create it.
+
+        :param db_stage: DB stage to create connections to
+        :param max_num_connections: max number of connections in the pool
+        :return: pool of connections that can be passed to
+            `hsql.execute_query_to_df()` instead of a connection
+        """
+        if db_stage not in cls.connection_pools:
+            get_connection_func = functools.partial(
+                cls._get_new_connection, db_stage
+            )
+            cls.connection_pools[db_stage] = hsql.DbConnectionPool(
+                get_connection_func, max_num_connections
+            )
+        pool = cls.connection_pools[db_stage]
+        hdbg.dassert_eq(
+            pool.max_num_connections,
+            max_num_connections,
+            "The pool has already been created with a different size",
+        )
+        return pool
+
     # #########################################################################
     # Private helpers.
     # #########################################################################
@@ -586,6 +620,7 @@ def save_data_to_db(
     time_zone: str,
     *,
     add_knowledge_timestamp: bool = True,
+    use_copy: bool = False,
 ) -> None:
     """
     Save data into specified database table.
@@ -598,6 +633,8 @@ def save_data_to_db(
     :param db_table: name of the table to insert to.
     :param add_knowledge_timestamp: if True, adds a column with the value of current time
     :param time_zone: time zone used to add correct knowledge_timestamp to the data
+    :param use_copy: if True, stream the data with `COPY` through a staging
+        table, which is faster for large data (e.g., multi-level bid/ask data)
     """
     if data.empty:
         _LOG.warning("The DataFrame is empty, nothing to insert.")
@@ -612,7 +649,11 @@ def save_data_to_db(
         unique_columns = TRADES_UNIQUE_COLUMNS
     else:
         raise ValueError(f"Invalid data_type='{data_type}'")
-    hsql.execute_insert_on_conflict_do_nothing_query(
+    if use_copy:
+        insert_func = hsql.execute_copy_insert_on_conflict_do_nothing_query
+    else:
+        insert_func = hsql.execute_insert_on_conflict_do_nothing_query
+    insert_func(
         connection=db_connection,
         obj=data,
         table_name=db_table,
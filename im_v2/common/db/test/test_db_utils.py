@@ -222,6 +222,27 @@ class TestDbConnectionManager(hunitest.TestCase):
         with self.assertRaises(AttributeError):
             imvcddbut.DbConnectionManager.get_connection(DB_STAGE)
 
+    def test_get_connection_pool1(self) -> None:
+        """
+        Test that the `get_connection_pool` method returns the same pool for
+        a stage and that the pool creates the connections lazily.
+        """
+        self.mock_connection.closed = 0
+        with umock.patch.dict(
+            imvcddbut.DbConnectionManager.connection_pools, clear=True
+        ):
+            pool = imvcddbut.DbConnectionManager.get_connection_pool(DB_STAGE)
+            self.mock_get_connection_from_env_vars.assert_not_called()
+            with pool.get_connection() as connection:
+                self.assertIs(connection, self.mock_connection)
+            self.mock_get_connection_from_env_vars.assert_called_once()
+            # The pool is reused.
+            pool2 = imvcddbut.DbConnectionManager.get_connection_pool(DB_STAGE)
+            self.assertIs(pool, pool2)
+            with pool2.get_connection():
+                pass
+            self.mock_get_connection_from_env_vars.assert_called_once()
+
 
 class TestSaveDataToDb(hunitest.TestCase):
     # This will be run before and after each test.
@@ -7,6 +7,7 @@ import im_v2.crypto_chassis.data.client.crypto_chassis_clients as imvccdcccc
 import logging
 from typing import Optional
 
+import helpers.hparquet as hparque
 import im_v2.common.data.client as icdc
 
 _LOG = logging.getLogger(__name__)
@@ -39,6 +40,8 @@ class CryptoChassisHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        num_threads: int = 4,
+        tile_cache: Optional[hparque.ParquetTileCache] = None,
     ) -> None:
         """
         Constructor.
@@ -60,4 +63,6 @@ class CryptoChassisHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            num_threads=num_threads,
+            tile_cache=tile_cache,
         )
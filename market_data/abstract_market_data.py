@@ -6,8 +6,9 @@ import market_data.abstract_market_data as mdabmada
 
 import abc
 import asyncio
+import collections
 import logging
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -28,6 +29,9 @@ _TRACE = False
 
 AssetId = int
 
+# Max number of bar latencies to keep, i.e., one day of 1-minute bars.
+_MAX_NUM_BAR_LATENCIES = 24 * 60
+
 
 # #############################################################################
 # MarketData
@@ -179,6 +183,41 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             max_iterations = None
             _LOG.warning("No time limit is set via `max_iterations`.")
         self._max_iterations = max_iterations
+        # Store the timestamp of the last bars waited on and the latency
+        # between the end of the bar and when the bar was available to the
+        # caller. Only the last bars are kept so that the memory doesn't grow
+        # in a long-running system.
+        self._bar_latencies_in_secs: Deque[
+            Tuple[pd.Timestamp, float]
+        ] = collections.deque(maxlen=_MAX_NUM_BAR_LATENCIES)
+
+    def __str__(
+        self,
+        *,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        attr_names_to_skip = self._get_attr_names_to_skip(attr_names_to_skip)
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        *,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        attr_names_to_skip = self._get_attr_names_to_skip(attr_names_to_skip)
+        return super().__repr__(attr_names_to_skip=attr_names_to_skip)
+
+    def _get_attr_names_to_skip(
+        self, attr_names_to_skip: Optional[List[str]]
+    ) -> List[str]:
+        """
+        Add the attributes depending on how the object was used so far (e.g.,
+        caches and stats) to the attributes that are not printed.
+        """
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip = attr_names_to_skip + ["_bar_latencies_in_secs"]
+        return attr_names_to_skip
 
     # TODO(gp): Who needs this? It seems an implementation detail.
     @property
@@ -566,13 +605,16 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         time when there is no time (e.g., before the market opens).
         """
         last_end_time = self._get_last_end_time()
-        _LOG.debug(hprint.to_str("last_end_time"))
-        if last_end_time is not None:
-            # Convert to ET.
-            # TODO(Dan): Pass timezone from ctor in CmTask1000.
-            last_end_time = last_end_time.tz_convert("America/New_York")
-        if _TRACE:
-            _LOG.trace("-> ret=%s", last_end_time)
+        last_end_time = self._process_last_end_time(last_end_time)
+        return last_end_time
+
+    async def get_last_end_time_async(self) -> Optional[pd.Timestamp]:
+        """
+        Same as `get_last_end_time()` but without blocking the event loop
+        while querying the data source, when the derived class supports it.
+        """
+        last_end_time = await self._get_last_end_time_async()
+        last_end_time = self._process_last_end_time(last_end_time)
         return last_end_time
 
     def get_last_price(
@@ -674,7 +716,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         num_iter = 0
         while True:
             wall_clock_time = self.get_wall_clock_time()
-            last_db_end_time = self.get_last_end_time()
+            last_db_end_time = await self.get_last_end_time_async()
             # TODO(gp): Cleanup. We should use the new hasynci.poll().
             _LOG.debug(
                 "\n### waiting on last bar: "
@@ -706,8 +748,20 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
                 raise TimeoutError
             num_iter += 1
             if _TRACE:
-                _LOG.trace("Sleep for %s secs", self._sleep_in_secs)
-            await asyncio.sleep(self._sleep_in_secs)
+                _LOG.trace("Wait for %s secs", self._sleep_in_secs)
+            await self._wait_for_new_data()
+        # Record the latency between the end of the bar and the moment the
+        # bar is available to the caller (e.g., to start running a DAG).
+        bar_latency_in_secs = (
+            end_sampling_time - current_bar_timestamp
+        ).total_seconds()
+        self._bar_latencies_in_secs.append(
+            (current_bar_timestamp, bar_latency_in_secs)
+        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                hprint.to_str("current_bar_timestamp bar_latency_in_secs")
+            )
         if _TRACE:
             _LOG.trace(
                 "-> %s",
@@ -715,6 +769,20 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             )
         return start_sampling_time, end_sampling_time, num_iter
 
+    def get_bar_latencies(self) -> pd.Series:
+        """
+        Return the latency in seconds of the last bars waited on by
+        `wait_for_latest_data()`, indexed by bar timestamp.
+
+        At most `_MAX_NUM_BAR_LATENCIES` bars are returned.
+        """
+        srs = pd.Series(
+            dict(self._bar_latencies_in_secs),
+            name="bar_latency_in_secs",
+            dtype=float,
+        )
+        return srs
+
     # /////////////////////////////////////////////////////////////////////////////
 
     # TODO(gp): Cleanup. Use a better name _get_XYZ.
@@ -756,6 +824,22 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             _LOG.trace("last_start_time=%s", last_start_time)
         return last_start_time
 
+    @staticmethod
+    def _process_last_end_time(
+        last_end_time: Optional[pd.Timestamp],
+    ) -> Optional[pd.Timestamp]:
+        """
+        Convert the last `end_time` returned by the derived class to ET.
+        """
+        _LOG.debug(hprint.to_str("last_end_time"))
+        if last_end_time is not None:
+            # Convert to ET.
+            # TODO(Dan): Pass timezone from ctor in CmTask1000.
+            last_end_time = last_end_time.tz_convert("America/New_York")
+        if _TRACE:
+            _LOG.trace("-> ret=%s", last_end_time)
+        return last_end_time
+
     # /////////////////////////////////////////////////////////////////////////////
     # Derived class interface.
     # /////////////////////////////////////////////////////////////////////////////
@@ -764,6 +848,26 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
     def _get_last_end_time(self) -> Optional[pd.Timestamp]:
         ...
 
+    async def _get_last_end_time_async(self) -> Optional[pd.Timestamp]:
+        """
+        Same as `_get_last_end_time()` but without blocking the event loop.
+
+        By default, call `_get_last_end_time()`. Derived classes querying a
+        DB through a pool of connections override this method to run the
+        query in a thread.
+        """
+        return self._get_last_end_time()
+
+    async def _wait_for_new_data(self) -> None:
+        """
+        Wait up to `sleep_in_secs` seconds for new data to become available.
+
+        By default, sleep for `sleep_in_secs` seconds, i.e., poll the data.
+        Derived classes that are notified of new data override this method to
+        return as soon as new data is available.
+        """
+        await asyncio.sleep(self._sleep_in_secs)
+
     @abc.abstractmethod
     def _get_data(
         self,
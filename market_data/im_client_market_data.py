@@ -33,6 +33,9 @@ class ImClientMarketData(mdabmada.MarketData):
         super().__init__(*args, **kwargs)
         hdbg.dassert_isinstance(im_client, icdc.ImClient)
         self._im_client = im_client
+        # The last end time returned by `get_last_end_time()`, used to read
+        # only the data after it at the next call.
+        self._last_end_time_watermark: Optional[pd.Timestamp] = None
 
     def get_last_price(
         self,
@@ -67,6 +70,13 @@ class ImClientMarketData(mdabmada.MarketData):
         # TODO(gp): It should delegate to the ImClient.
         return True
 
+    def _get_attr_names_to_skip(
+        self, attr_names_to_skip: Optional[List[str]]
+    ) -> List[str]:
+        attr_names_to_skip = super()._get_attr_names_to_skip(attr_names_to_skip)
+        attr_names_to_skip = attr_names_to_skip + ["_last_end_time_watermark"]
+        return attr_names_to_skip
+
     def _get_data(
         self,
         start_ts: Optional[pd.Timestamp],
@@ -218,14 +228,23 @@ class ImClientMarketData(mdabmada.MarketData):
         # `bar_length_in_minutes * 2`. In order not to complicate the interface
         #  use 15T (the longest bar length) * 2.
         timedelta = pd.Timedelta("30T")
-        df = self.get_data_for_last_period(timedelta)
+        wall_clock_time = self.get_wall_clock_time()
+        start_ts = wall_clock_time - timedelta
+        watermark = self._last_end_time_watermark
+        if watermark is not None and start_ts < watermark <= wall_clock_time:
+            # Every asset has data up to the last end time found, so the
+            # data before it doesn't change the result and it is not read.
+            start_ts = watermark
+        # `ImClient` filters by end time, like in `get_data_for_last_period()`.
+        df = self.get_data_for_interval(
+            start_ts, wall_clock_time, self._end_time_col_name, self._asset_ids
+        )
         _LOG.debug(
             hpandas.df_to_str(
-                df, print_shape_info=True, tag="after get_data_for_last_period"
+                df, print_shape_info=True, tag="after get_data_for_interval"
             )
         )
         if df.empty:
-            wall_clock_time = self.get_wall_clock_time()
             _LOG.warning(
                 "No data found near wall_clock_time=%s", wall_clock_time
             )
@@ -241,11 +260,9 @@ class ImClientMarketData(mdabmada.MarketData):
             # We are looking for end timestamp that is present for all the assets.
             # In this case, it is 15:59 because at 16:00 the data is available
             # only for `asset1` and `asset3`.
-            df_max_ts_per_asset = (
-                df.reset_index()
-                .groupby(by=[self._asset_id_col])
-                .max()[self._end_time_col_name]
-            )
+            df_max_ts_per_asset = df.index.to_series().groupby(
+                df[self._asset_id_col]
+            ).max()
             _LOG.debug(
                 hpandas.df_to_str(
                     df_max_ts_per_asset,
@@ -254,5 +271,6 @@ class ImClientMarketData(mdabmada.MarketData):
                 )
             )
             ret = df_max_ts_per_asset.min()
+        self._last_end_time_watermark = ret
         _LOG.debug("-> ret=%s", ret)
         return ret
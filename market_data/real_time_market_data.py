@@ -4,8 +4,9 @@ Import as:
 import market_data.real_time_market_data as mdrtmada
 """
 
+import asyncio
 import logging
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 import pandas as pd
 
@@ -32,30 +33,55 @@ class RealTimeMarketData(mdabmada.MarketData):
 
     def __init__(
         self,
-        db_connection,
+        db_connection: Union[hsql.DbConnection, hsql.DbConnectionPool],
         table_name: str,
         where_clause: Optional[str],
         valid_id: Any,
         # Params from abstract `MarketData`.
         *args: Any,
+        notification_channel: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
         """
         Constructor.
 
+        :param db_connection: connection to the DB or pool of connections
+            - with a pool, `wait_for_latest_data()` queries the DB in a thread,
+              without blocking the event loop
         :param table_name: the table to use to get the data
         :param where_clause: an SQL where clause
             - E.g., `WHERE ...=... AND ...=...`
+        :param notification_channel: DB channel notified when data is inserted
+            in `table_name` (e.g., by the trigger created with
+            `hsql.get_create_insert_notification_trigger_query()`), so that
+            `wait_for_latest_data()` doesn't need to poll the DB
+            - `None` to poll the DB
         """
         super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        if notification_channel is not None:
+            hdbg.dassert(
+                not isinstance(db_connection, hsql.DbConnectionPool),
+                "Listening to notifications requires a dedicated connection",
+            )
         self.connection = db_connection
         self._table_name = table_name
         self._where_clause = where_clause
         self._valid_id = valid_id
+        self._notification_channel = notification_channel
+        # The connection subscribes to the notifications the first time it
+        # waits for data.
+        self._is_listening = False
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
 
+    def _get_attr_names_to_skip(
+        self, attr_names_to_skip: Optional[List[str]]
+    ) -> List[str]:
+        attr_names_to_skip = super()._get_attr_names_to_skip(attr_names_to_skip)
+        attr_names_to_skip = attr_names_to_skip + ["_is_listening"]
+        return attr_names_to_skip
+
     @staticmethod
     def _to_sql_datetime_string(dt: pd.Timestamp) -> str:
         """
@@ -119,61 +145,86 @@ class RealTimeMarketData(mdabmada.MarketData):
         """
         Return the last `end_time` available in the DB.
         """
+        query = self._get_last_end_time_query()
+        df = hsql.execute_query_to_df(self.connection, query)
+        end_time = self._get_end_time_from_df(df)
+        return end_time
+
+    async def _get_last_end_time_async(self) -> Optional[pd.Timestamp]:
+        if not isinstance(self.connection, hsql.DbConnectionPool):
+            # The queries on a single connection are run in the event loop,
+            # since they can't run concurrently with other queries on it.
+            return self._get_last_end_time()
+        query = self._get_last_end_time_query()
+        df = await hsql.execute_query_to_df_async(self.connection, query)
+        end_time = self._get_end_time_from_df(df)
+        return end_time
+
+    def _get_last_end_time_query(self) -> str:
+        """
+        Build the query returning the last `start_time` and `end_time`.
+        """
         # We assume that all the bars are inserted together in a single
         # transaction, so we can check for the max timestamp.
-        # Get the latest `start_time` (which is an index) with a query like:
+        # Get the latest `start_time` (which is an index) and the corresponding
+        # `end_time` with a single query like:
         #   ```
-        #   SELECT MAX(start_time)
+        #   SELECT start_time, end_time
         #     FROM bars_qa
         #     WHERE interval=60 AND region='AM' AND asset_id = '17085'
+        #     ORDER BY start_time DESC
+        #     LIMIT 1
         #   ```
+        # The `ORDER BY ... LIMIT 1` is resolved by scanning the index on
+        # `start_time` backwards, without a second round-trip to the DB.
         query = []
-        query.append(f"SELECT MAX({self._start_time_col_name})")
+        query.append(
+            f"SELECT {self._start_time_col_name}, {self._end_time_col_name}"
+        )
         query.append(f"FROM {self._table_name}")
         query.append("WHERE")
         if self._where_clause:
             query.append(f"{self._where_clause} AND")
         query.append(f"{self._asset_id_col} = '{self._valid_id}'")
+        query.append(f"ORDER BY {self._start_time_col_name} DESC")
+        query.append("LIMIT 1")
         query = " ".join(query)
         # _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
-        # Check that the `start_time` is a single value.
-        hdbg.dassert_eq(df.shape, (1, 1))
+        return query
+
+    @staticmethod
+    def _get_end_time_from_df(df: pd.DataFrame) -> pd.Timestamp:
+        """
+        Extract the last `end_time` from the result of the query.
+        """
+        # Check that there is a single row.
+        hdbg.dassert_eq(df.shape, (1, 2))
         start_time = df.iloc[0, 0]
-        # _LOG.debug("start_time from DB=%s", start_time)
-        # Get the `end_time` that corresponds to the last `start_time` with a
-        # query like:
-        #   ```
-        #   SELECT end_time
-        #     FROM bars_qa
-        #     WHERE interval=60 AND
-        #         region='AM' AND
-        #         start_time = '2021-10-07 15:50:00' AND
-        #         asset_id = '17085'
-        #   ```
-        query = []
-        query.append(f"SELECT {self._end_time_col_name}")
-        query.append(f"FROM {self._table_name}")
-        query.append("WHERE")
-        if self._where_clause:
-            query.append(f"{self._where_clause} AND")
-        query.append(
-            f"{self._start_time_col_name} = '{start_time}' AND "
-            + f"{self._asset_id_col} = '{self._valid_id}'"
-        )
-        query = " ".join(query)
-        # _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
-        # Check that the `end_time` is a single value.
-        hdbg.dassert_eq(df.shape, (1, 1))
-        end_time = df.iloc[0, 0]
-        # _LOG.debug("end_time from DB=%s", end_time)
+        end_time = df.iloc[0, 1]
+        # _LOG.debug("start_time=%s end_time=%s from DB", start_time, end_time)
         # We know that it should be `end_time = start_time + 1 minute`.
         start_time = pd.Timestamp(start_time, tz="UTC")
         end_time = pd.Timestamp(end_time, tz="UTC")
         hdbg.dassert_eq(end_time, start_time + pd.Timedelta(minutes=1))
         return end_time
 
+    async def _wait_for_new_data(self) -> None:
+        """
+        Wait for a notification that new data was inserted in the DB, up to
+        `sleep_in_secs` seconds.
+        """
+        if self._notification_channel is None:
+            # Poll the DB.
+            await super()._wait_for_new_data()
+            return
+        if not self._is_listening:
+            hsql.listen(self.connection, self._notification_channel)
+            self._is_listening = True
+        is_notified = await hsql.wait_for_notification(
+            self.connection, self._sleep_in_secs
+        )
+        _LOG.debug(hprint.to_str("is_notified"))
+
     def _get_sql_query(
         self,
         columns: Optional[List[str]],
@@ -262,3 +313,16 @@ class RealTimeMarketData2(mdimcmada.ImClientMarketData):
         self, im_client: icdc.SqlRealTimeImClient, *args, **kwargs
     ) -> None:
         super().__init__(*args, im_client=im_client, **kwargs)
+
+    async def _get_last_end_time_async(self) -> Optional[pd.Timestamp]:
+        if not self._im_client.has_connection_pool():
+            # The queries on a single connection are run in the event loop,
+            # since they can't run concurrently with other queries on it.
+            return self._get_last_end_time()
+        # Each query of the `ImClient` borrows a connection from the pool, so
+        # the queries can run in a thread.
+        loop = asyncio.get_running_loop()
+        last_end_time = await loop.run_in_executor(
+            None, self._get_last_end_time
+        )
+        return last_end_time
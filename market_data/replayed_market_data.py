@@ -4,12 +4,15 @@ Import as:
 import market_data.replayed_market_data as mdremada
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
+import numpy as np
 import pandas as pd
 
 import core.real_time as creatime
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -78,6 +81,14 @@ class ReplayedMarketData(mdabmada.MarketData):
             self._df.sort_values(
                 [self._end_time_col_name, self._asset_id_col], inplace=True
             )
+        # The df is static, so we cache the universe of asset ids and which
+        # columns are sorted, instead of recomputing them at every call.
+        self._asset_id_universe: Optional[Set[int]] = None
+        self._is_col_sorted: Dict[str, bool] = {}
+        # For each row in end time order, the earliest time when that row or a
+        # following one becomes available, together with the start and end
+        # times of the row. It is built the first time it is needed.
+        self._watermark_df: Optional[pd.DataFrame] = None
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
@@ -105,20 +116,35 @@ class ReplayedMarketData(mdabmada.MarketData):
             delay_in_secs = 0
         else:
             delay_in_secs = self._delay_in_secs
-        # TODO(gp): This assertion seems very slow. Move this check in a
-        #  centralized place instead of calling it every time, if possible.
         if asset_ids is not None:
             # Make sure that the requested asset_ids are in the df at some point.
             # This avoids mistakes when mocking data for certain assets, but request
             # data for assets that don't exist, which can make us wait for data that
             # will never come.
-            hdbg.dassert_is_subset(
-                asset_ids, self._df[self._asset_id_col].unique()
-            )
+            if self._asset_id_universe is None:
+                self._asset_id_universe = set(
+                    self._df[self._asset_id_col].unique()
+                )
+            hdbg.dassert_is_subset(asset_ids, self._asset_id_universe)
         # Filter the data by the current time.
         wall_clock_time = self.get_wall_clock_time()
         if _TRACE:
             _LOG.trace(hprint.to_str("wall_clock_time"))
+        if self._is_sorted(ts_col_name):
+            df_tmp = self._get_data_from_sorted_df(
+                start_ts,
+                end_ts,
+                ts_col_name,
+                asset_ids,
+                left_close,
+                right_close,
+                limit,
+                wall_clock_time,
+                delay_in_secs,
+            )
+            if _TRACE:
+                _LOG.trace("-> df_tmp=\n%s", hpandas.df_to_str(df_tmp))
+            return df_tmp
         df_tmp = creatime.get_data_as_of_datetime(
             self._df,
             self._knowledge_datetime_col_name,
@@ -151,12 +177,163 @@ class ReplayedMarketData(mdabmada.MarketData):
             _LOG.trace("-> df_tmp=\n%s", hpandas.df_to_str(df_tmp))
         return df_tmp
 
+    def _get_attr_names_to_skip(
+        self, attr_names_to_skip: Optional[List[str]]
+    ) -> List[str]:
+        attr_names_to_skip = super()._get_attr_names_to_skip(attr_names_to_skip)
+        attr_names_to_skip = attr_names_to_skip + [
+            "_asset_id_universe",
+            "_is_col_sorted",
+            "_watermark_df",
+        ]
+        return attr_names_to_skip
+
+    def _is_sorted(self, col_name: str) -> bool:
+        """
+        Return whether the values in `col_name` are sorted in increasing order.
+
+        The result is cached since the df doesn't change after the
+        construction.
+        """
+        if col_name not in self._is_col_sorted:
+            is_sorted = (
+                col_name in self._df.columns
+                and self._df[col_name].is_monotonic_increasing
+            )
+            self._is_col_sorted[col_name] = is_sorted
+        return self._is_col_sorted[col_name]
+
+    def _get_data_from_sorted_df(
+        self,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        ts_col_name: str,
+        asset_ids: Optional[List[int]],
+        left_close: bool,
+        right_close: bool,
+        limit: Optional[int],
+        wall_clock_time: pd.Timestamp,
+        delay_in_secs: int,
+    ) -> pd.DataFrame:
+        """
+        Same as `_get_data()` but using binary search on the sorted column
+        `ts_col_name` to find the rows in the requested interval.
+
+        The filters on knowledge time and asset ids are then applied only to
+        the rows in the interval and the result is materialized with a single
+        copy, so that the cost of a call doesn't depend on the size of the df.
+        """
+        # Handle `columns`.
+        if self._columns is not None:
+            hdbg.dassert_is_subset(self._columns, self._df.columns)
+            hdbg.dassert_in(ts_col_name, self._columns)
+            col_idxs = self._df.columns.get_indexer(self._columns)
+        else:
+            col_idxs = slice(None)
+        # Handle `period`.
+        hdateti.dassert_tz_compatible_timestamp_with_df(
+            wall_clock_time, self._df, self._knowledge_datetime_col_name
+        )
+        ts_srs = self._df[ts_col_name]
+        if start_ts is not None:
+            side = "left" if left_close else "right"
+            left_idx = ts_srs.searchsorted(start_ts, side)
+        else:
+            left_idx = 0
+        if end_ts is not None:
+            side = "right" if right_close else "left"
+            right_idx = ts_srs.searchsorted(end_ts, side)
+        else:
+            right_idx = self._df.shape[0]
+        right_idx = max(left_idx, right_idx)
+        # Filter the data by the current time.
+        datetime_eff = wall_clock_time - pd.Timedelta(seconds=delay_in_secs)
+        knowledge_srs = self._df[self._knowledge_datetime_col_name]
+        if self._is_sorted(self._knowledge_datetime_col_name):
+            # The knowledge time is sorted, so the data available at
+            # `datetime_eff` is a prefix of the df.
+            right_idx = min(
+                right_idx, knowledge_srs.searchsorted(datetime_eff, "right")
+            )
+            right_idx = max(left_idx, right_idx)
+            mask = np.ones(right_idx - left_idx, dtype=bool)
+        else:
+            mask = (
+                knowledge_srs.iloc[left_idx:right_idx] <= datetime_eff
+            ).to_numpy()
+        # Handle `asset_ids`.
+        if asset_ids is not None and not self._asset_id_universe.issubset(
+            asset_ids
+        ):
+            asset_id_values = self._df[self._asset_id_col].to_numpy()
+            mask &= np.isin(asset_id_values[left_idx:right_idx], asset_ids)
+        idxs = left_idx + np.flatnonzero(mask)
+        # Handle `limit`.
+        if limit:
+            hdbg.dassert_lte(1, limit)
+            idxs = idxs[:limit]
+        df_tmp = self._df.iloc[idxs, col_idxs]
+        return df_tmp
+
     def _get_last_end_time(self) -> Optional[pd.Timestamp]:
+        """
+        Return the last end time of the data available at the current time.
+        """
         # We need to find the last timestamp before the current time. We use
-        # `7W` but could also use all the data since we don't call the DB.
-        # TODO(gp): SELECT MAX(start_time) instead of getting all the data
-        #  and then find the max and use `start_time`
+        # `7D` but could also use all the data since we don't call the DB.
         timedelta = pd.Timedelta("7D")
+        if not self._is_sorted(self._end_time_col_name):
+            return self._get_last_end_time_from_data(timedelta)
+        if self._watermark_df is None:
+            self._watermark_df = self._get_watermark_df()
+        # Find the last row available at the current time with a binary search
+        # on the earliest knowledge time of the following rows.
+        wall_clock_time = self.get_wall_clock_time()
+        datetime_eff = wall_clock_time - pd.Timedelta(seconds=self._delay_in_secs)
+        num_rows = self._watermark_df[
+            self._knowledge_datetime_col_name
+        ].searchsorted(datetime_eff, "right")
+        ret = None
+        if num_rows > 0:
+            row = self._watermark_df.iloc[num_rows - 1]
+            # Like for `get_data_for_last_period()`, consider only the data
+            # that starts in the last `timedelta`.
+            if row[self._start_time_col_name] >= wall_clock_time - timedelta:
+                ret = row[self._end_time_col_name]
+        _LOG.debug("-> ret=%s", ret)
+        return ret
+
+    def _get_watermark_df(self) -> pd.DataFrame:
+        """
+        Compute the watermark of the rows for the asset ids of the object.
+
+        :return: df with the min knowledge time of each row and all the
+            following ones, and the start and end times of each row, in the
+            order of the end time
+        """
+        columns = [
+            self._knowledge_datetime_col_name,
+            self._start_time_col_name,
+            self._end_time_col_name,
+        ]
+        df = self._df
+        if self._asset_ids is not None:
+            df = df[df[self._asset_id_col].isin(self._asset_ids)]
+        watermark_df = df[columns].reset_index(drop=True)
+        knowledge_srs = watermark_df[self._knowledge_datetime_col_name]
+        # The min knowledge time from each row to the last one is sorted, so
+        # it can be searched.
+        watermark_df[self._knowledge_datetime_col_name] = knowledge_srs[
+            ::-1
+        ].cummin()[::-1]
+        return watermark_df
+
+    def _get_last_end_time_from_data(
+        self, timedelta: pd.Timedelta
+    ) -> Optional[pd.Timestamp]:
+        """
+        Return the last end time of the data in the last `timedelta`.
+        """
         df = self.get_data_for_last_period(timedelta)
         _LOG.debug(
             hpandas.df_to_str(df, print_shape_info=True, tag="after get_data")
@@ -168,6 +345,36 @@ class ReplayedMarketData(mdabmada.MarketData):
         _LOG.debug("-> ret=%s", ret)
         return ret
 
+    async def _wait_for_new_data(self) -> None:
+        """
+        Wait until the next row of the df becomes available, up to
+        `sleep_in_secs` seconds.
+
+        Since all the data is known in advance, the time when the next row
+        becomes available is computed from the knowledge time instead of
+        polling.
+        """
+        knowledge_col_name = self._knowledge_datetime_col_name
+        if not self._is_sorted(knowledge_col_name):
+            # Fall back to polling.
+            await super()._wait_for_new_data()
+            return
+        delay = pd.Timedelta(seconds=self._delay_in_secs)
+        wall_clock_time = self.get_wall_clock_time()
+        knowledge_srs = self._df[knowledge_col_name]
+        idx = knowledge_srs.searchsorted(wall_clock_time - delay, "right")
+        sleep_in_secs = self._sleep_in_secs
+        if idx < knowledge_srs.shape[0]:
+            # Wake up when the next row is available. This assumes that the
+            # replayed time advances at the speed of the event loop time;
+            # otherwise the caller wakes up early and waits again.
+            next_available_time = knowledge_srs.iloc[idx] + delay
+            secs_to_next = (next_available_time - wall_clock_time).total_seconds()
+            sleep_in_secs = min(sleep_in_secs, secs_to_next)
+        if _TRACE:
+            _LOG.trace("Sleep for %s secs", sleep_in_secs)
+        await asyncio.sleep(sleep_in_secs)
+
 
 # #############################################################################
 # Serialize / deserialize example of DB.
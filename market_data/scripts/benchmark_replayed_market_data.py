@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Benchmark `ReplayedMarketData.get_data_for_last_period()` as the replayed time
+advances through the data.
+
+The data is `--num_days` days of synthetic 1-minute bars for `--num_assets`
+assets. The benchmark is run both with sorted knowledge times and with knowledge
+times perturbed by a random delay, so that they are not sorted.
+
+> benchmark_replayed_market_data.py --num_days 30 --num_assets 100
+
+Import as:
+
+import market_data.scripts.benchmark_replayed_market_data as mdsbrmada
+"""
+
+import argparse
+import logging
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+import core.finance as cofinanc
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+import market_data.replayed_market_data as mdremada
+
+_LOG = logging.getLogger(__name__)
+
+# #############################################################################
+
+
+def _benchmark(df: pd.DataFrame, asset_ids: List[int], num_calls: int) -> None:
+    """
+    Time `get_data_for_last_period()` at different replayed times.
+    """
+    # Build a `ReplayedMarketData` with a wall clock that can be moved.
+    wall_clock_time = df["end_datetime"].min()
+    market_data = mdremada.ReplayedMarketData(
+        df,
+        "timestamp_db",
+        0,
+        "asset_id",
+        asset_ids,
+        "start_datetime",
+        "end_datetime",
+        None,
+        lambda: wall_clock_time,
+    )
+    timedelta = pd.Timedelta("10T")
+    end_times = df["end_datetime"].unique()
+    for pct in (0.1, 0.5, 0.9):
+        wall_clock_time = pd.Timestamp(end_times[int(pct * len(end_times))])
+        start_time = time.perf_counter()
+        for _ in range(num_calls):
+            market_data.get_data_for_last_period(timedelta)
+        elapsed_time = (time.perf_counter() - start_time) / num_calls
+        _LOG.info(
+            "wall_clock_time=%s: time per call=%.2fms",
+            wall_clock_time,
+            elapsed_time * 1e3,
+        )
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_days", action="store", type=int, default=30, help="Days of data"
+    )
+    parser.add_argument(
+        "--num_assets", action="store", type=int, default=100, help="Assets"
+    )
+    parser.add_argument(
+        "--num_calls",
+        action="store",
+        type=int,
+        default=100,
+        help="Number of calls for each replayed time",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_days)
+    # Generate the data.
+    start_datetime = pd.Timestamp("2000-01-03 09:31:00", tz="America/New_York")
+    end_datetime = start_datetime + pd.Timedelta(days=args.num_days)
+    asset_ids = list(range(1000, 1000 + args.num_assets))
+    df = cofinanc.generate_random_bars(start_datetime, end_datetime, asset_ids)
+    _LOG.info("df.shape=%s", df.shape)
+    _LOG.info("Sorted knowledge time")
+    _benchmark(df.copy(), asset_ids, args.num_calls)
+    _LOG.info("Unsorted knowledge time")
+    rng = np.random.default_rng(seed=1)
+    delays = rng.integers(0, 180, size=df.shape[0])
+    df["timestamp_db"] += pd.to_timedelta(delays, unit="s")
+    _benchmark(df, asset_ids, args.num_calls)
+
+
+if __name__ == "__main__":
+    _main(_parse())
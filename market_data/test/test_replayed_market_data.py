@@ -1,8 +1,11 @@
+import itertools
 import logging
-from typing import Any, Callable, Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+import core.finance as cofinanc
 import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
 import helpers.hpandas as hpandas
@@ -686,22 +689,41 @@ class TestReplayedMarketData4(hunitest.TestCase):
         """
         Wait for the market to open.
         """
-        start_time, end_time, num_iter = self._run()
+        start_time, end_time, num_iter, _ = self._run()
         # Check.
         expected_start_time = pd.Timestamp(
             "2000-01-03 09:31:00-05:00", tz="America/New_York"
         )
         self.assertEqual(start_time, expected_start_time)
-        #
+        # The bar is available at `09:31:10` and it is detected as soon as it is
+        # available, instead of after sleeping for `sleep_in_secs`.
         expected_end_time = pd.Timestamp(
-            "2000-01-03 09:31:30-05:00", tz="America/New_York"
+            "2000-01-03 09:31:10-05:00", tz="America/New_York"
         )
         self.assertEqual(end_time, expected_end_time)
         #
         expected_num_iter = 1
         self.assertEqual(num_iter, expected_num_iter)
 
-    def _run(self) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
+    def test_get_bar_latencies1(self) -> None:
+        """
+        Check the latency of the bar waited on.
+        """
+        _, _, _, market_data = self._run()
+        actual = market_data.get_bar_latencies()
+        # Check.
+        expected = pd.Series(
+            [10.0],
+            index=[
+                pd.Timestamp("2000-01-03 09:31:00-05:00", tz="America/New_York")
+            ],
+            name="bar_latency_in_secs",
+        )
+        pd.testing.assert_series_equal(actual, expected)
+
+    def _run(
+        self,
+    ) -> Tuple[pd.Timestamp, pd.Timestamp, int, mdremada.ReplayedMarketData]:
         """
         - Build a ReplayedMarketData
         - Run `is_last_bar_available()`
@@ -732,4 +754,175 @@ class TestReplayedMarketData4(hunitest.TestCase):
                 market_data.wait_for_latest_data(),
                 event_loop=event_loop,
             )
-        return start_time, end_time, num_iter
+        return start_time, end_time, num_iter, market_data
+
+
+# #############################################################################
+
+
+class TestReplayedMarketData5(hunitest.TestCase):
+    """
+    Test that `ReplayedMarketData._get_data()` using binary search on the
+    sorted df returns the same data as filtering the entire df.
+    """
+
+    @staticmethod
+    def get_expected_data(
+        market_data: mdremada.ReplayedMarketData,
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        ts_col_name: str,
+        asset_ids: List[int],
+        left_close: bool,
+        right_close: bool,
+        limit: Optional[int],
+    ) -> pd.DataFrame:
+        """
+        Filter the entire df by knowledge time, interval, and asset ids.
+        """
+        df = market_data._df
+        wall_clock_time = market_data.get_wall_clock_time()
+        mask = df["timestamp_db"] <= wall_clock_time
+        if left_close:
+            mask &= df[ts_col_name] >= start_ts
+        else:
+            mask &= df[ts_col_name] > start_ts
+        if right_close:
+            mask &= df[ts_col_name] <= end_ts
+        else:
+            mask &= df[ts_col_name] < end_ts
+        mask &= df["asset_id"].isin(asset_ids)
+        df = df[mask]
+        if limit:
+            df = df.head(limit)
+        return df
+
+    @staticmethod
+    def get_df(shuffle_knowledge_time: bool) -> pd.DataFrame:
+        """
+        Generate bars for 2 days and 5 assets.
+
+        :param shuffle_knowledge_time: whether to add a random delay to the
+            knowledge times, so that they are not sorted
+        """
+        start_datetime = pd.Timestamp(
+            "2000-01-03 09:31:00-05:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp(
+            "2000-01-04 16:00:00-05:00", tz="America/New_York"
+        )
+        asset_ids = [101, 102, 103, 104, 105]
+        df = cofinanc.generate_random_bars(start_datetime, end_datetime, asset_ids)
+        if shuffle_knowledge_time:
+            rng = np.random.default_rng(seed=1)
+            delays = rng.integers(0, 180, size=df.shape[0])
+            df["timestamp_db"] += pd.to_timedelta(delays, unit="s")
+        return df
+
+    def check_get_data(self, shuffle_knowledge_time: bool) -> None:
+        df = self.get_df(shuffle_knowledge_time)
+        all_asset_ids = [101, 102, 103, 104, 105]
+        replayed_timestamp = pd.Timestamp(
+            "2000-01-04 10:00:30-05:00", tz="America/New_York"
+        )
+        with hasynci.solipsism_context() as event_loop:
+            (
+                market_data,
+                _,
+            ) = mdmadaex.get_ReplayedTimeMarketData_from_df(
+                event_loop, replayed_timestamp, df
+            )
+            start_ts = pd.Timestamp(
+                "2000-01-04 09:50:00-05:00", tz="America/New_York"
+            )
+            end_ts = pd.Timestamp(
+                "2000-01-04 10:05:00-05:00", tz="America/New_York"
+            )
+            params = itertools.product(
+                ["end_datetime", "start_datetime"],
+                [all_asset_ids, [102, 104]],
+                [(True, False), (False, True)],
+                [None, 7],
+            )
+            for ts_col_name, asset_ids, (left_close, right_close), limit in params:
+                actual = market_data._get_data(
+                    start_ts,
+                    end_ts,
+                    ts_col_name,
+                    asset_ids,
+                    left_close,
+                    right_close,
+                    limit,
+                    ignore_delay=False,
+                )
+                expected = self.get_expected_data(
+                    market_data,
+                    start_ts,
+                    end_ts,
+                    ts_col_name,
+                    asset_ids,
+                    left_close,
+                    right_close,
+                    limit,
+                )
+                self.assertFalse(actual.empty)
+                pd.testing.assert_frame_equal(actual, expected)
+
+    def test1(self) -> None:
+        """
+        Test data with sorted knowledge time.
+        """
+        self.check_get_data(shuffle_knowledge_time=False)
+
+    def test2(self) -> None:
+        """
+        Test data with unsorted knowledge time.
+        """
+        self.check_get_data(shuffle_knowledge_time=True)
+
+    def test3(self) -> None:
+        """
+        Test `_get_last_end_time()` with sorted knowledge time.
+        """
+        self.check_get_last_end_time(shuffle_knowledge_time=False)
+
+    def test4(self) -> None:
+        """
+        Test `_get_last_end_time()` with unsorted knowledge time.
+        """
+        self.check_get_last_end_time(shuffle_knowledge_time=True)
+
+    def check_get_last_end_time(self, shuffle_knowledge_time: bool) -> None:
+        """
+        Compare `_get_last_end_time()` to the max end time of the data
+        returned by `get_data_for_last_period()` at different times.
+        """
+        df = self.get_df(shuffle_knowledge_time)
+        wall_clock_time = None
+        market_data = mdremada.ReplayedMarketData(
+            df,
+            "timestamp_db",
+            5,
+            "asset_id",
+            [102, 104],
+            "start_datetime",
+            "end_datetime",
+            None,
+            lambda: wall_clock_time,
+        )
+        wall_clock_times = pd.date_range(
+            "2000-01-03 09:00:00-05:00",
+            "2000-01-04 10:00:00-05:00",
+            freq="37min",
+        )
+        num_available = 0
+        for wall_clock_time in wall_clock_times:
+            actual = market_data._get_last_end_time()
+            expected = market_data._get_last_end_time_from_data(
+                pd.Timedelta("7D")
+            )
+            self.assertEqual(actual, expected)
+            num_available += actual is not None
+        # Check that the data is available only after the first bar.
+        self.assertLess(0, num_available)
+        self.assertLess(num_available, len(wall_clock_times))
@@ -186,6 +186,103 @@ def _get_price_per_share(
     return prices_srs
 
 
+def _get_twap_prices_in_batch(
+    market_data: mdata.MarketData,
+    orders: List[oordorde.Order],
+    timestamp_col: str,
+    columns: List[str],
+) -> pd.DataFrame:
+    """
+    Compute the TWAP of `columns` in the interval of each order.
+
+    The data for the union of the order intervals is retrieved once and the
+    TWAP of every order is computed in a single groupby pass with the same
+    semantic as `_get_price_per_share()` with `timing="twap"`.
+
+    :param columns: columns to compute the TWAP of (e.g., `bid`, `ask`)
+    :return: a df indexed by the position of the order in `orders`, e.g.,
+        ```
+               bid      ask
+        0   997.93   997.95
+        1   998.01   998.02
+        ```
+    """
+    hdbg.dassert(orders)
+    start_timestamp = min(order.start_timestamp for order in orders)
+    end_timestamp = max(order.end_timestamp for order in orders)
+    asset_ids = sorted({order.asset_id for order in orders})
+    # See `_get_price_per_share()` for the TWAP interval and ignoring the delay.
+    ignore_delay = True
+    data = market_data.get_data_for_interval(
+        start_timestamp,
+        end_timestamp,
+        timestamp_col,
+        asset_ids,
+        left_close=False,
+        right_close=True,
+        limit=None,
+        ignore_delay=ignore_delay,
+    )
+    hdbg.dassert_is_subset(columns, data.columns)
+    if data.index.name == timestamp_col:
+        timestamps = data.index
+    else:
+        hdbg.dassert_in(timestamp_col, data.columns)
+        timestamps = pd.DatetimeIndex(data[timestamp_col])
+    # Sort the data by asset id and timestamp so that the rows of each order
+    # are contiguous.
+    data_asset_ids = data[market_data.asset_id_col].to_numpy()
+    data_timestamps = timestamps.asi8
+    idxs = np.lexsort((data_timestamps, data_asset_ids))
+    data = data.iloc[idxs]
+    data_asset_ids = data_asset_ids[idxs]
+    data_timestamps = data_timestamps[idxs]
+    # Find the rows in (start_timestamp, end_timestamp] of each order.
+    order_asset_ids = np.array([order.asset_id for order in orders])
+    order_start_timestamps = np.array(
+        [order.start_timestamp.value for order in orders]
+    )
+    order_end_timestamps = np.array(
+        [order.end_timestamp.value for order in orders]
+    )
+    first_row_idxs = np.zeros(len(orders), dtype=np.int64)
+    last_row_idxs = np.zeros(len(orders), dtype=np.int64)
+    asset_first_row_idxs = np.searchsorted(data_asset_ids, asset_ids, "left")
+    asset_last_row_idxs = np.searchsorted(data_asset_ids, asset_ids, "right")
+    for asset_id, asset_first_row_idx, asset_last_row_idx in zip(
+        asset_ids, asset_first_row_idxs, asset_last_row_idxs
+    ):
+        mask = order_asset_ids == asset_id
+        asset_timestamps = data_timestamps[
+            asset_first_row_idx:asset_last_row_idx
+        ]
+        first_row_idxs[mask] = asset_first_row_idx + np.searchsorted(
+            asset_timestamps, order_start_timestamps[mask], "right"
+        )
+        last_row_idxs[mask] = asset_first_row_idx + np.searchsorted(
+            asset_timestamps, order_end_timestamps[mask], "right"
+        )
+    num_rows = last_row_idxs - first_row_idxs
+    hdbg.dassert_lt(
+        0,
+        num_rows.min(),
+        "No data for order=\n%s",
+        orders[int(num_rows.argmin())],
+    )
+    # Gather the rows of all the orders and average them by order.
+    order_idxs = np.repeat(np.arange(len(orders)), num_rows)
+    row_idxs = (
+        np.arange(num_rows.sum())
+        - np.repeat(np.cumsum(num_rows) - num_rows, num_rows)
+        + np.repeat(first_row_idxs, num_rows)
+    )
+    rows = data[columns].iloc[row_idxs]
+    twap_df = rows.groupby(order_idxs).mean()
+    if _TRACE:
+        _LOG.trace("twap_df=\n%s", hpandas.df_to_str(twap_df, precision=2))
+    return twap_df
+
+
 def _get_execution_prices(
     market_data: mdata.MarketData,
     orders: List[oordorde.Order],
@@ -193,100 +290,113 @@ def _get_execution_prices(
     # TODO(gp): Remove these defaults, if possible.
     timestamp_col: str = "end_datetime",
     column_remap: Optional[Dict[str, str]] = None,
-) -> pd.DataFrame:
+) -> pd.Series:
     """
     Get the simulated execution prices of a list of orders.
 
-    This method assumes that all orders in the list share a common:
-      - order type
-      - order start timestamp
-      - order end timestamp
+    The orders can have different types and intervals:
+    - the TWAP prices of all the orders are computed together from the data
+      retrieved once for the union of the order intervals
+    - the other orders are priced with one query per column for each group of
+      orders with the same timing and interval
 
     :param column_remap: remap columns from `market_data` to the canonical
         columns (e.g., "bid", "ask", "price", "midpoint")
-    :return: a df, e.g.,
+    :return: the prices indexed by the position of the order in `orders`, e.g.,
         ```
-                         price
-        asset_id
-        101             997.93
+        0    997.93
+        1    998.02
         ```
     """
-    _LOG.debug(hprint.to_str("orders"))
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(hprint.to_str("orders"))
+    hdbg.dassert(orders)
     needed_columns = ["bid", "ask", "price", "midpoint"]
     if column_remap is None:
         column_remap = {col_name: col_name for col_name in needed_columns}
     hdbg.dassert_set_eq(column_remap.keys(), needed_columns)
-    # Extract the property of the orders.
-    (
-        order_type,
-        start_timestamp,
-        end_timestamp,
-        asset_ids,
-    ) = _extract_order_properties(orders)
-    # Parse the order type.
-    _LOG.debug(
-        hprint.to_str("order_type start_timestamp end_timestamp asset_ids")
+    # Parse the order types and find the columns needed to price each order.
+    price_types = []
+    timings = []
+    order_columns = []
+    for order in orders:
+        config = order.type_.split("@")
+        hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order.type_)
+        price_type, timing = config
+        if price_type in ("price", "midpoint"):
+            columns = [price_type]
+        elif price_type.startswith("partial_spread"):
+            columns = ["bid", "ask"]
+        else:
+            raise ValueError(f"Invalid type='{order.type_}'")
+        price_types.append(price_type)
+        timings.append(timing)
+        order_columns.append(columns)
+    # Get the price per share of the needed columns for each order.
+    prices_per_share = pd.DataFrame(
+        np.nan, index=range(len(orders)), columns=needed_columns
     )
-    config = order_type.split("@")
-    hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order_type)
-    price_type, timing = config
-    # Get the price depending on the price_type.
-    if price_type in ("price", "midpoint"):
-        column = column_remap[price_type]
-        prices = _get_price_per_share(
-            market_data,
-            start_timestamp,
-            end_timestamp,
-            timestamp_col,
-            asset_ids,
-            column,
-            timing,
+    twap_idxs = [idx for idx, timing in enumerate(timings) if timing == "twap"]
+    if twap_idxs:
+        columns = sorted(
+            {column for idx in twap_idxs for column in order_columns[idx]}
         )
-    elif price_type.startswith("partial_spread"):
-        perc = float(price_type.split("_")[2])
-        hdbg.dassert_lte(0, perc)
-        hdbg.dassert_lte(perc, 1.0)
-        bid_col = column_remap["bid"]
-        bids = _get_price_per_share(
+        twap_df = _get_twap_prices_in_batch(
             market_data,
-            start_timestamp,
-            end_timestamp,
+            [orders[idx] for idx in twap_idxs],
             timestamp_col,
-            asset_ids,
-            bid_col,
-            timing,
+            [column_remap[column] for column in columns],
         )
-        ask_col = column_remap["ask"]
-        asks = _get_price_per_share(
-            market_data,
-            start_timestamp,
-            end_timestamp,
-            timestamp_col,
-            asset_ids,
-            ask_col,
-            timing,
+        prices_per_share.loc[twap_idxs, columns] = twap_df.to_numpy()
+    # Group the other orders by timing and interval.
+    groups: Dict[Tuple[str, pd.Timestamp, pd.Timestamp], List[int]] = (
+        collections.defaultdict(list)
+    )
+    for idx, (order, timing) in enumerate(zip(orders, timings)):
+        if timing != "twap":
+            key = (timing, order.start_timestamp, order.end_timestamp)
+            groups[key].append(idx)
+    for (timing, start_timestamp, end_timestamp), idxs in groups.items():
+        asset_ids = sorted({orders[idx].asset_id for idx in idxs})
+        columns = sorted(
+            {column for idx in idxs for column in order_columns[idx]}
         )
-        is_buy = []
-        for order in orders:
-            if order.diff_num_shares >= 0:
-                is_buy.append(True)
-            else:
-                is_buy.append(False)
-        is_buy = pd.Series(is_buy, bids.index)
-        is_sell = ~is_buy
-        # If perc == 0, we buy at the bid and sell at the ask (we collect the
-        # spread).
-        # If perc == 1, we buy at the ask and sell at the bid (we cross the spread).
-        buy_prices = (1.0 - perc) * bids + perc * asks
-        # _LOG.debug("buy_prices=\n%s", buy_prices)
-        sell_prices = perc * bids + (1.0 - perc) * asks
-        # _LOG.debug("sell_prices=\n%s", sell_prices)
-        prices = is_buy * buy_prices + is_sell * sell_prices
-    else:
-        raise ValueError(f"Invalid type='{order_type}'")
-    _LOG.debug(hprint.to_str("order_type start_timestamp end_timestamp"))
-    #
-    hdbg.dassert_isinstance(prices, pd.Series)
+        for column in columns:
+            prices_srs = _get_price_per_share(
+                market_data,
+                start_timestamp,
+                end_timestamp,
+                timestamp_col,
+                asset_ids,
+                column_remap[column],
+                timing,
+            )
+            hdbg.dassert_is_subset(asset_ids, prices_srs.index)
+            group_asset_ids = [orders[idx].asset_id for idx in idxs]
+            prices_per_share.loc[idxs, column] = prices_srs.loc[
+                group_asset_ids
+            ].to_numpy()
+    # Compute the price of each order depending on the price type.
+    price_types = np.array(price_types)
+    is_buy = np.array([order.diff_num_shares >= 0 for order in orders])
+    prices = pd.Series(np.nan, index=range(len(orders)), name="price")
+    for price_type in np.unique(price_types):
+        mask = price_types == price_type
+        if price_type in ("price", "midpoint"):
+            prices[mask] = prices_per_share.loc[mask, price_type]
+        else:
+            perc = float(price_type.split("_")[2])
+            hdbg.dassert_lte(0, perc)
+            hdbg.dassert_lte(perc, 1.0)
+            bids = prices_per_share.loc[mask, "bid"].to_numpy()
+            asks = prices_per_share.loc[mask, "ask"].to_numpy()
+            # If perc == 0, we buy at the bid and sell at the ask (we collect
+            # the spread).
+            # If perc == 1, we buy at the ask and sell at the bid (we cross the
+            # spread).
+            buy_prices = (1.0 - perc) * bids + perc * asks
+            sell_prices = perc * bids + (1.0 - perc) * asks
+            prices[mask] = np.where(is_buy[mask], buy_prices, sell_prices)
     if _TRACE:
         _LOG.trace("prices=\n%s", hpandas.df_to_str(prices, precision=2))
     return prices
@@ -411,7 +521,8 @@ def fill_orders_fully_at_once(
     prices
     :param orders: list of orders to execute
     """
-    _LOG.debug(hprint.to_str("orders"))
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(hprint.to_str("orders"))
     # TODO(Paul): The function `_get_execution_prices()` should be
     #  configurable.
     prices = _get_execution_prices(
@@ -421,19 +532,17 @@ def fill_orders_fully_at_once(
         column_remap=column_remap,
     )
     fills = []
-    for order in orders:
-        _LOG.debug(hprint.to_str("order"))
+    for order, price in zip(orders, prices.to_numpy()):
         # Extract the information from the order.
         end_timestamp = order.end_timestamp
         num_shares = order.diff_num_shares
-        hdbg.dassert_in(order.asset_id, prices.index)
-        price = prices[order.asset_id]
         if not np.isfinite(price):
             _LOG.warning("Unable to fill order=\n%s", order)
             continue
         # Build the corresponding fill.
         fill = omfill.Fill(order, end_timestamp, num_shares, price)
-        _LOG.debug(hprint.to_str("fill"))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(hprint.to_str("fill"))
         fills.append(fill)
     return fills
 
@@ -513,14 +622,11 @@ def fill_orders_fully_twap(
     )
     # Split the orders in child orders over the period of time.
     child_orders = _split_in_child_twap_orders(orders, freq_as_pd_string)
-    #
-    fills = []
-    for order in child_orders:
-        fills_tmp = fill_orders_fully_at_once(
-            market_data, timestamp_col, column_remap, [order]
-        )
-        hdbg.dassert_eq(len(fills_tmp), 1)
-        fills.append(fills_tmp[0])
+    # Price all the child orders together.
+    fills = fill_orders_fully_at_once(
+        market_data, timestamp_col, column_remap, child_orders
+    )
+    hdbg.dassert_eq(len(fills), len(child_orders))
     return fills
 
 
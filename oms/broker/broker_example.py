@@ -14,6 +14,7 @@ import oms.broker.database_broker as obrdabro
 import oms.broker.dataframe_broker as obdabro
 import oms.broker.replayed_fills_dataframe_broker as obrfdabr
 import oms.db.oms_db as odbomdb
+import oms.db.order_notifier as odbornot
 import oms.fill as omfill
 
 
@@ -99,6 +100,7 @@ def get_DatabaseBroker_example1(
     submitted_orders_table_name: str = odbomdb.SUBMITTED_ORDERS_TABLE_NAME,
     accepted_orders_table_name: str = odbomdb.ACCEPTED_ORDERS_TABLE_NAME,
     log_dir: Optional[str] = None,
+    order_notifier: Optional[odbornot.OrderNotifier] = None,
 ) -> obrdabro.DatabaseBroker:
     """
     Build a `DatabaseBroker` using `MarketData`, unless specified.
@@ -126,5 +128,6 @@ def get_DatabaseBroker_example1(
         submitted_orders_table_name=submitted_orders_table_name,
         accepted_orders_table_name=accepted_orders_table_name,
         log_dir=log_dir,
+        order_notifier=order_notifier,
     )
     return broker
@@ -28,6 +28,7 @@ import im_v2.common.data.client as icdc
 import im_v2.common.data.client.im_raw_data_client as imvcdcimrdc
 import im_v2.common.universe as ivcu
 import oms.broker.broker as obrobrok
+import oms.broker.ccxt.bid_ask_cache as obccbaca
 import oms.broker.ccxt.ccxt_logger as obcccclo
 import oms.broker.ccxt.ccxt_utils as obccccut
 import oms.fill as omfill
@@ -172,6 +173,16 @@ class AbstractCcxtBroker(obrobrok.Broker):
                     are supported."
             )
         self.bid_ask_lookback = bid_ask_lookback
+        # Keep the bid / ask data of the last period in memory, so that only
+        # the new data is read from the DB at each child order wave.
+        self._bid_ask_cache: Optional[obccbaca.BidAskCache] = None
+        if self._bid_ask_raw_data_reader is not None:
+            self._bid_ask_cache = obccbaca.BidAskCache(
+                self._bid_ask_raw_data_reader,
+                self._exchange_id,
+                self._contract_type,
+                self.ccxt_symbol_to_asset_id_mapping,
+            )
         leverage = 1
         self._set_leverage_for_all_symbols(leverage)
 
@@ -250,59 +261,41 @@ class AbstractCcxtBroker(obrobrok.Broker):
             2023-08-11 12:49:52.845000+00:00      SOL_USDT     binance 2023-08-11 12:49:52.979713+00:00 2023-08-11 12:49:53.205151+00:00        258.0        467.0  ...       24.4110       24.4100  ...        629.0        151.0  ...       24.4120       24.4130 ...  SOL/USDT:USDT  2237530510
             ```
         """
+        hdbg.dassert_is_not(
+            self._bid_ask_cache,
+            None,
+            "This method requires a bid / ask RawDataReader",
+        )
         # Get the first and last timestamp of the period.
         end_timestamp = pd.Timestamp.utcnow()
         start_timestamp = end_timestamp - pd.Timedelta(self.bid_ask_lookback)
-        # Load raw data.
-        bid_ask_data = self._bid_ask_raw_data_reader.load_db_table(
-            start_timestamp,
-            end_timestamp,
-            bid_ask_levels=[1],
-            # At this point we drop fully duplicated data entries.
-            deduplicate=True,
-            subset=[
-                "timestamp",
-                "currency_pair",
-                "bid_price",
-                "bid_size",
-                "ask_price",
-                "ask_size",
-                "level",
-            ],
-        )
-        self._logger.log_bid_ask_data(self._get_wall_clock_time, bid_ask_data)
-        # Drop duplicates from the bid/ask data.
-        bid_ask_data, _ = obccccut.drop_bid_ask_duplicates(bid_ask_data)
-        # Filter loaded data to only the broker's universe symbols.
-        # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
-        # 'BTC/USDT:USDT'
-        bid_ask_data["ccxt_symbols"] = bid_ask_data["currency_pair"].apply(
-            imv2ccuti.convert_currency_pair_to_ccxt_format,
-            args=(self._exchange_id, self._contract_type),
-        )
-        # Map CCXT symbols to asset IDs.
-        bid_ask_data = bid_ask_data.loc[
-            bid_ask_data["ccxt_symbols"].isin(
-                self.ccxt_symbol_to_asset_id_mapping
-            )
-        ]
-        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].apply(
-            lambda x: self.ccxt_symbol_to_asset_id_mapping[x]
+        # Load the raw data that is new since the previous call.
+        self._bid_ask_cache.update(start_timestamp, end_timestamp)
+        self._logger.log_bid_ask_data(
+            self._get_wall_clock_time, self._bid_ask_cache.get_raw_data()
         )
-        # When creating a set from a dictionary, only the keys are included
-        # in the set by default.
         hdbg.dassert_set_eq(
-            self.ccxt_symbol_to_asset_id_mapping,
-            bid_ask_data["ccxt_symbols"],
+            self.asset_id_to_ccxt_symbol_mapping,
+            self._bid_ask_cache.get_asset_ids(),
             "Bid/Ask data is missing symbols",
         )
-        # Convert original index from unix epoch to Timestamp, e.g.
-        # 1691758182667 ->
-        #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
-        bid_ask_data.index = bid_ask_data.index.to_series().apply(
-            lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
+        bid_ask_data = self._bid_ask_cache.get_data()
+        return bid_ask_data
+
+    def get_bid_ask_data_for_asset(self, asset_id: int) -> pd.DataFrame:
+        """
+        Get the bid/ask data of `asset_id` loaded by the last call to
+        `get_bid_ask_data_for_last_period()`.
+
+        :return: the rows of `get_bid_ask_data_for_last_period()` for
+            `asset_id`
+        """
+        hdbg.dassert_is_not(
+            self._bid_ask_cache,
+            None,
+            "This method requires a bid / ask RawDataReader",
         )
-        bid_ask_data = bid_ask_data.sort_index()
+        bid_ask_data = self._bid_ask_cache.get_asset_data(asset_id)
         return bid_ask_data
 
     # ////////////////////////////////////////////////////////////////////////
@@ -588,9 +581,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
         Calculate limit price for an order for `asset_id` and `side`.
         """
         # Get bid/ask data.
-        bid_ask_data = self.get_bid_ask_data_for_last_period()
-        # Filter data on asset_id.
-        bid_ask_data = bid_ask_data[bid_ask_data["asset_id"] == asset_id]
+        self.get_bid_ask_data_for_last_period()
+        bid_ask_data = self.get_bid_ask_data_for_asset(asset_id)
         # Calculate limit price.
         # Note: since this method is used for market order price calculation,
         # which does not have the execution frequency, we use the default
@@ -0,0 +1,223 @@
+"""
+Import as:
+
+import oms.broker.ccxt.bid_ask_cache as obccbaca
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+import im_v2.ccxt.utils as imv2ccuti
+import im_v2.common.data.client.im_raw_data_client as imvcdcimrdc
+import oms.broker.ccxt.ccxt_utils as obccccut
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# BidAskCache
+# #############################################################################
+
+
+class BidAskCache:
+    """
+    Keep the top-of-book bid / ask data of the last period in memory.
+
+    At each update only the rows that are newer than the previous update are
+    read from the DB, instead of the entire lookback period. Since data can be
+    written to the DB after its exchange timestamp, the rows in the last
+    `late_data_tolerance` before the previous update are read again.
+
+    The data is served per asset, so that computing the limit price of an
+    order doesn't require filtering the data of all the assets.
+    """
+
+    def __init__(
+        self,
+        raw_data_reader: imvcdcimrdc.RawDataReader,
+        exchange_id: str,
+        contract_type: str,
+        ccxt_symbol_to_asset_id_mapping: Dict[str, int],
+        *,
+        late_data_tolerance: str = "10S",
+    ) -> None:
+        """
+        Constructor.
+
+        :param raw_data_reader: reader of the bid / ask data from the DB
+        :param exchange_id: exchange of the data, e.g., "binance"
+        :param contract_type: "spot" or "futures"
+        :param ccxt_symbol_to_asset_id_mapping: map from the CCXT symbols
+            (e.g., "BTC/USDT:USDT") to the asset ids of the universe
+        :param late_data_tolerance: max delay between the exchange
+            timestamp of a row and when the row is written to the DB, in
+            pd.Timedelta-compatible string format
+        """
+        self._raw_data_reader = raw_data_reader
+        self._exchange_id = exchange_id
+        self._contract_type = contract_type
+        self._ccxt_symbol_to_asset_id_mapping = ccxt_symbol_to_asset_id_mapping
+        self._late_data_tolerance = pd.Timedelta(late_data_tolerance)
+        hdbg.dassert_lte(pd.Timedelta(0), self._late_data_tolerance)
+        # Map currency pairs (e.g., "BTC_USDT") to CCXT symbols.
+        self._ccxt_symbols: Dict[str, str] = {}
+        # End of the interval read at the previous update.
+        self._end_timestamp: Optional[pd.Timestamp] = None
+        # Raw data as returned by the reader indexed by Unix epoch in ms.
+        self._raw_data: Optional[pd.DataFrame] = None
+        # Deduplicated data of the universe assets indexed by timestamp.
+        self._data: Optional[pd.DataFrame] = None
+        # Map asset ids to the data of each asset.
+        self._data_by_asset: Dict[int, pd.DataFrame] = {}
+
+    def update(
+        self, start_timestamp: pd.Timestamp, end_timestamp: pd.Timestamp
+    ) -> None:
+        """
+        Update the cache to contain the data in `[start_timestamp,
+        end_timestamp]`.
+        """
+        hdbg.dassert_lte(start_timestamp, end_timestamp)
+        # Read the data after the previous update, keeping the rows before
+        # it.
+        read_start_timestamp = start_timestamp
+        if self._end_timestamp is not None:
+            read_start_timestamp = max(
+                start_timestamp, self._end_timestamp - self._late_data_tolerance
+            )
+        new_raw_data = self._raw_data_reader.load_db_table(
+            read_start_timestamp,
+            end_timestamp,
+            bid_ask_levels=[1],
+            # At this point we drop fully duplicated data entries.
+            deduplicate=True,
+            subset=[
+                "timestamp",
+                "currency_pair",
+                "bid_price",
+                "bid_size",
+                "ask_price",
+                "ask_size",
+                "level",
+            ],
+        )
+        # A reader can return data before the requested interval (e.g., when
+        # replaying logged data).
+        # The raw data is indexed by Unix epoch in ms, so the same cutoffs
+        # rounded to ms are used for the raw and the normalized data, to avoid
+        # keeping a row both in the cached and in the new data.
+        read_start_epoch = hdateti.convert_timestamp_to_unix_epoch(
+            read_start_timestamp, unit="ms"
+        )
+        new_raw_data = new_raw_data.loc[new_raw_data.index >= read_start_epoch]
+        new_data = self._normalize(new_raw_data)
+        if self._raw_data is None:
+            self._raw_data = new_raw_data
+            self._data = new_data
+        else:
+            start_epoch = hdateti.convert_timestamp_to_unix_epoch(
+                start_timestamp, unit="ms"
+            )
+            raw_index = self._raw_data.index
+            mask = (raw_index >= start_epoch) & (raw_index < read_start_epoch)
+            self._raw_data = pd.concat([self._raw_data.loc[mask], new_raw_data])
+            index = self._data.index
+            mask = (index >= pd.Timestamp(start_epoch, unit="ms", tz="UTC")) & (
+                index < pd.Timestamp(read_start_epoch, unit="ms", tz="UTC")
+            )
+            data = pd.concat([self._data.loc[mask], new_data])
+            # Keep a single row for each timestamp and asset, like
+            # `_normalize()` does for the new data.
+            keys = pd.MultiIndex.from_arrays([data.index, data["asset_id"]])
+            self._data = data.loc[~keys.duplicated(keep="last")]
+        self._end_timestamp = end_timestamp
+        # Split the data by asset, preserving the order of the rows.
+        self._data_by_asset = {
+            asset_id: df
+            for asset_id, df in self._data.groupby("asset_id", sort=False)
+        }
+        _LOG.debug(
+            "Read %s new rows, cached %s rows",
+            new_raw_data.shape[0],
+            self._raw_data.shape[0],
+        )
+
+    def get_raw_data(self) -> pd.DataFrame:
+        """
+        Return the cached data in the format returned by the reader.
+        """
+        hdbg.dassert_is_not(self._raw_data, None, "The cache is not updated")
+        return self._raw_data
+
+    def get_data(self) -> pd.DataFrame:
+        """
+        Return the cached data of all the universe assets.
+
+        :return: deduplicated data sorted by timestamp with the columns
+            `ccxt_symbols` and `asset_id`, see
+            `AbstractCcxtBroker.get_bid_ask_data_for_last_period()`
+        """
+        hdbg.dassert_is_not(self._data, None, "The cache is not updated")
+        return self._data
+
+    def get_asset_ids(self) -> List[int]:
+        """
+        Return the assets with data in the cache.
+        """
+        return list(self._data_by_asset.keys())
+
+    def get_asset_data(self, asset_id: int) -> pd.DataFrame:
+        """
+        Return the cached data of `asset_id`.
+        """
+        asset_data = self._data_by_asset.get(asset_id)
+        if asset_data is None:
+            # Return an empty df with the same columns if there is no data.
+            asset_data = self.get_data().iloc[:0]
+        return asset_data
+
+    def _normalize(self, raw_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Deduplicate raw data and add the CCXT symbols and the asset ids.
+        """
+        data, _ = obccccut.drop_bid_ask_duplicates(raw_data)
+        # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
+        # 'BTC/USDT:USDT', converting each currency pair only once.
+        codes, currency_pairs = pd.factorize(data["currency_pair"])
+        for currency_pair in currency_pairs:
+            if currency_pair not in self._ccxt_symbols:
+                self._ccxt_symbols[
+                    currency_pair
+                ] = imv2ccuti.convert_currency_pair_to_ccxt_format(
+                    currency_pair, self._exchange_id, self._contract_type
+                )
+        ccxt_symbols = np.array(
+            [self._ccxt_symbols[currency_pair] for currency_pair in currency_pairs],
+            dtype=object,
+        )
+        # Map CCXT symbols to asset IDs, using -1 for the symbols outside the
+        # universe.
+        asset_ids = np.array(
+            [
+                self._ccxt_symbol_to_asset_id_mapping.get(ccxt_symbol, -1)
+                for ccxt_symbol in ccxt_symbols
+            ],
+            dtype=np.int64,
+        )
+        data["ccxt_symbols"] = ccxt_symbols[codes]
+        # Filter loaded data to only the universe symbols.
+        data_asset_ids = asset_ids[codes]
+        mask = data_asset_ids != -1
+        data = data.loc[mask].copy()
+        data["asset_id"] = data_asset_ids[mask]
+        # Convert original index from unix epoch to Timestamp, e.g.
+        # 1691758182667 ->
+        #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
+        data.index = pd.to_datetime(data.index, unit="ms", utc=True)
+        data = data.sort_index()
+        return data
@@ -269,6 +269,8 @@ class CcxtBroker(obcaccbr.AbstractCcxtBroker):
         #  into a separate method.
         oms_fills = await self.get_fills_async()
         self._logger.log_oms_fills(self._get_wall_clock_time, oms_fills)
+        # Wait for the logs of the bar to be written.
+        self._logger.flush()
         # The receipt is not really needed since the order is accepted right away,
         # and we don't need to wait for the order being accepted.
         submitted_order_id = self._get_next_submitted_order_id()
@@ -490,8 +492,6 @@ class CcxtBroker(obcaccbr.AbstractCcxtBroker):
         )
         # Calculate limit price.
         side = "buy" if child_order_diff_signed_num_shares > 0 else "sell"
-        # Filter data on asset_id.
-        bid_ask_data = bid_ask_data[bid_ask_data["asset_id"] == asset_id]
         price_dict = self._get_limit_price_dict(
             bid_ask_data,
             side,
@@ -598,11 +598,12 @@ class CcxtBroker(obcaccbr.AbstractCcxtBroker):
             )
             # We don't need an `await` because we are just creating a coroutine
             # that we will execute later.
+            # Each child order receives only the bid / ask data of its asset.
             coroutine = self._submit_twap_child_order(
                 parent_order_ids_to_child_order_shares,
                 self._cached_open_positions,
                 execution_freq,
-                bid_ask_data,
+                self.get_bid_ask_data_for_asset(order.asset_id),
                 order,
                 wave_id,
             )
@@ -6,8 +6,9 @@ import oms.broker.ccxt.ccxt_logger as obcccclo
 
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import jsonpickle  # type: ignore
 import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
@@ -18,6 +19,7 @@ import helpers.hdbg as hdbg
 import helpers.hio as hio
 import helpers.hpickle as hpickle
 import helpers.hprint as hprint
+import helpers.hthreading as hthread
 import helpers.hwall_clock_time as hwacltim
 import oms.fill as omfill
 import oms.order.order as oordorde
@@ -27,6 +29,9 @@ CcxtData = Dict[str, Any]
 
 _LOG = logging.getLogger(__name__)
 
+# Extension of the files storing the log records of a bar as JSON lines.
+_SEGMENT_FILE_EXTENSION = ".jsonl"
+
 
 # TODO(gp): This should go after CcxtLogger.
 def load_oms_fills(logs_dir: str) -> List[List[omfill.Fill]]:
@@ -40,18 +45,17 @@ def load_oms_fills(logs_dir: str) -> List[List[omfill.Fill]]:
     # Initialize logger.
     logger = CcxtLogger(logs_dir, mode="read")
     # Read OMS fills and OMS parent orders from logs.
-    oms_fills_file_paths = logger._get_files(logger._oms_fills_dir)
+    oms_fills_data = logger._load_raw_data(logger._oms_fills_dir)
     oms_parent_orders_file_paths = logger._get_files(
         logger._oms_parent_orders_dir, file_extension="json"
     )
-    # `Fills` and `Orders` should have equal number of file paths.
-    hdbg.dassert_eq(len(oms_fills_file_paths), len(oms_parent_orders_file_paths))
+    # `Fills` and `Orders` should have equal number of logged bars.
+    hdbg.dassert_eq(len(oms_fills_data), len(oms_parent_orders_file_paths))
     oms_fills = []
-    for order_path, fill_path in zip(
-        oms_parent_orders_file_paths, oms_fills_file_paths
+    for order_path, fills_data in zip(
+        oms_parent_orders_file_paths, oms_fills_data
     ):
         orders_data = hio.from_json(order_path, use_types=True)
-        fills_data = hio.from_json(fill_path, use_types=True)
         for order_data, fill_data in zip(orders_data, fills_data):
             # Get OMS `Order`.
             order = oordorde.Order(
@@ -76,6 +80,29 @@ def load_oms_fills(logs_dir: str) -> List[List[omfill.Fill]]:
     return oms_fills
 
 
+def _append_segment_records(items: List[Tuple[str, str]]) -> None:
+    """
+    Append serialized log records to JSON-lines segment files.
+
+    Each segment file is opened once for all its records.
+
+    :param items: path of the segment file and serialized record
+    """
+    # Group the records by segment file preserving their order.
+    records: Dict[str, List[str]] = {}
+    for segment_file_name, record in items:
+        records.setdefault(segment_file_name, []).append(record)
+    for segment_file_name, segment_records in records.items():
+        hio.create_enclosing_dir(segment_file_name, incremental=True)
+        with open(segment_file_name, "a") as f:
+            f.write("\n".join(segment_records) + "\n")
+
+
+# #############################################################################
+# CcxtLogger
+# #############################################################################
+
+
 class CcxtLogger:
     """
     Write and read logs for `CcxtBroker`.
@@ -87,6 +114,15 @@ class CcxtLogger:
 
     For more info on logs structure, see
     `docs/trade_execution/ck.ccxt_broker_logs_schema.reference.md`
+
+    The data logged many times per bar (i.e., child orders, CCXT order
+    responses, fills, trades, positions, and balances) can be written:
+    - as one JSON file per call (the original layout), e.g.,
+      `{log_dir}/oms_child_orders/{asset_id}_{bar_timestamp}.{wall_clock_time}.json`
+    - as records of a JSON-lines segment file per bar, appended in a
+      background thread, e.g.,
+      `{log_dir}/oms_child_orders/segment.{bar_timestamp}.jsonl`
+    The reader loads both layouts.
     """
 
     # Default locations of log files.
@@ -109,7 +145,14 @@ class CcxtLogger:
     BROKER_CONFIG = "broker_config.json"
     ARGS_FILE = "args.json"
 
-    def __init__(self, log_dir: str, *, mode: str = "read"):
+    def __init__(
+        self,
+        log_dir: str,
+        *,
+        mode: str = "read",
+        log_format: str = "json_files",
+        max_queue_size: int = 10000,
+    ):
         """
         Constructor.
 
@@ -118,9 +161,26 @@ class CcxtLogger:
         :param mode: there are two modes:
             - write: the logger will write log files in `log_dir`
             - read: the logger will read log files from `log_dir`
+        :param log_format: how to write the data logged many times per bar
+            - "json_files": one JSON file per call
+            - "segments": append the records to a JSON-lines file per bar
+              in a background thread
+        :param max_queue_size: max number of records waiting to be written
+            with the "segments" format
         """
         self._log_dir = log_dir
         hdbg.dassert_is_not(self._log_dir, None)
+        hdbg.dassert_in(log_format, ["json_files", "segments"])
+        self._log_format = log_format
+        # Write the segment files in a background thread, so that logging
+        # from the coroutines submitting the orders doesn't wait for the disk.
+        self._sink: Optional[hthread.BackgroundWriter] = None
+        if mode == "write" and log_format == "segments":
+            self._sink = hthread.BackgroundWriter(
+                _append_segment_records,
+                max_queue_size=max_queue_size,
+                name="ccxt_log_sink",
+            )
         if mode == "read":
             fields = [
                 "args",
@@ -153,6 +213,16 @@ class CcxtLogger:
     # Write logs
     # #########################################################################
 
+    def flush(self) -> None:
+        """
+        Wait until the logged data is written.
+
+        With the "json_files" format the data is written synchronously, so
+        this is a no-op.
+        """
+        if self._sink is not None:
+            self._sink.flush()
+
     def log_broker_config(self, broker_configuration: Dict[str, Any]) -> None:
         """
         Log the broker configuration.
@@ -234,16 +304,14 @@ class CcxtLogger:
         )
         order_asset_id = logged_oms_child_order["asset_id"]
         # 1) Save OMS child orders.
-        incremental = True
         oms_order_log_dir = os.path.join(
             child_orders_log_dir, self.OMS_CHILD_ORDERS
         )
-        hio.create_dir(oms_order_log_dir, incremental)
         oms_order_file_name = (
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
         oms_order_file_name = os.path.join(oms_order_log_dir, oms_order_file_name)
-        hio.to_json(oms_order_file_name, logged_oms_child_order, use_types=True)
+        self._write_json(oms_order_file_name, logged_oms_child_order)
         _LOG.debug(
             "Saved OMS child orders log file %s",
             hprint.to_str("oms_order_file_name"),
@@ -252,12 +320,11 @@ class CcxtLogger:
         ccxt_log_dir = os.path.join(
             child_orders_log_dir, self.CCXT_CHILD_ORDER_RESPONSE
         )
-        hio.create_dir(ccxt_log_dir, incremental)
         response_file_name = (
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
         response_file_name = os.path.join(ccxt_log_dir, response_file_name)
-        hio.to_json(response_file_name, ccxt_child_order_response, use_types=True)
+        self._write_json(response_file_name, ccxt_child_order_response)
         _LOG.debug(
             "Saved CCXT child order response log file %s",
             hprint.to_str("response_file_name"),
@@ -291,7 +358,7 @@ class CcxtLogger:
             self._log_dir, self.CCXT_FILLS, f"ccxt_fills_{timestamp_str}.json"
         )
         _LOG.debug(hprint.to_str("ccxt_fills_file_name"))
-        hio.to_json(ccxt_fills_file_name, ccxt_fills, use_types=True)
+        self._write_json(ccxt_fills_file_name, ccxt_fills)
 
     def log_ccxt_trades(
         self,
@@ -320,7 +387,7 @@ class CcxtLogger:
             f"ccxt_trades_{timestamp_str}.json",
         )
         _LOG.debug(hprint.to_str("ccxt_trades_file_name"))
-        hio.to_json(ccxt_trades_file_name, ccxt_trades, use_types=True)
+        self._write_json(ccxt_trades_file_name, ccxt_trades)
 
     def log_oms_fills(
         self, get_wall_clock_time: Callable, oms_fills: List[omfill.Fill]
@@ -349,7 +416,7 @@ class CcxtLogger:
             f"oms_fills_{timestamp_str}.json",
         )
         _LOG.debug(hprint.to_str("oms_fills_file_name"))
-        hio.to_json(oms_fills_file_name, oms_fills, use_types=True)
+        self._write_json(oms_fills_file_name, oms_fills)
 
     # TODO(gp): Reorganize the format to be a bit regular
     # 1) always OMS data before than CCXT
@@ -1884,10 +1951,53 @@ class CcxtLogger:
             dir_name,
             f"{file_name_tag}.{wall_clock_time}.json",
         )
-        # Create enclosing dir.
-        hio.to_json(log_filename, data, use_types=True)
+        self._write_json(log_filename, data)
         _LOG.debug(hprint.to_str("log_filename"))
 
+    def _write_json(self, file_name: str, data: Any) -> None:
+        """
+        Write data as a JSON file or as a record of the segment file of the
+        current bar, depending on the log format.
+
+        :param file_name: path of the JSON file in the per-file layout
+        """
+        if self._sink is None:
+            hio.to_json(file_name, data, use_types=True)
+            return
+        dir_name, base_name = os.path.split(file_name)
+        bar_timestamp = hwacltim.get_current_bar_timestamp(
+            as_str=True, include_msec=True
+        )
+        hdbg.dassert_is_not(
+            bar_timestamp,
+            None,
+            "The current bar must be set to name the segment files",
+        )
+        segment_file_name = os.path.join(
+            dir_name, f"segment.{bar_timestamp}{_SEGMENT_FILE_EXTENSION}"
+        )
+        # Serialize the data right away, since it can be modified after being
+        # logged (e.g., the CCXT ids of an order).
+        record = jsonpickle.encode({"file_name": base_name, "data": data})
+        self._sink.put((segment_file_name, record))
+
+    @staticmethod
+    def _load_segment_file(path: str) -> List[Tuple[str, Any]]:
+        """
+        Load the records of a segment file.
+
+        :return: the name of the JSON file of each record in the per-file
+            layout and its data
+        """
+        txt = hio.from_file(path)
+        records = []
+        for line in txt.splitlines():
+            if not line:
+                continue
+            record = jsonpickle.decode(line)
+            records.append((record["file_name"], record["data"]))
+        return records
+
     def _load_raw_data(
         self,
         dir_name: str,
@@ -1895,15 +2005,25 @@ class CcxtLogger:
         append_list: bool = True,
     ) -> List[Dict[str, Any]]:
         """
-        Load raw data from the JSON files in the log directory.
+        Load raw data from the JSON files and the segment files in the log
+        directory.
 
         :param append_list: Set to True for DataFrame.extend() or False
             for DataFrame.append().
         """
         files = self._get_files(dir_name)
-        data_list = []
+        records = []
         for path in tqdm(files, desc=f"Loading '{dir_name}'"):
-            data = hio.from_json(path, use_types=True)
+            if path.endswith(_SEGMENT_FILE_EXTENSION):
+                records.extend(self._load_segment_file(path))
+            else:
+                data = hio.from_json(path, use_types=True)
+                records.append((os.path.basename(path), data))
+        # Sort the records in the same order as the files of the per-file
+        # layout, since a segment contains the records of all the assets.
+        records.sort(key=lambda record: record[0])
+        data_list = []
+        for _, data in records:
             if append_list:
                 data_list.append(data)
             else:
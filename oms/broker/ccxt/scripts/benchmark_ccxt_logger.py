@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the time to log and to load the child orders of an execution with
+the logs written as JSON files and as segment files.
+
+The execution has `--num_bars` bars with `--num_child_orders_per_bar` child
+orders each. The default values correspond to a full day of 5 minute bars
+with 25 assets and 5 waves of child orders per bar.
+
+> benchmark_ccxt_logger.py --num_bars 288 --num_child_orders_per_bar 125
+
+Import as:
+
+import oms.broker.ccxt.scripts.benchmark_ccxt_logger as obccsbcclo
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+import helpers.hwall_clock_time as hwacltim
+import oms.broker.ccxt.ccxt_logger as obcccclo
+import oms.order.order as oordorde
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+
+
+def _get_ccxt_child_order_response(ccxt_id: int) -> obcccclo.CcxtData:
+    """
+    Build a CCXT order response similar to the one of Binance.
+    """
+    timestamp = pd.Timestamp("2023-03-15 16:35:38.582", tz="UTC")
+    response = {
+        "info": {
+            "orderId": str(ccxt_id),
+            "symbol": "APEUSDT",
+            "status": "NEW",
+            "clientOrderId": "x-xcKtGhcub89989e55d47273a3610a9",
+            "price": "4.1200",
+            "avgPrice": "0.0000",
+            "origQty": "10",
+            "executedQty": "0",
+            "cumQty": "0",
+            "cumQuote": "0",
+            "timeInForce": "GTC",
+            "type": "LIMIT",
+            "reduceOnly": False,
+            "side": "BUY",
+            "updateTime": np.int64(1678898138582),
+        },
+        "id": np.int64(ccxt_id),
+        "clientOrderId": "x-xcKtGhcub89989e55d47273a3610a9",
+        "timestamp": 1678898138582,
+        "datetime": timestamp,
+        "symbol": "APE/USDT",
+        "type": "limit",
+        "side": "buy",
+        "price": np.float64(4.12),
+        "amount": np.float64(10.0),
+        "filled": np.float64(0.0),
+        "remaining": np.float64(10.0),
+        "status": "open",
+        "trades": [],
+        "fees": [],
+    }
+    return response
+
+
+def _run(
+    log_dir: str, log_format: str, num_bars: int, num_child_orders_per_bar: int
+) -> Tuple[float, float, float]:
+    """
+    Log and load the child orders.
+
+    :return: the mean time to log a child order, the time to wait for the
+        logs to be written at the end of each bar, and the time to load the
+        logs, in seconds
+    """
+    logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
+    start_timestamp = pd.Timestamp("2023-03-15 00:00:00", tz="UTC")
+    # Use a different wall clock time for each call, so that no JSON file is
+    # overwritten.
+    num_calls = num_bars * num_child_orders_per_bar
+    wall_clock_times = iter(
+        pd.date_range(start_timestamp, periods=num_calls, freq="S")
+    )
+    get_wall_clock_time = lambda: next(wall_clock_times)
+    log_time = 0.0
+    flush_time = 0.0
+    hwacltim.reset_current_bar_timestamp()
+    for bar_idx in range(num_bars):
+        bar_timestamp = start_timestamp + pd.Timedelta(minutes=5 * bar_idx)
+        hwacltim.set_current_bar_timestamp(bar_timestamp)
+        for order_idx in range(num_child_orders_per_bar):
+            ccxt_id = bar_idx * num_child_orders_per_bar + order_idx
+            order = oordorde.Order(
+                bar_timestamp,
+                order_idx,
+                "limit",
+                bar_timestamp,
+                bar_timestamp + pd.Timedelta(minutes=5),
+                0.0,
+                10.0,
+                order_id=ccxt_id,
+                extra_params={"ccxt_id": [ccxt_id]},
+            )
+            response = _get_ccxt_child_order_response(ccxt_id)
+            extra_info = {"bid_price": 4.12, "ask_price": 4.121}
+            start_time = time.perf_counter()
+            logger.log_child_order(
+                get_wall_clock_time, order, response, extra_info
+            )
+            log_time += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        logger.flush()
+        flush_time += time.perf_counter() - start_time
+    hwacltim.reset_current_bar_timestamp()
+    # Load the logs.
+    start_time = time.perf_counter()
+    reader = obcccclo.CcxtLogger(log_dir, mode="read")
+    child_orders = reader.load_oms_child_order()
+    ccxt_order_responses = reader.load_ccxt_order_response()
+    load_time = time.perf_counter() - start_time
+    hdbg.dassert_eq(len(child_orders), num_calls)
+    hdbg.dassert_eq(len(ccxt_order_responses), num_calls)
+    return log_time / num_calls, flush_time, load_time
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_bars", action="store", type=int, default=288, help="Bars to log"
+    )
+    parser.add_argument(
+        "--num_child_orders_per_bar",
+        action="store",
+        type=int,
+        default=125,
+        help="Child orders logged at each bar",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_bars)
+    hdbg.dassert_lte(1, args.num_child_orders_per_bar)
+    with tempfile.TemporaryDirectory() as dir_name:
+        for log_format in ["json_files", "segments"]:
+            log_dir = os.path.join(dir_name, log_format)
+            log_time, flush_time, load_time = _run(
+                log_dir,
+                log_format,
+                args.num_bars,
+                args.num_child_orders_per_bar,
+            )
+            _LOG.info(
+                "%s: log_child_order=%.2fms flush=%.1fs load=%.1fs",
+                log_format,
+                1000 * log_time,
+                flush_time,
+                load_time,
+            )
+
+
+if __name__ == "__main__":
+    _main(_parse())
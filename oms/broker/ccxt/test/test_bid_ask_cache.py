@@ -0,0 +1,128 @@
+import unittest.mock as umock
+
+import pandas as pd
+
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+import oms.broker.ccxt.bid_ask_cache as obccbaca
+import oms.broker.ccxt.test.test_ccxt_utils as obcttcut
+
+
+class TestBidAskCache1(hunitest.TestCase):
+    @staticmethod
+    def get_cache() -> obccbaca.BidAskCache:
+        mock_data_reader = umock.MagicMock()
+        mock_data_reader.load_db_table.side_effect = (
+            obcttcut._generate_raw_data_reader_bid_ask_data
+        )
+        # The data of `APE_USDT` is outside the universe.
+        ccxt_symbol_to_asset_id_mapping = {
+            "BTC/USDT": 1467591036,
+            "ETH/USDT": 1464553467,
+        }
+        cache = obccbaca.BidAskCache(
+            mock_data_reader,
+            "binance",
+            "spot",
+            ccxt_symbol_to_asset_id_mapping,
+            late_data_tolerance="2S",
+        )
+        return cache
+
+    def test_update1(self) -> None:
+        """
+        Check the data of the first update.
+        """
+        cache = self.get_cache()
+        start_timestamp = pd.Timestamp("2023-09-13 15:29:50", tz="UTC")
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:00", tz="UTC")
+        cache.update(start_timestamp, end_timestamp)
+        actual = hpandas.df_to_str(cache.get_data(), num_rows=6)
+        expected = r"""
+                                         currency_pair exchange_id  bid_size_l1  ask_size_l1  bid_price_l1  ask_price_l1           end_download_timestamp              knowledge_timestamp ccxt_symbols    asset_id
+        timestamp
+        2023-09-13 15:29:50+00:00             ETH_USDT     binance           22           25            31            10        2023-09-13 15:29:50+00:00        2023-09-13 15:29:50+00:00     ETH/USDT  1464553467
+        2023-09-13 15:29:50+00:00             BTC_USDT     binance           13           37            13            17        2023-09-13 15:29:50+00:00        2023-09-13 15:29:50+00:00     BTC/USDT  1467591036
+        2023-09-13 15:29:50.500000+00:00      ETH_USDT     binance           22           25            31            10 2023-09-13 15:29:50.500000+00:00 2023-09-13 15:29:50.500000+00:00     ETH/USDT  1464553467
+        ...
+        2023-09-13 15:29:59.500000+00:00      ETH_USDT     binance           22           25            31            10 2023-09-13 15:29:59.500000+00:00 2023-09-13 15:29:59.500000+00:00     ETH/USDT  1464553467
+        2023-09-13 15:30:00+00:00             ETH_USDT     binance           22           25            31            10        2023-09-13 15:30:00+00:00        2023-09-13 15:30:00+00:00     ETH/USDT  1464553467
+        2023-09-13 15:30:00+00:00             BTC_USDT     binance           13           37            13            17        2023-09-13 15:30:00+00:00        2023-09-13 15:30:00+00:00     BTC/USDT  1467591036
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        self.assertEqual(sorted(cache.get_asset_ids()), [1464553467, 1467591036])
+
+    def test_update2(self) -> None:
+        """
+        Check that an update reads only the new data and that the cached data
+        is the same as reading the entire period.
+        """
+        cache = self.get_cache()
+        start_timestamp = pd.Timestamp("2023-09-13 15:29:50", tz="UTC")
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:00", tz="UTC")
+        cache.update(start_timestamp, end_timestamp)
+        # Move the period forward.
+        start_timestamp = pd.Timestamp("2023-09-13 15:29:55", tz="UTC")
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:05", tz="UTC")
+        cache.update(start_timestamp, end_timestamp)
+        # Check that the data is read from the end of the previous update
+        # minus the tolerance for late data.
+        read_start_timestamp, read_end_timestamp = (
+            cache._raw_data_reader.load_db_table.call_args.args
+        )
+        self.assertEqual(
+            read_start_timestamp, pd.Timestamp("2023-09-13 15:29:58", tz="UTC")
+        )
+        self.assertEqual(read_end_timestamp, end_timestamp)
+        # Compare to reading the entire period, up to the order of the raw
+        # data.
+        expected_cache = self.get_cache()
+        expected_cache.update(start_timestamp, end_timestamp)
+        cols = ["timestamp", "currency_pair"]
+        actual = cache.get_raw_data().reset_index().sort_values(
+            cols, ignore_index=True
+        )
+        expected = expected_cache.get_raw_data().reset_index().sort_values(
+            cols, ignore_index=True
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+        for asset_id in [1464553467, 1467591036]:
+            actual = cache.get_asset_data(asset_id)
+            expected = expected_cache.get_data()
+            expected = expected[expected["asset_id"] == asset_id]
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(expected, num_rows=None),
+            )
+            self.assertEqual(actual.shape[0], 21)
+
+    def test_update3(self) -> None:
+        """
+        Check that a row on the boundary of the data read again is not
+        duplicated when the timestamps have a sub-millisecond precision.
+        """
+        cache = self.get_cache()
+        start_timestamp = pd.Timestamp("2023-09-13 15:29:50", tz="UTC")
+        # The data is read again from 15:29:58.0004, i.e., from 15:29:58 in
+        # ms, where there is a row.
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:00.0004", tz="UTC")
+        cache.update(start_timestamp, end_timestamp)
+        start_timestamp = pd.Timestamp("2023-09-13 15:29:55", tz="UTC")
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:05.0004", tz="UTC")
+        cache.update(start_timestamp, end_timestamp)
+        # Check.
+        expected_cache = self.get_cache()
+        expected_cache.update(start_timestamp, end_timestamp)
+        for asset_id in [1464553467, 1467591036]:
+            actual = cache.get_asset_data(asset_id)
+            self.assertTrue(actual.index.is_unique)
+            self.assertTrue(actual.index.is_monotonic_increasing)
+            expected = expected_cache.get_data()
+            expected = expected[expected["asset_id"] == asset_id]
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(expected, num_rows=None),
+            )
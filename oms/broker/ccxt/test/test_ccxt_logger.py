@@ -14,6 +14,7 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hsystem as hsystem
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 import oms.broker.ccxt.abstract_ccxt_broker as obcaccbr
 import oms.broker.ccxt.ccxt_logger as obcccclo
 import oms.fill as omfill
@@ -2792,6 +2793,116 @@ class TestCcxtLogger2(hunitest.TestCase):
         self.assert_equal(actual, expected_ccxt_order_response, fuzzy_match=True)
 
 
+class TestCcxtLogger3(hunitest.TestCase):
+    """
+    Test writing logs as segment files.
+    """
+
+    def tearDown(self) -> None:
+        hwacltim.reset_current_bar_timestamp()
+        super().tearDown()
+
+    def test_log_segments1(self) -> None:
+        """
+        Verify that the data is written in a segment file per bar.
+        """
+        log_dir = self.get_scratch_space()
+        self._log_data(log_dir, "segments")
+        # Check.
+        files = hio.listdir(
+            log_dir, "*", only_files=True, use_relative_paths=True
+        )
+        actual = "\n".join(sorted(files))
+        expected = r"""
+        balances/segment.20230315_12350000.jsonl
+        balances/segment.20230315_12360000.jsonl
+        ccxt_child_order_responses/segment.20230315_12350000.jsonl
+        ccxt_child_order_responses/segment.20230315_12360000.jsonl
+        child_order_fills/ccxt_fills/segment.20230315_12350000.jsonl
+        child_order_fills/ccxt_fills/segment.20230315_12360000.jsonl
+        oms_child_orders/segment.20230315_12350000.jsonl
+        oms_child_orders/segment.20230315_12360000.jsonl
+        """
+        self.assert_equal(actual, expected, dedent=True)
+
+    def test_log_segments2(self) -> None:
+        """
+        Verify that logging segment files requires the current bar.
+        """
+        log_dir = self.get_scratch_space()
+        logger = obcccclo.CcxtLogger(
+            log_dir, mode="write", log_format="segments"
+        )
+        hwacltim.reset_current_bar_timestamp()
+        wall_clock_time = pd.Timestamp("2023-03-15 12:35:00", tz="UTC")
+        get_wall_clock_time = lambda: wall_clock_time
+        with self.assertRaises(AssertionError):
+            logger.log_balance(get_wall_clock_time, _get_dummy_ccxt_balance())
+
+    def test_load_segments1(self) -> None:
+        """
+        Verify that the data logged as segment files is loaded in the same way
+        as the data logged as JSON files.
+        """
+        json_files_dir = os.path.join(self.get_scratch_space(), "json_files")
+        self._log_data(json_files_dir, "json_files")
+        hwacltim.reset_current_bar_timestamp()
+        segments_dir = os.path.join(self.get_scratch_space(), "segments")
+        self._log_data(segments_dir, "segments")
+        # Check.
+        expected_reader = obcccclo.CcxtLogger(json_files_dir)
+        actual_reader = obcccclo.CcxtLogger(segments_dir)
+        for load_func_name in [
+            "load_oms_child_order",
+            "load_ccxt_order_response",
+            "load_ccxt_fills",
+            "load_balances",
+        ]:
+            expected = getattr(expected_reader, load_func_name)()
+            actual = getattr(actual_reader, load_func_name)()
+            self.assert_equal(pprint.pformat(actual), pprint.pformat(expected))
+        self.assertEqual(len(actual_reader.load_oms_child_order()), 4)
+
+    @staticmethod
+    def _log_data(log_dir: str, log_format: str) -> None:
+        """
+        Log child orders, CCXT fills, and balances for 2 bars.
+        """
+        hio.create_dir(log_dir, incremental=True)
+        logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
+        initial_timestamp = pd.Timestamp("2023-03-15 12:35:00", tz="UTC")
+        # Advance the wall clock time by 1 second at each call, so that the
+        # names of the JSON files are deterministic and unique.
+        wall_clock_times = iter(
+            pd.date_range(initial_timestamp, periods=100, freq="S")
+        )
+        get_wall_clock_time = lambda: next(wall_clock_times)
+        child_order_responses = _get_dummy_ccxt_child_order_responses()
+        for bar_idx in range(2):
+            bar_timestamp = initial_timestamp + pd.Timedelta(minutes=bar_idx)
+            hwacltim.set_current_bar_timestamp(bar_timestamp)
+            for order_idx, response in enumerate(child_order_responses):
+                order = oordorde.Order(
+                    bar_timestamp,
+                    response["id"],
+                    "limit",
+                    bar_timestamp,
+                    bar_timestamp + pd.Timedelta(minutes=1),
+                    0.0,
+                    response["amount"],
+                    order_id=2 * bar_idx + order_idx,
+                    extra_params={"ccxt_id": [response["id"]]},
+                )
+                extra_info = {"bid_price": 4.12, "ask_price": 4.121}
+                logger.log_child_order(
+                    get_wall_clock_time, order, response, extra_info
+                )
+            ccxt_fills = _get_dummy_ccxt_fills()[bar_idx]
+            logger.log_ccxt_fills(get_wall_clock_time, ccxt_fills)
+            logger.log_balance(get_wall_clock_time, _get_dummy_ccxt_balance())
+        logger.flush()
+
+
 @pytest.mark.skip("CMTask5079: Disabled due to obsolete data format.")
 class Test_read_rt_data1(hunitest.TestCase):
     """
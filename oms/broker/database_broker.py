@@ -15,6 +15,7 @@ import helpers.hprint as hprint
 import helpers.hsql as hsql
 import oms.broker.fake_fills_broker as obfafibr
 import oms.db.oms_db as odbomdb
+import oms.db.order_notifier as odbornot
 import oms.order.order as oordorde
 
 _LOG = logging.getLogger(__name__)
@@ -51,6 +52,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
         # TODO(gp): This doesn't work for some reason.
         # *,
         poll_kwargs: Optional[Dict[str, Any]] = None,
+        order_notifier: Optional[odbornot.OrderNotifier] = None,
         **kwargs: Any,
     ):
         """
@@ -58,11 +60,15 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
 
         :param poll_kwargs: polling instruction when waiting for
             acceptance of an order
+        :param order_notifier: object notifying the submitted orders and
+            notified of the accepted orders, so that this object doesn't need
+            to wait for the next polling of the accepted orders table
+            - `None` to only poll the table
         """
         _LOG.debug(
             hprint.to_str(
                 "db_connection submitted_orders_table_name "
-                "accepted_orders_table_name poll_kwargs"
+                "accepted_orders_table_name poll_kwargs order_notifier"
             )
         )
         super().__init__(*args, **kwargs)
@@ -72,6 +78,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
         if poll_kwargs is None:
             poll_kwargs = hasynci.get_poll_kwargs(self._get_wall_clock_time)
         self._poll_kwargs = poll_kwargs
+        self._order_notifier = order_notifier
         # Store the submitted rows to the DB for internal bookkeeping.
         self._submissions: Dict[
             pd.Timestamp, pd.Series
@@ -85,7 +92,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
     ) -> str:
         if attr_names_to_skip is None:
             attr_names_to_skip = []
-        attr_names_to_skip.extend(["_submissions"])
+        attr_names_to_skip.extend(["_submissions", "_order_notifier"])
         return super().__str__(attr_names_to_skip=attr_names_to_skip)
 
     def __repr__(
@@ -94,7 +101,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
     ) -> str:
         if attr_names_to_skip is None:
             attr_names_to_skip = []
-        attr_names_to_skip.extend(["_submissions"])
+        attr_names_to_skip.extend(["_submissions", "_order_notifier"])
         return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     async def _submit_market_orders(
@@ -125,6 +132,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
             hsql.execute_insert_query(
                 self._db_connection, row, self._submitted_orders_table_name
             )
+            self._notify_submitted_orders()
         # TODO(gp): We save a single entry in the DB for all the orders instead
         #  of one row per order to accommodate some implementation semantic.
         order_df = pd.DataFrame(row)
@@ -155,6 +163,7 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
         hsql.execute_insert_query(
             self._db_connection, row, self._submitted_orders_table_name
         )
+        self._notify_submitted_orders()
         return file_name, orders
 
     async def _wait_for_accepted_orders(
@@ -165,11 +174,27 @@ class DatabaseBroker(obfafibr.FakeFillsBroker):
         Same as abstract method.
         """
         _LOG.debug("Wait for accepted orders ...")
+        poll_kwargs = self._poll_kwargs
+        if self._order_notifier is not None:
+            # Check the table as soon as the orders are accepted.
+            poll_kwargs = poll_kwargs.copy()
+            poll_kwargs["wait_for_change"] = (
+                self._order_notifier.get_wait_for_change(
+                    self._accepted_orders_table_name
+                )
+            )
         await odbomdb.wait_for_order_acceptance(
             self._db_connection,
             order_receipt,
-            self._poll_kwargs,
+            poll_kwargs,
             table_name=self._accepted_orders_table_name,
             field_name="filename",
         )
         _LOG.debug("Wait for accepted orders ... done")
+
+    def _notify_submitted_orders(self) -> None:
+        """
+        Notify the OMS that orders were written in the submitted orders table.
+        """
+        if self._order_notifier is not None:
+            self._order_notifier.notify(self._submitted_orders_table_name)
@@ -344,3 +344,113 @@ class Test_fill_orders1(hunitest.TestCase):
         # There should be no difference.
         asset_ids = [101, 102]
         self.helper(asset_ids, order, mode, exp)
+
+# #############################################################################
+# Test_get_execution_prices1
+# #############################################################################
+
+
+class Test_get_execution_prices1(hunitest.TestCase):
+    """
+    Price orders with different types and intervals in one call.
+    """
+
+    @staticmethod
+    def get_orders() -> List[oordorde.Order]:
+        orders = []
+        for asset_id, type_, start_time, end_time, diff_num_shares in [
+            (101, "price@twap", "09:30:00", "09:35:00", 100),
+            (102, "price@twap", "09:32:00", "09:34:00", 100),
+            (101, "midpoint@twap", "09:33:00", "09:39:00", -50),
+            (102, "partial_spread_0.25@twap", "09:30:00", "09:31:00", 10),
+            (102, "partial_spread_0.25@twap", "09:31:00", "09:35:00", -10),
+            (101, "partial_spread_0.5@end", "09:30:00", "09:35:00", 10),
+            (101, "price@start", "09:31:10", "09:35:00", 10),
+            (102, "price@start", "09:31:10", "09:35:00", 10),
+        ]:
+            start_timestamp = pd.Timestamp(
+                f"2000-01-01 {start_time}", tz="America/New_York"
+            )
+            end_timestamp = pd.Timestamp(
+                f"2000-01-01 {end_time}", tz="America/New_York"
+            )
+            order = oordorde.Order(
+                start_timestamp,
+                asset_id,
+                type_,
+                start_timestamp,
+                end_timestamp,
+                0,
+                diff_num_shares,
+                order_id=len(orders),
+            )
+            orders.append(order)
+        return orders
+
+    @staticmethod
+    def get_expected_price(
+        market_data: mdata.MarketData, order: oordorde.Order
+    ) -> float:
+        """
+        Price an order querying the market data for each needed column.
+        """
+        price_type, timing = order.type_.split("@")
+        if price_type in ("price", "midpoint"):
+            columns = [price_type]
+        else:
+            columns = ["bid", "ask"]
+        prices = {}
+        for column in columns:
+            prices_srs = obrobrok._get_price_per_share(
+                market_data,
+                order.start_timestamp,
+                order.end_timestamp,
+                "end_datetime",
+                [order.asset_id],
+                column,
+                timing,
+            )
+            prices[column] = prices_srs[order.asset_id]
+        if price_type in ("price", "midpoint"):
+            price = prices[price_type]
+        else:
+            perc = float(price_type.split("_")[2])
+            if order.diff_num_shares >= 0:
+                price = (1.0 - perc) * prices["bid"] + perc * prices["ask"]
+            else:
+                price = perc * prices["bid"] + (1.0 - perc) * prices["ask"]
+        return price
+
+    def test1(self) -> None:
+        orders = self.get_orders()
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example5(
+                event_loop,
+                pd.Timestamp("2000-01-01 09:29:00-05:00"),
+                pd.Timestamp("2000-01-02 09:30:00-05:00"),
+                [101, 102],
+                replayed_delay_in_mins_or_timestamp=pd.Timestamp(
+                    "2000-01-01 09:40:00-05:00"
+                ),
+                use_midpoint_as_price=True,
+            )
+            # Run.
+            prices = obrobrok._get_execution_prices(market_data, orders)
+            # Check.
+            actual = hpandas.df_to_str(prices.round(4), num_rows=None)
+            expected = r"""
+                price
+            0  997.9300
+            1 1002.3750
+            2  998.3492
+            3 1000.0525
+            4 1001.9975
+            5  997.4250
+            6  998.9300
+            7 1000.0750
+            """
+            self.assert_equal(actual, expected, fuzzy_match=True)
+            for idx, order in enumerate(orders):
+                expected_price = self.get_expected_price(market_data, order)
+                self.assertEqual(prices[idx], expected_price)
+
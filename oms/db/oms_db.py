@@ -137,6 +137,33 @@ def create_accepted_orders_table(
     return table_name
 
 
+# #############################################################################
+# Notifications
+# #############################################################################
+
+
+def get_notification_channel_name(table_name: str) -> str:
+    """
+    Get the name of the DB channel notified of the inserts in `table_name`.
+    """
+    return f"{table_name}_inserts"
+
+
+def create_notification_trigger(
+    db_connection: hsql.DbConnection, table_name: str
+) -> None:
+    """
+    Create a trigger notifying the inserts in `table_name`.
+    """
+    channel_name = get_notification_channel_name(table_name)
+    query = hsql.get_create_insert_notification_trigger_query(
+        table_name, channel_name
+    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("query=%s", query)
+    db_connection.cursor().execute(query)
+
+
 # #############################################################################
 # Current positions
 # #############################################################################
@@ -289,14 +316,30 @@ def create_restrictions_table(
 
 
 def create_oms_tables(
-    db_connection: hsql.DbConnection, incremental: bool, asset_id_name: str
+    db_connection: hsql.DbConnection,
+    incremental: bool,
+    asset_id_name: str,
+    *,
+    create_notification_triggers: bool = False,
 ) -> None:
+    """
+    Create the OMS tables.
+
+    :param create_notification_triggers: notify the inserts in the
+        submitted and accepted orders tables (see `DbOrderNotifier`)
+    """
     create_accepted_orders_table(
         db_connection, incremental, ACCEPTED_ORDERS_TABLE_NAME
     )
     create_submitted_orders_table(
         db_connection, incremental, SUBMITTED_ORDERS_TABLE_NAME
     )
+    if create_notification_triggers:
+        for table_name in [
+            SUBMITTED_ORDERS_TABLE_NAME,
+            ACCEPTED_ORDERS_TABLE_NAME,
+        ]:
+            create_notification_trigger(db_connection, table_name)
     create_current_positions_table(
         db_connection, incremental, asset_id_name, CURRENT_POSITIONS_TABLE_NAME
     )
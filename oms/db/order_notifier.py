@@ -0,0 +1,148 @@
+"""
+Notify the objects waiting for rows inserted in the OMS DB tables.
+
+Import as:
+
+import oms.db.order_notifier as odbornot
+"""
+
+import abc
+import asyncio
+import collections
+import logging
+from typing import Dict, Set
+
+import helpers.hasyncio as hasynci
+import helpers.hdbg as hdbg
+import helpers.hsql as hsql
+import oms.db.oms_db as odbomdb
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# OrderNotifier
+# #############################################################################
+
+
+class OrderNotifier(abc.ABC):
+    """
+    Notify the insertion of rows in the OMS tables (e.g., submitted and
+    accepted orders).
+
+    The objects waiting for rows in a table (e.g., `OrderProcessor` waiting
+    for submitted orders and `DatabaseBroker` waiting for accepted orders)
+    still check the table, but they wake up as soon as they are notified,
+    instead of after the polling interval.
+    """
+
+    @abc.abstractmethod
+    def notify(self, table_name: str) -> None:
+        """
+        Notify that rows were inserted in `table_name`.
+        """
+        ...
+
+    @abc.abstractmethod
+    async def wait_for_notification(
+        self, table_name: str, timeout_in_secs: float
+    ) -> bool:
+        """
+        Wait up to `timeout_in_secs` secs for rows inserted in `table_name`.
+
+        :return: whether a notification was received before the timeout
+        """
+        ...
+
+    def get_wait_for_change(self, table_name: str) -> hasynci.WaitForChange:
+        """
+        Get a function to pass to `hasynci.poll()` to wait for rows inserted
+        in `table_name`.
+        """
+
+        async def _wait_for_change(timeout_in_secs: float) -> bool:
+            return await self.wait_for_notification(table_name, timeout_in_secs)
+
+        return _wait_for_change
+
+
+# #############################################################################
+# InProcessOrderNotifier
+# #############################################################################
+
+
+class InProcessOrderNotifier(OrderNotifier):
+    """
+    Notify through asyncio events the objects running in the same event loop,
+    e.g., `DatabaseBroker` and `OrderProcessor` in a simulation.
+    """
+
+    def __init__(self) -> None:
+        self._events: Dict[str, asyncio.Event] = collections.defaultdict(
+            asyncio.Event
+        )
+
+    def notify(self, table_name: str) -> None:
+        self._events[table_name].set()
+
+    async def wait_for_notification(
+        self, table_name: str, timeout_in_secs: float
+    ) -> bool:
+        hdbg.dassert_lt(0, timeout_in_secs)
+        event = self._events[table_name]
+        try:
+            await asyncio.wait_for(event.wait(), timeout_in_secs)
+        except asyncio.TimeoutError:
+            return False
+        # Consume the notification.
+        event.clear()
+        return True
+
+
+# #############################################################################
+# DbOrderNotifier
+# #############################################################################
+
+
+class DbOrderNotifier(OrderNotifier):
+    """
+    Receive the notifications sent by the DB with LISTEN / NOTIFY.
+
+    The notifications are sent by the triggers on the OMS tables created by
+    `odbomdb.create_notification_trigger()`, so that the inserts done by any
+    process (e.g., a real OMS accepting the orders) are notified.
+    """
+
+    def __init__(self, db_connection: hsql.DbConnection) -> None:
+        """
+        Constructor.
+
+        :param db_connection: connection used only to receive the
+            notifications, since waiting for a notification reads from the
+            socket of the connection
+        """
+        self._db_connection = db_connection
+        self._channel_names: Set[str] = set()
+
+    def notify(self, table_name: str) -> None:
+        # The DB triggers notify the inserts.
+        _ = table_name
+
+    async def wait_for_notification(
+        self, table_name: str, timeout_in_secs: float
+    ) -> bool:
+        """
+        Same as the abstract method.
+
+        A notification for any of the tables this object waited for wakes up
+        the caller, which then checks its table.
+        """
+        hdbg.dassert_lt(0, timeout_in_secs)
+        channel_name = odbomdb.get_notification_channel_name(table_name)
+        if channel_name not in self._channel_names:
+            hsql.listen(self._db_connection, channel_name)
+            self._channel_names.add(channel_name)
+        is_notified = await hsql.wait_for_notification(
+            self._db_connection, timeout_in_secs
+        )
+        return is_notified
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+import helpers.hasyncio as hasynci
+import helpers.hunit_test as hunitest
+import oms.db.order_notifier as odbornot
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# TestInProcessOrderNotifier1
+# #############################################################################
+
+
+class TestInProcessOrderNotifier1(hunitest.TestCase):
+    @staticmethod
+    async def workload(
+        order_notifier: odbornot.InProcessOrderNotifier,
+    ) -> str:
+        """
+        Wait for notifications on two tables, one of which is notified after 2
+        secs.
+        """
+        event_loop = asyncio.get_running_loop()
+        start_time = event_loop.time()
+
+        async def _notify() -> None:
+            await asyncio.sleep(2.0)
+            order_notifier.notify("submitted_orders")
+
+        async def _wait(table_name: str) -> str:
+            is_notified = await order_notifier.wait_for_notification(
+                table_name, 5.0
+            )
+            elapsed_time = event_loop.time() - start_time
+            txt = f"{table_name}: is_notified={is_notified} "
+            txt += f"elapsed={elapsed_time}"
+            return txt
+
+        _, *txt = await asyncio.gather(
+            _notify(), _wait("submitted_orders"), _wait("accepted_orders")
+        )
+        return "\n".join(txt)
+
+    def test1(self) -> None:
+        order_notifier = odbornot.InProcessOrderNotifier()
+        with hasynci.solipsism_context() as event_loop:
+            coroutine = self.workload(order_notifier)
+            actual = hasynci.run(coroutine, event_loop=event_loop)
+        expected = r"""
+        submitted_orders: is_notified=True elapsed=2.0
+        accepted_orders: is_notified=False elapsed=5.0
+        """
+        self.assert_equal(actual, expected, dedent=True)
+
+    def test2(self) -> None:
+        """
+        Check that a notification sent before waiting is not lost and that it
+        is consumed by the first wait.
+        """
+        order_notifier = odbornot.InProcessOrderNotifier()
+        order_notifier.notify("submitted_orders")
+        wait_for_change = order_notifier.get_wait_for_change("submitted_orders")
+        with hasynci.solipsism_context() as event_loop:
+            is_notified1 = hasynci.run(
+                wait_for_change(1.0),
+                event_loop=event_loop,
+                close_event_loop=False,
+            )
+            is_notified2 = hasynci.run(
+                wait_for_change(1.0), event_loop=event_loop
+            )
+        self.assertTrue(is_notified1)
+        self.assertFalse(is_notified2)
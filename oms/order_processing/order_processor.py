@@ -19,6 +19,7 @@ import helpers.hprint as hprint
 import helpers.hsql as hsql
 import oms.broker.broker as obrobrok
 import oms.db.oms_db as odbomdb
+import oms.db.order_notifier as odbornot
 import oms.fill as omfill
 import oms.order.order as oordorde
 
@@ -60,6 +61,7 @@ class OrderProcessor(hobject.PrintableMixin):
         submitted_orders_table_name: str = odbomdb.SUBMITTED_ORDERS_TABLE_NAME,
         accepted_orders_table_name: str = odbomdb.ACCEPTED_ORDERS_TABLE_NAME,
         current_positions_table_name: str = odbomdb.CURRENT_POSITIONS_TABLE_NAME,
+        order_notifier: Optional[odbornot.OrderNotifier] = None,
     ) -> None:
         """
         Constructor.
@@ -85,6 +87,10 @@ class OrderProcessor(hobject.PrintableMixin):
             - Typically we use `OrderProcessor` in unit tests, we have control
               over the DB, and we can use names chosen by us, so we use the
               standard table names as defaults
+        :param order_notifier: object notifying the submitted orders and
+            notified of the accepted orders, so that this object doesn't need to
+            wait for the next polling of the submitted orders table
+            - `None` to only poll the table
         :param fill_mode: represent how orders are filled
             - `at_once`: all the orders are filled at once after
         """
@@ -101,7 +107,8 @@ class OrderProcessor(hobject.PrintableMixin):
                     "asset_id_name "
                     "submitted_orders_table_name "
                     "accepted_orders_table_name "
-                    "current_positions_table_name"
+                    "current_positions_table_name "
+                    "order_notifier"
                 )
             )
         self._db_connection = db_connection
@@ -128,6 +135,7 @@ class OrderProcessor(hobject.PrintableMixin):
         self._submitted_orders_table_name = submitted_orders_table_name
         self._accepted_orders_table_name = accepted_orders_table_name
         self._current_positions_table_name = current_positions_table_name
+        self._order_notifier = order_notifier
         #
         self._get_wall_clock_time = broker.market_data.get_wall_clock_time
         # NOTE: In our current execution model we place orders in one time slot,
@@ -141,6 +149,9 @@ class OrderProcessor(hobject.PrintableMixin):
         self.num_accepted_target_lists = 0
         self.num_accepted_orders = 0
         self.num_filled_orders = 0
+        # Map the acceptance timestamp of each order list to the delay from its
+        # submission.
+        self._submission_to_acceptance_latencies = {}
         # List of free-form events to represent the execution of this object.
         self.events = []
         #
@@ -157,7 +168,15 @@ class OrderProcessor(hobject.PrintableMixin):
     ) -> str:
         if attr_names_to_skip is None:
             attr_names_to_skip = []
-        attr_names_to_skip.extend(["_broker", "_orders", "events"])
+        attr_names_to_skip.extend(
+            [
+                "_broker",
+                "_orders",
+                "_order_notifier",
+                "_submission_to_acceptance_latencies",
+                "events",
+            ]
+        )
         return super().__str__(attr_names_to_skip=attr_names_to_skip)
 
     def __repr__(
@@ -166,7 +185,15 @@ class OrderProcessor(hobject.PrintableMixin):
     ) -> str:
         if attr_names_to_skip is None:
             attr_names_to_skip = []
-        attr_names_to_skip.extend(["_broker", "_orders", "events"])
+        attr_names_to_skip.extend(
+            [
+                "_broker",
+                "_orders",
+                "_order_notifier",
+                "_submission_to_acceptance_latencies",
+                "events",
+            ]
+        )
         return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     def get_execution_signature(self) -> str:
@@ -190,6 +217,18 @@ class OrderProcessor(hobject.PrintableMixin):
         txt = "\n".join(txt)
         return txt
 
+    def get_submission_to_acceptance_latencies(self) -> pd.Series:
+        """
+        Return the latency in seconds from the submission to the acceptance of
+        each order list, indexed by the acceptance timestamp.
+        """
+        srs = pd.Series(
+            self._submission_to_acceptance_latencies,
+            name="submission_to_acceptance_latency_in_secs",
+            dtype=float,
+        )
+        return srs
+
     # ///////////////////////////////////////////////////////////////////////////
 
     async def run_loop(
@@ -306,6 +345,13 @@ class OrderProcessor(hobject.PrintableMixin):
             self._get_wall_clock_time,
             timeout_in_secs=self.max_wait_time_for_order_in_secs,
         )
+        if self._order_notifier is not None:
+            # Check the table as soon as the orders are submitted.
+            poll_kwargs["wait_for_change"] = (
+                self._order_notifier.get_wait_for_change(
+                    self._submitted_orders_table_name
+                )
+            )
         diff_num_rows = await hsql.wait_for_change_in_number_of_rows(
             self._get_wall_clock_time,
             self._db_connection,
@@ -317,8 +363,12 @@ class OrderProcessor(hobject.PrintableMixin):
         # Extract the latest file_name after order submission is complete.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("Executing query for submitted orders filename...")
+        # The column `timestamp_db` has no timezone and stores the submission
+        # timestamp in the timezone of the DB session.
         query = f"""
-            SELECT filename, timestamp_db
+            SELECT filename, timestamp_db,
+                timestamp_db AT TIME ZONE current_setting('TimeZone')
+                    AS submission_timestamp
                 FROM {self._submitted_orders_table_name}
                 ORDER BY timestamp_db"""
         df = hsql.execute_query_to_df(self._db_connection, query)
@@ -333,8 +383,11 @@ class OrderProcessor(hobject.PrintableMixin):
         # TODO(gp): For now we accept only one order list.
         hdbg.dassert_eq(diff_num_rows, 1)
         file_name = df.tail(1).squeeze()["filename"]
+        submission_timestamp = pd.Timestamp(
+            df.tail(1).squeeze()["submission_timestamp"]
+        )
         if _LOG.isEnabledFor(logging.DEBUG):
-            _LOG.debug("file_name=%s", file_name)
+            _LOG.debug(hprint.to_str("file_name submission_timestamp"))
         # 2) Wait to simulate the submission being parsed and accepted.
         # TODO(gp): -> _wait_to_accept_submitted_orders
         msg = (
@@ -373,7 +426,21 @@ class OrderProcessor(hobject.PrintableMixin):
         hsql.execute_insert_query(
             self._db_connection, row, self._accepted_orders_table_name
         )
+        if self._order_notifier is not None:
+            self._order_notifier.notify(self._accepted_orders_table_name)
         self.num_accepted_target_lists += 1
+        submission_to_acceptance_latency_in_secs = (
+            wall_clock_time - submission_timestamp
+        ).total_seconds()
+        self._submission_to_acceptance_latencies[
+            wall_clock_time
+        ] = submission_to_acceptance_latency_in_secs
+        # The latency depends on the timezone of the DB session, so it is not
+        # stored in the events.
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                hprint.to_str("submission_to_acceptance_latency_in_secs")
+            )
         # 4) Add the new orders to the internal queue.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("Executing query for unfilled submitted orders...")
@@ -12,6 +12,7 @@ import pandas as pd
 import helpers.hdbg as hdbg
 import helpers.hprint as hprint
 import helpers.hsql as hsql
+import oms.db.order_notifier as odbornot
 import oms.order_processing.order_processor as ooprorpr
 import oms.portfolio.portfolio as oporport
 
@@ -32,7 +33,8 @@ def get_order_processor_example1(
     max_wait_time_for_order_in_secs: int,
     *,
     delay_to_accept_in_secs: int = 3,
-    delay_to_fill_in_secs: int = 10
+    delay_to_fill_in_secs: int = 10,
+    order_notifier: Optional[odbornot.OrderNotifier] = None,
 ) -> ooprorpr.OrderProcessor:
     """
     Build an OrderProcessor.
@@ -47,6 +49,8 @@ def get_order_processor_example1(
         to update the accepted orders table
     :param delay_to_fill_in_secs: delay after the order is accepted to
         update the position table with the filled positions
+    :param order_notifier: object notifying the submitted and accepted
+        orders, which should be the one passed to the `DatabaseBroker`
     """
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug(
@@ -82,6 +86,7 @@ def get_order_processor_example1(
         delay_to_fill_in_secs,
         broker,
         asset_id_name,
+        order_notifier=order_notifier,
     )
     return order_processor
 
@@ -5,7 +5,6 @@ import oms.portfolio.portfolio as oporport
 """
 
 import abc
-import collections
 import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple
@@ -14,7 +13,7 @@ import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
-import core.key_sorted_ordered_dict as cksoordi
+import core.timestamp_sorted_matrix as ctisomat
 import helpers.hdbg as hdbg
 import helpers.hio as hio
 import helpers.hobject as hobject
@@ -22,6 +21,7 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hwall_clock_time as hwacltim
 import oms.broker.broker as obrobrok
+import oms.portfolio.portfolio_journal as opopojou
 
 _LOG = logging.getLogger(__name__)
 
@@ -76,6 +76,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         retrieve_initial_holdings_from_db: bool = False,
         max_num_bars: Optional[int] = 100,
+        log_format: str = "csv",
     ):
         """
         Constructor.
@@ -95,6 +96,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             holdings_shares must be a subset of the index of `initial_holdings`.
         :param max_num_bars: maximum number of market data bars to store in memory;
             if `None`, then impose no restriction
+        :param log_format: how `log_state()` stores the state
+            - "csv": a CSV file per bar for each dataframe of the state
+            - "journal": a Parquet file per bar with all the dataframes of the
+              state, written in background and compacted into a file per day
+              (see `PortfolioJournal`)
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
@@ -104,7 +110,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
                     "pricing_method "
                     "initial_holdings_shares "
                     "retrieve_initial_holdings_from_db "
-                    "max_num_bars"
+                    "max_num_bars "
+                    "log_format"
                 )
             )
         # Set and unpack broker.
@@ -126,32 +133,36 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         # At each call to `mark_to_market()`, we capture `wall_clock_time` and
         # perform a sequence of updates to the following dictionaries.
         self._max_num_bars = max_num_bars
-        # We use `KeySortedOrderedDict` keyed `timestamp` to:
+        # We use `TimestampSortedMatrix` and `TimestampSortedArray` keyed by
+        # `timestamp` to:
         # - enforce that inserted new keys are always increasing according to the
         #   key order (i.e., increasing in time)
         # - simplify extracting the last timestamp
+        # - store the values of all the bars in NumPy arrays, so that
+        #   `get_historical_*()` slices the last bars instead of building a
+        #   dataframe from a series per bar
         # We initialize the collection of dictionaries from `holdings_shares_df`.
         # - timestamp to pd.Series of holdings in shares (indexed by asset_id)
         # - this does not include the "cash asset".
-        self._holdings_shares = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        self._holdings_shares = ctisomat.TimestampSortedMatrix(
+            self._max_num_bars
         )
         # - timestamp to float value of cash
-        self._cash = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        self._cash = ctisomat.TimestampSortedArray(self._max_num_bars)
+        # - timestamp to pd.Series of prices (indexed by asset_id)
+        self._holdings_prices = ctisomat.TimestampSortedMatrix(
+            self._max_num_bars
         )
-        # - timestamp to pd.DataFrame of price, value (indexed by asset_id)
-        self._holdings_notional = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        # - timestamp to pd.Series of values (indexed by asset_id)
+        self._holdings_notional = ctisomat.TimestampSortedMatrix(
+            self._max_num_bars
         )
         # - timestamp to pd.Series of notional trades (indexed by asset_id)
-        self._executed_trades_notional = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        self._executed_trades_notional = ctisomat.TimestampSortedMatrix(
+            self._max_num_bars
         )
         # - timestamp to pd.Series of statistics
-        self._statistics = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
-        )
+        self._statistics = ctisomat.TimestampSortedMatrix(self._max_num_bars)
         # Validate universe and holdings_shares.
         self._retrieve_initial_holdings_shares_from_db = (
             retrieve_initial_holdings_from_db
@@ -170,6 +181,10 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         self._initial_universe = initial_holdings_shares.index.drop(
             Portfolio.CASH_ID
         )
+        hdbg.dassert_in(log_format, ["csv", "journal"])
+        self._log_format = log_format
+        # Map log dirs to the journals storing the logged state.
+        self._journals: Dict[str, opopojou.PortfolioJournal] = {}
         #
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("After initialization:\n%s", repr(self))
@@ -289,25 +304,27 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         tz: str = "America/New_York",
         cast_asset_ids_to_int: bool = True,
+        start_timestamp: Optional[pd.Timestamp] = None,
+        end_timestamp: Optional[pd.Timestamp] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Read and process logged Portfolio state.
 
         :param log_dir: store the state of a Portfolio in terms of its
-            components, one per dir
+            components, one per dir, or in a journal (see `log_state()`)
+        :param start_timestamp: read only the bars with a timestamp greater
+            than or equal to `start_timestamp`
+            - `None` means no bound
+        :param end_timestamp: same as `start_timestamp` for the bars with a
+            timestamp less than or equal to `end_timestamp`
         """
-        holdings_shares_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_shares", tz
-        )
-        holdings_notional_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_notional", tz
-        )
-        executed_trades_shares_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_shares", tz
-        )
-        executed_trades_notional_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_notional", tz
+        state_dfs = Portfolio._load_state(
+            log_dir, tz, start_timestamp, end_timestamp
         )
+        holdings_shares_df = state_dfs["holdings_shares"]
+        holdings_notional_df = state_dfs["holdings_notional"]
+        executed_trades_shares_df = state_dfs["executed_trades_shares"]
+        executed_trades_notional_df = state_dfs["executed_trades_notional"]
         # Cast asset ids to int for all the dfs, if needed.
         if cast_asset_ids_to_int:
             holdings_shares_df.columns = holdings_shares_df.columns.astype(
@@ -334,7 +351,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         }
         portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
         #
-        stats_df = Portfolio._load_df_from_files(log_dir, "statistics", tz)
+        stats_df = state_dfs["statistics"]
         return portfolio_df, stats_df
 
     @classmethod
@@ -422,17 +439,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return whether the Portfolio contains only cash and no holdings_shares.
         """
-        # Get the dictionary of the last holdings_shares, excluding cash.
-        num_periods = 1
-        holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        if _LOG.isEnabledFor(logging.DEBUG):
-            _LOG.debug(hprint.to_str("holdings_shares_odict"))
-        # The
-        hdbg.dassert_isinstance(holdings_shares_odict, dict)
-        hdbg.dassert_eq(len(holdings_shares_odict), 1)
-        timestamp, holdings_srs = holdings_shares_odict.popitem()
+        # Get the last holdings_shares, excluding cash.
+        timestamp, holdings_srs = self._holdings_shares.peek()
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(hprint.to_str("timestamp"))
         hdbg.dassert_isinstance(timestamp, pd.Timestamp)
@@ -445,11 +453,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return the last timestamp of Portfolio internal state.
         """
-        num_periods = 1
-        holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        timestamp, _ = holdings_shares_odict.popitem()
+        timestamp = self._holdings_shares.get_last_key()
         return timestamp
 
     # /////////////////////////////////////////////////////////////////////////////
@@ -527,7 +531,14 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         holdings_shares_df = pd.concat([holdings_shares_df, cash_df])
         holdings_shares_df = holdings_shares_df.convert_dtypes()
         # Get mark-to-market values.
-        marked_to_market = self._holdings_notional[timestamp]
+        marked_to_market = pd.concat(
+            [
+                self._holdings_prices[timestamp],
+                self._holdings_notional[timestamp],
+            ],
+            axis=1,
+        )
+        marked_to_market.columns = Portfolio.PRICE_COLS
         cash_row = pd.DataFrame(
             index=[Portfolio.CASH_ID],
             columns=Portfolio.PRICE_COLS,
@@ -554,8 +565,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio statistics over time.
         """
-        stats_odict = self._statistics.get_ordered_dict(num_periods)
-        df = pd.DataFrame(stats_odict).transpose()
+        df = self._statistics.get_dataframe(num_periods)
         # Add `pnl` by diffing the snapshots of `net_wealth`.
         # ```
         # pnl = df["net_wealth"].diff().rename("pnl").to_frame()
@@ -578,12 +588,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in shares over time.
         """
-        asset_holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        asset_holdings_shares = pd.DataFrame(
-            asset_holdings_shares_odict
-        ).transpose()
+        asset_holdings_shares = self._holdings_shares.get_dataframe(num_periods)
         # # TODO(gp): @all there is a little repetition that we would like to remove.
         # # Explicitly cast to float. This makes the string representation of
         # # the dataframe more uniform and better.
@@ -599,10 +604,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in dollars over time.
         """
-        holdings_notional = collections.OrderedDict()
-        for k, v in self._holdings_notional.get_ordered_dict(num_periods).items():
-            holdings_notional[k] = v["value"]
-        holdings_notional = pd.DataFrame(holdings_notional).transpose()
+        holdings_notional = self._holdings_notional.get_dataframe(num_periods)
         holdings_notional.columns.name = self._asset_id_col
         # Explicitly cast to float. This makes the string representation of
         # the dataframe more uniform and better.
@@ -644,12 +646,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of notional executed trades over time.
         """
-        executed_trades_notional_odict = (
-            self._executed_trades_notional.get_ordered_dict(num_periods)
+        executed_trades_notional = self._executed_trades_notional.get_dataframe(
+            num_periods
         )
-        executed_trades_notional = pd.DataFrame(
-            executed_trades_notional_odict
-        ).transpose()
         executed_trades_notional.columns.name = self._asset_id_col
         # Explicitly cast to float. This makes the string representation of
         # the dataframe more uniform and better.
@@ -691,44 +690,60 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # /////////////////////////////////////////////////////////////////////////////
 
     def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
+        """
+        Log the state of the last `num_periods` bars in `log_dir`.
+
+        :return: the name of the CSV files or the path of the journal
+            segment file storing the state
+        """
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
         #
-        bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
+        dfs = {
+            "holdings_shares": self.get_historical_holdings_shares(num_periods),
+            "holdings_notional": self.get_historical_holdings_notional(
+                num_periods
+            ),
+            "executed_trades_shares": self.get_historical_executed_trades_shares(
+                num_periods
+            ),
+            "executed_trades_notional": (
+                self.get_historical_executed_trades_notional(num_periods)
+            ),
+            "statistics": self.get_historical_statistics(num_periods),
+        }
         #
         wall_clock_time = self._get_wall_clock_time()
+        if self._log_format == "journal":
+            if log_dir not in self._journals:
+                self._journals[log_dir] = opopojou.PortfolioJournal(log_dir)
+            file_name = self._journals[log_dir].append(dfs, wall_clock_time)
+            return file_name
+        #
+        bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
         wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
         file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
-        #
-        holdings_shares_df = self.get_historical_holdings_shares(num_periods)
-        Portfolio._write_df(
-            holdings_shares_df, log_dir, "holdings_shares", file_name
-        )
-        #
-        holdings_notional_df = self.get_historical_holdings_notional(num_periods)
-        Portfolio._write_df(
-            holdings_notional_df, log_dir, "holdings_notional", file_name
-        )
-        #
-        executed_trades_shares = self.get_historical_executed_trades_shares(
-            num_periods
-        )
-        Portfolio._write_df(
-            executed_trades_shares, log_dir, "executed_trades_shares", file_name
-        )
-        executed_trades_notional_df = (
-            self.get_historical_executed_trades_notional(num_periods)
-        )
-        Portfolio._write_df(
-            executed_trades_notional_df,
-            log_dir,
-            "executed_trades_notional",
-            file_name,
-        )
-        #
-        stats_df = self.get_historical_statistics(num_periods)
-        Portfolio._write_df(stats_df, log_dir, "statistics", file_name)
+        for name, df in dfs.items():
+            Portfolio._write_df(df, log_dir, name, file_name)
         return file_name
 
+    def wait_for_log_state(self) -> None:
+        """
+        Wait until the state logged in a journal is written.
+        """
+        for journal in self._journals.values():
+            journal.flush()
+
+    def close_log_state(self) -> None:
+        """
+        Write the state logged in the journals and close them.
+
+        E.g., call it at the end of a run to compact the journal of the last
+        day.
+        """
+        for journal in self._journals.values():
+            journal.close()
+        self._journals = {}
+
     def price_assets(self, asset_ids: List[int]) -> pd.Series:
         """
         Wrap `portfolio.market_data()` and packages output.
@@ -765,6 +780,51 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # Read / write state.
     # //////////////////////////////////////////////////////////////////////////////
 
+    @staticmethod
+    def _load_state(
+        log_dir: str,
+        tz: str,
+        start_timestamp: Optional[pd.Timestamp],
+        end_timestamp: Optional[pd.Timestamp],
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Load the dataframes of the state logged by `log_state()`.
+        """
+        names = [
+            "holdings_shares",
+            "holdings_notional",
+            "executed_trades_shares",
+            "executed_trades_notional",
+            "statistics",
+        ]
+        journal_dir = os.path.join(log_dir, opopojou.JOURNAL_DIR_NAME)
+        if os.path.exists(journal_dir):
+            # Read all the bars in the interval at once.
+            journal_dfs = opopojou.read_journal(
+                log_dir,
+                start_timestamp=start_timestamp,
+                end_timestamp=end_timestamp,
+            )
+            dfs = {}
+            for name in names:
+                # A dataframe is missing if it has never been logged with
+                # rows, e.g., when there are no trades.
+                df = journal_dfs.get(name, pd.DataFrame())
+                if isinstance(df.index, pd.DatetimeIndex):
+                    df.index = df.index.tz_convert(tz)
+                dfs[name] = df
+        else:
+            dfs = {
+                name: Portfolio._load_df_from_files(log_dir, name, tz)
+                for name in names
+            }
+            if start_timestamp is not None or end_timestamp is not None:
+                dfs = {
+                    name: df.loc[start_timestamp:end_timestamp]
+                    for name, df in dfs.items()
+                }
+        return dfs
+
     @staticmethod
     def _load_df_from_files(
         log_dir: str,
@@ -1010,7 +1070,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         :return: series of asset values
         """
         # This is the timestamp of the last snapshot.
-        as_of_timestamp, _ = self._holdings_shares.peek()
+        as_of_timestamp = self._holdings_shares.get_last_key()
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("as_of_timestamp=%s", as_of_timestamp)
         hdbg.dassert_isinstance(holding_shares, pd.Series)
@@ -1033,7 +1093,10 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             assets_marked_to_market = assets_marked_to_market.drop(
                 columns=Portfolio.CASH_ID
             )
-        self._holdings_notional[as_of_timestamp] = assets_marked_to_market
+        self._holdings_prices[as_of_timestamp] = assets_marked_to_market["price"]
+        self._holdings_notional[as_of_timestamp] = assets_marked_to_market[
+            "value"
+        ]
 
     def _compute_statistics(self) -> None:
         """
@@ -1043,12 +1106,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         Return asset/cash values, net wealth, exposure, and leverage for
         the portfolio at a given timestamp.
         """
-        cash_timestamp, _ = self._cash.peek()
+        cash_timestamp = self._cash.get_last_key()
         assets_ts, holdings_notional = self._holdings_notional.peek()
         hdbg.dassert_eq(cash_timestamp, assets_ts)
         hdbg.dassert_not_in(cash_timestamp, self._statistics)
         # Compute value of holdings_shares.
-        holdings_notional = holdings_notional["value"]
         is_finite = holdings_notional.apply(np.isfinite)
         net_holdings_notional = holdings_notional[is_finite].sum()
         hdbg.dassert(
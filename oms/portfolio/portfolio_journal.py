@@ -0,0 +1,240 @@
+"""
+Import as:
+
+import oms.portfolio.portfolio_journal as opopojou
+"""
+
+import logging
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hparquet as hparque
+import helpers.hthreading as hthread
+
+_LOG = logging.getLogger(__name__)
+
+# Dir storing the journal inside the log dir of a `Portfolio`.
+JOURNAL_DIR_NAME = "journal"
+
+_JOURNAL_COLS = ["timestamp", "name", "column", "value"]
+_JOURNAL_KEY_COLS = ["timestamp", "name", "column"]
+
+
+# #############################################################################
+# PortfolioJournal
+# #############################################################################
+
+
+class PortfolioJournal:
+    """
+    Store the state of a `Portfolio` logged at each bar in Parquet files.
+
+    The dataframes of the state (e.g., `holdings_shares`, `statistics`) are
+    stored in long format, with a row for each value, e.g.,
+    ```
+                      timestamp             name  column     value
+    2000-01-01 09:35:00-05:00  holdings_shares     101     20.0
+    2000-01-01 09:35:00-05:00  holdings_shares     202    -10.0
+    2000-01-01 09:35:00-05:00       statistics     gmv  30004.2
+    ```
+    so that the dataframes of all the bars are stored together, even if their
+    columns change (e.g., when the universe changes).
+
+    The rows of each bar are written in a background thread to a segment file
+    in the dir of the day, e.g.,
+    `{log_dir}/journal/20000101/20000101_093500.parquet`. When the day
+    changes or the journal is closed, the segments of the day are compacted
+    into a single file, e.g., `{log_dir}/journal/20000101.parquet`.
+    """
+
+    def __init__(self, log_dir: str) -> None:
+        """
+        Constructor.
+
+        :param log_dir: log dir of the `Portfolio`
+        """
+        self._dir_name = os.path.join(log_dir, JOURNAL_DIR_NAME)
+        # Date of the segments currently written, e.g., "20000101".
+        self._date: Optional[str] = None
+        # The writes are done in order, so a day is compacted after all its
+        # segments are written.
+        self._writer = hthread.BackgroundWriter(
+            _write_journal_items, name="portfolio_journal"
+        )
+
+    def append(
+        self, dfs: Dict[str, pd.DataFrame], wall_clock_time: pd.Timestamp
+    ) -> str:
+        """
+        Append the state of a bar to the journal.
+
+        :param dfs: dataframes of the state indexed by timestamp, e.g.,
+            `{"holdings_shares": ..., "statistics": ...}`
+        :param wall_clock_time: time of the bar, used to pick the dir of the
+            day and to name the segment file
+        :return: path of the segment file storing the state
+        """
+        date = wall_clock_time.strftime("%Y%m%d")
+        if self._date is not None and date != self._date:
+            self._writer.put(("compact", self._dir_name, self._date))
+        self._date = date
+        wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
+        file_name = os.path.join(
+            self._dir_name, date, f"{wall_clock_time_str}.parquet"
+        )
+        df = _to_long_format(dfs)
+        if not df.empty:
+            # The dataframes of the state are not modified after being
+            # logged, so the long format df is not shared with the caller.
+            self._writer.put(("segment", df, file_name))
+        return file_name
+
+    def flush(self) -> None:
+        """
+        Wait until the appended state is written.
+        """
+        self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Compact the segments of the current day and stop the background
+        thread.
+        """
+        if self._date is not None:
+            self._writer.put(("compact", self._dir_name, self._date))
+            self._date = None
+        self._writer.close()
+
+
+# #############################################################################
+
+
+def read_journal(
+    log_dir: str,
+    *,
+    start_timestamp: Optional[pd.Timestamp] = None,
+    end_timestamp: Optional[pd.Timestamp] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read the state of a `Portfolio` written by `PortfolioJournal`.
+
+    All the files are read at once, skipping the row groups outside the
+    requested interval.
+
+    :param log_dir: log dir of the `Portfolio`
+    :param start_timestamp: read only the bars with a timestamp greater than
+        or equal to `start_timestamp`
+        - `None` means no bound
+    :param end_timestamp: same as `start_timestamp` for the bars with a
+        timestamp less than or equal to `end_timestamp`
+    :return: dataframes of the state indexed by timestamp, e.g.,
+        `{"holdings_shares": ..., "statistics": ...}`
+    """
+    dir_name = os.path.join(log_dir, JOURNAL_DIR_NAME)
+    hdbg.dassert_dir_exists(dir_name)
+    df = hparque.from_parquet(
+        dir_name,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+        timestamp_col_name="timestamp",
+    )
+    # The segments of a day are removed after the compacted file is written,
+    # so the same rows can be stored twice if the process is interrupted in
+    # between.
+    df = df.drop_duplicates(_JOURNAL_KEY_COLS, keep="last")
+    dfs = {}
+    for name, df_name in df.groupby("name", sort=False):
+        # Keep the order of the columns as logged.
+        columns = pd.unique(df_name["column"])
+        df_name = df_name.pivot(
+            index="timestamp", columns="column", values="value"
+        )
+        df_name = df_name.reindex(columns=columns)
+        df_name.index.name = None
+        df_name.columns.name = None
+        dfs[name] = df_name
+    return dfs
+
+
+def _to_long_format(dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Convert dataframes indexed by timestamp to a single dataframe in long
+    format.
+    """
+    long_dfs = []
+    for name, df in dfs.items():
+        num_rows, num_cols = df.shape
+        if num_rows == 0 or num_cols == 0:
+            # E.g., there are no trades before the first bar.
+            continue
+        hdbg.dassert_isinstance(df.index, pd.DatetimeIndex)
+        long_df = pd.DataFrame(
+            {
+                "timestamp": df.index.repeat(num_cols),
+                "name": name,
+                "column": np.tile(df.columns.astype(str), num_rows),
+                "value": df.to_numpy(dtype=float).ravel(),
+            }
+        )
+        long_dfs.append(long_df)
+    if not long_dfs:
+        return pd.DataFrame(columns=_JOURNAL_COLS)
+    df = pd.concat(long_dfs, ignore_index=True)
+    hdbg.dassert_eq(df.columns.to_list(), _JOURNAL_COLS)
+    return df
+
+
+def _write_journal_items(items: List[Tuple[Any, ...]]) -> None:
+    """
+    Write the segments and compact the days queued by `PortfolioJournal`.
+
+    :param items: `("segment", df, file_name)` or `("compact", dir_name,
+        date)`
+    """
+    for item in items:
+        if item[0] == "segment":
+            _, df, file_name = item
+            if os.path.exists(file_name):
+                # The state of the same bar is logged again.
+                os.remove(file_name)
+            hparque.to_parquet(df, file_name)
+        elif item[0] == "compact":
+            _, dir_name, date = item
+            _compact_day(dir_name, date)
+        else:
+            raise ValueError(f"Invalid item='{item[0]}'")
+
+
+def _compact_day(dir_name: str, date: str) -> None:
+    """
+    Compact the segment files of a day into a single file.
+
+    The compacted file is replaced atomically and includes the rows of a
+    previous compaction of the same day, e.g., if the process was restarted.
+
+    :param dir_name: journal dir
+    :param date: day to compact, e.g., "20000101"
+    """
+    segments_dir_name = os.path.join(dir_name, date)
+    if not os.path.isdir(segments_dir_name):
+        # There is nothing to compact.
+        return
+    file_name = os.path.join(dir_name, f"{date}.parquet")
+    dfs = []
+    if os.path.exists(file_name):
+        dfs.append(hparque.from_parquet(file_name))
+    dfs.append(hparque.from_parquet(segments_dir_name))
+    df = pd.concat(dfs, ignore_index=True)
+    df = df.drop_duplicates(_JOURNAL_KEY_COLS, keep="last")
+    # Files starting with "_" are ignored when reading the journal dir.
+    tmp_file_name = os.path.join(dir_name, f"_tmp.{date}.parquet")
+    if os.path.exists(tmp_file_name):
+        os.remove(tmp_file_name)
+    hparque.to_parquet(df, tmp_file_name)
+    os.replace(tmp_file_name, file_name)
+    shutil.rmtree(segments_dir_name)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the time to store the history of a `Portfolio` and to retrieve it
+as dataframes, with the history stored in `KeySortedOrderedDict` and in
+`TimestampSortedMatrix`.
+
+At each bar the holdings of `--num_assets` assets are stored and the last
+`--num_periods` bars are retrieved, like `Portfolio.mark_to_market()` and
+`Portfolio.log_state()` do. One asset of the universe is replaced every day.
+The default values correspond to a 30-day run with 1 minute bars.
+
+> benchmark_portfolio_history.py --num_days 30 --bar_duration_in_mins 1
+
+Import as:
+
+import oms.portfolio.scripts.benchmark_portfolio_history as opsbpohi
+"""
+
+import argparse
+import logging
+import time
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+import core.key_sorted_ordered_dict as cksoordi
+import core.timestamp_sorted_matrix as ctisomat
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+
+
+def _get_holdings(
+    num_days: int, bar_duration_in_mins: int, num_assets: int
+) -> Iterator[Tuple[pd.Timestamp, pd.Series]]:
+    """
+    Generate the holdings of each bar.
+    """
+    start_timestamp = pd.Timestamp("2023-03-01 00:00:00", tz="America/New_York")
+    num_bars_per_day = 24 * 60 // bar_duration_in_mins
+    bar_duration = pd.Timedelta(minutes=bar_duration_in_mins)
+    rng = np.random.default_rng(seed=0)
+    for day in range(num_days):
+        asset_ids = pd.Index(
+            range(day, day + num_assets), dtype="int64", name="asset_id"
+        )
+        for bar_idx in range(num_bars_per_day):
+            timestamp = start_timestamp + (
+                day * num_bars_per_day + bar_idx + 1
+            ) * bar_duration
+            holdings = pd.Series(
+                rng.integers(-100, 100, num_assets).astype(float),
+                index=asset_ids,
+            )
+            yield timestamp, holdings
+
+
+def _run(
+    history_type: str,
+    num_days: int,
+    bar_duration_in_mins: int,
+    num_assets: int,
+    num_periods: int,
+) -> Tuple[float, float, float, pd.DataFrame]:
+    """
+    Store the holdings and retrieve the history.
+
+    :return: the mean time to store a bar, the mean time to retrieve the last
+        `num_periods` bars, the time to retrieve all the bars, in seconds, and
+        all the bars
+    """
+    if history_type == "KeySortedOrderedDict":
+        history = cksoordi.KeySortedOrderedDict(pd.Timestamp)
+        get_dataframe = lambda num_keys: pd.DataFrame(
+            history.get_ordered_dict(num_keys)
+        ).transpose()
+    elif history_type == "TimestampSortedMatrix":
+        history = ctisomat.TimestampSortedMatrix()
+        get_dataframe = history.get_dataframe
+    else:
+        raise ValueError(f"Invalid history_type='{history_type}'")
+    store_time = 0.0
+    retrieve_time = 0.0
+    num_bars = 0
+    for timestamp, holdings in _get_holdings(
+        num_days, bar_duration_in_mins, num_assets
+    ):
+        start_time = time.perf_counter()
+        history[timestamp] = holdings
+        store_time += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        _ = get_dataframe(num_periods)
+        retrieve_time += time.perf_counter() - start_time
+        num_bars += 1
+    start_time = time.perf_counter()
+    df = get_dataframe(None)
+    retrieve_all_time = time.perf_counter() - start_time
+    return store_time / num_bars, retrieve_time / num_bars, retrieve_all_time, df
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_days", action="store", type=int, default=30, help="Days to run"
+    )
+    parser.add_argument(
+        "--bar_duration_in_mins",
+        action="store",
+        type=int,
+        default=1,
+        help="Duration of a bar",
+    )
+    parser.add_argument(
+        "--num_assets",
+        action="store",
+        type=int,
+        default=25,
+        help="Assets in the universe",
+    )
+    parser.add_argument(
+        "--num_periods",
+        action="store",
+        type=int,
+        default=1,
+        help="Bars retrieved at each bar",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_days)
+    hdbg.dassert_lte(1, args.bar_duration_in_mins)
+    hdbg.dassert_lte(1, args.num_assets)
+    hdbg.dassert_lte(1, args.num_periods)
+    dfs = []
+    for history_type in ["KeySortedOrderedDict", "TimestampSortedMatrix"]:
+        store_time, retrieve_time, retrieve_all_time, df = _run(
+            history_type,
+            args.num_days,
+            args.bar_duration_in_mins,
+            args.num_assets,
+            args.num_periods,
+        )
+        _LOG.info(
+            "%s: store=%.3fms retrieve_last=%.3fms retrieve_all=%.2fs",
+            history_type,
+            1000 * store_time,
+            1000 * retrieve_time,
+            retrieve_all_time,
+        )
+        dfs.append(df)
+    # Check that the histories are the same.
+    hdbg.dassert(dfs[0].equals(dfs[1]))
+
+
+if __name__ == "__main__":
+    _main(_parse())
@@ -1,10 +1,14 @@
+import asyncio
 import io
 import logging
+import os
 
 import pandas as pd
 
 import core.real_time as creatime
 import helpers.hasyncio as hasynci
+import helpers.hio as hio
+import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
 import market_data as mdata
@@ -242,3 +246,138 @@ class TestDataFramePortfolio2(hunitest.TestCase):
             leverage                            0.0"""
             actual = portfolio.get_historical_statistics().transpose()
             self.assert_equal(str(actual), expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestDataFramePortfolio3
+# #############################################################################
+
+
+class TestDataFramePortfolio3(hunitest.TestCase):
+    """
+    Test the `log_state()`/`read_state()` round trip.
+    """
+
+    @staticmethod
+    async def log_state(
+        portfolio: opodapor.DataFramePortfolio, log_dir: str, close: bool
+    ) -> None:
+        """
+        Mark to market and log the state of the Portfolio for 3 bars.
+        """
+        for _ in range(3):
+            portfolio.mark_to_market()
+            _ = portfolio.log_state(log_dir)
+            await asyncio.sleep(60 * 5)
+        if close:
+            portfolio.close_log_state()
+        else:
+            portfolio.wait_for_log_state()
+
+    def run_portfolio(self, log_format: str, *, close: bool = True) -> str:
+        """
+        Log the state of a Portfolio with holdings.
+
+        :param close: close the log state at the end of the run
+        :return: the log dir
+        """
+        dir_name = log_format if close else f"{log_format}.open"
+        log_dir = os.path.join(self.get_scratch_space(), dir_name)
+        with hasynci.solipsism_context() as event_loop:
+            (
+                market_data,
+                _,
+            ) = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+            broker = obrbrexa.get_DataFrameBroker_example1(
+                event_loop, market_data=market_data
+            )
+            mark_to_market_col = "price"
+            pricing_method = "last"
+            holdings_dict = {101: 727.5, 202: 1040.3, -1: 10000}
+            portfolio = opodapor.DataFramePortfolio.from_dict(
+                broker,
+                mark_to_market_col,
+                pricing_method,
+                holdings_shares_dict=holdings_dict,
+                log_format=log_format,
+            )
+            coroutines = [self.log_state(portfolio, log_dir, close)]
+            hasynci.run(asyncio.gather(*coroutines), event_loop=event_loop)
+        return log_dir
+
+    def test_journal1(self) -> None:
+        """
+        Check that the state of the day is compacted into a single file.
+        """
+        log_dir = self.run_portfolio("journal")
+        # Check.
+        files = hio.listdir(
+            log_dir, "*", only_files=True, use_relative_paths=True
+        )
+        self.assertEqual(files, ["journal/20000101.parquet"])
+        portfolio_df, stats_df = opodapor.DataFramePortfolio.read_state(
+            log_dir
+        )
+        actual = hpandas.df_to_str(
+            portfolio_df, handle_signed_zeros=True, num_rows=None, precision=2
+        )
+        expected = r"""
+                                  holdings_shares         holdings_notional           executed_trades_shares         executed_trades_notional          pnl
+                                              101     202               101       202                    101     202                      101  202     101     202
+        2000-01-01 09:35:00-05:00           727.5  1040.3         727726.93  1.04e+06                  727.5  1040.3                      NaN  NaN     NaN     NaN
+        2000-01-01 09:40:00-05:00           727.5  1040.3         727646.49  1.04e+06                    0.0     0.0                      0.0  0.0  -80.43 -115.01
+        2000-01-01 09:45:00-05:00           727.5  1040.3         727440.69  1.04e+06                    0.0     0.0                      0.0  0.0 -205.81 -294.30
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_journal2(self) -> None:
+        """
+        Check that the state read from the journal is the same as the state
+        read from the CSV files.
+        """
+        csv_log_dir = self.run_portfolio("csv")
+        journal_log_dir = self.run_portfolio("journal")
+        start_timestamp = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        for kwargs in [{}, {"start_timestamp": start_timestamp}]:
+            expected_dfs = opodapor.DataFramePortfolio.read_state(
+                csv_log_dir, **kwargs
+            )
+            actual_dfs = opodapor.DataFramePortfolio.read_state(
+                journal_log_dir, **kwargs
+            )
+            for actual, expected in zip(actual_dfs, expected_dfs):
+                self.assert_equal(
+                    hpandas.df_to_str(actual, num_rows=None),
+                    hpandas.df_to_str(expected, num_rows=None),
+                )
+
+    def test_journal3(self) -> None:
+        """
+        Check that the state is logged in a file per bar before being
+        compacted.
+        """
+        log_dir = self.run_portfolio("journal", close=False)
+        # Check.
+        files = hio.listdir(
+            log_dir, "*", only_files=True, use_relative_paths=True
+        )
+        expected = [
+            "journal/20000101/20000101_093500.parquet",
+            "journal/20000101/20000101_094000.parquet",
+            "journal/20000101/20000101_094500.parquet",
+        ]
+        self.assertEqual(sorted(files), expected)
+        # The state read from the segments is the same as from the compacted
+        # file.
+        compacted_log_dir = self.run_portfolio("journal")
+        actual_dfs = opodapor.DataFramePortfolio.read_state(log_dir)
+        expected_dfs = opodapor.DataFramePortfolio.read_state(
+            compacted_log_dir
+        )
+        for actual, expected in zip(actual_dfs, expected_dfs):
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(expected, num_rows=None),
+            )
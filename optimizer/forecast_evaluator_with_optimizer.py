@@ -6,6 +6,7 @@ import optimizer.forecast_evaluator_with_optimizer as ofevwiop
 import logging
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
@@ -154,8 +155,25 @@ class ForecastEvaluatorWithOptimizer:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        reuse_optimization_problem: bool = False,
+        batch_optimization: bool = False,
         **kwargs: Dict[str, Any],
     ) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the portfolio optimizing the holdings bar by bar.
+
+        :param reuse_optimization_problem: build the optimization problem
+            once and only update its data at each bar (see
+            `CachedSinglePeriodOptimizer`), instead of building a new problem
+            at each bar
+            - the solution can differ from the one of a new problem within
+              the solver tolerance, which can change the quantized holdings
+        :param batch_optimization: optimize all the bars at once (see
+            `BatchSinglePeriodOptimizer`) and compute the holdings and the
+            trades with vectorized operations
+            - this requires that the optimizer config does not depend on the
+              current holdings, e.g., no transaction costs
+        """
         _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
         self._validate_df(df)
         # Record index in case we reindex the results.
@@ -165,6 +183,76 @@ class ForecastEvaluatorWithOptimizer:
             idx = None
         # Trim to indices with prices and beginning of forecast availability.
         df = self._apply_trimming(df)
+        if batch_optimization:
+            (
+                holdings_shares,
+                executed_trades_shares,
+            ) = self._compute_holdings_and_trades_in_batch(
+                df,
+                quantization,
+                asset_id_to_share_decimals,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+            )
+            price = df[self._price_col]
+            holdings_notional = holdings_shares * price
+            executed_trades_notional = executed_trades_shares * price
+        else:
+            (
+                holdings_shares,
+                holdings_notional,
+                executed_trades_shares,
+                executed_trades_notional,
+            ) = self._compute_holdings_and_trades(
+                df,
+                quantization,
+                asset_id_to_share_decimals,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+                reuse_optimization_problem,
+            )
+        pnl = holdings_notional.subtract(
+            holdings_notional.shift(1), fill_value=0
+        ).subtract(executed_trades_notional, fill_value=0)
+        stats = cofinanc.compute_bar_metrics(
+            holdings_notional,
+            -executed_trades_notional,
+            pnl,
+            compute_extended_stats=compute_extended_stats,
+        )
+        derived_dfs = {
+            "holdings_shares": holdings_shares,
+            "holdings_notional": holdings_notional,
+            "executed_trades_shares": executed_trades_shares,
+            "executed_trades_notional": executed_trades_notional,
+            "pnl": pnl,
+            "stats": stats,
+        }
+        # Apply burn-in and reindex like input.
+        return self._apply_burn_in_and_reindex(
+            df,
+            derived_dfs,
+            burn_in_bars,
+            burn_in_days,
+            idx,
+        )
+
+    def _compute_holdings_and_trades(
+        self,
+        df: pd.DataFrame,
+        quantization: Optional[int],
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        reuse_optimization_problem: bool,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Compute the holdings and the trades optimizing bar by bar.
+
+        :param df: trimmed `df` as in `compute_portfolio()`
+        :return: holdings in shares and notional, executed trades in shares
+            and notional
+        """
         # Prepare to process the DAG df row by row.
         iter_ = enumerate(df.iterrows())
         iter_idx = df.index
@@ -197,6 +285,12 @@ class ForecastEvaluatorWithOptimizer:
         eod_timestamps = cofinanc.retrieve_end_of_day_timestamps(
             df[self._price_col]
         )
+        if reuse_optimization_problem:
+            optimizer = osipeopt.CachedSinglePeriodOptimizer(
+                self._optimizer_config_dict
+            )
+        else:
+            optimizer = None
         # Process the DAG row by row.
         for idx, (timestamp, dag_data) in tqdm(iter_, total=num_rows):
             if idx + 1 < num_rows:
@@ -246,6 +340,7 @@ class ForecastEvaluatorWithOptimizer:
                 quantization,
                 asset_id_to_share_decimals,
                 liquidate_holdings,
+                optimizer,
             )
             # If the time step is not the last one, set the next-period
             # share holdings and executed trades in shares (assuming orders
@@ -268,36 +363,79 @@ class ForecastEvaluatorWithOptimizer:
                     executed_trades_shares_dict[next_timestamp] = (
                         targets_df["target_trades_shares"]
                     ).rename("executed_trades_shares")
-        # Create the portfolio dataframe.
+        # Create the portfolio dataframes.
         holdings_shares = pd.DataFrame(holdings_shares_dict).T
         holdings_notional = pd.DataFrame(holdings_notional_dict).T
         executed_trades_shares = pd.DataFrame(executed_trades_shares_dict).T
         executed_trades_notional = pd.DataFrame(executed_trades_notional_dict).T
-        pnl = holdings_notional.subtract(
-            holdings_notional.shift(1), fill_value=0
-        ).subtract(executed_trades_notional, fill_value=0)
-        stats = cofinanc.compute_bar_metrics(
+        return (
+            holdings_shares,
             holdings_notional,
-            -executed_trades_notional,
-            pnl,
-            compute_extended_stats=compute_extended_stats,
+            executed_trades_shares,
+            executed_trades_notional,
         )
-        derived_dfs = {
-            "holdings_shares": holdings_shares,
-            "holdings_notional": holdings_notional,
-            "executed_trades_shares": executed_trades_shares,
-            "executed_trades_notional": executed_trades_notional,
-            "pnl": pnl,
-            "stats": stats,
-        }
-        # Apply burn-in and reindex like input.
-        return self._apply_burn_in_and_reindex(
-            df,
-            derived_dfs,
-            burn_in_bars,
-            burn_in_days,
-            idx,
+
+    def _compute_holdings_and_trades_in_batch(
+        self,
+        df: pd.DataFrame,
+        quantization: Optional[int],
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compute the holdings and the trades optimizing all the bars at once.
+
+        Since the target holdings do not depend on the current holdings, the
+        result is the same as `_compute_holdings_and_trades()`.
+
+        :param df: trimmed `df` as in `compute_portfolio()`
+        :return: holdings and executed trades in shares
+        """
+        price = df[self._price_col]
+        hdbg.dassert(not price.isna().any().any(), "Found NaNs in prices")
+        # Compute the target holdings of all the bars.
+        optimizer = osipeopt.BatchSinglePeriodOptimizer(
+            self._optimizer_config_dict
+        )
+        target_weights = optimizer.optimize_weights(
+            df[self._prediction_col], df[self._volatility_col]
+        )
+        bod_timestamps = cofinanc.retrieve_beginning_of_day_timestamps(price)
+        eod_timestamps = cofinanc.retrieve_end_of_day_timestamps(price)
+        is_bod = df.index.isin(bod_timestamps["timestamp"])
+        is_eod = df.index.isin(eod_timestamps["timestamp"])
+        if liquidate_at_end_of_day:
+            # Liquidate the holdings at the bar before the end of the day.
+            next_is_eod = np.append(is_eod[1:], False)
+            target_weights[next_is_eod] = 0.0
+        rescaling = (
+            self._optimizer_config_dict["target_gmv"] / target_weights.shape[1]
+        )
+        target_holdings_shares = cofinanc.quantize_shares(
+            rescaling * target_weights / price,
+            quantization,
+            asset_id_to_decimals=asset_id_to_share_decimals,
         )
+        # The holdings of a bar are the target holdings of the previous bar,
+        # assuming that orders are fully filled, except at the beginning of
+        # the day, where they are the holdings of the previous bar.
+        holdings_shares = target_holdings_shares.shift(1)
+        if initialize_beginning_of_day_trades_to_zero:
+            holdings_shares[is_bod] = np.nan
+        holdings_shares.iloc[0] = 0.0
+        holdings_shares = holdings_shares.ffill()
+        # Compute the trades as the target holdings of the previous bar minus
+        # its holdings.
+        executed_trades_shares = cofinanc.quantize_shares(
+            target_holdings_shares.shift(1) - holdings_shares.shift(1),
+            quantization,
+            asset_id_to_decimals=asset_id_to_share_decimals,
+        )
+        if initialize_beginning_of_day_trades_to_zero:
+            executed_trades_shares[is_bod] = 0.0
+        executed_trades_shares.iloc[0] = 0.0
+        return holdings_shares, executed_trades_shares
 
     def annotate_forecasts(
         self,
@@ -359,6 +497,7 @@ class ForecastEvaluatorWithOptimizer:
         quantization,
         asset_id_to_share_decimals,
         liquidate_holdings,
+        optimizer: Optional[osipeopt.CachedSinglePeriodOptimizer],
     ) -> pd.Series:
         # Prepare data for the optimizer.
         holdings_df = pd.concat([holdings_shares, holdings_notional], axis=1)
@@ -367,13 +506,17 @@ class ForecastEvaluatorWithOptimizer:
         input_df = input_df.rename(columns={"index": "asset_id"})
         _LOG.debug("input_df cols=%s", input_df.columns)
         # Optimize.
-        output_df = osipeopt.optimize(
-            self._optimizer_config_dict,
-            input_df,
-            quantization=quantization,
-            asset_id_to_share_decimals=asset_id_to_share_decimals,
-            liquidate_holdings=liquidate_holdings,
-        )
+        kwargs = {
+            "quantization": quantization,
+            "asset_id_to_share_decimals": asset_id_to_share_decimals,
+            "liquidate_holdings": liquidate_holdings,
+        }
+        if optimizer is None:
+            output_df = osipeopt.optimize(
+                self._optimizer_config_dict, input_df, **kwargs
+            )
+        else:
+            output_df = optimizer.optimize(input_df, **kwargs)
         return output_df
 
     def _validate_df(self, df: pd.DataFrame) -> None:
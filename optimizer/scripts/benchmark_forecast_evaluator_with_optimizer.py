@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the bars per second processed by
+`ForecastEvaluatorWithOptimizer.compute_portfolio()` building a new
+optimization problem at each bar, reusing the problem across bars, and, when
+the transaction cost penalty is 0, optimizing all the bars at once.
+
+> benchmark_forecast_evaluator_with_optimizer.py --num_days 5 --num_assets 25
+
+Import as:
+
+import optimizer.scripts.benchmark_forecast_evaluator_with_optimizer as osbfevwo
+"""
+
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+import core.finance_data_example as cfidaexa
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+import optimizer.forecast_evaluator_with_optimizer as ofevwiop
+import optimizer.single_period_optimization as osipeopt
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+
+
+def _get_config_dict(
+    target_gmv: float, transaction_cost_penalty: float, solver: str
+) -> dict:
+    dict_ = {
+        "dollar_neutrality_penalty": 0.01,
+        "constant_correlation": 0.5,
+        "constant_correlation_penalty": 0.25,
+        "relative_holding_penalty": 0.0,
+        "relative_holding_max_frac_of_gmv": 0.8,
+        "target_gmv": target_gmv,
+        "target_gmv_upper_bound_penalty": 0.0,
+        "target_gmv_hard_upper_bound_multiple": 1.00,
+        "transaction_cost_penalty": transaction_cost_penalty,
+        "solver": solver,
+    }
+    return dict_
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_days", action="store", type=int, default=5, help="Days to run"
+    )
+    parser.add_argument(
+        "--num_assets",
+        action="store",
+        type=int,
+        default=25,
+        help="Assets in the universe",
+    )
+    parser.add_argument(
+        "--bar_duration", action="store", default="5T", help="Bar duration"
+    )
+    parser.add_argument(
+        "--transaction_cost_penalty",
+        action="store",
+        type=float,
+        default=0.001,
+        help="Transaction cost penalty of the optimizer",
+    )
+    parser.add_argument(
+        "--solver", action="store", default="ECOS", help="cvxpy solver"
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    hdbg.dassert_lte(1, args.num_days)
+    hdbg.dassert_lte(1, args.num_assets)
+    # Build the data.
+    start_datetime = pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York")
+    end_datetime = start_datetime + pd.Timedelta(days=args.num_days - 1)
+    end_datetime = end_datetime.replace(hour=16, minute=0)
+    asset_ids = list(range(101, 101 + args.num_assets))
+    df = cfidaexa.get_forecast_price_based_dataframe(
+        start_datetime,
+        end_datetime,
+        asset_ids,
+        bar_duration=args.bar_duration,
+    )
+    config_dict = _get_config_dict(
+        1e4 * args.num_assets, args.transaction_cost_penalty, args.solver
+    )
+    forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+        price_col="price",
+        volatility_col="volatility",
+        prediction_col="prediction",
+        optimizer_config_dict=config_dict,
+    )
+    modes = {
+        "new_problem": {"reuse_optimization_problem": False},
+        "reused_problem": {"reuse_optimization_problem": True},
+    }
+    if osipeopt.is_path_independent(config_dict):
+        modes["batch"] = {"batch_optimization": True}
+    for mode, kwargs in modes.items():
+        start_time = time.perf_counter()
+        dfs = forecast_evaluator.compute_portfolio(df, quantization=0, **kwargs)
+        elapsed_time = time.perf_counter() - start_time
+        num_bars = dfs["holdings_shares"].shape[0]
+        _LOG.info(
+            "%s: bars=%s time=%.1fs bars/sec=%.1f",
+            mode,
+            num_bars,
+            elapsed_time,
+            num_bars / elapsed_time,
+        )
+
+
+if __name__ == "__main__":
+    _main(_parse())
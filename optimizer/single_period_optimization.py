@@ -44,6 +44,11 @@ def optimize(
     return output_df
 
 
+# #############################################################################
+# SinglePeriodOptimizer
+# #############################################################################
+
+
 class SinglePeriodOptimizer:
     def __init__(
         self,
@@ -51,6 +56,7 @@ class SinglePeriodOptimizer:
         df: pd.DataFrame,
         *,
         restrictions: Optional[pd.DataFrame] = None,
+        problem_cache: Optional["CachedSinglePeriodOptimizer"] = None,
     ) -> None:
         """
         Single period optimization constructor.
@@ -62,6 +68,9 @@ class SinglePeriodOptimizer:
             - asset volatility is needed to generate a risk constraint
             - some restriction constraints are position-dependent
         :param restrictions: restrictions dataframe
+        :param problem_cache: reuse the cvxpy problem built by a previous
+            optimization with the same assets and constraints
+            - `None` means build a new problem
         """
         # Process `config_dict` and extract parameters.
         self._dollar_neutrality_penalty = config_dict["dollar_neutrality_penalty"]
@@ -110,6 +119,7 @@ class SinglePeriodOptimizer:
         else:
             self._solver = None
         self._verbose = config_dict.get("verbose", False)
+        self._problem_cache = problem_cache
 
     def optimize(
         self,
@@ -269,6 +279,10 @@ class SinglePeriodOptimizer:
         :return: target weights and weight diffs (from current weights),
             normalized by current GMV.
         """
+        if self._problem_cache is not None:
+            problem = self._problem_cache.get_problem(self)
+            problem.solve(self)
+            return problem.target_weights, problem.target_weight_diffs
         # Determine the current GMV and GMV-normalized weights.
         # Create a placeholder for (current) GMV-normalized weight adjustments.
         target_weight_diffs = cvx.Variable(self._n_assets)
@@ -310,10 +324,17 @@ class SinglePeriodOptimizer:
         # TODO(Paul): Compute estimates for PnL, costs.
         return target_weights, target_weight_diffs
 
-    def _get_soft_constraints(self) -> List[opbase.Expression]:
+    def _get_soft_constraints(
+        self, volatility: Optional[osofcons.SERIES_OR_PARAMETER] = None
+    ) -> List[opbase.Expression]:
+        """
+        :param volatility: volatility of the assets
+            - `None` means use the volatility in the df
+        """
         # Create soft constraints
         soft_constraints = []
-        volatility = self._df["volatility"]
+        if volatility is None:
+            volatility = self._df["volatility"]
         # Maybe add constant correlation risk constraint.
         if "constant_correlation" in self._config_dict:
             constant_correlation = self._config_dict["constant_correlation"]
@@ -371,23 +392,50 @@ class SinglePeriodOptimizer:
 
     def _get_restriction_constraints(self) -> List[opbase.Expression]:
         constraints = []
+        do_not_buy, do_not_sell = self._get_restriction_masks()
+        if do_not_buy.any():
+            do_not_buy_constraint = oharcons.DoNotBuyHardConstraint(do_not_buy)
+            constraints.append(do_not_buy_constraint)
+        if do_not_sell.any():
+            do_not_sell_constraint = oharcons.DoNotSellHardConstraint(do_not_sell)
+            constraints.append(do_not_sell_constraint)
+        # Note: it is possible for this list to be empty.
+        return constraints
+
+    def _get_restriction_masks(self) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get the assets that cannot be bought and sold given the holdings.
+
+        :return: boolean series for the assets that cannot be bought and
+            for the assets that cannot be sold
+        """
+        hdbg.dassert_is_not(self._restrictions, None)
         df = self._df.merge(self._restrictions, how="left", on="asset_id").fillna(
             False
         )
         do_not_buy = ((df["holdings_shares"] >= 0) & df["is_buy_restricted"]) | (
             (df["holdings_shares"] < 0) & df["is_buy_cover_restricted"]
         )
-        if do_not_buy.any():
-            do_not_buy_constraint = oharcons.DoNotBuyHardConstraint(do_not_buy)
-            constraints.append(do_not_buy_constraint)
         do_not_sell = (
             (df["holdings_shares"] > 0) & df["is_sell_long_restricted"]
         ) | ((df["holdings_shares"] <= 0) & df["is_sell_short_restricted"])
-        if do_not_sell.any():
-            do_not_sell_constraint = oharcons.DoNotSellHardConstraint(do_not_sell)
-            constraints.append(do_not_sell_constraint)
-        # Note: it is possible for this list to be empty.
-        return constraints
+        return do_not_buy, do_not_sell
+
+    def _get_problem_key(self) -> Tuple:
+        """
+        Get a key identifying the problem built for the assets and the
+        constraints.
+
+        Two optimizations with the same key differ only in the values of the
+        parameters of the problem (see `_ParameterizedProblem`).
+        """
+        key = [tuple(self._asset_ids.to_list())]
+        if self._restrictions is not None:
+            # The restriction constraints depend on the holdings.
+            do_not_buy, do_not_sell = self._get_restriction_masks()
+            key.append(tuple(do_not_buy.to_list()))
+            key.append(tuple(do_not_sell.to_list()))
+        return tuple(key)
 
     def _process_results(
         self,
@@ -438,3 +486,317 @@ class SinglePeriodOptimizer:
         df = pd.concat(srs_list, axis=1)
         _LOG.debug("optimizer result=\n%s", hpandas.df_to_str(df, precision=2))
         return df
+
+
+# #############################################################################
+# _ParameterizedProblem
+# #############################################################################
+
+
+class _ParameterizedProblem:
+    """
+    Store a cvxpy problem of `SinglePeriodOptimizer` whose data are
+    `cvx.Parameter`s.
+
+    The problem follows the DPP rules, so that cvxpy canonicalizes it only at
+    the first solve and then only updates the values of the parameters.
+    """
+
+    def __init__(self, spo: SinglePeriodOptimizer) -> None:
+        """
+        Build the problem for the assets and the constraints of `spo`.
+        """
+        n_assets = spo._n_assets
+        self._current_weights = cvx.Parameter(n_assets)
+        self._predictions = cvx.Parameter(n_assets)
+        self._volatility = cvx.Parameter(n_assets, nonneg=True)
+        # The target weights are a variable (instead of the sum of the current
+        # weights and the weight diffs) so that the expressions multiplying
+        # them by a parameter follow the DPP rules.
+        self.target_weight_diffs = cvx.Variable(n_assets)
+        self.target_weights = cvx.Variable(n_assets)
+        mu = cvx.sum(cvx.multiply(self._predictions, self.target_weights))
+        hdbg.dassert(mu.is_concave())
+        # Get constraints.
+        soft_constraints = spo._get_soft_constraints(self._volatility)
+        hard_constraints = spo._get_hard_constraints()
+        # Convert constraints into cvxpy expressions.
+        soft_constraint_cvx_expr = [
+            constraint.get_expr(
+                self.target_weights, self.target_weight_diffs, spo._target_gmv
+            )
+            for constraint in soft_constraints
+        ]
+        hard_constraint_cvx_expr = [
+            constraint.get_expr(
+                self.target_weights, self.target_weight_diffs, spo._target_gmv
+            )
+            for constraint in hard_constraints
+        ]
+        hard_constraint_cvx_expr.append(
+            self.target_weights
+            == self._current_weights + self.target_weight_diffs
+        )
+        # Create the cvxpy problem.
+        self._problem = cvx.Problem(
+            cvx.Maximize(mu - sum(soft_constraint_cvx_expr)),
+            hard_constraint_cvx_expr,
+        )
+        hdbg.dassert(self._problem.is_dpp())
+
+    def solve(self, spo: SinglePeriodOptimizer) -> None:
+        """
+        Solve the problem with the data of `spo`.
+
+        The solvers supporting it (e.g., OSQP, SCS) start from the solution
+        of the previous solve.
+        """
+        self._current_weights.value = spo._current_weights.to_numpy()
+        predictions = spo._df["prediction"] * spo._df["volatility"]
+        self._predictions.value = predictions.to_numpy()
+        self._volatility.value = spo._df["volatility"].to_numpy()
+        optimal_value = self._problem.solve(
+            spo._solver, verbose=spo._verbose, warm_start=True
+        )
+        if self._problem.status != "optimal":
+            _LOG.warning("problem.status=%s", self._problem.status)
+        _LOG.debug("`optimal_value`=%0.2f", optimal_value)
+
+
+# #############################################################################
+# CachedSinglePeriodOptimizer
+# #############################################################################
+
+
+class CachedSinglePeriodOptimizer:
+    """
+    Run `SinglePeriodOptimizer` reusing the cvxpy problem across calls.
+
+    The problem is built once for each set of assets and constraints, e.g.,
+    at the first call and when the universe changes. The next calls only
+    update the predictions, the volatility, and the holdings.
+    """
+
+    def __init__(self, config_dict: dict) -> None:
+        """
+        Constructor.
+
+        :param config_dict: optimizer config, as in `SinglePeriodOptimizer`
+        """
+        self._config_dict = config_dict
+        self._problem_key: Optional[Tuple] = None
+        self._problem: Optional[_ParameterizedProblem] = None
+        # Number of problems built, e.g., for testing.
+        self.num_builds = 0
+
+    def optimize(
+        self,
+        df: pd.DataFrame,
+        *,
+        restrictions: Optional[pd.DataFrame] = None,
+        **kwargs: Dict[str, Any],
+    ) -> pd.DataFrame:
+        """
+        Same as `SinglePeriodOptimizer.optimize()`.
+
+        :param df: same as in `SinglePeriodOptimizer`
+        :param restrictions: same as in `SinglePeriodOptimizer`
+        """
+        spo = SinglePeriodOptimizer(
+            self._config_dict,
+            df,
+            restrictions=restrictions,
+            problem_cache=self,
+        )
+        output_df = spo.optimize(**kwargs)
+        return output_df
+
+    def get_problem(self, spo: SinglePeriodOptimizer) -> _ParameterizedProblem:
+        """
+        Get the problem for `spo`, building it if the assets or the
+        constraints changed.
+        """
+        problem_key = spo._get_problem_key()
+        if self._problem is None or problem_key != self._problem_key:
+            _LOG.debug("Building the problem for key=%s", problem_key)
+            self._problem = _ParameterizedProblem(spo)
+            self._problem_key = problem_key
+            self.num_builds += 1
+        return self._problem
+
+
+# #############################################################################
+# BatchSinglePeriodOptimizer
+# #############################################################################
+
+
+def is_path_independent(config_dict: dict) -> bool:
+    """
+    Return whether the optimal weights of a bar do not depend on the current
+    holdings.
+
+    The only soft constraint of `SinglePeriodOptimizer` depending on the
+    current holdings is the transaction cost. Thus, without it, the bars can
+    be optimized independently (e.g., all at once).
+    """
+    return config_dict["transaction_cost_penalty"] == 0
+
+
+class _StackedProblem:
+    """
+    Store a cvxpy problem optimizing the weights of several bars at once.
+
+    The problem is the sum of the problems of `SinglePeriodOptimizer` for the
+    bars, which are independent since the weights do not depend on the
+    current holdings. As in `_ParameterizedProblem`, the data of each bar are
+    `cvx.Parameter`s, so that the problem is canonicalized once and then
+    solved for each batch of bars.
+    """
+
+    def __init__(self, spo: SinglePeriodOptimizer, num_bars: int) -> None:
+        """
+        Build the problem for `num_bars` bars with the assets and the
+        constraints of `spo`.
+        """
+        hdbg.dassert_lte(1, num_bars)
+        n_assets = spo._n_assets
+        self._predictions = [cvx.Parameter(n_assets) for _ in range(num_bars)]
+        self._volatility = [
+            cvx.Parameter(n_assets, nonneg=True) for _ in range(num_bars)
+        ]
+        # Each row stores the target weights of a bar.
+        self.target_weights = cvx.Variable((num_bars, n_assets))
+        hard_constraints = spo._get_hard_constraints()
+        objectives = []
+        constraint_cvx_expr = []
+        for bar in range(num_bars):
+            target_weights = self.target_weights[bar]
+            # The current weights do not affect the solution, so the weight
+            # diffs are computed from zero weights.
+            target_weight_diffs = target_weights
+            mu = cvx.sum(cvx.multiply(self._predictions[bar], target_weights))
+            soft_constraints = spo._get_soft_constraints(self._volatility[bar])
+            soft_constraint_cvx_expr = [
+                constraint.get_expr(
+                    target_weights, target_weight_diffs, spo._target_gmv
+                )
+                for constraint in soft_constraints
+            ]
+            objectives.append(mu - sum(soft_constraint_cvx_expr))
+            constraint_cvx_expr.extend(
+                constraint.get_expr(
+                    target_weights, target_weight_diffs, spo._target_gmv
+                )
+                for constraint in hard_constraints
+            )
+        self._problem = cvx.Problem(
+            cvx.Maximize(sum(objectives)), constraint_cvx_expr
+        )
+        hdbg.dassert(self._problem.is_dpp())
+
+    @property
+    def num_bars(self) -> int:
+        return self.target_weights.shape[0]
+
+    def solve(
+        self,
+        spo: SinglePeriodOptimizer,
+        predictions: np.ndarray,
+        volatility: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Solve the problem for the bars in the rows of the passed arrays.
+
+        :param predictions: volatility-adjusted returns predictions with
+            shape `(num_bars, n_assets)`
+        :param volatility: volatility with the same shape as `predictions`
+        :return: target weights with the same shape as `predictions`
+        """
+        hdbg.dassert_eq(predictions.shape, self.target_weights.shape)
+        hdbg.dassert_eq(volatility.shape, self.target_weights.shape)
+        for bar in range(self.num_bars):
+            self._predictions[bar].value = predictions[bar] * volatility[bar]
+            self._volatility[bar].value = volatility[bar]
+        optimal_value = self._problem.solve(
+            spo._solver, verbose=spo._verbose, warm_start=True
+        )
+        if self._problem.status != "optimal":
+            _LOG.warning("problem.status=%s", self._problem.status)
+        _LOG.debug("`optimal_value`=%0.2f", optimal_value)
+        return self.target_weights.value
+
+
+class BatchSinglePeriodOptimizer:
+    """
+    Compute the target weights of `SinglePeriodOptimizer` for many bars at
+    once.
+
+    The bars are optimized in batches of `batch_size` bars, each solved as a
+    single stacked problem. This requires that the weights do not depend on
+    the current holdings (see `is_path_independent()`).
+    """
+
+    def __init__(self, config_dict: dict, *, batch_size: int = 4) -> None:
+        """
+        Constructor.
+
+        :param config_dict: optimizer config, as in `SinglePeriodOptimizer`
+        :param batch_size: number of bars in a stacked problem
+        """
+        hdbg.dassert(
+            is_path_independent(config_dict),
+            "The optimal weights depend on the current holdings",
+        )
+        hdbg.dassert_lte(1, batch_size)
+        self._config_dict = config_dict
+        self._batch_size = batch_size
+
+    def optimize_weights(
+        self,
+        prediction_df: pd.DataFrame,
+        volatility_df: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """
+        Compute the target weights of each bar.
+
+        :param prediction_df: volatility-adjusted returns predictions indexed
+            by bar with asset ids as columns
+        :param volatility_df: volatility aligned with `prediction_df`
+        :return: target weights aligned with `prediction_df`, as in
+            `SinglePeriodOptimizer`
+        """
+        hpandas.dassert_axes_equal(prediction_df, volatility_df)
+        hdbg.dassert_lte(1, prediction_df.shape[0])
+        hdbg.dassert(not prediction_df.isna().any().any())
+        hdbg.dassert(not volatility_df.isna().any().any())
+        predictions = prediction_df.to_numpy(dtype=np.float64)
+        volatility = volatility_df.to_numpy(dtype=np.float64)
+        # Build the problem using the assets of the first bar, since the
+        # constraints do not depend on the holdings or the prices.
+        asset_ids = prediction_df.columns
+        df = pd.DataFrame(
+            {
+                "asset_id": asset_ids,
+                "holdings_shares": 0.0,
+                "price": 1.0,
+                "holdings_notional": 0.0,
+                "prediction": predictions[0],
+                "volatility": volatility[0],
+            }
+        )
+        spo = SinglePeriodOptimizer(self._config_dict, df)
+        num_bars = predictions.shape[0]
+        problem = _StackedProblem(spo, min(self._batch_size, num_bars))
+        target_weights = np.empty_like(predictions)
+        for start in range(0, num_bars, problem.num_bars):
+            end = min(start + problem.num_bars, num_bars)
+            # Pad the last batch by repeating its last bar.
+            rows = np.minimum(
+                np.arange(start, start + problem.num_bars), num_bars - 1
+            )
+            weights = problem.solve(spo, predictions[rows], volatility[rows])
+            target_weights[start:end] = weights[: end - start]
+        target_weights = pd.DataFrame(
+            target_weights, index=prediction_df.index, columns=asset_ids
+        )
+        return target_weights
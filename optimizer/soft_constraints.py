@@ -6,6 +6,7 @@ import optimizer.soft_constraints as osofcons
 
 import abc
 import logging
+from typing import Union
 
 import pandas as pd
 
@@ -21,6 +22,20 @@ cvx = pytest.importorskip("cvxpy")
 
 _LOG = logging.getLogger(__name__)
 
+# Per-asset values passed as a `cvx.Parameter` can be updated without
+# rebuilding the problem (see `CachedSinglePeriodOptimizer`).
+SERIES_OR_PARAMETER = Union[pd.Series, cvx.Parameter]
+
+
+def _get_values(srs: SERIES_OR_PARAMETER):
+    """
+    Return the values to use in a cvxpy expression.
+    """
+    if isinstance(srs, cvx.Parameter):
+        return srs
+    hdbg.dassert_isinstance(srs, pd.Series)
+    return srs.values
+
 
 # #############################################################################
 # Class and builder for objective function costs.
@@ -56,6 +71,12 @@ class SoftConstraint(abc.ABC):
     def get_expr(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         expr = self._estimate(target_weights, target_weight_diffs, gmv)
         self.expr = expr.copy()
+        if expr.parameters():
+            # The product of two expressions depending on parameters does not
+            # follow the DPP rules, so that cvxpy would canonicalize the
+            # problem again at each solve. Thus we use the current value of
+            # `gamma`.
+            return self.gamma.value * expr
         return self.gamma * expr
 
     @abc.abstractmethod
@@ -109,7 +130,10 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     """
 
     def __init__(
-        self, correlation: float, volatility: pd.Series, gamma: float = 1.0
+        self,
+        correlation: float,
+        volatility: SERIES_OR_PARAMETER,
+        gamma: float = 1.0,
     ) -> None:
         self._correlation = correlation
         self._volatility = volatility
@@ -118,12 +142,11 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weight_diffs
         _ = gmv
+        volatility = _get_values(self._volatility)
         expr1 = (1 - self._correlation) * cvx.sum_squares(
-            cvx.multiply(target_weights, self._volatility.values)
-        )
-        expr2 = self._correlation * cvx.power(
-            target_weights @ self._volatility.values, 2
+            cvx.multiply(target_weights, volatility)
         )
+        expr2 = self._correlation * cvx.power(target_weights @ volatility, 2)
         expr = expr1 + expr2
         return expr
 
@@ -134,29 +157,34 @@ class ConstantCorrelationRiskModel(SoftConstraint):
 
 
 class SpreadCost(SoftConstraint):
-    def __init__(self, spread: pd.Series, gamma: float = 1.0) -> None:
-        hdbg.dassert_isinstance(spread, pd.Series)
-        hdbg.dassert((spread >= 0).all())
+    def __init__(self, spread: SERIES_OR_PARAMETER, gamma: float = 1.0) -> None:
+        if isinstance(spread, pd.Series):
+            hdbg.dassert((spread >= 0).all())
+        else:
+            hdbg.dassert_isinstance(spread, cvx.Parameter)
+            hdbg.dassert(spread.is_nonneg())
         self._spread = spread
         super().__init__(gamma)
 
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        expr = (self._spread.values / 2) @ cvx.abs(target_weight_diffs).T
+        expr = (_get_values(self._spread) / 2) @ cvx.abs(target_weight_diffs).T
         return expr
 
 
 class TransactionCost(SoftConstraint):
-    def __init__(self, volatility: pd.Series, gamma: float = 1.0) -> None:
-        hdbg.dassert_isinstance(volatility, pd.Series)
+    def __init__(
+        self, volatility: SERIES_OR_PARAMETER, gamma: float = 1.0
+    ) -> None:
+        hdbg.dassert_isinstance(volatility, (pd.Series, cvx.Parameter))
         self._volatility = volatility
         super().__init__(gamma)
 
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        expr = self._volatility.values @ cvx.abs(target_weight_diffs).T
+        expr = _get_values(self._volatility) @ cvx.abs(target_weight_diffs).T
         return expr
 
 
@@ -140,6 +140,63 @@ class TestForecastEvaluatorWithOptimizer1(hunitest.TestCase):
 """
         self.assert_equal(actual, expected, fuzzy_match=True)
 
+    def test_batch_optimization1(self) -> None:
+        """
+        Check that optimizing all the bars at once gives the same portfolio.
+        """
+        data = self.get_data2()
+        config_dict = self.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        expected = forecast_evaluator.to_str(data, quantization=0)
+        actual = forecast_evaluator.to_str(
+            data, quantization=0, batch_optimization=True
+        )
+        self.assert_equal(actual, expected)
+
+    def test_batch_optimization2(self) -> None:
+        """
+        Check the batch optimization over several days.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-04 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201],
+            bar_duration="30T",
+        )
+        config_dict = self.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        # The solution of the stacked problem is the same as the one of the
+        # bar-by-bar optimization only within the solver tolerance, which can
+        # change the quantized holdings, so the output is checked against a
+        # golden.
+        actual = []
+        for initialize_to_zero in [True, False]:
+            actual.append(
+                "# initialize_beginning_of_day_trades_to_zero="
+                f"{initialize_to_zero}"
+            )
+            kwargs = {
+                "quantization": 0,
+                "initialize_beginning_of_day_trades_to_zero": initialize_to_zero,
+            }
+            actual.append(
+                forecast_evaluator.to_str(
+                    data, batch_optimization=True, **kwargs
+                )
+            )
+        actual = "\n".join(actual)
+        self.check_string(actual)
+
     def test_to_str_intraday_1_asset(self) -> None:
         data = self.get_data(
             pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
@@ -357,3 +357,165 @@ class TestSinglePeriodOptimizer1(hunitest.TestCase):
         """
         # pylint: enable=line-too-long
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestCachedSinglePeriodOptimizer1
+# #############################################################################
+
+
+class TestCachedSinglePeriodOptimizer1(hunitest.TestCase):
+    @staticmethod
+    def get_config_dict() -> dict:
+        dict_ = {
+            "dollar_neutrality_penalty": 0.1,
+            "constant_correlation": 0.5,
+            "constant_correlation_penalty": 0.25,
+            "relative_holding_penalty": 0.0,
+            "relative_holding_max_frac_of_gmv": 1.0,
+            "target_gmv": 3000,
+            "target_gmv_upper_bound_penalty": 0.0,
+            "target_gmv_hard_upper_bound_multiple": 1.01,
+            "transaction_cost_penalty": 0.01,
+            "solver": "ECOS",
+        }
+        return dict_
+
+    def check_optimize(
+        self,
+        optimizer: osipeopt.CachedSinglePeriodOptimizer,
+        df: pd.DataFrame,
+        restrictions: Optional[pd.DataFrame],
+    ) -> None:
+        """
+        Check that the cached optimizer returns the same targets as
+        `SinglePeriodOptimizer`.
+        """
+        config_dict = self.get_config_dict()
+        spo = osipeopt.SinglePeriodOptimizer(
+            config_dict, df, restrictions=restrictions
+        )
+        expected = spo.optimize(quantization=0)
+        actual = optimizer.optimize(
+            df, restrictions=restrictions, quantization=0
+        )
+        precision = 2
+        self.assert_equal(
+            hpandas.df_to_str(actual.round(precision), num_rows=None),
+            hpandas.df_to_str(expected.round(precision), num_rows=None),
+        )
+
+    def test1(self) -> None:
+        """
+        Check that the problem is built once for the same assets.
+        """
+        optimizer = osipeopt.CachedSinglePeriodOptimizer(self.get_config_dict())
+        df = TestSinglePeriodOptimizer1.get_prediction_df()
+        restrictions = None
+        self.check_optimize(optimizer, df, restrictions)
+        # Update the predictions and the holdings.
+        df["prediction"] = [-0.02, 0.04, 0.07]
+        df["holdings_shares"] = [-500, 1500, -1000]
+        df["holdings_notional"] = df["holdings_shares"] * df["price"]
+        self.check_optimize(optimizer, df, restrictions)
+        self.assertEqual(optimizer.num_builds, 1)
+
+    def test_rebuild1(self) -> None:
+        """
+        Check that the problem is built again when the assets or the
+        restrictions change.
+        """
+        optimizer = osipeopt.CachedSinglePeriodOptimizer(self.get_config_dict())
+        df = TestSinglePeriodOptimizer1.get_prediction_df()
+        restrictions = None
+        self.check_optimize(optimizer, df, restrictions)
+        # Change the universe.
+        df["asset_id"] = [1, 2, 4]
+        self.check_optimize(optimizer, df, restrictions)
+        self.assertEqual(optimizer.num_builds, 2)
+        # Add restrictions.
+        restrictions = pd.DataFrame(
+            [[4, False, False, True, False]],
+            range(0, 1),
+            [
+                "asset_id",
+                "is_buy_restricted",
+                "is_buy_cover_restricted",
+                "is_sell_short_restricted",
+                "is_sell_long_restricted",
+            ],
+        )
+        self.check_optimize(optimizer, df, restrictions)
+        self.assertEqual(optimizer.num_builds, 3)
+
+
+# #############################################################################
+# TestBatchSinglePeriodOptimizer1
+# #############################################################################
+
+
+class TestBatchSinglePeriodOptimizer1(hunitest.TestCase):
+    @staticmethod
+    def get_config_dict() -> dict:
+        config_dict = TestCachedSinglePeriodOptimizer1.get_config_dict()
+        config_dict["transaction_cost_penalty"] = 0.0
+        return config_dict
+
+    def test1(self) -> None:
+        """
+        Check that the weights are the same as optimizing each bar.
+        """
+        asset_ids = [1, 2, 3]
+        prediction_df = pd.DataFrame(
+            [
+                [0.05, 0.09, 0.03],
+                [-0.02, 0.04, 0.07],
+                [0.01, -0.06, 0.02],
+            ],
+            columns=asset_ids,
+        )
+        volatility_df = pd.DataFrame(
+            [
+                [0.05, 0.07, 0.08],
+                [0.06, 0.07, 0.05],
+                [0.04, 0.08, 0.06],
+            ],
+            columns=asset_ids,
+        )
+        config_dict = self.get_config_dict()
+        # Use batches of 2 bars, so that the last batch is padded.
+        optimizer = osipeopt.BatchSinglePeriodOptimizer(
+            config_dict, batch_size=2
+        )
+        actual = optimizer.optimize_weights(prediction_df, volatility_df)
+        # Optimize each bar.
+        expected = []
+        for bar in range(prediction_df.shape[0]):
+            df = pd.DataFrame(
+                {
+                    "asset_id": asset_ids,
+                    "holdings_shares": [1000, 1500, -500],
+                    "price": 1.0,
+                    "holdings_notional": [1000, 1500, -500],
+                    "prediction": prediction_df.iloc[bar].values,
+                    "volatility": volatility_df.iloc[bar].values,
+                }
+            )
+            spo = osipeopt.SinglePeriodOptimizer(config_dict, df)
+            target_weights, _ = spo._optimize_weights()
+            expected.append(target_weights.value)
+        expected = pd.DataFrame(expected, columns=asset_ids)
+        precision = 3
+        self.assert_equal(
+            hpandas.df_to_str(actual.round(precision), num_rows=None),
+            hpandas.df_to_str(expected.round(precision), num_rows=None),
+        )
+
+    def test_path_dependent1(self) -> None:
+        """
+        Check that the weights depending on the holdings are not supported.
+        """
+        config_dict = TestCachedSinglePeriodOptimizer1.get_config_dict()
+        self.assertFalse(osipeopt.is_path_independent(config_dict))
+        with self.assertRaises(AssertionError):
+            osipeopt.BatchSinglePeriodOptimizer(config_dict)